@@ -0,0 +1,274 @@
+# Fachada assíncrona (asyncio) para os sistemas de arquivos
+# A AsyncFileSystem envolve um FileSystem, do i-node ou de blocos livres, e oferece as operações como
+# corrotinas. Cada operação roda em um executor com uma quantidade limitada de threads, então as leituras e
+# escritas na imagem de disco não bloqueiam o event loop. As operações sobre um mesmo caminho rodam na ordem
+# em que foram pedidas; operações sobre caminhos diferentes rodam ao mesmo tempo. A ordem vale para o
+# caminho exato: quem cria um diretório e depois escreve dentro dele deve esperar o mkdir terminar.
+# Os erros são lançados como Exception com a mensagem do sistema de arquivos (no i-node, as mensagens de
+# erro retornadas viram exceções). Este módulo é igual nas pastas do i-node e de blocos livres.
+import asyncio
+
+# Quantidade padrão de threads do executor
+ASYNC_WORKERS = 8
+# Quantidade máxima de operações entregues ao executor e ainda não concluídas, por thread; as demais
+# esperam no event loop, sem ocupar a fila do executor
+ASYNC_PENDING = 4
+
+
+# Normaliza um caminho para a forma absoluta "/a/b", usada como chave da ordem das operações
+def _key(path):
+    return "/" + "/".join(part for part in path.split("/") if part)
+
+
+# Separa um caminho normalizado em diretório pai e nome
+def _split(path):
+    parent, _, name = path.rpartition("/")
+    return parent or "/", name
+
+
+# Classe com as operações síncronas sobre o sistema de arquivos i-node, com os erros convertidos em exceções
+class _INodeOperations:
+    # Método de inicialização da classe _INodeOperations
+    def __init__(self, filesystem):
+        self.filesystem = filesystem
+
+    # Abre um arquivo (o FileSystem do i-node retorna None quando não consegue abrir)
+    def open(self, path, mode):
+        handle = self.filesystem.open(path, mode)
+        if handle is None:
+            raise Exception("Erro ao abrir o arquivo.")
+        return handle
+
+    # Lê até `size` bytes de um arquivo a partir de `offset` (sem `size`, até o fim)
+    def read(self, path, offset, size):
+        data = self.filesystem.pread(path, offset, size)
+        if data is None:
+            raise Exception("Arquivo não existe")
+        return data
+
+    # Escreve bytes em um arquivo a partir de `offset`, criando-o se não existir
+    def write(self, path, data, offset):
+        count = self.filesystem.pwrite(path, offset, data)
+        if count is None:
+            parent, name = _split(path)
+            if self.filesystem.add_node(parent, name) is None:
+                raise Exception("Erro ao criar o arquivo.")
+            count = self.filesystem.pwrite(path, offset, data)
+        return count
+
+    # Lista os nomes das entradas de um diretório
+    def listdir(self, path):
+        entries = self.filesystem.iterdir(path)
+        if entries is None:
+            raise Exception("Diretório não existe")
+        return [name for name, _ in entries]
+
+    # Obtém o nome, o tipo, o tamanho e os atributos de um arquivo ou diretório
+    def stat(self, path):
+        node = self.filesystem.find_node(path)
+        if node is None:
+            raise Exception("Arquivo ou diretório não existe")
+        return {"name": node.name, "is_directory": node.is_directory,
+                "size": 0 if node.is_directory else node.content.size, "attributes": dict(node.attributes or {})}
+
+    # Cria um diretório
+    def mkdir(self, path):
+        parent, name = _split(path)
+        if self.filesystem.add_node(parent, name, True) is None:
+            raise Exception("Erro ao criar o diretório.")
+
+    # Remove um arquivo
+    def unlink(self, path):
+        node = self.filesystem.find_node(path)
+        if node is None or node.is_directory:
+            raise Exception("Arquivo não existe")
+        message = self.filesystem.delete_node(path)
+        if message.startswith("Erro"):
+            raise Exception(message)
+
+
+# Classe com as operações síncronas sobre o sistema de arquivos de blocos livres (que já lança exceções)
+class _BlockOperations:
+    # Método de inicialização da classe _BlockOperations
+    def __init__(self, filesystem):
+        self.filesystem = filesystem
+
+    # Abre um arquivo
+    def open(self, path, mode):
+        return self.filesystem.open(path, mode)
+
+    # Lê até `size` bytes de um arquivo a partir de `offset` (sem `size`, até o fim)
+    def read(self, path, offset, size):
+        return self.filesystem.read_file(path, offset, size)
+
+    # Escreve bytes em um arquivo a partir de `offset`, criando-o se não existir
+    def write(self, path, data, offset):
+        if self.filesystem.lookup(path) is None:
+            self.filesystem.create_file(path)
+        self.filesystem.write_file(path, data, offset)
+        return len(data)
+
+    # Lista os nomes das entradas de um diretório
+    def listdir(self, path):
+        return [name for name, _ in self.filesystem.list_entries(path)]
+
+    # Obtém o nome, o tipo, o tamanho e os atributos de um arquivo ou diretório
+    def stat(self, path):
+        entry = self.filesystem.lookup(path)
+        if entry is None:
+            raise Exception("Arquivo ou diretório não existe")
+        return {"name": entry.name, "is_directory": entry.is_directory,
+                "size": 0 if entry.is_directory else entry.size, "attributes": dict(entry.attributes)}
+
+    # Cria um diretório
+    def mkdir(self, path):
+        self.filesystem.create_directory(path)
+
+    # Remove um arquivo
+    def unlink(self, path):
+        self.filesystem.remove_file(path)
+
+
+# Classe para um arquivo aberto pela AsyncFileSystem; as operações seguem a ordem das demais operações
+# sobre o mesmo caminho. As escritas passam por um buffer e só aparecem para as outras operações depois
+# de flush ou close
+class AsyncFile:
+    # Método de inicialização da classe AsyncFile
+    def __init__(self, filesystem, path, handle):
+        self.filesystem = filesystem
+        self.path = path
+        self.handle = handle
+
+    # Lê até `size` bytes (ou caracteres, no modo texto); sem `size`, até o fim
+    async def read(self, size=-1):
+        return await self.filesystem._run(self.path, self.handle.read, size)
+
+    # Escreve os dados e retorna a quantidade escrita
+    async def write(self, data):
+        return await self.filesystem._run(self.path, self.handle.write, data)
+
+    # Muda a posição atual
+    async def seek(self, offset, whence=0):
+        return await self.filesystem._run(self.path, self.handle.seek, offset, whence)
+
+    # Obtém a posição atual
+    async def tell(self):
+        return await self.filesystem._run(self.path, self.handle.tell)
+
+    # Grava o buffer de escrita no arquivo
+    async def flush(self):
+        await self.filesystem._run(self.path, self.handle.flush)
+
+    # Fecha o arquivo
+    async def close(self):
+        await self.filesystem._run(self.path, self.handle.close)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, kind, value, traceback):
+        await self.close()
+
+
+# Classe da fachada assíncrona sobre um FileSystem do i-node ou de blocos livres
+class AsyncFileSystem:
+    # Método de inicialização da classe AsyncFileSystem
+    # `workers` é a quantidade de threads do executor, que limita as operações executadas ao mesmo tempo
+    def __init__(self, filesystem, workers=ASYNC_WORKERS):
+        # Importado só aqui, como nos sistemas de arquivos: concurrent.futures é uma importação cara
+        from concurrent.futures import ThreadPoolExecutor
+        self.filesystem = filesystem
+        # O FileSystem do i-node é o que tem add_node
+        if hasattr(filesystem, "add_node"):
+            self.operations = _INodeOperations(filesystem)
+        else:
+            self.operations = _BlockOperations(filesystem)
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="asyncfs")
+        self.slots = asyncio.Semaphore(workers * ASYNC_PENDING)
+        # Para cada caminho com operações pendentes, o futuro concluído quando a última delas terminar
+        self.tails = {}
+
+    # Método que executa `function(*arguments)` no executor depois das operações já pedidas para `path`
+    async def _run(self, path, function, *arguments):
+        loop = asyncio.get_running_loop()
+        previous = self.tails.get(path)
+        done = loop.create_future()
+        self.tails[path] = done
+        running = None
+        try:
+            if previous is not None:
+                # asyncio.wait não cancela `previous` se esta operação for cancelada enquanto espera
+                await asyncio.wait((previous,))
+            async with self.slots:
+                running = loop.run_in_executor(self.executor, function, *arguments)
+                return await asyncio.shield(running)
+        finally:
+            # Mesmo se esta corrotina for cancelada, a próxima operação do caminho só começa quando a
+            # função terminar na thread; cancelada antes de começar, ela só libera a próxima quando a
+            # anterior terminar
+            if running is not None and not running.done():
+                running.add_done_callback(lambda future: self._finished(path, done, future))
+            elif running is None and previous is not None and not previous.done():
+                previous.add_done_callback(lambda _: self._finished(path, done, None))
+            else:
+                self._finished(path, done, running)
+
+    # Método que libera a próxima operação de um caminho quando a atual termina
+    def _finished(self, path, done, future):
+        # Consulta a exceção de uma operação cancelada, que ninguém mais vai esperar
+        if future is not None and future.done() and not future.cancelled():
+            future.exception()
+        done.set_result(None)
+        if self.tails.get(path) is done:
+            del self.tails[path]
+
+    # Abre um arquivo e retorna um AsyncFile (o modo segue o open() do Python)
+    async def open(self, path, mode="r"):
+        path = _key(path)
+        handle = await self._run(path, self.operations.open, path, mode)
+        return AsyncFile(self, path, handle)
+
+    # Lê até `size` bytes de um arquivo a partir de `offset` (sem `size`, até o fim)
+    async def read(self, path, offset=0, size=None):
+        path = _key(path)
+        return await self._run(path, self.operations.read, path, offset, size)
+
+    # Escreve bytes (ou texto, gravado em UTF-8) em um arquivo a partir de `offset`, criando-o se não
+    # existir; retorna a quantidade de bytes escritos
+    async def write(self, path, data, offset=0):
+        path = _key(path)
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        return await self._run(path, self.operations.write, path, data, offset)
+
+    # Lista os nomes das entradas de um diretório
+    async def listdir(self, path="/"):
+        path = _key(path)
+        return await self._run(path, self.operations.listdir, path)
+
+    # Obtém {"name", "is_directory", "size", "attributes"} de um arquivo ou diretório
+    async def stat(self, path):
+        path = _key(path)
+        return await self._run(path, self.operations.stat, path)
+
+    # Cria um diretório
+    async def mkdir(self, path):
+        path = _key(path)
+        await self._run(path, self.operations.mkdir, path)
+
+    # Remove um arquivo
+    async def unlink(self, path):
+        path = _key(path)
+        await self._run(path, self.operations.unlink, path)
+
+    # Espera as operações pendentes e encerra o executor
+    async def close(self):
+        while self.tails:
+            await asyncio.wait(list(self.tails.values()))
+        self.executor.shutdown(wait=True)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, kind, value, traceback):
+        await self.close()
@@ -0,0 +1,117 @@
+# Índice secundário de um atributo definido com set_attribute
+# Cada índice guarda, para cada valor, o conjunto de chaves (números de inode) que têm esse valor (consulta
+# por igualdade em tempo constante) e, para números e textos, uma lista ordenada dos valores distintos
+# (consulta por intervalo com busca binária, proporcional ao tamanho do resultado).
+import threading
+from bisect import bisect_left, bisect_right, insort
+
+# Operadores aceitos nas consultas
+OPERATORS = ("==", "<", "<=", ">", ">=")
+
+
+# Obtém o grupo de ordenação de um valor: valores só são comparados com outros do mesmo grupo
+# Retorna None para valores que só podem ser consultados por igualdade
+def _order_group(value):
+    if isinstance(value, (int, float)):
+        return "number" if value == value else None  # NaN não tem ordem
+    if isinstance(value, str):
+        return "text"
+    return None
+
+
+# Verifica se um valor pode ser indexado (None, que indica um atributo ausente, e valores como listas
+# e dicionários ficam fora do índice)
+def _hashable(value):
+    if value is None:
+        return False
+    try:
+        hash(value)
+    except TypeError:
+        return False
+    return True
+
+
+# Verifica se um valor satisfaz `op value` com as mesmas regras do índice (usada quando não há índice)
+def matches(stored, op, value):
+    if op == "==":
+        return stored is not None and stored == value
+    group = _order_group(value)
+    if group is None or _order_group(stored) != group:
+        return False
+    if op == "<":
+        return stored < value
+    if op == "<=":
+        return stored <= value
+    if op == ">":
+        return stored > value
+    return stored >= value
+
+
+# Classe para o índice de um atributo
+class AttributeIndex:
+    # Método de inicialização da classe AttributeIndex
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.keys = {}  # Valor -> conjunto de chaves com esse valor
+        self.ordered = {"number": [], "text": []}  # Grupo -> valores distintos em ordem crescente
+
+    # Método para registrar que `key` tem o valor `value`
+    def add(self, key, value):
+        if not _hashable(value):
+            return
+        with self.lock:
+            keys = self.keys.get(value)
+            if keys is None:
+                keys = self.keys[value] = set()
+                group = _order_group(value)
+                if group is not None:
+                    insort(self.ordered[group], value)
+            keys.add(key)
+
+    # Método para retirar o valor `value` da chave `key`
+    def remove(self, key, value):
+        if not _hashable(value):
+            return
+        with self.lock:
+            keys = self.keys.get(value)
+            if keys is None:
+                return
+            keys.discard(key)
+            if not keys:
+                del self.keys[value]
+                group = _order_group(value)
+                if group is not None:
+                    values = self.ordered[group]
+                    del values[bisect_left(values, value)]
+
+    # Método para trocar o valor de uma chave (`old` ou `new` podem ser None, quando ausentes)
+    def update(self, key, old, new):
+        if old is not None:
+            self.remove(key, old)
+        if new is not None:
+            self.add(key, new)
+
+    # Método para obter as chaves cujo valor satisfaz `op value` (ver OPERATORS)
+    def lookup(self, op, value):
+        if op not in OPERATORS:
+            raise ValueError(op)
+        with self.lock:
+            if op == "==":
+                return list(self.keys.get(value, ())) if _hashable(value) else []
+            group = _order_group(value)
+            if group is None:
+                return []
+            values = self.ordered[group]
+            if op == "<":
+                selected = values[:bisect_left(values, value)]
+            elif op == "<=":
+                selected = values[:bisect_right(values, value)]
+            elif op == ">":
+                selected = values[bisect_right(values, value):]
+            else:
+                selected = values[bisect_left(values, value):]
+            return [key for selected_value in selected for key in self.keys[selected_value]]
+
+    # Método para obter a quantidade de valores distintos no índice
+    def __len__(self):
+        return len(self.keys)
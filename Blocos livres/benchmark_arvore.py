@@ -0,0 +1,70 @@
+# Benchmark do espaço de nomes hierárquico do sistema de blocos livres
+# Árvores largas: um diretório com muitas entradas (criação, busca, verificação arquivo/diretório e listagem)
+# Árvores profundas: uma cadeia de diretórios (resolução do caminho mais profundo, navegação e volta ao pai)
+# Em ambos os casos o custo por passo deve se manter constante à medida que a árvore cresce.
+import random
+import time
+
+from blocoslivres import FileSystem
+
+# Quantidades de entradas do diretório largo
+LARGURAS = [10_000, 100_000, 1_000_000]
+# Profundidades da cadeia de diretórios
+PROFUNDIDADES = [100, 1_000, 10_000]
+# Quantidade de buscas medidas em cada tamanho
+BUSCAS = 10_000
+
+
+# Mede o tempo médio (em microssegundos) de uma função aplicada a cada item
+def medir(funcao, itens):
+    inicio = time.perf_counter()
+    for item in itens:
+        funcao(item)
+    return (time.perf_counter() - inicio) / len(itens) * 1e6
+
+
+# Benchmark de um diretório com `largura` arquivos
+def largo(largura):
+    fs = FileSystem(1 << 16, block_size=64)
+    fs.create_directory("/dados")
+    inicio = time.perf_counter()
+    for i in range(largura):
+        fs.create_file(f"/dados/arquivo{i}.txt")
+    criacao = (time.perf_counter() - inicio) / largura * 1e6
+    caminhos = [f"/dados/arquivo{random.randrange(largura)}.txt" for _ in range(BUSCAS)]
+    busca = medir(fs.lookup, caminhos)
+    verificacao = medir(fs.is_directory, caminhos)
+    inicio = time.perf_counter()
+    entradas = fs.list_entries("/dados")
+    listagem = (time.perf_counter() - inicio) / len(entradas) * 1e6
+    print(f"largo  {largura:>9} entradas | criação {criacao:6.2f} us | busca {busca:5.2f} us | "
+          f"é diretório {verificacao:5.2f} us | listagem {listagem:5.3f} us/entrada")
+
+
+# Benchmark de uma cadeia de `profundidade` diretórios
+def profundo(profundidade):
+    fs = FileSystem(1 << 16, block_size=64)
+    for _ in range(profundidade):
+        fs.create_directory("d")
+        fs.navigate("d")
+    caminho = "/" + "/".join(["d"] * profundidade)
+    # Resolução do caminho completo, por componente
+    resolucao = medir(fs.lookup, [caminho] * 100) / profundidade
+    # Volta até a raiz pelo ponteiro para o pai e desce de novo, um nível por vez
+    inicio = time.perf_counter()
+    for _ in range(profundidade):
+        fs.navigate_back()
+    volta = (time.perf_counter() - inicio) / profundidade * 1e6
+    inicio = time.perf_counter()
+    for _ in range(profundidade):
+        fs.navigate("d")
+    descida = (time.perf_counter() - inicio) / profundidade * 1e6
+    print(f"fundo  {profundidade:>9} níveis   | resolução {resolucao:5.3f} us/nível | "
+          f"voltar {volta:5.2f} us/nível | navegar {descida:5.2f} us/nível")
+
+
+if __name__ == "__main__":
+    for largura in LARGURAS:
+        largo(largura)
+    for profundidade in PROFUNDIDADES:
+        profundo(profundidade)
@@ -0,0 +1,125 @@
+# Benchmark da fachada assíncrona (asyncfs.py) sobre o sistema de arquivos de blocos livres
+# Usa um volume guardado em uma imagem de disco e dispara milhares de operações ao mesmo tempo (leituras,
+# escritas, stat e listdir sobre muitos arquivos) com asyncio.gather. Compara as mesmas operações chamadas
+# diretamente no event loop com a AsyncFileSystem para algumas quantidades de threads, medindo a vazão e o
+# atraso de uma tarefa que deveria acordar a cada milissegundo (o quanto o event loop ficou bloqueado).
+# Uso: python benchmark_assincrono.py [operações em andamento]
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+
+from asyncfs import AsyncFileSystem
+from blocoslivres import FileSystem
+
+# Quantidade padrão de operações disparadas ao mesmo tempo
+OPERACOES = 10_000
+# Quantidade de arquivos usados pelas operações e tamanho de cada um
+ARQUIVOS = 1_000
+TAMANHO = 16 << 10
+# Quantidades de threads testadas na AsyncFileSystem
+THREADS = (1, 4, 16)
+# Tamanho do volume, em blocos de 4 KiB
+BLOCOS = 1 << 16
+
+
+# Cria o sistema de arquivos na imagem `caminho` com os arquivos usados pelas operações
+def novo_sistema(caminho):
+    fs = FileSystem(BLOCOS, image_path=caminho)
+    fs.create_directory("/dados")
+    conteudo = os.urandom(TAMANHO)
+    for i in range(ARQUIVOS):
+        fs.create_file(f"/dados/f{i}", conteudo)
+    return fs
+
+
+# Sorteia as operações: 40% leituras, 30% escritas, 20% stat e 10% listdir
+def sortear(quantidade):
+    aleatorio = random.Random(1)
+    dados = os.urandom(4096)
+    operacoes = []
+    for _ in range(quantidade):
+        caminho = f"/dados/f{aleatorio.randrange(ARQUIVOS)}"
+        sorteio = aleatorio.random()
+        if sorteio < 0.4:
+            operacoes.append(("read", caminho, aleatorio.randrange(TAMANHO - 4096), 4096))
+        elif sorteio < 0.7:
+            operacoes.append(("write", caminho, dados, aleatorio.randrange(TAMANHO - 4096)))
+        elif sorteio < 0.9:
+            operacoes.append(("stat", caminho))
+        else:
+            operacoes.append(("listdir", "/dados"))
+    return operacoes
+
+
+# Executa uma operação chamando o sistema de arquivos diretamente, dentro do event loop
+async def direta(fs, operacao):
+    nome = operacao[0]
+    if nome == "read":
+        return fs.read_file(operacao[1], operacao[2], operacao[3])
+    if nome == "write":
+        return fs.write_file(operacao[1], operacao[2], operacao[3])
+    if nome == "stat":
+        return fs.lookup(operacao[1])
+    return fs.list_entries(operacao[1])
+
+
+# Executa uma operação pela AsyncFileSystem
+async def assincrona(afs, operacao):
+    nome = operacao[0]
+    if nome == "read":
+        return await afs.read(operacao[1], operacao[2], operacao[3])
+    if nome == "write":
+        return await afs.write(operacao[1], operacao[2], operacao[3])
+    if nome == "stat":
+        return await afs.stat(operacao[1])
+    return await afs.listdir(operacao[1])
+
+
+# Tarefa que acorda a cada milissegundo e guarda os atrasos observados
+async def medir_atraso(atrasos, parar):
+    while not parar.is_set():
+        inicio = time.perf_counter()
+        await asyncio.sleep(0.001)
+        atrasos.append(time.perf_counter() - inicio - 0.001)
+
+
+# Dispara todas as operações ao mesmo tempo e retorna a vazão, o atraso do event loop no percentil 99 e o
+# maior atraso
+async def rodar(executar, alvo, operacoes):
+    atrasos = [0.0]
+    parar = asyncio.Event()
+    medidor = asyncio.ensure_future(medir_atraso(atrasos, parar))
+    await asyncio.sleep(0.01)
+    inicio = time.perf_counter()
+    await asyncio.gather(*[executar(alvo, operacao) for operacao in operacoes])
+    tempo = time.perf_counter() - inicio
+    parar.set()
+    await medidor
+    atrasos.sort()
+    return len(operacoes) / tempo, atrasos[int(len(atrasos) * 0.99)], atrasos[-1]
+
+
+# Mostra uma linha do resultado
+def mostrar(titulo, vazao, percentil, maior):
+    print(f"{titulo:<28} {vazao:>8.0f} ops/s   atraso do event loop: p99 {percentil * 1000:6.1f} ms, "
+          f"máximo {maior * 1000:6.1f} ms")
+
+
+async def principal(quantidade, fs):
+    operacoes = sortear(quantidade)
+    print(f"{quantidade} operações em andamento sobre {ARQUIVOS} arquivos de {TAMANHO >> 10} KiB")
+    mostrar("Chamadas diretas no loop", *await rodar(direta, fs, operacoes))
+    for threads in THREADS:
+        async with AsyncFileSystem(fs, workers=threads) as afs:
+            mostrar(f"AsyncFileSystem ({threads} threads)", *await rodar(assincrona, afs, operacoes))
+
+
+if __name__ == "__main__":
+    quantidade = int(sys.argv[1]) if len(sys.argv) > 1 else OPERACOES
+    with tempfile.TemporaryDirectory() as temporario:
+        fs = novo_sistema(os.path.join(temporario, "volume.img"))
+        asyncio.run(principal(quantidade, fs))
+        fs.close()
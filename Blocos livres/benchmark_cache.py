@@ -0,0 +1,89 @@
+# Benchmark das políticas de descarte do cache de blocos por reprodução de traços de acesso
+# Os traços são gravados pelo próprio cache (BlockCache.trace) enquanto uma carga roda no sistema de
+# arquivos, e depois reproduzidos em caches com cada política e capacidade, comparando a taxa de acertos.
+# Uso: python benchmark_cache.py [traço.txt ...]  (cada linha do arquivo é "r BLOCO" ou "w BLOCO";
+# sem argumentos, os traços são gerados e gravados em arquivos temporários)
+import os
+import random
+import sys
+import tempfile
+import time
+
+from blockcache import BlockCache, POLICIES
+from blocoslivres import FileSystem
+
+# Capacidades do cache avaliadas, em blocos
+CAPACIDADES = [64, 256, 1024]
+# Quantidade de arquivos e de blocos por arquivo das cargas gravadas
+ARQUIVOS = 200
+BLOCOS_POR_ARQUIVO = 16
+# Quantidade de leituras de arquivo em cada carga
+LEITURAS = 4_000
+
+
+# Grava o traço de uma carga: `escolher(i)` retorna o índice do arquivo lido no passo i
+def gravar(escolher, caminho):
+    fs = FileSystem(1 << 14, block_size=64, cache_blocks=1 << 14)
+    for i in range(ARQUIVOS):
+        fs.create_file(f"/f{i}", "x" * (64 * BLOCOS_POR_ARQUIVO))
+    fs.cache.trace = []
+    for i in range(LEITURAS):
+        indice = escolher(i)
+        fs.read_file(f"/f{indice}")
+        if i % 10 == 0:
+            fs.write_file(f"/f{indice}", b"y" * 64, 0)
+    with open(caminho, "w") as arquivo:
+        arquivo.writelines(f"{operacao} {bloco}\n" for operacao, bloco in fs.cache.trace)
+
+
+# Lê um traço gravado
+def carregar(caminho):
+    with open(caminho) as arquivo:
+        return [(operacao, int(bloco)) for operacao, bloco in (linha.split() for linha in arquivo if linha.strip())]
+
+
+# Reproduz um traço em um cache com armazenamento em memória e retorna as estatísticas e o tempo
+def reproduzir(traco, politica, capacidade):
+    armazenamento = {}
+    cache = BlockCache(armazenamento.get, armazenamento.__setitem__, capacidade, politica, write_back=True)
+    inicio = time.perf_counter()
+    for operacao, bloco in traco:
+        if operacao == "r":
+            cache.read(bloco)
+        else:
+            cache.write(bloco, b"")
+    return cache.stats(), time.perf_counter() - inicio
+
+
+# Cargas usadas quando nenhum traço é informado
+def cargas():
+    aleatorio = random.Random(42)
+    quentes = ARQUIVOS // 10
+    return {
+        # Popularidade concentrada em poucos arquivos (distribuição de Zipf aproximada)
+        "zipf": lambda i: min(int(aleatorio.paretovariate(1.2)) - 1, ARQUIVOS - 1),
+        # Um conjunto quente interrompido por varreduras completas (ruim para o LRU)
+        "varredura": lambda i: (i // 2) % ARQUIVOS if (i // 400) % 2 else aleatorio.randrange(quentes),
+        # Laço sobre um conjunto um pouco maior que o cache
+        "laço": lambda i: i % (ARQUIVOS // 3),
+    }
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        tracos = {os.path.basename(caminho): carregar(caminho) for caminho in sys.argv[1:]}
+    else:
+        tracos = {}
+        with tempfile.TemporaryDirectory() as pasta:
+            for nome, escolher in cargas().items():
+                caminho = os.path.join(pasta, f"{nome}.txt")
+                gravar(escolher, caminho)
+                tracos[nome] = carregar(caminho)
+    for nome, traco in tracos.items():
+        print(f"traço {nome}: {len(traco)} acessos")
+        for capacidade in CAPACIDADES:
+            linha = []
+            for politica in POLICIES:
+                estatisticas, duracao = reproduzir(traco, politica, capacidade)
+                linha.append(f"{politica} {estatisticas['hit_ratio']:6.1%} ({len(traco) / duracao / 1e6:4.2f} M/s)")
+            print(f"  {capacidade:>5} blocos | " + " | ".join(linha))
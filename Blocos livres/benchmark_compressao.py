@@ -0,0 +1,76 @@
+# Benchmark da compressão transparente de blocos do sistema de blocos livres
+# Para cada codec (e sem compressão), grava arquivos de log, CSV e dados aleatórios (que não comprimem e
+# ficam sem compressão) e informa a razão de compressão e a vazão de escrita e de leitura. A leitura é
+# medida duas vezes: a primeira descomprime os blocos e a segunda é servida pelo cache de blocos.
+import os
+import random
+import time
+
+from blocoslivres import FileSystem
+
+# Codecs avaliados (None = sem compressão)
+CODECS = [None, "zlib", "lzma", "bz2"]
+# Tamanho de cada arquivo gravado (em bytes)
+TAMANHO = 8 * 1024 * 1024
+
+
+# Gera as linhas de um log de aplicação
+def gerar_log(tamanho):
+    aleatorio = random.Random(1)
+    niveis = ["INFO", "INFO", "INFO", "WARN", "ERROR"]
+    linhas = []
+    total = 0
+    while total < tamanho:
+        linha = (f"2024-05-{aleatorio.randrange(1, 29):02d} {aleatorio.randrange(24):02d}:"
+                 f"{aleatorio.randrange(60):02d}:{aleatorio.randrange(60):02d} {aleatorio.choice(niveis)} "
+                 f"servidor-{aleatorio.randrange(8)} requisição {aleatorio.randrange(10**6)} concluída em "
+                 f"{aleatorio.randrange(1, 900)} ms\n")
+        linhas.append(linha)
+        total += len(linha)
+    return "".join(linhas).encode()[:tamanho]
+
+
+# Gera um arquivo CSV com colunas numéricas e de texto
+def gerar_csv(tamanho):
+    aleatorio = random.Random(2)
+    cidades = ["Recife", "Salvador", "Curitiba", "Manaus", "Natal", "Belém"]
+    linhas = ["id,cidade,quantidade,preco\n"]
+    total = 0
+    while total < tamanho:
+        linha = f"{len(linhas)},{aleatorio.choice(cidades)},{aleatorio.randrange(100)},{aleatorio.random() * 100:.2f}\n"
+        linhas.append(linha)
+        total += len(linha)
+    return "".join(linhas).encode()[:tamanho]
+
+
+# Mede a razão de compressão e a vazão de um codec
+def medir(codec, dados):
+    fs = FileSystem(1 << 16, block_size=4096, compression=codec, cache_blocks=8192)
+    inicio = time.perf_counter()
+    for nome, conteudo in dados.items():
+        with fs.open(f"/{nome}", "wb") as arquivo:
+            arquivo.write(conteudo)
+    escrita = time.perf_counter() - inicio
+    fs.cache.discard(0, fs.total_blocks)
+    leituras = []
+    for _ in range(2):
+        inicio = time.perf_counter()
+        for nome, conteudo in dados.items():
+            assert fs.read_file(f"/{nome}") == conteudo
+        leituras.append(time.perf_counter() - inicio)
+    estatisticas = fs.compression_stats()
+    megabytes = sum(len(conteudo) for conteudo in dados.values()) / (1 << 20)
+    razoes = []
+    for nome in dados:
+        blocos = list(fs.lookup(f"/{nome}").iter_blocks())
+        guardados = sum(len(fs.block_data[bloco]) for bloco in blocos)
+        razoes.append(f"{nome} {len(blocos) * fs.block_size / guardados:5.1f}x")
+    print(f"{codec or 'nenhum':<7} | razão {estatisticas['ratio']:5.2f}x ({', '.join(razoes)}) | "
+          f"escrita {megabytes / escrita:6.0f} MB/s | leitura {megabytes / leituras[0]:6.0f} MB/s, "
+          f"com cache {megabytes / leituras[1]:6.0f} MB/s")
+
+
+if __name__ == "__main__":
+    dados = {"log": gerar_log(TAMANHO), "csv": gerar_csv(TAMANHO), "aleatorio": os.urandom(TAMANHO)}
+    for codec in CODECS:
+        medir(codec, dados)
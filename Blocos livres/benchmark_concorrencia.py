@@ -0,0 +1,64 @@
+# Benchmark de vazão do sistema de blocos livres com várias threads
+# Mede operações por segundo com 1, 2, 4 e 8 threads, cada uma em seu próprio diretório.
+# O teste de estresse com as verificações do mapa de bits fica em test_blocos_concorrencia.py.
+import threading
+import time
+
+from blocoslivres import FileSystem
+
+# Quantidades de threads avaliadas no benchmark
+THREADS = [1, 2, 4, 8]
+# Operações executadas por cada thread no benchmark
+OPERACOES = 8_000
+
+
+# Executa a função em `quantidade` threads e retorna o tempo total (as exceções são repassadas)
+def em_paralelo(quantidade, funcao):
+    erros = []
+    inicio_comum = threading.Barrier(quantidade)
+
+    def executar(indice):
+        try:
+            inicio_comum.wait()
+            funcao(indice)
+        except BaseException as erro:
+            erros.append(erro)
+
+    threads = [threading.Thread(target=executar, args=(i,)) for i in range(quantidade)]
+    inicio = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if erros:
+        raise erros[0]
+    return time.perf_counter() - inicio
+
+
+# Cria os diretórios usados pelas threads
+def criar_diretorios(fs, nomes):
+    for nome in nomes:
+        fs.create_directory(nome)
+
+
+# Mede a vazão com threads trabalhando em diretórios disjuntos
+def vazao(quantidade):
+    fs = FileSystem(1 << 20, block_size=64)
+    criar_diretorios(fs, [f"t{i}" for i in range(quantidade)])
+
+    def trabalho(indice):
+        for i in range(OPERACOES // 4):
+            caminho = f"/t{indice}/f{i}"
+            fs.create_file(caminho, "conteudo")
+            fs.write_file(caminho, b"dados" * 20, 8)
+            fs.read_file(caminho)
+            fs.list_directory(f"/t{indice}")
+
+    duracao = em_paralelo(quantidade, trabalho)
+    total = quantidade * OPERACOES
+    print(f"{quantidade} threads | {total:>7} operações | {duracao:6.2f} s | {total / duracao:10.0f} ops/s")
+
+
+if __name__ == "__main__":
+    for quantidade in THREADS:
+        vazao(quantidade)
@@ -0,0 +1,43 @@
+# Benchmark das consultas por atributo do sistema de blocos livres
+# Compara query sem índice (examina todos os inodes) e com índice, para igualdade e intervalo,
+# à medida que a quantidade de arquivos cresce. Com índice, o custo acompanha o tamanho do resultado.
+import time
+
+from blocoslivres import FileSystem
+
+# Quantidades de arquivos avaliadas
+QUANTIDADES = [1_000, 10_000, 100_000]
+# Quantidade de donos distintos (cada consulta de igualdade retorna QUANTIDADE / DONOS arquivos)
+DONOS = 1_000
+# Repetições de cada consulta
+REPETICOES = 20
+
+
+# Mede o tempo médio de uma consulta em microssegundos
+def medir(fs, *consulta):
+    inicio = time.perf_counter()
+    for _ in range(REPETICOES):
+        resultado = fs.query(*consulta)
+    return (time.perf_counter() - inicio) / REPETICOES * 1e6, len(resultado)
+
+
+# Executa as consultas em um sistema com `quantidade` arquivos
+def executar(quantidade):
+    fs = FileSystem(1 << 20, block_size=64)
+    fs.create_directory("/dados")
+    for i in range(quantidade):
+        fs.create_file(f"/dados/f{i}", "x" * (i % 64))
+        fs.set_attribute(f"/dados/f{i}", "owner", f"usuario{i % DONOS}")
+    consultas = [("owner", "==", "usuario7"), ("size", ">", 62)]
+    sem_indice = [medir(fs, *consulta) for consulta in consultas]
+    for attribute, _, _ in consultas:
+        fs.create_index(attribute)
+    com_indice = [medir(fs, *consulta) for consulta in consultas]
+    for (attribute, op, value), (lento, total), (rapido, _) in zip(consultas, sem_indice, com_indice):
+        print(f"{quantidade:>7} arquivos | {attribute} {op} {value!r:>10} | {total:>5} resultados | "
+              f"sem índice {lento:10.1f} us | com índice {rapido:8.1f} us")
+
+
+if __name__ == "__main__":
+    for quantidade in QUANTIDADES:
+        executar(quantidade)
@@ -0,0 +1,51 @@
+# Benchmark da deduplicação de blocos do sistema de blocos livres
+# Cria muitos arquivos a partir de poucos modelos (configurações, modelos de documentos e artefatos
+# repetidos), com uma linha própria no início de parte deles, e compara o espaço ocupado e a vazão da
+# criação com e sem deduplicação. Também mede uma cópia de subárvore, que com deduplicação só
+# compartilha os blocos.
+import os
+import random
+import time
+
+from blocoslivres import FileSystem
+
+# Quantidade de arquivos criados
+ARQUIVOS = 5_000
+# Quantidade de modelos distintos e tamanho de cada um (em bytes)
+MODELOS = 20
+TAMANHO_MODELO = 32 * 1024
+# Fração dos arquivos que recebe um cabeçalho próprio (o primeiro bloco deixa de ser igual ao do modelo)
+PERSONALIZADOS = 0.3
+
+
+# Cria os arquivos e mede o espaço ocupado com ou sem deduplicação
+def medir(dedup):
+    fs = FileSystem(1 << 17, block_size=4096, dedup=dedup)
+    aleatorio = random.Random(1)
+    modelos = [os.urandom(TAMANHO_MODELO) for _ in range(MODELOS)]
+    fs.create_directory("/projetos")
+    inicio = time.perf_counter()
+    for i in range(ARQUIVOS):
+        conteudo = aleatorio.choice(modelos)
+        if aleatorio.random() < PERSONALIZADOS:
+            conteudo = f"# arquivo {i}\n".encode() + conteudo[32:]
+        fs.create_file(f"/projetos/arquivo{i}.cfg", conteudo)
+    duracao = time.perf_counter() - inicio
+    usados = fs.total_blocks - fs.free_block_count()
+    inicio = time.perf_counter()
+    fs.copytree("/projetos", "/copia")
+    copia = time.perf_counter() - inicio
+    megabytes = ARQUIVOS * TAMANHO_MODELO / (1 << 20)
+    print(f"{'com' if dedup else 'sem'} deduplicação | {usados:>7} blocos ocupados | "
+          f"criação {megabytes / duracao:6.0f} MB/s | copytree {copia:5.2f} s | "
+          f"{fs.total_blocks - fs.free_block_count():>7} blocos depois da cópia")
+    if dedup:
+        estatisticas = fs.dedup_stats()
+        print(f"razão de deduplicação {estatisticas['dedup_ratio']:.1f}x | "
+              f"{estatisticas['bytes_saved'] / (1 << 20):.0f} MiB economizados | "
+              f"{estatisticas['shared_blocks']} blocos compartilhados")
+
+
+if __name__ == "__main__":
+    medir(False)
+    medir(True)
@@ -0,0 +1,92 @@
+# Benchmark da desfragmentação do sistema de blocos livres
+# Cria uma imagem fragmentada (muitos arquivos crescendo intercalados, com parte deles removida depois),
+# mostra o relatório de fragmentação e mede a leitura sequencial antes e depois da desfragmentação.
+# Também mede a latência das leituras de outra thread enquanto a desfragmentação roda, sem limite de
+# vazão e com limite, para mostrar que a cópia em lotes não bloqueia o uso do sistema de arquivos.
+import os
+import random
+import statistics
+import tempfile
+import threading
+import time
+
+from blocoslivres import FileSystem
+
+# Quantidade de arquivos e de acréscimos intercalados entre eles
+ARQUIVOS = 200
+ACRESCIMOS = 20_000
+# Limites de vazão avaliados (blocos por segundo; None = sem limite)
+LIMITES = [None, 5_000]
+
+
+# Cria uma imagem fragmentada e retorna o sistema de arquivos montado
+def fragmentar(caminho):
+    fs = FileSystem(1 << 16, block_size=4096, image_path=caminho)
+    aleatorio = random.Random(1)
+    dados = os.urandom(8192)
+    for i in range(ARQUIVOS):
+        fs.create_file(f"/f{i}")
+    for _ in range(ACRESCIMOS):
+        fs.append_file(f"/f{aleatorio.randrange(ARQUIVOS)}", dados[:aleatorio.randrange(1, 8192)])
+    for i in range(0, ARQUIVOS, 4):
+        fs.remove_file(f"/f{i}")
+    return fs
+
+
+# Mostra as linhas principais do relatório de fragmentação
+def mostrar(titulo, relatorio):
+    print(f"{titulo}: {relatorio['free_runs']} sequências livres, maior {relatorio['largest_free_run']} "
+          f"de {relatorio['free_blocks']} blocos livres | {relatorio['fragmented_files']} de {relatorio['files']} "
+          f"arquivos fragmentados, {relatorio['average_extents']:.1f} extensões por arquivo")
+
+
+# Mede a vazão (MB/s) da leitura de todos os arquivos em pedaços de 1 MiB
+def ler_tudo(fs):
+    total = 0
+    inicio = time.perf_counter()
+    for nome in fs.list_directory("/"):
+        with fs.open(f"/{nome}", "rb") as arquivo:
+            while True:
+                pedaco = arquivo.read(1 << 20)
+                if not pedaco:
+                    break
+                total += len(pedaco)
+    return total / (1 << 20) / (time.perf_counter() - inicio)
+
+
+# Desfragmenta com o limite de vazão informado enquanto outra thread lê arquivos, e mede a latência das leituras
+def desfragmentar(fs, limite):
+    nomes = fs.list_directory("/")
+    parar = threading.Event()
+    latencias = []
+
+    def leitor():
+        aleatorio = random.Random(2)
+        while not parar.is_set():
+            inicio = time.perf_counter()
+            fs.read_file(f"/{aleatorio.choice(nomes)}", 0, 4096)
+            latencias.append((time.perf_counter() - inicio) * 1e6)
+
+    thread = threading.Thread(target=leitor)
+    thread.start()
+    inicio = time.perf_counter()
+    totais = fs.defragment(rate=limite)
+    duracao = time.perf_counter() - inicio
+    parar.set()
+    thread.join()
+    latencias.sort()
+    print(f"desfragmentação (limite {limite or 'nenhum'} blocos/s): {totais['files']} arquivos, "
+          f"{totais['blocks']} blocos em {duracao:.2f} s | leituras concorrentes: {len(latencias)}, "
+          f"mediana {statistics.median(latencias):.0f} us, p99 {latencias[len(latencias) * 99 // 100]:.0f} us")
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as pasta:
+        for limite in LIMITES:
+            fs = fragmentar(os.path.join(pasta, f"fragmentada{limite}.img"))
+            mostrar("antes ", fs.fragmentation_report())
+            antes = ler_tudo(fs)
+            desfragmentar(fs, limite)
+            mostrar("depois", fs.fragmentation_report())
+            print(f"leitura sequencial: {antes:.0f} MB/s antes, {ler_tudo(fs):.0f} MB/s depois\n")
+            fs.close()
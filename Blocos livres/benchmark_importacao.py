@@ -0,0 +1,84 @@
+# Benchmark da importação e da exportação de árvores do sistema de arquivos de blocos livres
+# Cria no computador um corpus de arquivos pequenos (e alguns grandes) e compara a importação arquivo por
+# arquivo (lendo cada arquivo e chamando create_file) com import_tree, que lê o conteúdo com várias threads
+# e cria os arquivos de cada diretório em lotes. Depois mede a exportação para um diretório e para um arquivo .tar e a
+# importação desse .tar. Uso: python benchmark_importacao.py [quantidade de arquivos]
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+from blocoslivres import FileSystem
+
+# Quantidade padrão de arquivos do corpus (1_000_000 também funciona, mas o corpus demora a ser criado)
+ARQUIVOS = 100_000
+# Arquivos por diretório do corpus
+POR_DIRETORIO = 1_000
+# Tamanho máximo dos arquivos pequenos e quantidade de arquivos grandes (de 8 MiB)
+TAMANHO_MAXIMO = 4096
+GRANDES = 8
+# Tamanho do volume, em blocos de 4 KiB
+BLOCOS = 1 << 20
+
+
+# Cria um sistema de arquivos em memória
+def novo_sistema():
+    return FileSystem(BLOCOS)
+
+
+# Cria o corpus no diretório `raiz`
+def criar_corpus(raiz, quantidade):
+    aleatorio = random.Random(1)
+    dados = os.urandom(8 << 20)
+    for i in range(quantidade):
+        diretorio = os.path.join(raiz, f"d{i // POR_DIRETORIO}")
+        if i % POR_DIRETORIO == 0:
+            os.makedirs(diretorio)
+        with open(os.path.join(diretorio, f"f{i}.txt"), "wb") as arquivo:
+            arquivo.write(dados[:aleatorio.randrange(TAMANHO_MAXIMO)])
+    for i in range(GRANDES):
+        with open(os.path.join(raiz, f"grande{i}.bin"), "wb") as arquivo:
+            arquivo.write(dados)
+
+
+# Importa o corpus arquivo por arquivo, como faria um script usando só create_file
+def importar_um_a_um(fs, raiz):
+    fs.create_directory("/corpus")
+    for base, diretorios, arquivos in os.walk(raiz):
+        relativo = os.path.relpath(base, raiz)
+        destino = "/corpus" if relativo == "." else "/corpus/" + relativo.replace(os.sep, "/")
+        for nome in diretorios:
+            fs.create_directory(f"{destino}/{nome}")
+        for nome in arquivos:
+            with open(os.path.join(base, nome), "rb") as arquivo:
+                fs.create_file(f"{destino}/{nome}", arquivo.read())
+
+
+# Formata os totais retornados por import_tree e export_tree
+def resumo(totais):
+    return (f"{totais['files']} arquivos, {totais['directories']} diretórios e {totais['bytes']} bytes em "
+            f"{totais['seconds']:.2f} s ({totais['files_per_second']:.0f} arquivos/s, "
+            f"{totais['mb_per_second']:.1f} MB/s)")
+
+
+if __name__ == "__main__":
+    quantidade = int(sys.argv[1]) if len(sys.argv) > 1 else ARQUIVOS
+    with tempfile.TemporaryDirectory() as temporario:
+        raiz = os.path.join(temporario, "corpus")
+        inicio = time.perf_counter()
+        criar_corpus(raiz, quantidade)
+        print(f"Corpus de {quantidade + GRANDES} arquivos criado em {time.perf_counter() - inicio:.1f} s")
+
+        inicio = time.perf_counter()
+        importar_um_a_um(novo_sistema(), raiz)
+        print(f"create_file um a um: {(quantidade + GRANDES) / (time.perf_counter() - inicio):.0f} arquivos/s")
+
+        fs = novo_sistema()
+        print("import_tree:", resumo(fs.import_tree(raiz, "/")))
+        print("export_tree (diretório):", resumo(fs.export_tree("/corpus", os.path.join(temporario, "exportado"))))
+        shutil.rmtree(raiz)
+        arquivo_tar = os.path.join(temporario, "corpus.tar")
+        print("export_tree (.tar):", resumo(fs.export_tree("/corpus", arquivo_tar)))
+        print("import_tree (.tar):", resumo(novo_sistema().import_tree(arquivo_tar, "/")))
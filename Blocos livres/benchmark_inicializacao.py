@@ -0,0 +1,43 @@
+# Benchmark da inicialização do sistema de arquivos de blocos livres
+# Cada medição roda em um processo Python novo, para que nenhum módulo já esteja carregado, e informa o
+# tempo de importação, o tempo até o primeiro create_file e se o tkinter foi carregado. A importação de
+# blocoslivres_gui mostra o custo de carregar a interface gráfica junto com o sistema de arquivos.
+import json
+import statistics
+import subprocess
+import sys
+
+# Quantidade de processos medidos em cada caso (o resultado é a mediana)
+REPETICOES = 15
+
+# Código executado em cada processo; `modulo` é o módulo importado antes de criar o sistema de arquivos
+CODIGO = """
+import json, sys, time
+inicio = time.perf_counter()
+import {modulo}
+from blocoslivres import FileSystem
+importacao = time.perf_counter() - inicio
+fs = FileSystem(1024)
+fs.create_file("notas.txt", "conteúdo")
+primeiro = time.perf_counter() - inicio
+print(json.dumps([importacao, primeiro, "tkinter" in sys.modules]))
+"""
+
+
+# Mede um caso em processos novos e retorna (importação, primeiro create_file, tkinter carregado)
+def medir(modulo):
+    resultados = []
+    for _ in range(REPETICOES):
+        saida = subprocess.run([sys.executable, "-c", CODIGO.format(modulo=modulo)], capture_output=True,
+                               text=True, check=True).stdout
+        resultados.append(json.loads(saida))
+    importacao = statistics.median(resultado[0] for resultado in resultados)
+    primeiro = statistics.median(resultado[1] for resultado in resultados)
+    return importacao, primeiro, resultados[0][2]
+
+
+if __name__ == "__main__":
+    for modulo in ("blocoslivres", "blocoslivres_gui"):
+        importacao, primeiro, tkinter = medir(modulo)
+        print(f"import {modulo:<16} | importação {importacao * 1000:6.1f} ms | primeiro create_file "
+              f"{primeiro * 1000:6.1f} ms | tkinter {'carregado' if tkinter else 'não carregado'}")
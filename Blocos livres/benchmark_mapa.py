@@ -0,0 +1,42 @@
+# Benchmark do mapa de blocos da interface gráfica
+# Ocupa metade dos blocos de volumes de tamanhos diferentes, em extensões espalhadas, e compara o tempo
+# de get_block_map (a ocupação resumida das 2048 células do mapa, pelo resumo por grupos de blocos) com o
+# de get_allocated_blocks_bitmap (a representação em texto de todos os blocos, usada antes pela interface).
+# O mapa também é medido com zoom, mostrando só um trecho do volume.
+import random
+import time
+
+from blocoslivres import FileSystem
+
+# Quantidades de blocos dos volumes medidos
+VOLUMES = [10_000, 1_000_000, 10_000_000, 100_000_000]
+# Volume a partir do qual a representação em texto não é mais medida (fica lenta e grande demais)
+LIMITE_TEXTO = 10_000_000
+# Quantidade de células do mapa (64 colunas por 32 linhas, como na interface)
+CELULAS = 64 * 32
+
+
+# Mede o tempo de uma chamada, em milissegundos (melhor de 3)
+def medir(funcao):
+    tempos = []
+    for _ in range(3):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return min(tempos) * 1000
+
+
+if __name__ == "__main__":
+    for blocos in VOLUMES:
+        fs = FileSystem(blocos)
+        aleatorio = random.Random(1)
+        # Ocupa extensões de tamanhos variados e libera metade delas
+        extensoes = []
+        while fs.free_block_count() > blocos // 4:
+            extensoes.append(fs.allocate_extent(aleatorio.randrange(1, 2 * max(1, blocos // 10_000))))
+        for inicio, tamanho in extensoes[::2]:
+            fs.free_extent(inicio, tamanho)
+        mapa = medir(lambda: fs.get_block_map(CELULAS))
+        zoom = medir(lambda: fs.get_block_map(CELULAS, blocos // 3, blocos // 3 + blocos // 100))
+        texto = f"{medir(fs.get_allocated_blocks_bitmap):9.1f} ms" if blocos <= LIMITE_TEXTO else "        -"
+        print(f"{blocos:>11} blocos | mapa {mapa:6.1f} ms | mapa com zoom {zoom:6.1f} ms | texto {texto}")
@@ -0,0 +1,57 @@
+# Benchmark de leitura e escrita sequencial de arquivos grandes no sistema de blocos livres
+# Grava um arquivo em pedaços de 1 MiB por fs.open e depois o lê em pedaços de 1 MiB e de 64 KiB,
+# sobre uma imagem de disco sem cache e com cache. A referência é a leitura direta do arquivo da imagem
+# pelo sistema operacional, que é o limite prático da vazão.
+import os
+import tempfile
+import time
+
+from blocoslivres import FileSystem
+
+# Tamanho do arquivo gravado e lido (em MiB)
+TAMANHO_MB = 64
+# Tamanhos dos pedaços usados nas leituras
+PEDACOS = [1 << 20, 64 << 10]
+# Configurações avaliadas: opções repassadas ao FileSystem
+CONFIGURACOES = {
+    "sem cache": {},
+    "cache 16 MiB": {"cache_bytes": 16 << 20},
+    "cache 16 MiB, write-back": {"cache_bytes": 16 << 20, "write_back": True},
+}
+
+
+# Lê um arquivo aberto em pedaços de `pedaco` bytes e retorna a vazão em MB/s
+def ler(arquivo, pedaco, total):
+    inicio = time.perf_counter()
+    while arquivo.read(pedaco):
+        pass
+    return total / (time.perf_counter() - inicio)
+
+
+# Mede a vazão de escrita e de leitura com as opções informadas
+def medir(nome, pasta, opcoes):
+    caminho = os.path.join(pasta, "sequencial.img")
+    fs = FileSystem((TAMANHO_MB * 2 << 20) // 4096, image_path=caminho, **opcoes)
+    dados = os.urandom(1 << 20)
+    inicio = time.perf_counter()
+    with fs.open("/grande.bin", "wb") as arquivo:
+        for _ in range(TAMANHO_MB):
+            arquivo.write(dados)
+    fs.sync()
+    escrita = TAMANHO_MB / (time.perf_counter() - inicio)
+    leituras = []
+    for pedaco in PEDACOS:
+        with fs.open("/grande.bin", "rb") as arquivo:
+            leituras.append(ler(arquivo, pedaco, TAMANHO_MB))
+    fs.close()
+    with open(caminho, "rb") as arquivo:
+        direta = ler(arquivo, 1 << 20, os.path.getsize(caminho) / (1 << 20))
+    os.remove(caminho)
+    print(f"{nome:<26} | escrita {escrita:7.0f} MB/s | leitura 1 MiB {leituras[0]:7.0f} MB/s | "
+          f"leitura 64 KiB {leituras[1]:7.0f} MB/s | imagem direta {direta:7.0f} MB/s")
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as pasta:
+        for nome, opcoes in CONFIGURACOES.items():
+            medir(nome, pasta, opcoes)
@@ -0,0 +1,61 @@
+# Benchmark das operações sobre subárvores do sistema de blocos livres
+# Compara a remoção arquivo por arquivo (remove_file + remove_directory) com o rmtree, que percorre a
+# subárvore uma vez e devolve os blocos ao alocador em lotes ordenados, e mede o copytree e o move.
+import os
+import tempfile
+import time
+
+from blocoslivres import FileSystem
+
+# Quantidade de diretórios e de arquivos por diretório da subárvore
+DIRETORIOS = 20
+ARQUIVOS = 500
+
+
+# Cria a subárvore /dados com DIRETORIOS diretórios de ARQUIVOS arquivos
+def montar(fs):
+    fs.create_directory("/dados")
+    for d in range(DIRETORIOS):
+        fs.create_directory(f"/dados/d{d}")
+        for i in range(ARQUIVOS):
+            fs.create_file(f"/dados/d{d}/f{i}", "x" * (64 * (i % 8 + 1)), directory="/")
+
+
+# Remove a subárvore arquivo por arquivo
+def remover_um_a_um(fs):
+    for d in range(DIRETORIOS):
+        for i in range(ARQUIVOS):
+            fs.remove_file(f"/dados/d{d}/f{i}")
+        fs.remove_directory(f"/dados/d{d}")
+    fs.remove_directory("/dados")
+
+
+# Executa as medições em memória ou sobre uma imagem de disco
+def medir(image_path=None):
+    tipo = "imagem " if image_path else "memória"
+    fs = FileSystem(1 << 17, block_size=64, image_path=image_path)
+    montar(fs)
+    inicio = time.perf_counter()
+    remover_um_a_um(fs)
+    um_a_um = time.perf_counter() - inicio
+    montar(fs)
+    inicio = time.perf_counter()
+    totais = fs.rmtree("/dados")
+    arvore = time.perf_counter() - inicio
+    print(f"{tipo} | {totais['entries']} entradas, {totais['blocks']} blocos | "
+          f"um a um {um_a_um:6.3f} s | rmtree {arvore:6.3f} s ({um_a_um / arvore:4.1f}x)")
+    montar(fs)
+    inicio = time.perf_counter()
+    totais = fs.copytree("/dados", "/copia")
+    copia = time.perf_counter() - inicio
+    inicio = time.perf_counter()
+    fs.move("/copia", "/dados/copia")
+    movimento = time.perf_counter() - inicio
+    print(f"{tipo} | copytree {totais['entries']} entradas em {copia:6.3f} s | move {movimento * 1e6:6.1f} us")
+    fs.close()
+
+
+if __name__ == "__main__":
+    medir()
+    with tempfile.TemporaryDirectory() as pasta:
+        medir(os.path.join(pasta, "subarvore.img"))
@@ -0,0 +1,308 @@
+# Mapa de bits compacto para o controle de blocos livres (um bit por bloco)
+# O bit i fica no byte i // 8, na posição i % 8 (bit menos significativo primeiro);
+# 1 indica bloco ocupado e 0 indica bloco livre
+# Além dos bits, o mapa mantém a quantidade de blocos ocupados por grupo de blocos, em vários níveis
+# (cada nível agrupa 16 grupos do nível anterior); assim a ocupação de qualquer intervalo é obtida
+# somando poucos grupos, sem percorrer os bits, e o mapa de blocos da interface não depende do tamanho do volume
+import re
+from array import array
+
+# Expressões que localizam, em velocidade de C, o primeiro byte que não está cheio / não está vazio
+_NOT_FULL = re.compile(rb'[^\xff]')
+_NOT_EMPTY = re.compile(rb'[^\x00]')
+# Expressões que localizam `n` bytes vazios seguidos (criadas sob demanda, uma por tamanho)
+_EMPTY_RUNS = {}
+
+# Tamanho da palavra usada na varredura, em bytes
+WORD_BYTES = 8
+# Tamanho, em bytes, dos trechos do mapa marcados como modificados (shift de 6 = 64 bytes)
+DIRTY_SHIFT = 6
+# Quantidade de blocos por grupo no primeiro nível do resumo de ocupação (shift de 9 = 512 blocos)
+GROUP_SHIFT = 9
+# Quantidade de grupos de um nível reunidos em um grupo do nível seguinte (shift de 4 = 16)
+FANOUT_SHIFT = 4
+
+
+# Classe que mantém o estado de ocupação dos blocos em um buffer de bytes
+class Bitmap:
+    # Método de inicialização da classe Bitmap
+    # `buffer` pode ser um bytearray, memoryview ou mmap já existente (por exemplo, a região do disco)
+    # Com `track_dirty`, os trechos modificados são registrados para que possam ser gravados no journal
+    def __init__(self, size, buffer=None, track_dirty=False):
+        self.size = size
+        self.dirty = set() if track_dirty else None
+        nbytes = (size + 7) // 8
+        if buffer is None:
+            self.bits = bytearray(nbytes)
+            self.count = 0
+            # Marca os bits de preenchimento do último byte como ocupados para que nunca sejam alocados
+            self._mark_padding()
+        else:
+            if len(buffer) < nbytes:
+                raise Exception("Buffer pequeno demais para o mapa de bits")
+            self.bits = buffer
+            self._mark_padding()
+            self.count = self._count_range(0, size)
+        self._build_levels()
+
+    # Método para montar o resumo de ocupação: uma lista de (shift, contagens por grupo), do nível mais
+    # fino ao mais grosso; o último nível tem no máximo 1 << FANOUT_SHIFT grupos
+    def _build_levels(self):
+        base = 1 << GROUP_SHIFT
+        counts = array('q', (self._count_bits(start, min(start + base, self.size)) for start in range(0, self.size, base)))
+        shift = GROUP_SHIFT
+        self.levels = [(shift, counts)]
+        while len(counts) > 1 << FANOUT_SHIFT:
+            fanout = 1 << FANOUT_SHIFT
+            counts = array('q', (sum(counts[index:index + fanout]) for index in range(0, len(counts), fanout)))
+            shift += FANOUT_SHIFT
+            self.levels.append((shift, counts))
+
+    # Método para somar `delta` à contagem de ocupados dos grupos que contêm o bloco `index`
+    def _add_to_groups(self, index, delta):
+        for shift, counts in self.levels:
+            counts[index >> shift] += delta
+
+    # Método para marcar os bits que sobram no último byte como ocupados
+    def _mark_padding(self):
+        if self.size % 8:
+            self.bits[self.size // 8] |= (0xff << (self.size % 8)) & 0xff
+
+    # Método para contar os bits ocupados em um intervalo
+    def _count_range(self, start, end):
+        total = 0
+        chunk = 1 << 20
+        for offset in range(start // 8, (end + 7) // 8, chunk):
+            data = bytes(self.bits[offset:min(offset + chunk, (end + 7) // 8)])
+            total += int.from_bytes(data, 'little').bit_count()
+        # Desconta os bits de preenchimento contados no último byte
+        if end % 8 and end == self.size:
+            total -= 8 - end % 8
+        return total
+
+    # Método para contar exatamente os bits ocupados de `start` a `end - 1`
+    def _count_bits(self, start, end):
+        if start >= end:
+            return 0
+        word = int.from_bytes(bytes(self.bits[start >> 3:(end + 7) >> 3]), 'little') >> (start & 7)
+        return (word & ((1 << (end - start)) - 1)).bit_count()
+
+    # Método para contar os blocos ocupados de `start` a `end - 1` pelo resumo de ocupação
+    # Só os bits das pontas (menos de um grupo de cada lado) são contados diretamente; o meio é somado pelos
+    # grupos, subindo de nível assim que o intervalo fica alinhado, então o custo não depende do tamanho
+    def count_set(self, start, end):
+        end = min(end, self.size)
+        first = (start + (1 << GROUP_SHIFT) - 1) >> GROUP_SHIFT
+        last = end >> GROUP_SHIFT
+        if first >= last:
+            return self._count_bits(start, end)
+        total = self._count_bits(start, first << GROUP_SHIFT) + self._count_bits(last << GROUP_SHIFT, end)
+        fanout = 1 << FANOUT_SHIFT
+        for level, (_, counts) in enumerate(self.levels):
+            if level == len(self.levels) - 1:
+                return total + sum(counts[first:last])
+            # Soma os grupos das pontas até o intervalo ficar alinhado ao nível seguinte
+            while first < last and first % fanout:
+                total += counts[first]
+                first += 1
+            while first < last and last % fanout:
+                last -= 1
+                total += counts[last]
+            if first >= last:
+                return total
+            first >>= FANOUT_SHIFT
+            last >>= FANOUT_SHIFT
+        return total
+
+    # Método para obter a ocupação de `buckets` faixas consecutivas de `start` a `end - 1`
+    # Retorna uma lista de (blocos na faixa, blocos ocupados); a faixa i vai de start + i * tamanho // buckets
+    # até start + (i + 1) * tamanho // buckets, então faixas vazias aparecem quando há mais faixas que blocos
+    def occupancy(self, buckets, start=0, end=None):
+        end = self.size if end is None else min(end, self.size)
+        span = end - start
+        bounds = [start + span * index // buckets for index in range(buckets + 1)]
+        return [(high - low, self.count_set(low, high)) for low, high in zip(bounds, bounds[1:])]
+
+    # Método para verificar se um bloco está ocupado
+    def test(self, index):
+        return (self.bits[index >> 3] >> (index & 7)) & 1 == 1
+
+    # Método para marcar um bloco como ocupado
+    def set(self, index):
+        mask = 1 << (index & 7)
+        if not self.bits[index >> 3] & mask:
+            self.bits[index >> 3] |= mask
+            self.count += 1
+            for shift, counts in self.levels:
+                counts[index >> shift] += 1
+            if self.dirty is not None:
+                self.dirty.add(index >> 3 >> DIRTY_SHIFT)
+
+    # Método para marcar um bloco como livre
+    def clear(self, index):
+        mask = 1 << (index & 7)
+        if self.bits[index >> 3] & mask:
+            self.bits[index >> 3] &= ~mask & 0xff
+            self.count -= 1
+            for shift, counts in self.levels:
+                counts[index >> shift] -= 1
+            if self.dirty is not None:
+                self.dirty.add(index >> 3 >> DIRTY_SHIFT)
+
+    # Método para marcar um intervalo de blocos como ocupado (ou livre, com value=False)
+    # Os bytes inteiros do meio do intervalo são preenchidos de uma só vez
+    def set_range(self, start, length, value=True):
+        end = start + length
+        index = start
+        while index < end and index & 7:
+            self.set(index) if value else self.clear(index)
+            index += 1
+        full_end = end & ~7
+        if index < full_end:
+            first, last = index >> 3, full_end >> 3
+            # Atualiza o resumo de ocupação grupo a grupo, antes de preencher os bytes
+            group_bytes = 1 << (GROUP_SHIFT - 3)
+            position = first
+            while position < last:
+                group_end = min(last, (position // group_bytes + 1) * group_bytes)
+                before = int.from_bytes(bytes(self.bits[position:group_end]), 'little').bit_count()
+                delta = (group_end - position) * 8 - before if value else -before
+                if delta:
+                    self.count += delta
+                    self._add_to_groups(position << 3, delta)
+                position = group_end
+            self.bits[first:last] = (b'\xff' if value else b'\x00') * (last - first)
+            if self.dirty is not None:
+                self.dirty.update(range(first >> DIRTY_SHIFT, ((last - 1) >> DIRTY_SHIFT) + 1))
+            index = full_end
+        while index < end:
+            self.set(index) if value else self.clear(index)
+            index += 1
+
+    # Método para marcar um intervalo de blocos como livre
+    def clear_range(self, start, length):
+        self.set_range(start, length, False)
+
+    # Método para encontrar o primeiro bit com o valor pedido entre `start` e `end`
+    # Pula os bytes uniformes com a expressão regular e resolve a palavra encontrada com aritmética de bits
+    def _find(self, start, pattern, want_set, end=None):
+        end = self.size if end is None else min(end, self.size)
+        if start >= end:
+            return None
+        # Primeiro trata a palavra parcial que contém `start`
+        word_start = (start >> 3) // WORD_BYTES * WORD_BYTES
+        while True:
+            word = int.from_bytes(bytes(self.bits[word_start:word_start + WORD_BYTES]), 'little')
+            if not want_set:
+                word = ~word
+            # Descarta os bits anteriores a `start`
+            word &= ~((1 << (start - word_start * 8)) - 1) if start > word_start * 8 else -1
+            word &= (1 << (WORD_BYTES * 8)) - 1
+            if word:
+                index = word_start * 8 + ((word & -word).bit_length() - 1)
+                return index if index < end else None
+            # Procura o próximo byte não uniforme depois da palavra atual (sem passar de `end`)
+            match = pattern.search(self.bits, word_start + WORD_BYTES, (end + 7) // 8)
+            if match is None:
+                return None
+            byte = match.start()
+            word_start = byte // WORD_BYTES * WORD_BYTES
+            start = byte * 8
+
+    # Método para encontrar o próximo bloco livre a partir de `start` (antes de `end`)
+    def find_clear(self, start=0, end=None):
+        return self._find(start, _NOT_FULL, False, end)
+
+    # Método para encontrar o próximo bloco ocupado a partir de `start` (antes de `end`)
+    def find_set(self, start=0, end=None):
+        return self._find(start, _NOT_EMPTY, True, end)
+
+    # Método para obter o tamanho da sequência de blocos livres que começa em `start`
+    # Com `limit`, a varredura para assim que a sequência atinge esse tamanho
+    def clear_run_length(self, start, limit=None):
+        end = self.size if limit is None else min(self.size, start + limit)
+        run_end = self.find_set(start, end)
+        return (end if run_end is None else run_end) - start
+
+    # Método para encontrar uma sequência de pelo menos `length` blocos livres entre `start` e `end`
+    # Retorna o bloco inicial da primeira sequência suficiente (first-fit) ou None
+    # Para sequências longas, só os trechos com bytes vazios suficientes são examinados: uma sequência de
+    # `length` bits livres sempre contém (length - 7) // 8 bytes vazios seguidos
+    def find_clear_run(self, length, start=0, end=None):
+        end = self.size if end is None else end
+        index = start
+        empty_bytes = (length - 7) // 8
+        pattern = None
+        if empty_bytes >= 2:
+            pattern = _EMPTY_RUNS.get(empty_bytes)
+            if pattern is None:
+                pattern = _EMPTY_RUNS[empty_bytes] = re.compile(rb'\x00{%d}' % empty_bytes)
+        while index is not None and index < end:
+            if pattern is not None:
+                match = pattern.search(self.bits, index >> 3, (end + 7) // 8 + empty_bytes)
+                if match is None:
+                    return None
+                # O byte anterior ao trecho encontrado não é vazio, então a sequência começa no máximo 7 bits antes
+                index = max(index, match.start() * 8 - 7)
+            index = self.find_clear(index)
+            if index is None or index >= end:
+                return None
+            # Só é preciso verificar os `length` blocos seguintes
+            run_end = self.find_set(index, index + length)
+            if run_end is None:
+                if index + length <= self.size:
+                    return index
+                return None
+            index = run_end
+        return None
+
+    # Método para percorrer as sequências de blocos livres como tuplas (início, tamanho)
+    def iter_clear_runs(self, start=0):
+        index = self.find_clear(start)
+        while index is not None:
+            run_end = self.find_set(index)
+            if run_end is None:
+                run_end = self.size
+            yield index, run_end - index
+            index = self.find_clear(run_end)
+
+    # Método para obter os índices dos trechos que contêm um intervalo de blocos
+    @staticmethod
+    def chunks(start, length):
+        return range(start >> 3 >> DIRTY_SHIFT, ((start + length - 1) >> 3 >> DIRTY_SHIFT) + 1)
+
+    # Método para obter, para cada trecho que contém um intervalo de blocos, a máscara dos bits do intervalo
+    # dentro do trecho, como tuplas (índice do trecho, máscara) (ver take_dirty)
+    @staticmethod
+    def chunk_masks(start, length):
+        bits = 8 << DIRTY_SHIFT
+        for index in Bitmap.chunks(start, length):
+            first = index * bits
+            low, high = max(start, first) - first, min(start + length, first + bits) - first
+            yield index, ((1 << (high - low)) - 1) << low
+
+    # Método para marcar como modificados os trechos que contêm um intervalo de blocos, sem alterá-los
+    def mark_dirty(self, start, length):
+        self.dirty.update(self.chunks(start, length))
+
+    # Método para obter e limpar os trechos modificados como tuplas (deslocamento em bytes, dados)
+    # `cleared` associa o índice de um trecho à máscara (ver chunk_masks) dos blocos que devem aparecer
+    # livres nos dados mesmo que ainda estejam ocupados no mapa (liberações que só valem depois do commit
+    # do journal)
+    def take_dirty(self, cleared=None):
+        if not self.dirty:
+            return []
+        chunk = 1 << DIRTY_SHIFT
+        changes = []
+        for index in sorted(self.dirty):
+            data = bytes(self.bits[index * chunk:(index + 1) * chunk])
+            mask = cleared.get(index) if cleared else None
+            if mask:
+                data = (int.from_bytes(data, 'little') & ~mask).to_bytes(len(data), 'little')
+            changes.append((index * chunk, data))
+        self.dirty.clear()
+        return changes
+
+    # Método para obter a quantidade de blocos livres
+    def free_count(self):
+        return self.size - self.count
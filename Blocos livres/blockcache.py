@@ -0,0 +1,415 @@
+# Cache de blocos entre o sistema de arquivos e o armazenamento dos blocos (imagem de disco ou memória)
+# O cache guarda até `capacity` blocos; quando está cheio, a política de descarte escolhe qual bloco sai.
+# Políticas disponíveis: LRU (o usado há mais tempo), CLOCK (aproximação do LRU com um bit de referência)
+# e ARC (equilibra blocos usados uma vez e blocos usados várias vezes, adaptando-se à carga).
+# No modo write-through, cada escrita vai direto para o armazenamento; no modo write-back, os blocos
+# escritos ficam marcados como sujos e só são gravados quando saem do cache ou em flush(); blocos sujos
+# vizinhos são agrupados em uma única escrita no armazenamento.
+import threading
+from collections import OrderedDict
+
+# Quantidade máxima de blocos sujos vizinhos gravados junto com um bloco descartado
+COALESCE_MAX = 256
+
+
+# Política LRU: descarta o bloco usado há mais tempo
+class LRUPolicy:
+    # Método de inicialização da classe LRUPolicy
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.order = OrderedDict()  # Blocos do usado há mais tempo ao usado mais recentemente
+
+    # Método chamado quando um bloco presente no cache é usado
+    def hit(self, key):
+        self.order.move_to_end(key)
+
+    # Método chamado quando um bloco ausente vai entrar no cache; retorna o bloco descartado (ou None)
+    def miss(self, key):
+        victim = None
+        if len(self.order) >= self.capacity:
+            victim, _ = self.order.popitem(last=False)
+        self.order[key] = None
+        return victim
+
+    # Método chamado quando um bloco sai do cache sem ser descartado pela política (bloco liberado)
+    def remove(self, key):
+        self.order.pop(key, None)
+
+
+# Política CLOCK: os blocos ficam em um anel com um bit de referência; o ponteiro percorre o anel,
+# limpando os bits ligados, e descarta o primeiro bloco com o bit desligado
+class ClockPolicy:
+    # Método de inicialização da classe ClockPolicy
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.slots = []  # Posição no anel -> bloco (None para posição vazia)
+        self.referenced = bytearray()  # Posição no anel -> bit de referência
+        self.positions = {}  # Bloco -> posição no anel
+        self.empty = []  # Posições vazias deixadas por blocos removidos
+        self.hand = 0
+
+    # Método chamado quando um bloco presente no cache é usado
+    def hit(self, key):
+        self.referenced[self.positions[key]] = 1
+
+    # Método chamado quando um bloco ausente vai entrar no cache; retorna o bloco descartado (ou None)
+    def miss(self, key):
+        victim = None
+        if self.empty:
+            position = self.empty.pop()
+        elif len(self.slots) < self.capacity:
+            position = len(self.slots)
+            self.slots.append(None)
+            self.referenced.append(0)
+        else:
+            while self.referenced[self.hand]:
+                self.referenced[self.hand] = 0
+                self.hand = (self.hand + 1) % len(self.slots)
+            position = self.hand
+            victim = self.slots[position]
+            del self.positions[victim]
+            self.hand = (self.hand + 1) % len(self.slots)
+        self.slots[position] = key
+        self.referenced[position] = 0
+        self.positions[key] = position
+        return victim
+
+    # Método chamado quando um bloco sai do cache sem ser descartado pela política (bloco liberado)
+    def remove(self, key):
+        position = self.positions.pop(key, None)
+        if position is not None:
+            # A posição vazia é reutilizada antes que o ponteiro volte a procurar um bloco para descartar
+            self.slots[position] = None
+            self.empty.append(position)
+
+
+# Política ARC (Adaptive Replacement Cache, Megiddo e Modha)
+# T1 guarda os blocos usados uma vez e T2 os usados mais de uma vez; B1 e B2 guardam só os números dos
+# blocos descartados recentemente de cada lista. Um acerto em B1 aumenta o espaço alvo `p` de T1, e um
+# acerto em B2 o diminui, o que adapta o cache entre cargas de recência e de frequência.
+class ARCPolicy:
+    # Método de inicialização da classe ARCPolicy
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.p = 0
+        self.t1 = OrderedDict()
+        self.t2 = OrderedDict()
+        self.b1 = OrderedDict()
+        self.b2 = OrderedDict()
+
+    # Método chamado quando um bloco presente no cache é usado
+    def hit(self, key):
+        if key in self.t1:
+            del self.t1[key]
+        else:
+            del self.t2[key]
+        self.t2[key] = None
+
+    # Método que escolhe o bloco a descartar e guarda o seu número na lista fantasma correspondente
+    def _replace(self, key):
+        if self.t1 and (len(self.t1) > self.p or (key in self.b2 and len(self.t1) == self.p)):
+            victim, _ = self.t1.popitem(last=False)
+            self.b1[victim] = None
+        else:
+            victim, _ = self.t2.popitem(last=False)
+            self.b2[victim] = None
+        return victim
+
+    # Método chamado quando um bloco ausente vai entrar no cache; retorna o bloco descartado (ou None)
+    def miss(self, key):
+        capacity = self.capacity
+        full = len(self.t1) + len(self.t2) >= capacity
+        victim = None
+        if key in self.b1:
+            self.p = min(capacity, self.p + max(len(self.b2) // len(self.b1), 1))
+            if full:
+                victim = self._replace(key)
+            del self.b1[key]
+            self.t2[key] = None
+            return victim
+        if key in self.b2:
+            self.p = max(0, self.p - max(len(self.b1) // len(self.b2), 1))
+            if full:
+                victim = self._replace(key)
+            del self.b2[key]
+            self.t2[key] = None
+            return victim
+        if len(self.t1) + len(self.b1) >= capacity:
+            if len(self.t1) < capacity:
+                self.b1.popitem(last=False)
+                if full:
+                    victim = self._replace(key)
+            else:
+                victim, _ = self.t1.popitem(last=False)
+        elif full:
+            if len(self.t1) + len(self.t2) + len(self.b1) + len(self.b2) >= 2 * capacity:
+                self.b2.popitem(last=False)
+            victim = self._replace(key)
+        self.t1[key] = None
+        return victim
+
+    # Método chamado quando um bloco sai do cache sem ser descartado pela política (bloco liberado)
+    def remove(self, key):
+        for queue in (self.t1, self.t2, self.b1, self.b2):
+            queue.pop(key, None)
+
+
+# Políticas de descarte disponíveis pelo nome
+POLICIES = {"lru": LRUPolicy, "clock": ClockPolicy, "arc": ARCPolicy}
+
+
+# Classe para o cache de blocos
+class BlockCache:
+    # Método de inicialização da classe BlockCache
+    # `read` e `write` acessam o armazenamento: read(bloco) -> dados (ou None) e write(bloco, dados)
+    # `policy` é o nome de uma política de POLICIES ou uma classe com os métodos hit, miss e remove
+    # `trace`, se for uma lista, recebe cada acesso como ("r" ou "w", bloco), para ser reproduzido depois
+    # `read_run(primeiro_bloco, quantidade)` e `write_run(primeiro_bloco, lista_de_dados)`, se informadas,
+    # leem e gravam blocos consecutivos de uma vez (read_run retorna a lista dos dados de cada bloco)
+    def __init__(self, read, write, capacity, policy="lru", write_back=False, trace=None, read_run=None,
+                 write_run=None):
+        if capacity < 1:
+            raise Exception("O cache deve ter capacidade para pelo menos um bloco")
+        policy_class = POLICIES[policy] if isinstance(policy, str) else policy
+        self.read_store = read
+        self.write_store = write
+        self.read_run = read_run
+        self.write_run = write_run
+        self.capacity = capacity
+        self.policy = policy_class(capacity)
+        self.write_back = write_back
+        self.trace = trace
+        self.lock = threading.Lock()
+        self.data = {}  # Bloco -> dados em cache
+        self.dirty = set()  # Blocos escritos que ainda não foram gravados no armazenamento
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.writebacks = 0
+        self.writes = 0  # Gravações de blocos sujos no armazenamento (cada uma pode ter vários blocos)
+        self.prefetched = 0
+        # Leituras antecipadas agendadas que ainda não terminaram, quantidade de descartes e, enquanto há
+        # leituras agendadas, os descartes feitos (número, primeiro_bloco, quantidade) (ver prefetch)
+        self.scheduled = 0
+        self.discards = 0
+        self.discarded = []
+
+    # Método que grava no armazenamento os blocos sujos consecutivos de `first` a `last`; quem chama deve ter a trava
+    def _write_back(self, first, last):
+        if self.write_run is not None and last > first:
+            self.write_run(first, [self.data[block] for block in range(first, last + 1)])
+        else:
+            for block in range(first, last + 1):
+                self.write_store(block, self.data[block])
+        self.dirty.difference_update(range(first, last + 1))
+        self.writebacks += last - first + 1
+        self.writes += 1 if self.write_run is not None else last - first + 1
+
+    # Método que coloca um bloco no cache, descartando outro se necessário; quem chama deve ter a trava
+    # Um bloco sujo descartado é gravado junto com os blocos sujos vizinhos, que continuam no cache
+    def _admit(self, block, data):
+        victim = self.policy.miss(block)
+        if victim is not None:
+            if victim in self.dirty:
+                first = last = victim
+                while first - 1 in self.dirty and victim - first < COALESCE_MAX:
+                    first -= 1
+                while last + 1 in self.dirty and last - first < COALESCE_MAX:
+                    last += 1
+                self._write_back(first, last)
+            del self.data[victim]
+            self.evictions += 1
+        self.data[block] = data
+
+    # Método para ler um bloco (do cache ou, em uma falta, do armazenamento)
+    def read(self, block):
+        with self.lock:
+            if self.trace is not None:
+                self.trace.append(("r", block))
+            if block in self.data:
+                self.hits += 1
+                self.policy.hit(block)
+                return self.data[block]
+            self.misses += 1
+            data = self.read_store(block)
+            # Guarda uma cópia: uma memoryview sobre a imagem mudaria junto com o disco
+            if isinstance(data, (bytearray, memoryview)):
+                data = bytes(data)
+            self._admit(block, data)
+            return data
+
+    # Método que lê do armazenamento os blocos de `start` a `start + count - 1`; quem chama deve ter a trava
+    def _load(self, start, count):
+        if self.read_run is not None and count > 1:
+            blocks = self.read_run(start, count)
+        else:
+            blocks = [self.read_store(block) for block in range(start, start + count)]
+        # Guarda cópias: uma memoryview sobre a imagem mudaria junto com o disco
+        return [bytes(data) if isinstance(data, (bytearray, memoryview)) else data for data in blocks]
+
+    # Método para ler blocos consecutivos; retorna a lista dos dados de cada bloco
+    # As faltas consecutivas são lidas do armazenamento de uma vez
+    def read_blocks(self, start, count):
+        result = []
+        with self.lock:
+            if self.trace is not None:
+                self.trace.extend(("r", block) for block in range(start, start + count))
+            block = start
+            while block < start + count:
+                if block in self.data:
+                    self.hits += 1
+                    self.policy.hit(block)
+                    result.append(self.data[block])
+                    block += 1
+                    continue
+                missing = block
+                while missing < start + count and missing not in self.data:
+                    missing += 1
+                for data in self._load(block, missing - block):
+                    self.misses += 1
+                    self._admit(block, data)
+                    result.append(data)
+                    block += 1
+        return result
+
+    # Método para escrever um bloco (`data` deve ser imutável, como bytes)
+    def write(self, block, data):
+        with self.lock:
+            if self.trace is not None:
+                self.trace.append(("w", block))
+            if block in self.data:
+                self.hits += 1
+                self.policy.hit(block)
+                self.data[block] = data
+            else:
+                self.misses += 1
+                self._admit(block, data)
+            if self.write_back:
+                self.dirty.add(block)
+            else:
+                self.write_store(block, data)
+
+    # Método para escrever blocos consecutivos a partir de `start` (`blocks` é a lista dos dados de cada bloco)
+    # No modo write-through, o armazenamento recebe todos os blocos em uma única escrita
+    def write_blocks(self, start, blocks):
+        with self.lock:
+            for block, data in enumerate(blocks, start):
+                if self.trace is not None:
+                    self.trace.append(("w", block))
+                if block in self.data:
+                    self.hits += 1
+                    self.policy.hit(block)
+                    self.data[block] = data
+                else:
+                    self.misses += 1
+                    self._admit(block, data)
+                # Marca cada bloco logo ao entrar: um bloco do próprio trecho pode ser descartado pelos seguintes
+                if self.write_back:
+                    self.dirty.add(block)
+            if self.write_back:
+                return
+            if self.write_run is not None:
+                self.write_run(start, blocks)
+            else:
+                for block, data in enumerate(blocks, start):
+                    self.write_store(block, data)
+
+    # Método para agendar uma leitura antecipada; retorna a marca que deve ser passada a prefetch
+    # A marca deve ser obtida junto com os blocos a carregar (com a trava que impede que eles sejam liberados)
+    def schedule_prefetch(self):
+        with self.lock:
+            self.scheduled += 1
+            return self.discards
+
+    # Método para carregar no cache blocos que devem ser lidos em breve (leitura antecipada)
+    # Blocos que já estão no cache não são lidos de novo; o carregamento não conta como acerto nem falta
+    # `runs` é uma lista de (primeiro_bloco, quantidade)
+    # Com a `mark` de schedule_prefetch, os blocos descartados depois dela são ignorados: foram liberados
+    # (e talvez reutilizados por outro arquivo) depois que a leitura foi pedida, e o armazenamento pode ainda
+    # ter os dados do dono anterior
+    def prefetch(self, runs, mark=None):
+        try:
+            for start, count in runs:
+                with self.lock:
+                    skipped = self._discarded_since(mark, start, count)
+                    block = start
+                    while block < start + count:
+                        if block in self.data or block in skipped:
+                            block += 1
+                            continue
+                        missing = block
+                        while missing < start + count and missing not in self.data and missing not in skipped:
+                            missing += 1
+                        for data in self._load(block, missing - block):
+                            self._admit(block, data)
+                            self.prefetched += 1
+                            block += 1
+        finally:
+            if mark is not None:
+                with self.lock:
+                    self.scheduled -= 1
+                    if not self.scheduled:
+                        self.discarded = []
+
+    # Método para obter os blocos de `start` a `start + count - 1` descartados depois de `mark`; quem chama
+    # deve ter a trava
+    def _discarded_since(self, mark, start, count):
+        skipped = set()
+        if mark is None:
+            return skipped
+        for number, first, length in reversed(self.discarded):
+            if number <= mark:
+                break
+            skipped.update(range(max(first, start), min(first + length, start + count)))
+        return skipped
+
+    # Método para retirar do cache blocos liberados (sem gravá-los, mesmo se estiverem sujos)
+    def discard(self, start, length=1):
+        with self.lock:
+            self.discards += 1
+            if self.scheduled:
+                self.discarded.append((self.discards, start, length))
+            if length > len(self.data):
+                blocks = [block for block in self.data if start <= block < start + length]
+            else:
+                blocks = [block for block in range(start, start + length) if block in self.data]
+            for block in blocks:
+                del self.data[block]
+                self.dirty.discard(block)
+                self.policy.remove(block)
+
+    # Método para gravar no armazenamento todos os blocos sujos, em ordem de bloco; retorna quantos foram gravados
+    # Blocos sujos consecutivos são gravados com uma única escrita
+    def flush(self):
+        with self.lock:
+            blocks = sorted(self.dirty)
+            index = 0
+            while index < len(blocks):
+                end = index
+                while end + 1 < len(blocks) and blocks[end + 1] == blocks[end] + 1:
+                    end += 1
+                self._write_back(blocks[index], blocks[end])
+                index = end + 1
+            return len(blocks)
+
+    # Método para obter as estatísticas do cache
+    def stats(self):
+        with self.lock:
+            accesses = self.hits + self.misses
+            return {
+                "blocks": len(self.data),
+                "capacity": self.capacity,
+                "dirty": len(self.dirty),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / accesses if accesses else 0.0,
+                "evictions": self.evictions,
+                "writebacks": self.writebacks,
+                "writes": self.writes,
+                "prefetched": self.prefetched,
+            }
+
+    # Método para zerar as estatísticas
+    def reset_stats(self):
+        with self.lock:
+            self.hits = self.misses = self.evictions = self.writebacks = self.writes = self.prefetched = 0
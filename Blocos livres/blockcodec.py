@@ -0,0 +1,83 @@
+# Compressão transparente de blocos com os codecs da biblioteca padrão (zlib, lzma e bz2)
+# Um bloco comprimido é guardado como Compressed: o primeiro byte identifica o codec e o restante são os
+# dados comprimidos. Blocos que não diminuem com a compressão são guardados como bytes comuns, sem
+# nenhum acréscimo, então a leitura sempre sabe como decodificar um bloco sem consultar outras tabelas.
+import bz2
+import lzma
+import threading
+import zlib
+from collections import OrderedDict
+
+# Codecs disponíveis pelo nome: (identificador, função de compressão, função de descompressão)
+# Os níveis privilegiam a vazão: zlib e bz2 no nível 6 e lzma no preset 1
+CODECS = {
+    "zlib": (1, lambda data: zlib.compress(data, 6), zlib.decompress),
+    "lzma": (2, lambda data: lzma.compress(data, preset=1), lzma.decompress),
+    "bz2": (3, lambda data: bz2.compress(data, 6), bz2.decompress),
+}
+# Identificador -> função de descompressão
+_DECOMPRESSORS = {tag: decompress for tag, _, decompress in CODECS.values()}
+
+
+# Classe para os dados de um bloco comprimido (o primeiro byte identifica o codec)
+class Compressed(bytes):
+    __slots__ = ()
+
+
+# Verifica o nome de um codec (None indica dados sem compressão); lança ValueError se for inválido
+def check_codec(codec):
+    if codec is not None and codec not in CODECS:
+        raise ValueError(codec)
+
+
+# Comprime os dados com o codec informado; retorna os próprios dados (como bytes) se não diminuírem
+def compress(codec, data):
+    if codec is None or not data:
+        return bytes(data)
+    tag, compressor, _ = CODECS[codec]
+    payload = compressor(data)
+    if len(payload) + 1 >= len(data):
+        return bytes(data)
+    return Compressed(bytes((tag,)) + payload)
+
+
+# Descomprime dados guardados por compress (dados comuns são retornados sem alteração)
+def decompress(stored):
+    if type(stored) is not Compressed:
+        return stored
+    return _DECOMPRESSORS[stored[0]](memoryview(stored)[1:])
+
+
+# Classe para um cache dos dados descomprimidos, limitado em bytes
+# A chave é o próprio objeto comprimido: dados iguais dão o mesmo resultado, então o cache nunca precisa
+# ser invalidado (uma escrita cria um novo objeto comprimido, e o antigo sai do cache pelo LRU)
+class DecompressedCache:
+    # Método de inicialização da classe DecompressedCache
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()  # Dados comprimidos -> dados descomprimidos
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+
+    # Método para obter os dados descomprimidos (dados sem compressão não passam pelo cache)
+    def get(self, stored):
+        if type(stored) is not Compressed:
+            return stored
+        with self.lock:
+            data = self.entries.get(stored)
+            if data is not None:
+                self.entries.move_to_end(stored)
+                self.hits += 1
+                return data
+        data = decompress(stored)
+        with self.lock:
+            self.misses += 1
+            if stored not in self.entries:
+                self.entries[stored] = data
+                self.size += len(data)
+                while self.size > self.capacity and self.entries:
+                    _, evicted = self.entries.popitem(last=False)
+                    self.size -= len(evicted)
+        return data
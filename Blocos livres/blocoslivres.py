@@ -1,475 +1,2230 @@
-# Importa a biblioteca tkinter e suas funcionalidades de messagebox e simpledialog
-import tkinter as tk
-from tkinter import messagebox, simpledialog
+# Importa o módulo os para verificar a existência da imagem de disco
+import os
+# Importa o módulo io para os objetos de arquivo retornados por FileSystem.open
+import io
+# Importa o módulo threading para as travas que permitem o uso por várias threads
+import threading
+# Importa o módulo time para limitar a vazão da desfragmentação
+import time
+# Importa o módulo hashlib para identificar blocos pelo conteúdo na deduplicação
+import hashlib
+# Importa o ExitStack para adquirir uma quantidade variável de travas
+from contextlib import ExitStack
+# Importa o islice para obter uma página das entradas de um diretório sem copiar as anteriores
+from itertools import count, islice
+# Importa o deque para a fila de tarefas da importação e da exportação
+from collections import deque
+# Importa o mapa de bits usado para controlar os blocos livres
+from bitmap import Bitmap
+# Importa a imagem de disco persistente
+from diskimage import DiskImage, InodeRecord, INODE_DIRECTORY, INODE_FILE, create_image
+# Importa a trava de leitores e escritor usada nos diretórios
+from rwlock import RWLock
+# Importa os índices secundários de atributos
+from attrindex import AttributeIndex, OPERATORS, matches
+# Importa o cache de blocos
+from blockcache import BlockCache
+# Importa a compressão de blocos
+from blockcodec import CODECS, Compressed, check_codec, compress, decompress
+
+# Tabela com a representação textual ("1 0 1 ...") dos 8 bits de cada valor de byte
+_BYTE_BITS = [' '.join('1' if (value >> bit) & 1 else '0' for bit in range(8)) for value in range(256)]
+
+# Quantidade de entradas processadas por lote nas operações sobre subárvores (rmtree e copytree)
+BULK_BATCH = 4096
+
+# Quantidade máxima de blocos copiados por lote na desfragmentação (a trava do arquivo só é mantida
+# durante um lote, então leituras e escritas no arquivo esperam no máximo a cópia de um lote)
+DEFRAG_BATCH = 256
+
+# Tamanho do cache de blocos criado quando há compressão e nenhum cache foi pedido (os blocos ficam
+# descomprimidos no cache)
+COMPRESSION_CACHE_BLOCKS = 256
+
+# Janela inicial e máxima da leitura antecipada de arquivos abertos, em bytes
+# A janela dobra a cada leitura sequencial e volta ao início depois de um acesso fora de ordem
+READAHEAD_MIN = 128 * 1024
+READAHEAD_MAX = 4 * 1024 * 1024
+
+# Tamanho dos pedaços lidos e gravados na importação e na exportação de árvores (import_tree/export_tree)
+TRANSFER_CHUNK = 1 << 20
+# Quantidade padrão de threads que leem e gravam o conteúdo na importação e na exportação
+TRANSFER_WORKERS = 8
+# Quantidade máxima de arquivos de cada tarefa da importação e da exportação; os arquivos pequenos de uma
+# tarefa são criados de uma vez, com uma só aquisição da trava do diretório
+TRANSFER_BATCH = 256
+# Quantidade de tarefas na fila por thread (limita a memória usada com diretórios muito grandes)
+TRANSFER_PENDING = 4
+# Sufixos dos arquivos .tar aceitos na exportação e o modo do tarfile correspondente
+TAR_MODES = {".tar": "w", ".tar.gz": "w:gz", ".tgz": "w:gz", ".tar.bz2": "w:bz2", ".tar.xz": "w:xz"}
+
+# Exceção lançada quando uma operação sobre uma subárvore é cancelada
+# `totals` tem o que já havia sido feito: {"entries": ..., "blocks": ...} no rmtree e no copytree e
+# {"files": ..., "directories": ..., "bytes": ...} na importação e na exportação
+class OperationCancelled(Exception):
+    # Método de inicialização da classe OperationCancelled
+    def __init__(self, totals):
+        super().__init__("Operação cancelada")
+        self.totals = totals
+
+# Classe que acumula os totais de uma importação ou exportação, atualizados por várias threads, e
+# informa o progresso e o cancelamento
+class _Transfer:
+    # Método de inicialização da classe _Transfer
+    def __init__(self, progress, cancel):
+        self.progress = progress
+        self.cancel = cancel
+        self.totals = {"files": 0, "directories": 0, "bytes": 0}
+        self.started = time.perf_counter()
+        self.lock = threading.Lock()
+
+    # Método que soma arquivos, diretórios e bytes aos totais; cada lote de arquivos informa o progresso
+    def add(self, files=0, directories=0, size=0):
+        with self.lock:
+            self.totals["files"] += files
+            self.totals["directories"] += directories
+            self.totals["bytes"] += size
+            if files and self.progress is not None:
+                self.progress(self.totals["files"], self.totals["bytes"])
+
+    # Método que indica se o cancelamento foi pedido
+    def cancelled(self):
+        return self.cancel is not None and self.cancel.is_set()
+
+    # Método para lançar OperationCancelled se o cancelamento foi pedido
+    def check(self):
+        if self.cancelled():
+            raise OperationCancelled(dict(self.totals))
+
+    # Método que encerra a transferência e retorna os totais com a duração e a vazão
+    def finish(self):
+        seconds = time.perf_counter() - self.started
+        totals = dict(self.totals, seconds=seconds)
+        totals["files_per_second"] = totals["files"] / seconds if seconds else 0.0
+        totals["mb_per_second"] = totals["bytes"] / (1 << 20) / seconds if seconds else 0.0
+        return totals
+
+# Classe para representar um arquivo como uma lista de extensões (bloco inicial, quantidade de blocos)
+class FileEntry:
+    # Indica que a entrada é um arquivo (verificação em tempo constante, sem consultar outras tabelas)
+    is_directory = False
+
+    # Método de inicialização da classe FileEntry
+    def __init__(self, name, parent):
+        # Nome do arquivo no diretório pai
+        self.name = name
+        # Número do inode do diretório pai (None depois que o arquivo é removido)
+        self.parent = parent
+        # Número do inode do arquivo; com imagem, é também a sua posição na tabela de inodes
+        self.inode = None
+        # Lista de extensões contíguas (start, length) ocupadas pelo arquivo, em ordem
+        self.extents = []
+        # Tamanho do conteúdo do arquivo em bytes
+        self.size = 0
+        # Blocos indiretos que guardam na imagem as extensões que não cabem no inode
+        self.indirect_blocks = []
+        # Atributos definidos pelo usuário
+        self.attributes = {}
+        # Número de sequência da entrada no diretório pai (ver FileSystem.sequence)
+        self.sequence = 0
+        # Trava que protege as extensões, o tamanho e o conteúdo do arquivo
+        self.lock = threading.Lock()
+
+    # Método para obter a quantidade total de blocos ocupados pelo arquivo
+    def block_count(self):
+        return sum(length for _, length in self.extents)
+
+    # Método para percorrer todos os blocos físicos do arquivo, em ordem
+    def iter_blocks(self):
+        for start, length in self.extents:
+            yield from range(start, start + length)
+
+    # Método para percorrer os blocos do arquivo a partir de um índice lógico de bloco
+    # Retorna tuplas (bloco físico, quantidade de blocos contíguos restantes na extensão)
+    def iter_runs(self, first_block=0):
+        skipped = 0
+        for start, length in self.extents:
+            if skipped + length <= first_block:
+                skipped += length
+                continue
+            offset = max(0, first_block - skipped)
+            yield start + offset, length - offset
+            skipped += length
+
+# Classe para representar um diretório: entradas que associam nomes a números de inode
+class DirectoryEntry:
+    # Indica que a entrada é um diretório
+    is_directory = True
+
+    # Método de inicialização da classe DirectoryEntry
+    def __init__(self, name, parent):
+        # Nome do diretório no diretório pai ('/' para a raiz)
+        self.name = name
+        # Número do inode do diretório pai (a raiz aponta para si mesma; None depois da remoção)
+        self.parent = parent
+        # Número do inode do diretório
+        self.inode = None
+        # Entradas do diretório: nome -> número do inode, na ordem de criação
+        self.entries = {}
+        # Atributos definidos pelo usuário
+        self.attributes = {}
+        # Número de sequência da entrada no diretório pai (ver FileSystem.sequence)
+        self.sequence = 0
+        # Trava de leitores e escritor que protege as entradas
+        self.lock = RWLock()
+
+# Função para interpretar o modo de abertura (como no open() do Python); retorna
+# (pode ler, pode escrever, trunca, cria se não existir, acrescenta no final, modo binário)
+def parse_mode(mode):
+    kinds = set(mode)
+    if not kinds <= set("rwaxb+t") or len(mode) != len(kinds) or len(kinds & set("rwax")) != 1 or {"b", "t"} <= kinds:
+        raise ValueError(f"Modo inválido: {mode!r}")
+    update = "+" in kinds
+    return ("r" in kinds or update, "r" not in kinds or update, "w" in kinds,
+            not kinds & {"r"}, "a" in kinds, "b" in kinds)
+
+# Classe para um arquivo bruto (io.RawIOBase) sobre um arquivo do sistema de blocos livres
+# O FileSystem.open a envolve com os buffers e a camada de texto do módulo io
+class BlockFileIO(io.RawIOBase):
+    # Método de inicialização da classe BlockFileIO
+    # O arquivo aberto continua acessível mesmo que seja movido para outro diretório
+    def __init__(self, file_system, entry, readable, writable, append=False):
+        super().__init__()
+        self.file_system = file_system
+        self.entry = entry
+        self._readable = readable
+        self._writable = writable
+        self._append = append
+        self.position = 0
+        # Estado da leitura antecipada: posição esperada da próxima leitura sequencial,
+        # tamanho atual da janela e até onde os blocos já foram pedidos
+        self._next_read = 0
+        self._window = READAHEAD_MIN
+        self._ahead = 0
+
+    def readable(self):
+        return self._readable
+
+    def writable(self):
+        return self._writable
+
+    def seekable(self):
+        return True
+
+    # Método para ler bytes diretamente para o buffer informado
+    def readinto(self, buffer):
+        if not self._readable:
+            raise io.UnsupportedOperation("Arquivo não aberto para leitura")
+        sequential = self.position == self._next_read
+        count = self.file_system._readinto_entry(self.entry, self.position, buffer)
+        self.position += count
+        self._next_read = self.position
+        if count:
+            self._read_ahead(sequential)
+        return count
+
+    # Método que pede os próximos blocos antes que sejam lidos, se o acesso for sequencial
+    # Um novo pedido é feito quando a leitura passa da metade da janela já pedida
+    def _read_ahead(self, sequential):
+        if not sequential:
+            self._window = READAHEAD_MIN
+            self._ahead = self.position
+            return
+        if self._ahead - self.position > self._window // 2:
+            return
+        start = max(self._ahead, self.position)
+        self._ahead = self.position + self._window
+        self.file_system._read_ahead(self.entry, start, self._ahead - start)
+        self._window = min(self._window * 2, READAHEAD_MAX)
+
+    # Método para escrever bytes na posição atual (ou no final, no modo de acréscimo)
+    def write(self, data):
+        if not self._writable:
+            raise io.UnsupportedOperation("Arquivo não aberto para escrita")
+        count = len(data)
+        # No modo de acréscimo, o fim do arquivo é obtido junto com a escrita, para não perder
+        # acréscimos de outras threads
+        self.position = self.file_system._write_entry(self.entry, data, None if self._append else self.position)
+        return count
+
+    # Método para mudar a posição atual
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_SET:
+            position = offset
+        elif whence == io.SEEK_CUR:
+            position = self.position + offset
+        elif whence == io.SEEK_END:
+            position = self.entry.size + offset
+        else:
+            raise ValueError(f"whence inválido: {whence}")
+        if position < 0:
+            raise ValueError("Posição negativa")
+        self.position = position
+        return position
+
+    def tell(self):
+        return self.position
+
+    # Método para truncar o arquivo no tamanho informado (ou na posição atual)
+    def truncate(self, size=None):
+        if not self._writable:
+            raise io.UnsupportedOperation("Arquivo não aberto para escrita")
+        size = self.position if size is None else size
+        self.file_system._truncate_entry(self.entry, size)
+        return size
 
 # Classe para representar um sistema de arquivos
+# O espaço de nomes é hierárquico: cada arquivo ou diretório tem um número de inode, cada diretório
+# associa nomes a números de inode e cada entrada aponta para o seu diretório pai. Assim, cada passo da
+# resolução de um caminho, da navegação e da verificação arquivo/diretório leva tempo constante.
+# Caminhos podem ser absolutos ("/docs/a.txt") ou relativos ao diretório atual ("a.txt", "../b").
+# Concorrência: quando uma operação trava mais de um diretório, as travas são adquiridas em ordem
+# crescente de número de inode; as travas de diretório vêm antes da trava de um arquivo, que vem antes
+# da allocator_lock. Essa ordem fixa impede deadlocks.
+# - rename_lock: serializa as movimentações de diretórios (e a remoção de diretórios no rmtree), para
+#   que nenhuma delas forme um ciclo; é sempre a primeira trava adquirida
+# - DirectoryEntry.lock (leitores/escritor): protege as entradas de um diretório
+# - FileEntry.lock: protege as extensões e o conteúdo de um arquivo
+# - allocator_lock: protege o mapa de bits, o cursor de alocação, a tabela de inodes e o journal
 class FileSystem:
     # Método de inicialização da classe FileSystem
-    def __init__(self, total_blocks):
+    # Com `image_path`, os blocos e os metadados ficam em uma imagem de disco (criada se não existir);
+    # nesse caso o total de blocos e o tamanho do bloco de uma imagem existente prevalecem.
+    # Os metadados são gravados no journal em lotes de `journal_batch_size` operações ou a cada
+    # `journal_commit_interval` segundos, o que ocorrer primeiro.
+    # Com `cache_blocks` (ou `cache_bytes`), os blocos passam por um cache com a política `cache_policy`
+    # ("lru", "clock" ou "arc"); com `write_back`, as escritas só chegam ao armazenamento quando o bloco
+    # sai do cache ou em sync()/close(), e podem ser perdidas se o programa terminar antes disso
+    # Com `dedup`, blocos de arquivos com o mesmo conteúdo são guardados uma única vez e compartilhados
+    # (ver _store_shared); uma imagem com blocos compartilhados deve ser montada com `dedup` também
+    # `compression` é o codec dos blocos guardados em memória ("zlib", "lzma", "bz2" ou None); o atributo
+    # "compression" de um arquivo (ver set_compression) tem prioridade sobre ele
+    def __init__(self, total_blocks, block_size=4096, image_path=None, journal_batch_size=1024,
+                 journal_commit_interval=0.05, cache_blocks=None, cache_bytes=None, cache_policy="lru",
+                 write_back=False, dedup=False, compression=None):
+        self._check_compression(compression, image_path)
+        # Codec padrão dos blocos e codecs dos blocos de arquivos com outro codec (bloco -> codec)
+        self.compression = compression
+        self.block_codecs = {}
+        # Imagem de disco montada (None para manter tudo em memória) e temporizador que grava o lote
+        # pendente do journal quando nenhuma operação termina depois dele (ver _commit_idle)
+        self.image = None
+        self.commit_timer = None
+        if image_path is not None:
+            if not os.path.exists(image_path):
+                create_image(image_path, total_blocks, block_size)
+            self.image = DiskImage(image_path, batch_size=journal_batch_size,
+                                   commit_interval=journal_commit_interval)
+            total_blocks = self.image.total_blocks
+            block_size = self.image.block_size
         # Define o número total de blocos no sistema de arquivos
         self.total_blocks = total_blocks
-        # Inicializa o conjunto de blocos livres como todos os blocos disponíveis
-        self.free_blocks = set(range(total_blocks))
-        # Dicionário para armazenar os blocos alocados com seus respectivos dados
-        self.allocated_blocks = {}
-        # Dicionário para armazenar os arquivos com seus blocos associados e diretórios
-        self.files = {}
-        # Dicionário para armazenar os diretórios e os arquivos que eles contêm
-        self.directories = {'/': set()}
-        # Define o diretório atual como o diretório raiz
-        self.current_directory = '/'
-        # Dicionário para armazenar os atributos dos arquivos e diretórios
-        self.attributes = {}
+        # Define o tamanho de cada bloco em bytes
+        self.block_size = block_size
+        # Mapa de bits com um bit por bloco (1 = alocado, 0 = livre); com imagem, é uma cópia em memória
+        # da região do disco cujos trechos modificados são gravados pelo journal
+        if self.image is not None:
+            self.bitmap = Bitmap(total_blocks, bytearray(self.image.bitmap_buffer()), track_dirty=True)
+        else:
+            self.bitmap = Bitmap(total_blocks)
+        # Com imagem, os blocos liberados continuam ocupados no mapa de bits (e com o conteúdo) até o commit
+        # do journal que registra a liberação; assim, uma falha antes do commit não deixa um arquivo
+        # restaurado pelo journal apontando para blocos zerados ou reutilizados (ver _release_freed).
+        # Sequências (início, tamanho) liberadas pelas operações em andamento (por thread) e pelas operações
+        # já terminadas do lote em andamento; as de uma operação só aparecem livres no mapa de bits do
+        # journal quando ela termina, junto com os inodes que deixaram de usá-las
+        self.freeing = {}
+        self.freed = []
+        # Blocos de `freed` por trecho do mapa de bits, como máscaras de bits (ver Bitmap.take_dirty)
+        self.freed_masks = {}
+        # Blocos dessas sequências, que já não podem ser lidos, escritos nem liberados de novo (ver is_allocated)
+        self.pending_free = Bitmap(total_blocks) if self.image is not None else None
+        # Dicionário com os dados dos blocos alocados que já foram escritos (somente sem imagem)
+        self.block_data = {}
+        # Posição a partir da qual a próxima alocação procura blocos livres (next-fit)
+        self.allocation_cursor = 0
+        # Cache de blocos (None para acessar o armazenamento diretamente)
+        if cache_bytes is not None:
+            cache_blocks = max(cache_bytes // block_size, 1)
+        if cache_blocks is None and compression is not None:
+            cache_blocks = COMPRESSION_CACHE_BLOCKS
+        self.cache = None
+        if cache_blocks is not None:
+            self.cache = BlockCache(self._store_read, self._store_write, cache_blocks, cache_policy, write_back,
+                                    read_run=self._store_read_run, write_run=self._store_write_run)
+        # Executor da leitura antecipada para o cache (criado no primeiro uso)
+        self.prefetcher = None
+        # Tabela de inodes em memória: número do inode -> FileEntry ou DirectoryEntry
+        self.inodes = {}
+        # Números de inode livres para reutilização e próximo número ainda não usado (sem imagem)
+        self.free_inodes = []
+        self.next_inode = 1
+        # Travas da alocação de blocos e inodes e das movimentações de diretórios (ver a descrição da classe)
+        self.allocator_lock = threading.RLock()
+        self.rename_lock = threading.Lock()
+        # Diretório raiz (sempre o inode 0) e número do inode do diretório atual
+        self.root = DirectoryEntry('/', 0)
+        self.root.inode = 0
+        # Números de sequência das entradas, crescentes na ordem em que entram nos diretórios (criação ou
+        # movimentação); gravados nos inodes, restauram a ordem das entradas na montagem da imagem
+        self.sequence = count(1)
+        self.inodes[0] = self.root
+        self.current_inode = 0
+        # Índices secundários criados com create_index (atributo -> AttributeIndex)
+        self.indexes = {}
+        # Deduplicação: quantidade de referências dos blocos compartilhados (blocos ausentes têm uma só),
+        # resumo do conteúdo -> bloco e bloco -> resumo do conteúdo
+        self.dedup = dedup
+        self.refcounts = {}
+        self.block_hashes = {}
+        self.hash_of = {}
+        if self.image is not None:
+            self._load_image()
+
+    # Método para carregar os metadados da imagem (somente a tabela de inodes; os dados ficam no disco)
+    def _load_image(self):
+        children = []
+        for slot in range(self.image.inode_high_water):
+            record = self.image.read_inode(slot)
+            if record is None:
+                self.free_inodes.append(slot)
+                continue
+            if slot == 0:
+                entry = self.root
+            elif record.kind == INODE_DIRECTORY:
+                entry = DirectoryEntry(record.name, record.parent)
+            else:
+                entry = FileEntry(record.name, record.parent)
+                entry.size = record.size
+                entry.extents = list(record.extents)
+                entry.indirect_blocks = record.indirect_blocks
+            entry.inode = slot
+            entry.attributes = record.attributes
+            entry.sequence = record.sequence
+            self.inodes[slot] = entry
+            if slot != 0:
+                children.append(entry)
+        # Preenche as entradas dos diretórios pelos ponteiros para o pai, depois que todos foram carregados,
+        # na ordem em que entraram nos diretórios (a ordem dos inodes na tabela não é a de criação)
+        children.sort(key=lambda entry: entry.sequence)
+        self.sequence = count(children[-1].sequence + 1 if children else 1)
+        for entry in children:
+            self.inodes[entry.parent].entries[entry.name] = entry.inode
+        if self.dedup:
+            self._load_dedup()
+
+    # Método para reconstruir as referências e os resumos dos blocos de uma imagem deduplicada
+    # As referências vêm das extensões dos arquivos; os resumos exigem ler cada bloco uma vez
+    def _load_dedup(self):
+        for entry in self.inodes.values():
+            if entry.is_directory:
+                continue
+            for block in entry.iter_blocks():
+                if block in self.hash_of:
+                    self.refcounts[block] = self.refcounts.get(block, 1) + 1
+                    continue
+                digest = hashlib.sha256(self._padded_block(block)).digest()
+                self.hash_of[block] = digest
+                self.block_hashes.setdefault(digest, block)
+
+    # Método para atribuir um número de inode a um arquivo ou diretório e registrá-lo na tabela de inodes
+    # Com imagem, o número é a posição do inode na tabela de inodes do disco
+    def _allocate_inode(self, entry):
+        with self.allocator_lock:
+            if self.free_inodes:
+                number = self.free_inodes.pop()
+            elif self.image is not None:
+                number = self.image.reserve_inode()
+            else:
+                number = self.next_inode
+                self.next_inode += 1
+            entry.inode = number
+            entry.sequence = next(self.sequence)
+            self.inodes[number] = entry
+        for attribute, index in list(self.indexes.items()):
+            index.add(number, self._indexed_value(entry, attribute))
+
+    # Método para gravar na imagem o inode de um arquivo (extensões e tamanho) ou de um diretório
+    def _persist(self, entry):
+        if self.image is None:
+            return
+        with self.allocator_lock:
+            if entry.is_directory:
+                record = InodeRecord(INODE_DIRECTORY, entry.name, entry.parent, attributes=entry.attributes,
+                                     sequence=entry.sequence)
+            else:
+                # Ajusta a cadeia de blocos indiretos à quantidade de extensões
+                needed = self.image.indirect_blocks_needed(len(entry.extents))
+                while len(entry.indirect_blocks) > needed:
+                    self.free_block(entry.indirect_blocks.pop())
+                while len(entry.indirect_blocks) < needed:
+                    entry.indirect_blocks.append(self.allocate_block())
+                record = InodeRecord(INODE_FILE, entry.name, entry.parent, entry.size, entry.extents,
+                                     entry.attributes, entry.indirect_blocks, entry.sequence)
+            self.image.write_inode(entry.inode, record)
+
+    # Método para liberar o número de inode de um arquivo ou diretório (e o inode na imagem)
+    def _release_inode(self, entry):
+        for attribute, index in list(self.indexes.items()):
+            index.remove(entry.inode, self._indexed_value(entry, attribute))
+        with self.allocator_lock:
+            del self.inodes[entry.inode]
+            if self.image is not None:
+                self.image.free_inode(entry.inode)
+            self.free_inodes.append(entry.inode)
+
+    # Método para encerrar a operação de metadados da thread atual: registra no journal os trechos
+    # modificados do mapa de bits e deixa a imagem decidir se o lote já deve ser gravado (group commit).
+    # Chamadas diretas a allocate_block/free_block entram no lote da próxima operação da mesma thread
+    def _metadata_changed(self):
+        if self.image is None:
+            return
+        with self.allocator_lock:
+            self._finish_freeing(self.freeing.pop(threading.get_ident(), []))
+            if self.image.end_operation():
+                self._release_freed()
+            elif self.commit_timer is None and self.image.journal.first_pending is not None:
+                self._schedule_commit(self.image.journal.commit_interval)
+
+    # Método que registra no journal o mapa de bits com as sequências `freeing` de uma operação que terminou
+    # Os trechos dessas sequências podem já ter sido registrados (ainda ocupados) por outra operação, então
+    # são marcados de novo; quem chama deve ter a allocator_lock
+    def _finish_freeing(self, freeing):
+        for start, length in freeing:
+            self.bitmap.mark_dirty(start, length)
+            for chunk, mask in Bitmap.chunk_masks(start, length):
+                self.freed_masks[chunk] = self.freed_masks.get(chunk, 0) | mask
+        self.freed.extend(freeing)
+        # Os blocos em liberação das operações terminadas aparecem livres no mapa de bits registrado no journal
+        for offset, data in self.bitmap.take_dirty(self.freed_masks):
+            self.image.write_metadata(self.image.bitmap_offset + offset, data)
+
+    # Método que agenda o temporizador do commit; quem chama deve ter a allocator_lock
+    def _schedule_commit(self, delay):
+        self.commit_timer = threading.Timer(delay, self._commit_idle)
+        self.commit_timer.daemon = True
+        self.commit_timer.start()
+
+    # Método executado pelo temporizador: o lote só é gravado no fim de uma operação, então, sem ele, as
+    # operações terminadas antes de o programa ficar ocioso esperariam indefinidamente pelo commit.
+    # Grava as operações que esperam há journal_commit_interval segundos; os registros de uma operação
+    # ainda em andamento em outra thread ficam para o lote seguinte
+    def _commit_idle(self):
+        with self.allocator_lock:
+            self.commit_timer = None
+            if self.image is None or self.image.journal.first_pending is None:
+                return
+            journal = self.image.journal
+            # Um commit feito no fim de uma operação pode ter começado um lote novo depois do agendamento
+            remaining = journal.first_pending + journal.commit_interval - time.monotonic()
+            if remaining > 0:
+                self._schedule_commit(remaining)
+                return
+            self.image.commit(completed_only=True)
+            self._release_freed()
+
+    # Método que devolve ao alocador os blocos cuja liberação já foi gravada no journal (zerando-os na
+    # imagem); quem chama deve ter a allocator_lock
+    def _release_freed(self):
+        for start, length in self.freed:
+            self.image.discard_blocks(start, length)
+            self.bitmap.clear_range(start, length)
+            self.pending_free.clear_range(start, length)
+        self.freed = []
+        self.freed_masks = {}
+
+    # Método que adia a liberação de blocos consecutivos da imagem até o commit (ver _release_freed);
+    # quem chama deve ter a allocator_lock
+    def _defer_free(self, start, length):
+        self.freeing.setdefault(threading.get_ident(), []).append((start, length))
+        self.pending_free.set_range(start, length)
+        self.bitmap.mark_dirty(start, length)
+
+    # Método para gravar no disco as alterações pendentes da imagem
+    # As operações ainda em andamento em outras threads ficam para o commit em que terminarem
+    def sync(self):
+        if self.cache is not None:
+            self.cache.flush()
+        if self.image is not None:
+            with self.allocator_lock:
+                self._metadata_changed()
+                self.image.flush()
+                self._release_freed()
+
+    # Método para desmontar a imagem de disco
+    def close(self):
+        if self.prefetcher is not None:
+            self.prefetcher.shutdown(wait=True)
+            self.prefetcher = None
+        if self.cache is not None:
+            self.cache.flush()
+        if self.image is None:
+            return
+        with self.allocator_lock:
+            self._metadata_changed()
+            # Na desmontagem, as operações que ficaram em andamento em outras threads também são gravadas
+            for freeing in self.freeing.values():
+                self._finish_freeing(freeing)
+            self.freeing = {}
+            self.image.commit()
+            self._release_freed()
+            if self.commit_timer is not None:
+                self.commit_timer.cancel()
+                self.commit_timer = None
+            self.image.close()
+            self.image = None
+
+    # Método para alocar uma extensão de até `length` blocos contíguos
+    # Tenta começar em `hint` (normalmente o fim da última extensão do arquivo) para estendê-la;
+    # depois procura uma sequência livre de tamanho suficiente e, por fim, qualquer bloco livre
+    def allocate_extent(self, length, hint=None):
+        with self.allocator_lock:
+            # Verifica se há blocos livres disponíveis
+            if self.bitmap.free_count() == 0:
+                raise Exception("Nenhum bloco livre disponível")
+            cursor = self.allocation_cursor
+            if hint is not None and hint < self.total_blocks and not self.bitmap.test(hint):
+                start = hint
+            else:
+                start = self.bitmap.find_clear_run(length, cursor)
+                if start is None:
+                    start = self.bitmap.find_clear_run(length, 0, cursor)
+                if start is None:
+                    start = self.bitmap.find_clear(cursor)
+                if start is None:
+                    start = self.bitmap.find_clear(0)
+            # Ocupa a sequência de blocos livres a partir do início escolhido
+            run = self.bitmap.clear_run_length(start, length)
+            self.bitmap.set_range(start, run)
+            self.allocation_cursor = (start + run) % self.total_blocks
+            return start, run
 
     # Método para alocar um bloco no sistema de arquivos
     def allocate_block(self):
-        # Verifica se há blocos livres disponíveis
-        if len(self.free_blocks) == 0:
-            raise Exception("Nenhum bloco livre disponível")
-        # Remove e retorna um bloco livre para alocação
-        block = self.free_blocks.pop()
-        # Adiciona o bloco aos blocos alocados sem atribuir dados inicialmente
-        self.allocated_blocks[block] = None
+        block, _ = self.allocate_extent(1)
         return block
 
     # Método para liberar um bloco previamente alocado
+    # Um bloco compartilhado pela deduplicação só é liberado quando perde a última referência
     def free_block(self, block):
-        # Verifica se o bloco está realmente alocado
-        if block not in self.allocated_blocks:
+        with self.allocator_lock:
+            # Verifica se o bloco está realmente alocado
+            if not self.is_allocated(block):
+                raise Exception("Bloco não está alocado")
+            if self._release_reference(block):
+                return
+            # Descarta os dados, o resumo e o codec do bloco e o marca como livre no mapa de bits
+            self._free_run(block, 1)
+
+    # Método para liberar uma extensão inteira de blocos
+    # Os blocos compartilhados da extensão só perdem uma referência; os demais são liberados
+    def free_extent(self, start, length):
+        # Verifica se todos os blocos da extensão estão alocados
+        if start < 0 or start + length > self.total_blocks:
             raise Exception("Bloco não está alocado")
-        # Remove o bloco dos blocos alocados e o adiciona aos blocos livres
-        del self.allocated_blocks[block]
-        self.free_blocks.add(block)
+        with self.allocator_lock:
+            first_free = self.bitmap.find_clear(start)
+            if first_free is not None and first_free < start + length:
+                raise Exception("Bloco não está alocado")
+            if self.pending_free is not None and self.pending_free.find_set(start, start + length) is not None:
+                raise Exception("Bloco não está alocado")
+            if self.refcounts:
+                shared = sorted(self._blocks_in(self.refcounts, start, length))
+                if shared:
+                    # Libera os trechos entre os blocos compartilhados
+                    for block in shared:
+                        self._release_reference(block)
+                    for run_start, run_end in zip([start] + [block + 1 for block in shared], shared + [start + length]):
+                        if run_end > run_start:
+                            self._free_run(run_start, run_end - run_start)
+                    return
+            self._free_run(start, length)
+
+    # Método que libera blocos consecutivos sem referências compartilhadas; quem chama deve ter a allocator_lock
+    def _free_run(self, start, length):
+        if self.block_codecs:
+            for block in self._blocks_in(self.block_codecs, start, length):
+                del self.block_codecs[block]
+        if self.hash_of:
+            for block in self._blocks_in(self.hash_of, start, length):
+                self._unhash(block)
+        if self.cache is not None:
+            self.cache.discard(start, length)
+        if self.image is not None:
+            self._defer_free(start, length)
+        else:
+            for block in range(start, start + length):
+                self.block_data.pop(block, None)
+            self.bitmap.clear_range(start, length)
+
+    # Método para obter os blocos de `start` a `start + length - 1` que são chaves de `table`
+    # Percorre o menor entre o intervalo e a tabela
+    def _blocks_in(self, table, start, length):
+        if length > len(table):
+            return [block for block in table if start <= block < start + length]
+        return [block for block in range(start, start + length) if block in table]
+
+    # Método que retira uma referência de um bloco compartilhado; retorna False se o bloco não é
+    # compartilhado (a referência retirada seria a última); quem chama deve ter a allocator_lock
+    def _release_reference(self, block):
+        count = self.refcounts.get(block)
+        if count is None:
+            return False
+        if count > 2:
+            self.refcounts[block] = count - 1
+        else:
+            del self.refcounts[block]
+        return True
+
+    # Método que esquece o resumo do conteúdo de um bloco; quem chama deve ter a allocator_lock
+    def _unhash(self, block):
+        digest = self.hash_of.pop(block, None)
+        if digest is not None and self.block_hashes.get(digest) == block:
+            del self.block_hashes[digest]
+
+    # Método para verificar se um bloco está alocado
+    # Um bloco liberado continua ocupado no mapa de bits até o commit, mas já não conta como alocado
+    def is_allocated(self, block):
+        return (0 <= block < self.total_blocks and self.bitmap.test(block)
+                and (self.pending_free is None or not self.pending_free.test(block)))
+
+    # Método para obter a quantidade de blocos livres
+    def free_block_count(self):
+        return self.bitmap.free_count()
 
     # Método para escrever dados em um bloco alocado
     def write_block(self, block, data):
         # Verifica se o bloco está alocado
-        if block not in self.allocated_blocks:
+        if not self.is_allocated(block):
             raise Exception("Bloco não está alocado")
+        # Verifica se os dados cabem no bloco
+        if data is not None and len(data) > self.block_size:
+            raise Exception("Dados excedem o tamanho do bloco")
         # Escreve os dados no bloco especificado
-        self.allocated_blocks[block] = data
+        if self.cache is None:
+            self._store_write(block, data)
+            return
+        # O cache guarda uma cópia imutável: o chamador pode reutilizar o buffer (por exemplo, o do io.BufferedWriter)
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        elif isinstance(data, (bytearray, memoryview)):
+            data = bytes(data)
+        self.cache.write(block, data)
 
     # Método para ler os dados de um bloco alocado
     def read_block(self, block):
         # Verifica se o bloco está alocado
-        if block not in self.allocated_blocks:
+        if not self.is_allocated(block):
             raise Exception("Bloco não está alocado")
-        # Retorna os dados do bloco especificado
-        return self.allocated_blocks[block]
+        if self.cache is not None:
+            return self.cache.read(block)
+        return self._store_read(block)
+
+    # Método que escreve um bloco diretamente no armazenamento (imagem ou memória)
+    def _store_write(self, block, data):
+        if self.image is not None:
+            self.image.write_block(block, data.encode('utf-8') if isinstance(data, str) else data or b'')
+        else:
+            codec = self.block_codecs.get(block, self.compression)
+            if codec is not None and data:
+                data = compress(codec, data.encode('utf-8') if isinstance(data, str) else data)
+            # Guarda uma cópia imutável: o chamador pode reutilizar o buffer (por exemplo, o do io.BufferedWriter)
+            elif isinstance(data, (bytearray, memoryview)):
+                data = bytes(data)
+            self.block_data[block] = data
+
+    # Método que escreve blocos consecutivos diretamente no armazenamento com uma única cópia
+    # `blocks` é a lista dos dados de cada bloco (o último pode ser menor que um bloco)
+    def _store_write_run(self, start, blocks):
+        if self.image is None:
+            for offset, data in enumerate(blocks):
+                self._store_write(start + offset, data)
+            return
+        padded = [data if len(data) == self.block_size else bytes(data) + bytes(self.block_size - len(data))
+                  for data in blocks[:-1]]
+        padded.append(blocks[-1])
+        self.image.write_blocks(start, b''.join(padded))
+
+    # Método que escreve blocos inteiros e consecutivos de um arquivo (pelo cache, se houver)
+    # A imagem recebe todos os blocos em uma única escrita (no modo write-back, quando o cache os grava)
+    def _write_run(self, start, data):
+        if self.cache is not None:
+            size = self.block_size
+            self.cache.write_blocks(start, [bytes(data[offset:offset + size]) for offset in range(0, len(data), size)])
+        elif self.image is not None:
+            self.image.write_blocks(start, data)
+        else:
+            for offset in range(0, len(data), self.block_size):
+                self._store_write(start + offset // self.block_size, data[offset:offset + self.block_size])
+
+    # Método que lê `count` blocos consecutivos como um único objeto de count * block_size bytes
+    # Blocos nunca escritos (ou escritos parcialmente) são lidos como zeros
+    def _read_run(self, start, count):
+        if self.cache is None and self.image is not None:
+            return self.image.read_blocks(start, count)
+        if self.cache is not None:
+            blocks = self.cache.read_blocks(start, count)
+        else:
+            blocks = self._store_read_run(start, count)
+        parts = []
+        for data in blocks:
+            if data is None:
+                parts.append(bytes(self.block_size))
+            elif len(data) < self.block_size:
+                parts.append(bytes(data) + bytes(self.block_size - len(data)))
+            else:
+                parts.append(data)
+        return parts[0] if count == 1 else b''.join(parts)
+
+    # Método que pede antecipadamente os blocos de um trecho de arquivo que deve ser lido em breve
+    # Com cache, os blocos são carregados no cache por uma thread em segundo plano; sem cache, o sistema
+    # operacional é avisado para carregar as páginas da imagem
+    def _read_ahead(self, entry, offset, size):
+        if self.cache is None and self.image is None:
+            return
+        with entry.lock:
+            end = min(entry.size, offset + size)
+            if entry.parent is None or offset >= end:
+                return
+            first = offset // self.block_size
+            remaining = -(-end // self.block_size) - first
+            runs = []
+            for start, length in entry.iter_runs(first):
+                runs.append((start, min(length, remaining)))
+                remaining -= runs[-1][1]
+                if remaining <= 0:
+                    break
+            # Com a trava do arquivo, nenhum desses blocos é liberado antes da marca: os liberados depois
+            # dela não entram no cache quando a leitura for feita
+            mark = self.cache.schedule_prefetch() if self.cache is not None else None
+        if self.cache is None:
+            for start, count in runs:
+                self.image.will_need(start, count)
+            return
+        with self.allocator_lock:
+            if self.prefetcher is None:
+                # Importado só aqui: concurrent.futures (com logging) é a importação mais cara do módulo
+                from concurrent.futures import ThreadPoolExecutor
+                self.prefetcher = ThreadPoolExecutor(max_workers=1, thread_name_prefix="leitura-antecipada")
+        self.prefetcher.submit(self.cache.prefetch, runs, mark)
+
+    # Método que lê um bloco diretamente do armazenamento
+    # Retorna None se o bloco ainda não foi escrito; com imagem, retorna uma memoryview sobre o mmap, sem cópia
+    def _store_read(self, block):
+        if self.image is not None:
+            return self.image.read_block(block)
+        return decompress(self.block_data.get(block))
+
+    # Método que lê blocos consecutivos diretamente do armazenamento; retorna a lista dos dados de cada bloco
+    # Com imagem, cada bloco é uma fatia de uma única memoryview sobre o mmap
+    def _store_read_run(self, start, count):
+        if self.image is None:
+            return [decompress(self.block_data.get(block)) for block in range(start, start + count)]
+        view = self.image.read_blocks(start, count)
+        size = self.block_size
+        return [view[offset:offset + size] for offset in range(0, count * size, size)]
+
+    # Método para ajustar a quantidade de blocos de um arquivo
+    # Blocos novos são alocados preferencialmente logo após a última extensão
+    def _resize_file(self, entry, size):
+        needed = -(-size // self.block_size)
+        current = entry.block_count()
+        # Aloca novas extensões até cobrir o tamanho pedido
+        while current < needed:
+            hint = None
+            if entry.extents:
+                last_start, last_length = entry.extents[-1]
+                hint = last_start + last_length
+            try:
+                start, length = self.allocate_extent(needed - current, hint)
+            except Exception:
+                # Desfaz o crescimento parcial para não deixar o arquivo inconsistente
+                self._resize_file(entry, entry.size)
+                raise
+            # Une a extensão nova à última quando forem contíguas
+            if entry.extents and hint == start:
+                entry.extents[-1] = (last_start, last_length + length)
+            else:
+                entry.extents.append((start, length))
+            current += length
+        # Libera as extensões (ou parte delas) que ficaram além do novo tamanho
+        while current > needed:
+            start, length = entry.extents[-1]
+            excess = min(length, current - needed)
+            self.free_extent(start + length - excess, excess)
+            if excess == length:
+                entry.extents.pop()
+            else:
+                entry.extents[-1] = (start, length - excess)
+            current -= excess
+
+    # Método para encontrar o arquivo ou diretório de um caminho; retorna None se não existir
+    # Caminhos relativos partem de `base` (um DirectoryEntry) ou do diretório atual. Cada componente é
+    # resolvido em tempo constante pelas entradas do diretório; ".." segue o ponteiro para o pai
+    def _resolve(self, path, base=None):
+        if path.startswith('/'):
+            entry = self.root
+        else:
+            entry = base if base is not None else self.inodes.get(self.current_inode)
+        for part in path.split('/'):
+            if entry is None or not entry.is_directory:
+                return None
+            if part in ('', '.'):
+                continue
+            if part == '..':
+                entry = self.inodes.get(entry.parent) if entry.parent is not None else None
+                continue
+            # Chamadas diretas à trava (sem o gerenciador de contexto), pois este é o caminho mais frequente
+            entry.lock.acquire_read()
+            try:
+                number = entry.entries.get(part)
+            finally:
+                entry.lock.release_read()
+            entry = self.inodes.get(number) if number is not None else None
+        return entry
+
+    # Método para obter o registro (FileEntry ou DirectoryEntry) de um caminho; None se não existir
+    def lookup(self, path):
+        return self._resolve(path)
+
+    # Método para verificar se um caminho é um diretório
+    def is_directory(self, path):
+        entry = self._resolve(path)
+        return entry is not None and entry.is_directory
+
+    # Método para obter o caminho absoluto de um arquivo ou diretório pelos ponteiros para o pai
+    def path_of(self, entry):
+        parts = []
+        while entry.inode != 0:
+            if entry.parent is None:
+                raise Exception("Arquivo ou diretório não existe")
+            parts.append(entry.name)
+            entry = self.inodes[entry.parent]
+        return '/' + '/'.join(reversed(parts))
+
+    # Caminho absoluto do diretório atual
+    @property
+    def current_directory(self):
+        return self.path_of(self.inodes[self.current_inode])
+
+    # Método para obter o diretório de um caminho (ou o diretório atual, sem caminho)
+    def _directory(self, path=None):
+        entry = self.inodes.get(self.current_inode) if path is None else self._resolve(path)
+        if entry is None or not entry.is_directory or entry.parent is None:
+            raise Exception("Diretório não existe")
+        return entry
+
+    # Método para separar um caminho em diretório pai (DirectoryEntry) e nome da última entrada
+    # Com `directory`, caminhos relativos partem desse diretório em vez do diretório atual
+    def _split(self, path, directory=None):
+        base = self._directory(directory)
+        head, separator, name = path.rstrip('/').rpartition('/')
+        parent = self._resolve(head or '/', base) if separator else base
+        if parent is None or not parent.is_directory:
+            raise Exception("Diretório não existe")
+        if name in ('', '.', '..'):
+            raise Exception("Nome inválido")
+        return parent, name
+
+    # Método para obter o registro de um arquivo
+    def _file(self, path):
+        entry = self._resolve(path)
+        if entry is None or entry.is_directory:
+            raise Exception("Arquivo não existe")
+        return entry
+
+    # Método para ler um intervalo de bytes de um arquivo
+    def read_file(self, filename, offset=0, size=None):
+        return self._read_entry(self._file(filename), offset, size)
+
+    # Método que faz a leitura com a trava do arquivo (um arquivo removido é tratado como inexistente)
+    def _read_entry(self, entry, offset=0, size=None):
+        with entry.lock:
+            if entry.parent is None:
+                raise Exception("Arquivo não existe")
+            return self._read(entry, offset, size)
+
+    # Método que lê os blocos de um arquivo; quem chama deve ter a trava do arquivo
+    def _read(self, entry, offset=0, size=None):
+        return b''.join(self._read_parts(entry, offset, size))
+
+    # Método que obtém os trechos do conteúdo de um arquivo, um por extensão; quem chama deve ter a trava
+    # Com imagem e sem cache, os trechos são memoryviews sobre o mmap, válidas só enquanto a trava é mantida
+    def _read_parts(self, entry, offset=0, size=None):
+        end = entry.size if size is None else min(entry.size, offset + size)
+        parts = []
+        if offset >= end:
+            return parts
+        position = (offset // self.block_size) * self.block_size
+        # Percorre as extensões a partir do bloco que contém o deslocamento inicial,
+        # lendo de uma vez os blocos necessários de cada extensão
+        for start, length in entry.iter_runs(offset // self.block_size):
+            count = min(length, -(-(end - position) // self.block_size))
+            data = self._read_run(start, count)
+            parts.append(data[max(0, offset - position):min(count * self.block_size, end - position)])
+            position += count * self.block_size
+            if position >= end:
+                break
+        return parts
+
+    # Método que copia o conteúdo de um arquivo a partir de `offset` diretamente para `buffer`
+    # Retorna a quantidade de bytes copiados (usado por BlockFileIO.readinto, sem objetos intermediários)
+    def _readinto_entry(self, entry, offset, buffer):
+        target = memoryview(buffer).cast("B")
+        with entry.lock:
+            if entry.parent is None:
+                raise Exception("Arquivo não existe")
+            count = 0
+            for part in self._read_parts(entry, offset, len(target)):
+                target[count:count + len(part)] = part
+                count += len(part)
+        return count
+
+    # Método para escrever bytes em um arquivo a partir de um deslocamento, estendendo-o se necessário
+    def write_file(self, filename, data, offset=0):
+        self._write_entry(self._file(filename), data, offset)
+
+    # Método para acrescentar bytes ao final de um arquivo; retorna o novo tamanho
+    def append_file(self, filename, data):
+        return self._write_entry(self._file(filename), data, None)
+
+    # Método que faz a escrita com a trava do arquivo e encerra a operação de metadados
+    # Com `offset` None, escreve no final do arquivo; retorna a posição logo após os dados escritos
+    def _write_entry(self, entry, data, offset):
+        with entry.lock:
+            if entry.parent is None:
+                raise Exception("Arquivo não existe")
+            end = self._write(entry, data, entry.size if offset is None else offset)
+            self._metadata_changed()
+            return end
+
+    # Método que escreve nos blocos de um arquivo; quem chama deve ter a trava do arquivo
+    def _write(self, entry, data, offset=0):
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        data = memoryview(data)
+        end = offset + len(data)
+        if end > entry.size:
+            self._resize_file(entry, end)
+            self._set_size(entry, end)
+            self._persist(entry)
+        self._register_codec(entry, offset // self.block_size, -(-end // self.block_size))
+        if self.dedup:
+            return self._write_dedup(entry, data, offset, end)
+        position = (offset // self.block_size) * self.block_size
+        for start, length in entry.iter_runs(offset // self.block_size):
+            block = start
+            while block < start + length and position < end:
+                lo = max(offset, position)
+                hi = min(end, position + self.block_size)
+                if lo == position and hi == position + self.block_size:
+                    # Blocos inteiros: escreve sem ler o conteúdo anterior, todos os consecutivos de uma vez
+                    count = min(start + length - block, (end - position) // self.block_size)
+                    self._write_run(block, data[position - offset:position - offset + count * self.block_size])
+                    block += count
+                    position += count * self.block_size
+                    continue
+                current = bytearray(self.read_block(block) or b'')[:entry.size - position]
+                if len(current) < hi - position:
+                    current.extend(bytes(hi - position - len(current)))
+                current[lo - position:hi - position] = data[lo - offset:hi - offset]
+                self.write_block(block, bytes(current))
+                block += 1
+                position += self.block_size
+            if position >= end:
+                break
+        return end
+
+    # Método que escreve nos blocos de um arquivo com deduplicação, um bloco por vez
+    # Os blocos físicos são obtidos antes das escritas, pois cada escrita pode trocar o bloco de um índice
+    def _write_dedup(self, entry, data, offset, end):
+        first = offset // self.block_size
+        last = (end - 1) // self.block_size
+        blocks = []
+        for start, length in entry.iter_runs(first):
+            blocks.extend(range(start, start + min(length, last - first + 1 - len(blocks))))
+            if len(blocks) > last - first:
+                break
+        remapped = False
+        for index, block in enumerate(blocks, first):
+            position = index * self.block_size
+            lo = max(offset, position)
+            hi = min(end, position + self.block_size)
+            if lo == position and hi == position + self.block_size:
+                content = bytes(data[position - offset:position - offset + self.block_size])
+            else:
+                current = bytearray(self.read_block(block) or b'')[:entry.size - position]
+                if len(current) < hi - position:
+                    current.extend(bytes(hi - position - len(current)))
+                current[lo - position:hi - position] = data[lo - offset:hi - offset]
+                content = bytes(current)
+            remapped |= self._store_shared(entry, index, block, content)
+        if remapped:
+            self._persist(entry)
+        return end
+
+    # Método que grava o conteúdo do bloco de índice `index` de um arquivo, hoje no bloco físico `block`
+    # Se outro bloco já tem o mesmo conteúdo, o arquivo passa a compartilhá-lo e `block` perde uma
+    # referência; se `block` é compartilhado, a escrita vai para um bloco novo (cópia na escrita).
+    # Retorna True se o bloco físico do índice mudou; quem chama deve ter a trava do arquivo
+    def _store_shared(self, entry, index, block, content):
+        padded = content + bytes(self.block_size - len(content))
+        digest = hashlib.sha256(padded).digest()
+        with self.allocator_lock:
+            existing = self.block_hashes.get(digest)
+            if existing == block:
+                return False
+            # O conteúdo é comparado para que uma colisão do resumo não misture blocos diferentes
+            if existing is not None and self._padded_block(existing) == padded:
+                self.refcounts[existing] = self.refcounts.get(existing, 1) + 1
+                self._remap(entry, index, existing)
+                self.free_block(block)
+                return True
+            remapped = block in self.refcounts
+            if remapped:
+                new_block = self.allocate_block()
+                self._release_reference(block)
+                self._remap(entry, index, new_block)
+                self._register_codec(entry, index, index + 1)
+                block = new_block
+            else:
+                self._unhash(block)
+            self.write_block(block, content)
+            self.hash_of[block] = digest
+            self.block_hashes.setdefault(digest, block)
+            return remapped
+
+    # Método que lê um bloco completo, com zeros depois do conteúdo gravado
+    def _padded_block(self, block):
+        data = self._read_run(block, 1)
+        return bytes(data)
+
+    # Método que troca o bloco físico do índice `index` de um arquivo, dividindo a extensão que o contém
+    def _remap(self, entry, index, block):
+        extents = []
+        skipped = 0
+        for start, length in entry.extents:
+            if skipped <= index < skipped + length:
+                offset = index - skipped
+                pieces = [(start, offset), (block, 1), (start + offset + 1, length - offset - 1)]
+            else:
+                pieces = [(start, length)]
+            for piece_start, piece_length in pieces:
+                if not piece_length:
+                    continue
+                if extents and extents[-1][0] + extents[-1][1] == piece_start:
+                    extents[-1] = (extents[-1][0], extents[-1][1] + piece_length)
+                else:
+                    extents.append((piece_start, piece_length))
+            skipped += length
+        entry.extents = extents
+
+    # Método que verifica o codec de compressão pedido (com imagem, os blocos têm tamanho fixo no disco e
+    # a compressão não economizaria espaço, então ela só é aceita em memória)
+    def _check_compression(self, codec, image_path):
+        try:
+            check_codec(codec)
+        except ValueError:
+            raise Exception("Codec de compressão inválido")
+        if codec is not None and image_path is not None:
+            raise Exception("A compressão só é suportada sem imagem de disco")
+
+    # Método para obter o codec de compressão de um arquivo (o do atributo "compression" ou o padrão)
+    def _codec_of(self, entry):
+        codec = entry.attributes.get("compression", self.compression)
+        return codec if codec is None or codec in CODECS else self.compression
+
+    # Método que registra o codec dos blocos de índice `first` a `last - 1` de um arquivo antes de
+    # uma escrita; quem chama deve ter a trava do arquivo
+    def _register_codec(self, entry, first, last):
+        codec = self._codec_of(entry)
+        if codec == self.compression and not self.block_codecs:
+            return
+        for start, length in entry.iter_runs(first):
+            for block in range(start, start + min(length, last - first)):
+                if codec == self.compression:
+                    self.block_codecs.pop(block, None)
+                else:
+                    self.block_codecs[block] = codec
+            first += length
+            if first >= last:
+                break
+
+    # Método para definir o codec de compressão de um arquivo (None para guardá-lo sem compressão)
+    # Os blocos já escritos são recomprimidos com o novo codec
+    def set_compression(self, path, codec):
+        self._check_compression(codec, self.image.path if self.image is not None else None)
+        entry = self._file(path)
+        with entry.lock:
+            self._set_indexed(entry, "compression", codec)
+            self._persist(entry)
+            for index, block in enumerate(list(entry.iter_blocks())):
+                data = self.read_block(block)
+                if data is not None:
+                    self._register_codec(entry, index, index + 1)
+                    self.write_block(block, data)
+            self._metadata_changed()
+
+    # Método para obter as estatísticas de compressão dos blocos guardados em memória
+    # "bytes" soma os blocos descomprimidos e "stored_bytes" o que eles ocupam; "ratio" é a razão entre os dois
+    def compression_stats(self):
+        size = stored = compressed = 0
+        with self.allocator_lock:
+            blocks = list(self.block_data.values())
+        for data in blocks:
+            if data is None:
+                continue
+            stored += len(data)
+            if type(data) is Compressed:
+                compressed += 1
+                size += len(decompress(data))
+            else:
+                size += len(data)
+        return {"bytes": size, "stored_bytes": stored, "compressed_blocks": compressed, "blocks": len(blocks),
+                "ratio": size / stored if stored else 1.0}
+
+    # Método para obter as estatísticas da deduplicação
+    # "logical_blocks" conta os blocos de todos os arquivos e "physical_blocks" os blocos distintos que eles
+    # ocupam; "dedup_ratio" é a razão entre os dois e "bytes_saved" o espaço economizado pelo compartilhamento
+    def dedup_stats(self):
+        with self.allocator_lock:
+            logical = sum(entry.block_count() for entry in self.inodes.values() if not entry.is_directory)
+            saved = sum(count - 1 for count in self.refcounts.values())
+            shared = len(self.refcounts)
+        physical = logical - saved
+        return {
+            "logical_blocks": logical,
+            "physical_blocks": physical,
+            "shared_blocks": shared,
+            "dedup_ratio": logical / physical if physical else 1.0,
+            "bytes_saved": saved * self.block_size,
+        }
+
+    # Método para truncar (ou estender com zeros) um arquivo até o tamanho informado
+    def truncate_file(self, filename, size):
+        self._truncate_entry(self._file(filename), size)
+
+    # Método que faz o truncamento com a trava do arquivo e encerra a operação de metadados
+    def _truncate_entry(self, entry, size):
+        with entry.lock:
+            if entry.parent is None:
+                raise Exception("Arquivo não existe")
+            self._truncate(entry, size)
+            self._metadata_changed()
+
+    # Método que trunca um arquivo; quem chama deve ter a trava do arquivo
+    def _truncate(self, entry, size):
+        self._resize_file(entry, size)
+        # Descarta os bytes além do novo tamanho no último bloco
+        if size < entry.size and size % self.block_size:
+            last_block = None
+            for start, length in entry.iter_runs(size // self.block_size):
+                last_block = start
+                break
+            data = self.read_block(last_block)
+            if data and self.dedup:
+                self._store_shared(entry, size // self.block_size, last_block, bytes(data[:size % self.block_size]))
+            elif data:
+                self.write_block(last_block, bytes(data[:size % self.block_size]))
+        self._set_size(entry, size)
+        self._persist(entry)
 
     # Método para criar um novo arquivo no sistema de arquivos
+    # `filename` pode ser um caminho; caminhos relativos partem de `directory` (ou do diretório atual)
     def create_file(self, filename, content='', directory=None):
-        # Define o diretório atual se nenhum diretório for especificado
-        if directory is None:
-            directory = self.current_directory
-        # Verifica se o diretório especificado existe
-        if directory not in self.directories:
-            raise Exception("Diretório não existe")
-        # Verifica se o arquivo já existe
-        if filename in self.files:
+        parent, name = self._split(filename, directory)
+        self._create_file(parent, name, content)
+
+    # Método que cria um arquivo em um diretório e retorna o seu registro
+    # Com `exist_ok`, um arquivo já existente com o mesmo nome é retornado em vez de causar erro
+    def _create_file(self, parent, name, content='', exist_ok=False):
+        entry = FileEntry(name, parent.inode)
+        with parent.lock.writing():
+            # O diretório pode ter sido removido enquanto se esperava pela trava
+            if parent.parent is None:
+                raise Exception("Diretório não existe")
+            # Verifica se o arquivo já existe
+            if name in parent.entries:
+                existing = self.inodes[parent.entries[name]]
+                if exist_ok and not existing.is_directory:
+                    return existing
+                raise Exception("Arquivo já existe")
+            with entry.lock:
+                # Os blocos são alocados conforme o conteúdo
+                self._allocate_inode(entry)
+                try:
+                    if content:
+                        self._write(entry, content)
+                    else:
+                        self._persist(entry)
+                except Exception:
+                    self._discard_file(entry)
+                    self._metadata_changed()
+                    raise
+                # Adiciona o arquivo às entradas do diretório
+                parent.entries[name] = entry.inode
+                self._metadata_changed()
+        return entry
+
+    # Método que cria vários arquivos em um diretório com uma só aquisição da trava do diretório e uma só
+    # operação de metadados; `items` é uma lista de (nome, conteúdo). Retorna os registros criados
+    def _create_files(self, parent, items):
+        entries = []
+        with parent.lock.writing():
+            if parent.parent is None:
+                raise Exception("Diretório não existe")
+            try:
+                for name, content in items:
+                    if name in parent.entries:
+                        raise Exception("Arquivo já existe")
+                    entry = FileEntry(name, parent.inode)
+                    with entry.lock:
+                        self._allocate_inode(entry)
+                        try:
+                            if content:
+                                self._write(entry, content)
+                            else:
+                                self._persist(entry)
+                        except Exception:
+                            self._discard_file(entry)
+                            raise
+                        parent.entries[name] = entry.inode
+                    entries.append(entry)
+            finally:
+                self._metadata_changed()
+        return entries
+
+    # Método para abrir um arquivo e obter um objeto de arquivo (leitura/escrita em partes, seek e iteração)
+    # O modo segue o open() do Python: "r", "w", "a", "x" com "+" e "b"/"t" opcionais;
+    # caminhos relativos partem de `directory` (ou do diretório atual)
+    def open(self, filename, mode='r', directory=None, encoding='utf-8'):
+        readable, writable, truncate, create, append, binary = parse_mode(mode)
+        parent, name = self._split(filename, directory)
+        entry = self._resolve(name, parent)
+        if entry is None:
+            if not create:
+                raise Exception("Arquivo não existe")
+            entry = self._create_file(parent, name, exist_ok='x' not in mode)
+        elif entry.is_directory:
+            raise Exception("Arquivo não existe")
+        elif 'x' in mode:
             raise Exception("Arquivo já existe")
-        # Aloca um bloco para o novo arquivo
-        block = self.allocate_block()
-        # Adiciona o arquivo ao dicionário de arquivos com seu bloco e diretório associados
-        self.files[filename] = (block, directory)
-        # Adiciona o arquivo ao diretório especificado
-        self.directories[directory].add(filename)
-        # Escreve os dados no bloco se houver conteúdo especificado
-        if content:
-            self.write_block(block, content)
+        elif truncate:
+            self._truncate_entry(entry, 0)
+        raw = BlockFileIO(self, entry, readable, writable, append)
+        # O buffer cobre vários blocos para que cada leitura ou escrita percorra extensões inteiras
+        buffer_size = max(io.DEFAULT_BUFFER_SIZE, self.block_size * 16)
+        if readable and writable:
+            handle = io.BufferedRandom(raw, buffer_size)
+        elif writable:
+            handle = io.BufferedWriter(raw, buffer_size)
+        else:
+            handle = io.BufferedReader(raw, buffer_size)
+        if binary:
+            return handle
+        return io.TextIOWrapper(handle, encoding=encoding)
 
     # Método para visualizar o conteúdo de um arquivo
     def view_file(self, filename):
-        # Verifica se o arquivo existe
-        if filename not in self.files:
-            raise Exception("Arquivo não existe")
-        # Obtém o bloco associado ao arquivo e lê seus dados
-        block, _ = self.files[filename]
-        return self.read_block(block)
+        # Lê todas as extensões do arquivo e decodifica o conteúdo
+        return self.read_file(filename).decode('utf-8', errors='replace')
 
     # Método para editar o conteúdo de um arquivo
     def edit_file(self, filename, data):
-        # Verifica se o arquivo existe
-        if filename not in self.files:
-            raise Exception("Arquivo não existe")
-        # Obtém o bloco associado ao arquivo e escreve os novos dados
-        block, _ = self.files[filename]
-        self.write_block(block, data)
+        # Substitui o conteúdo, liberando ou alocando blocos conforme o novo tamanho
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        entry = self._file(filename)
+        with entry.lock:
+            if entry.parent is None:
+                raise Exception("Arquivo não existe")
+            self._truncate(entry, len(data))
+            self._write(entry, data)
+            self._metadata_changed()
 
     # Método para remover um arquivo do sistema de arquivos
     def remove_file(self, filename):
-        # Verifica se o arquivo existe
-        if filename not in self.files:
-            raise Exception("Arquivo não existe")
-        # Obtém o bloco associado ao arquivo e o libera
-        block, _ = self.files[filename]
-        self.free_block(block)
-        # Remove o arquivo dos registros de arquivos e do diretório
-        del self.files[filename]
-        self.directories[self.current_directory].remove(filename)
+        entry = self._file(filename)
+        while True:
+            # Trava o diretório que contém o arquivo e confirma que ele não foi movido nesse meio tempo
+            parent_number = entry.parent
+            parent = self.inodes.get(parent_number) if parent_number is not None else None
+            if parent is None:
+                raise Exception("Arquivo não existe")
+            with parent.lock.writing(), entry.lock:
+                if entry.parent != parent_number:
+                    continue
+                # Remove o arquivo do diretório e libera as extensões e o inode
+                del parent.entries[entry.name]
+                self._discard_file(entry)
+                self._metadata_changed()
+                return
+
+    # Método para mover um arquivo para outro diretório (mantendo o nome)
+    def move_file(self, filename, directory):
+        self._move(self._file(filename), self._directory(directory), None)
+
+    # Método para mover ou renomear um arquivo ou diretório; um diretório é movido com toda a subárvore
+    # em tempo constante, pois só a entrada no diretório pai e o ponteiro para o pai mudam.
+    # Se `destination` for um diretório existente, a entrada vai para dentro dele com o mesmo nome;
+    # caso contrário, `destination` é o novo caminho da entrada
+    def move(self, source, destination):
+        entry = self._resolve(source)
+        if entry is None:
+            raise Exception("Arquivo ou diretório não existe")
+        if entry is self.root:
+            raise Exception("Não é possível mover o diretório raiz")
+        target = self._resolve(destination)
+        if target is not None and target.is_directory:
+            self._move(entry, target, None)
+        else:
+            parent, name = self._split(destination)
+            self._move(entry, parent, name)
+
+    # Método que move uma entrada para o diretório `target` com o nome `name` (None mantém o nome)
+    # Movimentações de diretórios são serializadas por rename_lock, para que duas delas não formem um ciclo
+    def _move(self, entry, target, name):
+        if not entry.is_directory:
+            self._relink(entry, target, name)
+            return
+        with self.rename_lock:
+            # Um diretório não pode ser movido para dentro da própria subárvore
+            if self._contains(entry, target):
+                raise Exception("Não é possível mover um diretório para dentro dele mesmo")
+            self._relink(entry, target, name)
+
+    # Método que troca o diretório pai e o nome de uma entrada
+    # As travas dos dois diretórios são adquiridas em ordem de número de inode, o que evita deadlocks
+    # entre movimentações simultâneas em sentidos opostos
+    def _relink(self, entry, target, name):
+        while True:
+            source_number = entry.parent
+            source = self.inodes.get(source_number) if source_number is not None else None
+            if source is None:
+                raise Exception("Arquivo não existe")
+            new_name = entry.name if name is None else name
+            if source is target and new_name == entry.name:
+                return
+            with ExitStack() as locks:
+                for directory in sorted({source, target}, key=lambda directory_entry: directory_entry.inode):
+                    locks.enter_context(directory.lock.writing())
+                if not entry.is_directory:
+                    locks.enter_context(entry.lock)
+                # Outra thread moveu a entrada antes de as travas serem adquiridas: tenta de novo
+                if entry.parent != source_number:
+                    continue
+                if target.parent is None:
+                    raise Exception("Diretório não existe")
+                if new_name in target.entries:
+                    raise Exception("Arquivo já existe")
+                if source is target:
+                    # Renomear no mesmo diretório mantém a posição da entrada (e o número de sequência), para
+                    # que a listagem paginada não mude de ordem
+                    old_name = entry.name
+                    source.entries = {new_name if key == old_name else key: number
+                                      for key, number in source.entries.items()}
+                else:
+                    del source.entries[entry.name]
+                    target.entries[new_name] = entry.inode
+                    entry.sequence = next(self.sequence)
+                entry.name = new_name
+                entry.parent = target.inode
+                self._persist(entry)
+                self._metadata_changed()
+                return
+
+    # Método para verificar se `entry` é `ancestor` ou está dentro da subárvore dele (pelos ponteiros para o pai)
+    def _contains(self, ancestor, entry):
+        while entry is not None:
+            if entry is ancestor:
+                return True
+            if entry.inode == 0 or entry.parent is None:
+                return False
+            entry = self.inodes.get(entry.parent)
+        return False
+
+    # Método para liberar os blocos e o inode de um arquivo; quem chama deve ter a trava do arquivo
+    def _discard_file(self, entry):
+        self._free_extents(entry.extents + [(block, 1) for block in entry.indirect_blocks])
+        entry.extents = []
+        entry.indirect_blocks = []
+        self._release_inode(entry)
+        entry.parent = None
 
     # Método para remover um diretório do sistema de arquivos
     def remove_directory(self, directory):
-        # Verifica se o diretório existe
-        if directory not in self.directories:
-            raise Exception("Diretório não existe")
-        # Não permite a remoção do diretório raiz
-        if directory == '/':
+        entry = self._directory(directory)
+        # Não permite a remoção do diretório raiz nem do diretório atual
+        if entry is self.root:
             raise Exception("Não é possível remover o diretório raiz")
-        # Verifica se o diretório está vazio
-        if self.list_directory(directory):
-            raise Exception("Diretório não está vazio")
-        # Remove o diretório dos registros de diretórios e do diretório atual
-        del self.directories[directory]
-        self.directories[self.current_directory].remove(directory)
-
-    # Método para criar um novo diretório no sistema de arquivos
+        if entry.inode == self.current_inode:
+            raise Exception("Não é possível remover o diretório atual")
+        parent = self.inodes.get(entry.parent)
+        if parent is None:
+            raise Exception("Diretório não existe")
+        first, second = sorted((parent, entry), key=lambda directory_entry: directory_entry.inode)
+        with first.lock.writing(), second.lock.writing():
+            if entry.parent != parent.inode:
+                raise Exception("Diretório não existe")
+            # Verifica se o diretório está vazio
+            if entry.entries:
+                raise Exception("Diretório não está vazio")
+            # Remove o diretório das entradas do pai e libera o seu inode
+            del parent.entries[entry.name]
+            self._release_inode(entry)
+            entry.parent = None
+            self._metadata_changed()
+
+    # Método para criar um novo diretório (o caminho pode ser relativo ao diretório atual)
     def create_directory(self, directory):
-        # Verifica se o diretório já existe
-        if directory in self.directories:
-            raise Exception("Diretório já existe")
-        # Verifica se o diretório atual existe
-        if self.current_directory not in self.directories:
-            raise Exception("Diretório atual não existe")
-        # Adiciona o novo diretório aos registros de diretórios
-        self.directories[directory] = set()
-        self.directories[self.current_directory].add(directory)
-
-    # Método para listar os arquivos e diretórios de um diretório específico
-    def list_directory(self, directory=None):
-        # Define o diretório atual se nenhum diretório for especificado
+        parent, name = self._split(directory)
+        self._create_directory(parent, name)
+
+    # Método que cria um diretório dentro de outro e retorna o seu registro
+    def _create_directory(self, parent, name, attributes=None):
+        entry = DirectoryEntry(name, parent.inode)
+        if attributes:
+            entry.attributes = dict(attributes)
+        with parent.lock.writing():
+            if parent.parent is None:
+                raise Exception("Diretório não existe")
+            # Verifica se o diretório já existe
+            if name in parent.entries:
+                raise Exception("Diretório já existe")
+            # Adiciona o novo diretório às entradas do pai
+            self._allocate_inode(entry)
+            self._persist(entry)
+            parent.entries[name] = entry.inode
+            self._metadata_changed()
+        return entry
+
+    # Método para devolver ao alocador uma lista de extensões (start, length)
+    # As extensões são ordenadas e as vizinhas são unidas, então cada sequência livre resultante é
+    # liberada com uma só chamada. Retorna a quantidade de blocos liberados e esvazia a lista
+    def _free_extents(self, extents):
+        if not extents:
+            return 0
+        extents.sort()
+        total = 0
+        with self.allocator_lock:
+            run_start, run_length = extents[0]
+            for start, length in extents[1:]:
+                if start == run_start + run_length:
+                    run_length += length
+                    continue
+                self.free_extent(run_start, run_length)
+                total += run_length
+                run_start, run_length = start, length
+            self.free_extent(run_start, run_length)
+            total += run_length
+        extents.clear()
+        return total
+
+    # Método para lançar OperationCancelled se o cancelamento foi pedido
+    def _check_cancel(self, cancel, totals):
+        if cancel is not None and cancel.is_set():
+            raise OperationCancelled(dict(totals))
+
+    # Método para remover um diretório com toda a sua subárvore
+    # A subárvore é percorrida uma única vez. Os blocos dos arquivos são devolvidos ao alocador em lotes
+    # ordenados, em que as extensões vizinhas formam sequências livres. `progress(entradas, blocos)` é
+    # chamada a cada lote; `cancel` (por exemplo, um threading.Event) interrompe a remoção entre lotes com
+    # OperationCancelled, e o que ainda não foi removido continua intacto.
+    # Retorna {"entries": entradas removidas, "blocks": blocos liberados}
+    def rmtree(self, directory, progress=None, cancel=None):
+        top = self._directory(directory)
+        if top is self.root:
+            raise Exception("Não é possível remover o diretório raiz")
+        if self._contains(top, self.inodes.get(self.current_inode)):
+            raise Exception("Não é possível remover o diretório atual")
+        totals = {"entries": 0, "blocks": 0}
+        extents = []
+
+        # Libera os blocos acumulados, encerra a operação de metadados e informa o progresso
+        def flush():
+            totals["blocks"] += self._free_extents(extents)
+            self._metadata_changed()
+            if progress is not None:
+                progress(totals["entries"], totals["blocks"])
+
+        # Percurso em pós-ordem: os arquivos de um diretório são removidos na primeira visita,
+        # e o diretório (já vazio) depois de todos os seus subdiretórios
+        stack = [(top, False)]
+        try:
+            while stack:
+                self._check_cancel(cancel, totals)
+                directory_entry, visited = stack.pop()
+                if visited:
+                    removed = self._remove_empty_directory(top, directory_entry)
+                    if removed is None:
+                        # Entradas criadas durante a remoção: percorre o diretório de novo
+                        stack.append((directory_entry, False))
+                    totals["entries"] += removed or 0
+                    continue
+                stack.append((directory_entry, True))
+                with directory_entry.lock.reading():
+                    children = [self.inodes[number] for number in directory_entry.entries.values()]
+                files = []
+                for child in children:
+                    if child.is_directory:
+                        stack.append((child, False))
+                    else:
+                        files.append(child)
+                for index in range(0, len(files), BULK_BATCH):
+                    self._check_cancel(cancel, totals)
+                    totals["entries"] += self._unlink_files(directory_entry, files[index:index + BULK_BATCH], extents)
+                    if len(extents) >= BULK_BATCH:
+                        flush()
+        finally:
+            # Mesmo se cancelada, a operação devolve os blocos dos arquivos já desligados
+            flush()
+        return totals
+
+    # Método que desliga um lote de arquivos de um diretório e acumula as suas extensões em `extents`
+    # Retorna a quantidade de arquivos removidos (os que foram movidos para fora do diretório são ignorados)
+    def _unlink_files(self, directory, files, extents):
+        count = 0
+        with directory.lock.writing():
+            for entry in files:
+                with entry.lock:
+                    if entry.parent != directory.inode:
+                        continue
+                    del directory.entries[entry.name]
+                    extents.extend(entry.extents)
+                    extents.extend((block, 1) for block in entry.indirect_blocks)
+                    entry.extents = []
+                    entry.indirect_blocks = []
+                    self._release_inode(entry)
+                    entry.parent = None
+                    count += 1
+        return count
+
+    # Método que remove um diretório vazio durante o rmtree de `top`
+    # Retorna 1 se removeu, 0 se o diretório já não pertence à subárvore e None se ele não está vazio
+    def _remove_empty_directory(self, top, entry):
+        with self.rename_lock:
+            if entry.parent is None or not self._contains(top, entry):
+                return 0
+            parent = self.inodes[entry.parent]
+            first, second = sorted((parent, entry), key=lambda directory_entry: directory_entry.inode)
+            with first.lock.writing(), second.lock.writing():
+                if entry.entries:
+                    return None
+                del parent.entries[entry.name]
+                self._release_inode(entry)
+                entry.parent = None
+        return 1
+
+    # Método para copiar um diretório com toda a sua subárvore para um novo caminho
+    # Cada bloco é copiado diretamente para o bloco correspondente da cópia (sem montar o arquivo inteiro
+    # em memória). `progress` e `cancel` funcionam como no rmtree; uma cópia cancelada fica parcial.
+    # Retorna {"entries": entradas copiadas, "blocks": blocos copiados}
+    def copytree(self, source, destination, progress=None, cancel=None):
+        original = self._directory(source)
+        parent, name = self._split(destination)
+        if self._contains(original, parent):
+            raise Exception("Não é possível copiar um diretório para dentro dele mesmo")
+        stack = [(original, self._create_directory(parent, name, original.attributes))]
+        totals = {"entries": 1, "blocks": 0}
+        while stack:
+            self._check_cancel(cancel, totals)
+            directory_entry, copy = stack.pop()
+            with directory_entry.lock.reading():
+                children = [self.inodes[number] for number in directory_entry.entries.values()]
+            for child in children:
+                if child.is_directory:
+                    stack.append((child, self._create_directory(copy, child.name, child.attributes)))
+                else:
+                    totals["blocks"] += self._copy_file(child, self._create_file(copy, child.name))
+                totals["entries"] += 1
+                if totals["entries"] % BULK_BATCH == 0:
+                    self._check_cancel(cancel, totals)
+                    if progress is not None:
+                        progress(totals["entries"], totals["blocks"])
+        if progress is not None:
+            progress(totals["entries"], totals["blocks"])
+        return totals
+
+    # Método que copia o conteúdo e os atributos de um arquivo para outro (vazio)
+    # Retorna a quantidade de blocos copiados
+    def _copy_file(self, source, target):
+        first, second = sorted((source, target), key=lambda entry: entry.inode)
+        with first.lock, second.lock:
+            if source.parent is None:
+                return 0
+            for attribute, value in source.attributes.items():
+                self._set_indexed(target, attribute, value)
+            if self.dedup:
+                # Com deduplicação, a cópia só compartilha os blocos do original
+                with self.allocator_lock:
+                    for block in source.iter_blocks():
+                        self.refcounts[block] = self.refcounts.get(block, 1) + 1
+                    target.extents = list(source.extents)
+                self._set_size(target, source.size)
+                self._persist(target)
+                self._metadata_changed()
+                return source.block_count()
+            self._resize_file(target, source.size)
+            self._set_size(target, source.size)
+            copied = 0
+            for block, target_block in zip(source.iter_blocks(), target.iter_blocks()):
+                data = self.read_block(block)
+                if data is not None:
+                    self.write_block(target_block, data)
+                copied += 1
+            self._persist(target)
+            self._metadata_changed()
+        return copied
+
+    # Método para importar uma árvore do computador como o novo diretório `new_name` dentro de `destination`
+    # (que já deve existir), como no sistema i-node: o conteúdo de um diretório ou de um arquivo .tar (também
+    # comprimido com gzip, bz2 ou xz) é criado nesse diretório. Sem `new_name`, usa o nome da origem (sem a
+    # extensão do .tar). O conteúdo dos arquivos é lido em pedaços de TRANSFER_CHUNK por `workers` threads, e
+    # os arquivos pequenos de cada diretório são criados em lotes; um .tar é lido em sequência, como um fluxo.
+    # `progress(arquivos, bytes)` é chamada a cada lote e `cancel` interrompe a importação com
+    # OperationCancelled, como no copytree; uma importação cancelada fica parcial.
+    # Retorna {"files", "directories", "bytes", "seconds", "files_per_second", "mb_per_second"}
+    def import_tree(self, source, destination='/', new_name=None, workers=TRANSFER_WORKERS, progress=None,
+                    cancel=None):
+        parent = self._directory(destination)
+        if new_name is None:
+            new_name = os.path.basename(os.path.normpath(source))
+            for suffix in TAR_MODES:
+                if new_name.endswith(suffix):
+                    new_name = new_name[:-len(suffix)]
+                    break
+        if not new_name or '/' in new_name:
+            raise Exception("Nome inválido")
+        if not os.path.exists(source):
+            raise Exception("Origem não existe")
+        import tarfile
+        is_directory = os.path.isdir(source)
+        if not is_directory and not tarfile.is_tarfile(source):
+            raise Exception("A origem não é um diretório nem um arquivo .tar")
+        target = self._create_directory(parent, new_name)
+        transfer = _Transfer(progress, cancel)
+        if is_directory:
+            self._run_tasks(self._import_directory_tasks(source, target, transfer), workers)
+        else:
+            self._import_tar(source, target, transfer)
+        return transfer.finish()
+
+    # Método que percorre um diretório do computador criando os diretórios e gera as tarefas que importam
+    # os arquivos, como tuplas (função, argumentos)
+    def _import_directory_tasks(self, source, target, transfer):
+        stack = [(source, target)]
+        while stack:
+            host_directory, directory = stack.pop()
+            batch = []
+            with os.scandir(host_directory) as items:
+                for item in items:
+                    transfer.check()
+                    if item.is_dir(follow_symlinks=False):
+                        stack.append((item.path, self._create_directory(directory, item.name)))
+                        transfer.add(directories=1)
+                    elif item.is_file(follow_symlinks=False):
+                        batch.append((item.name, item.path))
+                        if len(batch) == TRANSFER_BATCH:
+                            yield self._import_files, (directory, batch, transfer)
+                            batch = []
+            if batch:
+                yield self._import_files, (directory, batch, transfer)
+
+    # Método que importa um lote de arquivos do computador para um diretório (executado pelas threads)
+    # Os arquivos de até TRANSFER_CHUNK bytes são criados juntos; os maiores são gravados em pedaços
+    def _import_files(self, directory, files, transfer):
+        if transfer.cancelled():
+            return
+        small = []
+        for name, path in files:
+            with open(path, 'rb') as host_file:
+                data = host_file.read(TRANSFER_CHUNK)
+                if len(data) < TRANSFER_CHUNK:
+                    small.append((name, data))
+                    continue
+                entry = self._create_file(directory, name)
+                size = self._write_chunks(entry, data, host_file)
+            transfer.add(files=1, size=size)
+        self._create_files(directory, small)
+        transfer.add(files=len(small), size=sum(len(data) for _, data in small))
+
+    # Método que grava em um arquivo o primeiro pedaço `data` e o resto do arquivo aberto `reader`, em
+    # pedaços de TRANSFER_CHUNK; retorna a quantidade de bytes gravados
+    def _write_chunks(self, entry, data, reader):
+        size = 0
+        while data:
+            self._write_entry(entry, data, None)
+            size += len(data)
+            data = reader.read(TRANSFER_CHUNK)
+        return size
+
+    # Método que importa um arquivo .tar em sequência; os arquivos pequenos seguidos de um mesmo
+    # diretório são criados em lotes. Ligações, arquivos especiais e caminhos com ".." do .tar são ignorados
+    def _import_tar(self, source, target, transfer):
+        import tarfile
+        directories = {(): target}
+        batch = []
+        batch_directory = None
+
+        # Cria os arquivos pequenos acumulados
+        def flush():
+            if batch:
+                self._create_files(batch_directory, batch)
+                transfer.add(files=len(batch), size=sum(len(data) for _, data in batch))
+                batch.clear()
+
+        with tarfile.open(source, 'r|*') as archive:
+            for member in archive:
+                transfer.check()
+                parts = tuple(part for part in member.name.split('/') if part not in ('', '.'))
+                if '..' in parts:
+                    continue
+                if member.isdir():
+                    self._tar_directory(directories, parts, transfer)
+                elif member.isfile() and parts:
+                    directory = self._tar_directory(directories, parts[:-1], transfer)
+                    if directory is not batch_directory or len(batch) == TRANSFER_BATCH:
+                        flush()
+                        batch_directory = directory
+                    reader = archive.extractfile(member)
+                    data = reader.read(TRANSFER_CHUNK)
+                    if len(data) < TRANSFER_CHUNK:
+                        batch.append((parts[-1], data))
+                        continue
+                    size = self._write_chunks(self._create_file(directory, parts[-1]), data, reader)
+                    transfer.add(files=1, size=size)
+            flush()
+
+    # Método que obtém (criando, se preciso) o diretório de um caminho do .tar, dado como tupla de nomes
+    def _tar_directory(self, directories, parts, transfer):
+        directory = directories.get(parts)
         if directory is None:
-            directory = self.current_directory
-        # Verifica se o diretório especificado existe
-        if directory not in self.directories:
-            raise Exception("Diretório não existe")
-        # Retorna uma lista dos arquivos e diretórios no diretório especificado
-        return list(self.directories[directory])
+            parent = self._tar_directory(directories, parts[:-1], transfer)
+            directory = directories[parts] = self._create_directory(parent, parts[-1])
+            transfer.add(directories=1)
+        return directory
+
+    # Método para exportar um diretório para o computador: se `destination` termina em .tar (ou .tar.gz,
+    # .tgz, .tar.bz2 ou .tar.xz), a subárvore é gravada nesse arquivo, em sequência; senão, ela é criada
+    # dentro do diretório `destination` (criado se não existir), com o conteúdo copiado em pedaços por
+    # `workers` threads. `progress` e `cancel` funcionam como no import_tree, e o retorno é o mesmo
+    def export_tree(self, source, destination, workers=TRANSFER_WORKERS, progress=None, cancel=None):
+        top = self._directory(source)
+        transfer = _Transfer(progress, cancel)
+        mode = next((mode for suffix, mode in TAR_MODES.items() if destination.endswith(suffix)), None)
+        if mode is not None:
+            self._export_tar(top, destination, mode, transfer)
+        else:
+            os.makedirs(destination, exist_ok=True)
+            self._run_tasks(self._export_directory_tasks(top, destination, transfer), workers)
+        return transfer.finish()
+
+    # Método que percorre uma subárvore em pré-ordem, gerando (caminho relativo, registro) para cada
+    # diretório e arquivo abaixo de `top`
+    def _walk_tree(self, top):
+        stack = [('', top)]
+        while stack:
+            path, directory = stack.pop()
+            with directory.lock.reading():
+                children = [self.inodes[number] for number in directory.entries.values()]
+            for child in children:
+                child_path = f"{path}/{child.name}" if path else child.name
+                yield child_path, child
+                if child.is_directory:
+                    stack.append((child_path, child))
+
+    # Método que cria os diretórios da exportação e gera as tarefas que copiam os arquivos
+    def _export_directory_tasks(self, top, destination, transfer):
+        batch = []
+        for path, entry in self._walk_tree(top):
+            transfer.check()
+            host_path = os.path.join(destination, *path.split('/'))
+            if entry.is_directory:
+                os.makedirs(host_path, exist_ok=True)
+                transfer.add(directories=1)
+                continue
+            batch.append((entry, host_path))
+            if len(batch) == TRANSFER_BATCH:
+                yield self._export_files, (batch, transfer)
+                batch = []
+        if batch:
+            yield self._export_files, (batch, transfer)
+
+    # Método que copia um lote de arquivos para o computador, em pedaços (executado pelas threads)
+    def _export_files(self, files, transfer):
+        for entry, host_path in files:
+            if transfer.cancelled():
+                return
+            size = 0
+            with open(host_path, 'wb') as host_file:
+                while True:
+                    data = self._read_entry(entry, size, TRANSFER_CHUNK)
+                    if not data:
+                        break
+                    host_file.write(data)
+                    size += len(data)
+            transfer.add(files=1, size=size)
+
+    # Método que grava uma subárvore em um arquivo .tar, lendo cada arquivo em pedaços
+    def _export_tar(self, top, destination, mode, transfer):
+        import tarfile
+        with tarfile.open(destination, mode) as archive:
+            for path, entry in self._walk_tree(top):
+                transfer.check()
+                info = tarfile.TarInfo(path)
+                info.mtime = time.time()
+                if entry.is_directory:
+                    info.type = tarfile.DIRTYPE
+                    info.mode = 0o755
+                    archive.addfile(info)
+                    transfer.add(directories=1)
+                    continue
+                info.size = entry.size
+                reader = io.BufferedReader(BlockFileIO(self, entry, True, False), TRANSFER_CHUNK)
+                archive.addfile(info, reader)
+                transfer.add(files=1, size=info.size)
+
+    # Método que executa as tarefas (função, argumentos) de uma transferência em `workers` threads, com no
+    # máximo TRANSFER_PENDING tarefas na fila por thread. Se uma tarefa falhar ou a transferência for
+    # cancelada, as tarefas que ainda estão na fila são descartadas e o erro é propagado
+    def _run_tasks(self, tasks, workers):
+        # Importado só aqui, como na leitura antecipada: concurrent.futures é uma importação cara
+        from concurrent.futures import ThreadPoolExecutor
+        pending = deque()
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="transferencia") as pool:
+            try:
+                for function, arguments in tasks:
+                    pending.append(pool.submit(function, *arguments))
+                    while len(pending) > workers * TRANSFER_PENDING:
+                        pending.popleft().result()
+                while pending:
+                    pending.popleft().result()
+            except BaseException:
+                for future in pending:
+                    future.cancel()
+                raise
+
+    # Método para listar os nomes dos arquivos e diretórios de um diretório (o atual, sem caminho)
+    def list_directory(self, directory=None):
+        entry = self._directory(directory)
+        with entry.lock.reading():
+            return list(entry.entries)
+
+    # Método para listar as entradas de um diretório como tuplas (nome, é diretório)
+    def list_entries(self, directory=None):
+        entry = self._directory(directory)
+        with entry.lock.reading():
+            items = list(entry.entries.items())
+        inodes = self.inodes
+        return [(name, inodes[number].is_directory) for name, number in items if number in inodes]
+
+    # Método para listar uma página das entradas de um diretório como tuplas (nome, é diretório): até
+    # `limit` entradas a partir da posição `start`, na ordem de criação. Novas entradas entram no fim,
+    # então a página seguinte começa em `start` mais a quantidade de entradas recebidas
+    def iterdir(self, directory=None, start=0, limit=None):
+        entry = self._directory(directory)
+        with entry.lock.reading():
+            items = list(islice(entry.entries.items(), start, None if limit is None else start + limit))
+        inodes = self.inodes
+        return [(name, inodes[number].is_directory) for name, number in items if number in inodes]
 
     # Método para navegar para um diretório específico
     def navigate(self, directory):
         # Verifica se o diretório existe
-        if directory not in self.directories:
-            raise Exception("Diretório não existe")
+        entry = self._directory(directory)
         # Não permite navegar de volta para o diretório raiz se já estiver no diretório raiz
-        if directory == '/' and self.current_directory != '/':
+        if entry is self.root and self.current_inode != 0:
             raise Exception("Não é possível navegar de volta para o diretório raiz")
         # Define o diretório atual como o diretório especificado
-        self.current_directory = directory
+        self.current_inode = entry.inode
 
-    # Método para navegar de volta para o diretório pai
+    # Método para navegar de volta para o diretório pai (pelo ponteiro para o pai)
     def navigate_back(self):
-        # Retorna se o diretório atual já é o diretório raiz
-        if self.current_directory == '/':
-            return
-        # Obtém o diretório pai do diretório atual
-        parent_directory = '/'.join(self.current_directory.split('/')[:-1])
-        # Define o diretório pai como o diretório atual
-        if parent_directory == '':
-            parent_directory = '/'
-        self.current_directory = parent_directory
+        current = self.inodes.get(self.current_inode)
+        self.current_inode = current.parent if current is not None and current.parent is not None else 0
 
     # Método para obter uma representação em bitmap dos blocos alocados no sistema de arquivos
     def get_allocated_blocks_bitmap(self):
-        # Cria uma lista de bits representando os blocos alocados ou livres
-        bitmap = ['1' if i in self.allocated_blocks else '0' for i in range(self.total_blocks)]
+        # Converte cada byte do mapa de bits de uma vez usando a tabela pré-calculada
+        full_bytes = self.total_blocks // 8
+        with self.allocator_lock:
+            parts = [_BYTE_BITS[byte] for byte in self.bitmap.bits[:full_bytes]]
+        # Acrescenta os bits do último byte incompleto
+        parts.extend('1' if self.bitmap.test(i) else '0' for i in range(full_bytes * 8, self.total_blocks))
         # Retorna a representação em bitmap como uma string
-        return ' '.join(bitmap)
+        return ' '.join(parts)
+
+    # Método para obter o mapa de bits compacto (um bit por bloco) sem cópia
+    def get_allocated_blocks_view(self):
+        return memoryview(self.bitmap.bits)[:(self.total_blocks + 7) // 8]
+
+    # Método para obter o mapa de blocos resumido: divide os blocos de `start` a `end - 1` em `buckets`
+    # faixas e retorna uma lista de (blocos na faixa, blocos ocupados). Usa as contagens por grupo de
+    # blocos mantidas a cada alocação e liberação, então o custo depende de `buckets`, não do volume
+    def get_block_map(self, buckets, start=0, end=None):
+        with self.allocator_lock:
+            return self.bitmap.occupancy(buckets, start, end)
+
+    # Método para obter um relatório de fragmentação do espaço livre e dos arquivos
+    # "free_run_histogram" agrupa as sequências livres por potência de 2 (chave 4 = de 4 a 7 blocos),
+    # "extents_per_file" conta os arquivos por quantidade de extensões e "most_fragmented" lista os
+    # `top` arquivos com mais extensões como (caminho, extensões)
+    def fragmentation_report(self, top=10):
+        with self.allocator_lock:
+            runs = [length for _, length in self.bitmap.iter_clear_runs()]
+            files = [entry for entry in self.inodes.values() if not entry.is_directory]
+        histogram = {}
+        for length in runs:
+            bucket = 1 << (length.bit_length() - 1)
+            histogram[bucket] = histogram.get(bucket, 0) + 1
+        extents_per_file = {}
+        for entry in files:
+            count = len(entry.extents)
+            extents_per_file[count] = extents_per_file.get(count, 0) + 1
+        most_fragmented = []
+        for entry in sorted(files, key=lambda entry: len(entry.extents), reverse=True)[:top]:
+            if len(entry.extents) < 2:
+                break
+            try:
+                most_fragmented.append((self.path_of(entry), len(entry.extents)))
+            except Exception:
+                continue  # Arquivo removido durante o relatório
+        free_blocks = sum(runs)
+        largest = max(runs, default=0)
+        return {
+            "free_blocks": free_blocks,
+            "free_runs": len(runs),
+            "largest_free_run": largest,
+            "free_run_histogram": dict(sorted(histogram.items())),
+            # 0 quando todo o espaço livre é uma única sequência; perto de 1 quando está todo espalhado
+            "free_space_fragmentation": 1 - largest / free_blocks if free_blocks else 0.0,
+            "files": len(files),
+            "fragmented_files": sum(count for extents, count in extents_per_file.items() if extents > 1),
+            "extents_per_file": dict(sorted(extents_per_file.items())),
+            "average_extents": sum(len(entry.extents) for entry in files) / len(files) if files else 0.0,
+            "most_fragmented": most_fragmented,
+        }
+
+    # Método para desfragmentar os arquivos enquanto o sistema de arquivos continua em uso
+    # Cada arquivo com mais de uma extensão é copiado, em lotes de até `batch` blocos, para uma sequência
+    # livre do tamanho do arquivo (a primeira a partir do início do disco); depois de cada lote o arquivo
+    # passa a usar os blocos novos e os antigos são liberados, então ele fica consistente entre os lotes.
+    # `rate` limita a vazão da cópia em blocos por segundo (None para não limitar); entre os lotes a
+    # desfragmentação sempre cede a vez às outras threads. `progress(arquivos, blocos)` é chamada depois
+    # de cada arquivo e `cancel` interrompe entre os lotes com OperationCancelled, como no rmtree.
+    # Arquivos com blocos compartilhados pela deduplicação não são movidos, para não desfazer o compartilhamento.
+    # Retorna {"files": arquivos desfragmentados, "blocks": blocos movidos, "skipped": arquivos sem
+    # espaço contíguo suficiente ou com blocos compartilhados}
+    def defragment(self, batch=DEFRAG_BATCH, rate=None, progress=None, cancel=None):
+        with self.allocator_lock:
+            candidates = [entry for entry in self.inodes.values()
+                          if not entry.is_directory and len(entry.extents) > 1]
+        candidates.sort(key=lambda entry: entry.inode)
+        totals = {"files": 0, "blocks": 0, "skipped": 0}
+        started = time.perf_counter()
+        for entry in candidates:
+            self._check_cancel(cancel, totals)
+            moved = self._relocate_file(entry, batch, rate, started, totals, cancel)
+            if moved is None:
+                totals["skipped"] += 1
+                continue
+            if moved:
+                totals["files"] += 1
+            if progress is not None:
+                progress(totals["files"], totals["blocks"])
+        return totals
+
+    # Método que move um arquivo para uma única extensão, um lote por vez
+    # Retorna os blocos movidos, ou None se o arquivo não pode ser movido
+    def _relocate_file(self, entry, batch, rate, started, totals, cancel):
+        with entry.lock:
+            if entry.parent is None or len(entry.extents) < 2:
+                return 0
+            total = entry.block_count()
+            with self.allocator_lock:
+                if self.refcounts and any(self._blocks_in(self.refcounts, start, length)
+                                          for start, length in entry.extents):
+                    return None
+                target = self.bitmap.find_clear_run(total)
+                if target is None:
+                    return None
+                # Reserva a sequência inteira, para que outras alocações não a ocupem entre os lotes
+                self.bitmap.set_range(target, total)
+        moved = 0
+        try:
+            while True:
+                self._throttle(rate, started, totals["blocks"])
+                self._check_cancel(cancel, totals)
+                with entry.lock:
+                    # O arquivo pode ter sido removido, truncado ou crescido entre os lotes
+                    if entry.parent is None or (moved and entry.extents[:1] != [(target, moved)]):
+                        break
+                    limit = min(total, entry.block_count())
+                    if moved >= limit:
+                        break
+                    count = min(batch, limit - moved)
+                    self._move_blocks(entry, moved, count, target)
+                moved += count
+                totals["blocks"] += count
+        finally:
+            # Devolve a parte da reserva que o arquivo não chegou a usar (os blocos já movidos são do arquivo)
+            if moved < total:
+                self.free_extent(target + moved, total - moved)
+            self._metadata_changed()
+        return moved
+
+    # Método que copia os blocos lógicos de `first` a `first + count - 1` de um arquivo para a sequência
+    # que começa em `target` e troca as extensões do arquivo; quem chama deve ter a trava do arquivo
+    # A primeira extensão do arquivo já é a parte movida, (target, first), quando first > 0
+    def _move_blocks(self, entry, first, count, target):
+        runs = []
+        remaining = count
+        for start, length in entry.iter_runs(first):
+            runs.append((start, min(length, remaining)))
+            remaining -= runs[-1][1]
+            if remaining == 0:
+                break
+        data = b''.join(self._read_run(start, length) for start, length in runs)
+        if self.block_codecs:
+            # Os blocos de destino recebem o codec dos blocos de origem antes da escrita (que comprime com
+            # ele), porque a liberação da origem descarta os codecs registrados para ela
+            with self.allocator_lock:
+                moved = target + first
+                for block in (block for start, length in runs for block in range(start, start + length)):
+                    if block in self.block_codecs:
+                        self.block_codecs[moved] = self.block_codecs[block]
+                    moved += 1
+        self._write_run(target + first, data)
+        # As extensões passam a ser a parte movida seguida do restante das extensões antigas
+        rest = []
+        skipped = 0
+        for start, length in entry.extents:
+            if skipped + length <= first + count:
+                skipped += length
+                continue
+            offset = max(0, first + count - skipped)
+            rest.append((start + offset, length - offset))
+            skipped += length
+        entry.extents = [(target, first + count)] + rest
+        with self.allocator_lock:
+            # Com deduplicação, os resumos dos blocos não compartilhados acompanham os blocos movidos
+            hashes = []
+            if self.hash_of:
+                moved = target + first
+                for block in (block for start, length in runs for block in range(start, start + length)):
+                    if block in self.hash_of and block not in self.refcounts:
+                        hashes.append((moved, self.hash_of[block]))
+                    moved += 1
+            self._free_extents(runs)
+            for block, digest in hashes:
+                self.hash_of[block] = digest
+                self.block_hashes.setdefault(digest, block)
+        self._persist(entry)
+        self._metadata_changed()
+
+    # Método que espera o necessário para manter a vazão da desfragmentação abaixo de `rate` blocos por
+    # segundo; sem limite, apenas cede a vez às outras threads
+    def _throttle(self, rate, started, blocks):
+        delay = 0
+        if rate is not None:
+            delay = max(0, blocks / rate - (time.perf_counter() - started))
+        time.sleep(delay)
 
 
     def set_attribute(self, path, attribute, value):
-        if path not in self.files and path not in self.directories:
+        # "size" é o tamanho do arquivo, que só muda com escritas e truncamentos (ver _indexed_value)
+        if attribute == "size":
+            raise Exception("O atributo 'size' não pode ser alterado")
+        entry = self._resolve(path)
+        if entry is None:
             raise Exception("Caminho não encontrado")
-        if path not in self.attributes:
-            self.attributes[path] = {}
-        self.attributes[path][attribute] = value
+        # Grava os atributos no inode correspondente
+        with entry.lock.writing() if entry.is_directory else entry.lock:
+            self._set_indexed(entry, attribute, value)
+            self._persist(entry)
+        self._metadata_changed()
         return f"Atributo '{attribute}' definido para '{path}' com valor '{value}'"
 
     def get_attribute(self, path, attribute):
-        if path in self.attributes and attribute in self.attributes[path]:
-            return self.attributes[path][attribute]
-        return None
-
-# Classe para uma interface gráfica de usuário para o sistema de arquivos
-class FileSystemGUI:
-    # Método de inicialização da classe FileSystemGUI
-    def __init__(self, master):
-        # Define a janela principal da interface gráfica
-        self.master = master
-        self.master.title("Sistema de Arquivos GUI")
-        # Cria uma instância do sistema de arquivos com 100 blocos
-        self.file_system = FileSystem(100)
-        # Define o diretório atual como o diretório raiz
-        self.current_directory = '/'
-        # Cria um rótulo para exibir o diretório atual
-        self.current_path_label = tk.Label(master, text="Diretório Atual: " + self.current_directory)
-        self.current_path_label.pack()
-        # Cria uma caixa de listagem para exibir os diretórios
-        self.directory_listbox = tk.Listbox(master, height=10, width=50)
-        self.directory_listbox.pack()
-        # Cria uma caixa de listagem para exibir os arquivos no diretório atual
-        self.file_listbox = tk.Listbox(master, height=10, width=50)
-        self.file_listbox.pack()
-        # Cria botões para navegar, criar diretório, criar arquivo, visualizar arquivo, editar arquivo, remover arquivo,
-        # remover diretório e visualizar blocos alocados
-        self.navigate_button = tk.Button(master, text="Abrir Diretório", command=self.open_directory)
-        self.navigate_button.pack()
-        self.navigate_back_button = tk.Button(master, text="Voltar", command=self.go_back)
-        self.navigate_back_button.pack()
-        self.create_directory_button = tk.Button(master, text="Criar Diretório", command=self.create_directory)
-        self.create_directory_button.pack()
-        self.create_file_button = tk.Button(master, text="Criar Arquivo", command=self.create_file)
-        self.create_file_button.pack()
-        self.view_file_button = tk.Button(master, text="Visualizar Arquivo", command=self.view_file)
-        self.view_file_button.pack()
-        self.edit_file_button = tk.Button(master, text="Editar Arquivo", command=self.edit_file)
-        self.edit_file_button.pack()
-        self.remove_file_button = tk.Button(master, text="Remover Arquivo", command=self.remove_file)
-        self.remove_file_button.pack()
-        self.remove_directory_button = tk.Button(master, text="Remover Diretório", command=self.remove_directory)
-        self.remove_directory_button.pack()
-        self.view_allocated_blocks_button = tk.Button(master, text="Visualizar Blocos Ocupados", command=self.view_allocated_blocks)
-        self.view_allocated_blocks_button.pack()
-        self.set_attr_button = tk.Button(master, text="Definir Atributo", command=self.set_attr)
-        self.set_attr_button.pack()
-        self.get_attr_button = tk.Button(master, text="Obter Atributo", command=self.get_attr)
-        self.get_attr_button.pack()
-        # Atualiza a caixa de listagem de diretórios
-        self.update_directory_listbox()
-
-    # Método para abrir um diretório selecionado na caixa de listagem de diretórios
-    def open_directory(self):
-        # Obtém o índice do diretório selecionado
-        selected_directory_index = self.directory_listbox.curselection()
-        # Exibe um erro se nenhum diretório foi selecionado
-        if not selected_directory_index:
-            messagebox.showerror("Erro", "Nenhum diretório selecionado")
-            return
-        # Obtém o nome do diretório selecionado
-        selected_directory = self.directory_listbox.get(selected_directory_index)
-        # Navega para o diretório selecionado no sistema de arquivos
-        self.file_system.navigate(selected_directory)
-        # Atualiza o diretório atual e a caixa de listagem de diretórios
-        self.current_directory = self.file_system.current_directory
-        self.update_directory_listbox()
-
-    # Método para navegar de volta para o diretório pai
-    def go_back(self):
-        # Navega para o diretório pai no sistema de arquivos
-        self.file_system.navigate_back()
-        # Atualiza o diretório atual e a caixa de listagem de diretórios
-        self.current_directory = self.file_system.current_directory
-        self.update_directory_listbox()
-
-    # Método para criar um novo diretório
-    def create_directory(self):
-        # Solicita o nome do diretório ao usuário
-        directory_name = simpledialog.askstring("Criar Diretório", "Nome do Diretório:")
-        # Cria o diretório no sistema de arquivos e atualiza a caixa de listagem de diretórios
-        if directory_name:
-            try:
-                self.file_system.create_directory(directory_name)
-                self.update_directory_listbox()
-            except Exception as e:
-                messagebox.showerror("Erro", str(e))
-
-    # Método para criar um novo arquivo
-    def create_file(self):
-        # Solicita o nome do arquivo ao usuário
-        filename = simpledialog.askstring("Criar Arquivo", "Nome do Arquivo:")
-        # Cria o arquivo no sistema de arquivos e atualiza a caixa de listagem de arquivos
-        if filename:
-            try:
-                self.file_system.create_file(filename)
-                self.update_file_listbox()
-            except Exception as e:
-                messagebox.showerror("Erro", str(e))
+        entry = self._resolve(path)
+        if entry is None:
+            return None
+        return self._indexed_value(entry, attribute)
 
-    # Método para visualizar o conteúdo de um arquivo
-    def view_file(self):
-        # Obtém o índice do arquivo selecionado
-        selected_file_index = self.file_listbox.curselection()
-        # Exibe um erro se nenhum arquivo foi selecionado
-        if not selected_file_index:
-            messagebox.showerror("Erro", "Nenhum arquivo selecionado")
-            return
-        # Obtém o nome do arquivo selecionado
-        selected_file = self.file_listbox.get(selected_file_index)
-        # Exibe o conteúdo do arquivo em uma caixa de mensagem
-        try:
-            content = self.file_system.view_file(selected_file)
-            messagebox.showinfo("Conteúdo do Arquivo", content)
-        # Exceção se o arquivo não puder ser encontrado
-        except Exception as e:
-            messagebox.showerror("Erro", str(e))
+    # Método que define um atributo mantendo o índice dele; quem chama deve ter a trava da entrada
+    def _set_indexed(self, entry, attribute, value):
+        old = entry.attributes.get(attribute)
+        entry.attributes[attribute] = value
+        index = self.indexes.get(attribute)
+        if index is not None and entry.parent is not None:
+            index.update(entry.inode, old, value)
 
-    # Método para editar o conteúdo de um arquivo
-    def edit_file(self):
-        # Obtém o índice do arquivo selecionado
-        selected_file_index = self.file_listbox.curselection()
-        # Exibe um erro se nenhum arquivo foi selecionado
-        if not selected_file_index:
-            messagebox.showerror("Erro", "Nenhum arquivo selecionado")
-            return
-        # Obtém o nome do arquivo selecionado
-        selected_file = self.file_listbox.get(selected_file_index)
-        try:
-            # Obtém o conteúdo atual do arquivo
-            current_content = self.file_system.view_file(selected_file)
-            # Solicita o novo conteúdo ao usuário
-            new_content = simpledialog.askstring("Editar Arquivo", "Novo Conteúdo:", initialvalue=current_content)
-            # Atualiza o conteúdo do arquivo se o novo conteúdo for fornecido
-            if new_content is not None:
-                self.file_system.edit_file(selected_file, new_content)
-        except Exception as e:
-            messagebox.showerror("Erro", str(e))
-
-    # Método para remover um arquivo
-    def remove_file(self):
-        # Obtém o índice do arquivo selecionado
-        selected_file_index = self.file_listbox.curselection()
-        # Exibe um erro se nenhum arquivo foi selecionado
-        if not selected_file_index:
-            messagebox.showerror("Erro", "Nenhum arquivo selecionado")
-            return
-        # Obtém o nome do arquivo selecionado
-        selected_file = self.file_listbox.get(selected_file_index)
-        try:
-            # Remove o arquivo do sistema de arquivos e atualiza a caixa de listagem de arquivos
-            self.file_system.remove_file(selected_file)
-            self.update_file_listbox()
-        except Exception as e:
-            messagebox.showerror("Erro", str(e))
-
-    # Método para remover um diretório
-    def remove_directory(self):
-        # Obtém o índice do diretório selecionado
-        selected_directory_index = self.directory_listbox.curselection()
-        # Exibe um erro se nenhum diretório foi selecionado
-        if not selected_directory_index:
-            messagebox.showerror("Erro", "Nenhum diretório selecionado")
+    # Método que altera o tamanho de um arquivo mantendo o índice "size"; quem chama deve ter a trava do arquivo
+    def _set_size(self, entry, size):
+        index = self.indexes.get("size")
+        if index is not None and entry.parent is not None:
+            index.update(entry.inode, entry.size, size)
+        entry.size = size
+
+    # Método para obter o valor de uma entrada usado nos índices e nas consultas
+    # "size" é o tamanho dos arquivos em bytes; os demais são atributos definidos com set_attribute
+    def _indexed_value(self, entry, attribute):
+        if attribute == "size":
+            return None if entry.is_directory else entry.size
+        return entry.attributes.get(attribute)
+
+    # Método para criar um índice secundário de um atributo (ou de "size", o tamanho dos arquivos)
+    # O índice é montado com uma passagem pelos inodes e depois é mantido a cada set_attribute,
+    # criação, escrita e remoção, o que torna as consultas de query proporcionais ao resultado
+    def create_index(self, attribute):
+        if attribute in self.indexes:
             return
-        # Obtém o nome do diretório selecionado
-        selected_directory = self.directory_listbox.get(selected_directory_index)
-        try:
-            # Remove o diretório do sistema de arquivos e atualiza a caixa de listagem de diretórios
-            self.file_system.remove_directory(selected_directory)
-            self.update_directory_listbox()
-        except Exception as e:
-            messagebox.showerror("Erro", str(e))
-
-    # Método para atualizar a caixa de listagem de diretórios
-    def update_directory_listbox(self):
-        # Limpa a caixa de listagem de diretórios
-        self.directory_listbox.delete(0, tk.END)
-        # Obtém a lista de diretórios no diretório atual
-        directories = self.file_system.list_directory()
-        # Adiciona os diretórios à caixa de listagem
-        for directory in directories:
-            self.directory_listbox.insert(tk.END, directory)
-        # Atualiza o rótulo do diretório atual
-        self.current_path_label.config(text="Diretório Atual: " + self.current_directory)
-        # Atualiza a caixa de listagem de arquivos
-        self.update_file_listbox()
-
-    # Método para atualizar a caixa de listagem de arquivos no diretório atual
-    def update_file_listbox(self):
-        # Limpa a caixa de listagem de arquivos
-        self.file_listbox.delete(0, tk.END)
-        # Obtém a lista de arquivos no diretório atual
-        files = self.file_system.list_directory()
-        # Adiciona os arquivos à caixa de listagem
-        for filename in files:
-            if filename in self.file_system.files:
-                self.file_listbox.insert(tk.END, filename)
-
-    # Método para visualizar os blocos alocados no sistema de arquivos
-    def view_allocated_blocks(self):
-        # Obtém a representação em bitmap dos blocos alocados
-        bitmap = self.file_system.get_allocated_blocks_bitmap()
-        # Exibe a representação em bitmap em uma caixa de mensagem
-        messagebox.showinfo("Blocos Ocupados", bitmap)
- 
-    # Define o valor de um atributo
-    def set_attr(self):
-        path = simpledialog.askstring("Definir Atributo", "Digite o caminho do nó:")
-        attribute = simpledialog.askstring("Definir Atributo", "Digite o nome do atributo:")
-        value = simpledialog.askstring("Definir Atributo", "Digite o valor do atributo:")
-        if path and attribute and value:
-            message = self.file_system.set_attribute(path, attribute, value)
-            messagebox.showinfo("Definir Atributo", message)
-        else:
-            messagebox.showerror("Erro", "Todos os campos são obrigatórios.")
-
-# Método para obter o valor de um atributo
-    def get_attr(self):
-        path = simpledialog.askstring("Obter Atributo", "Digite o caminho do nó (a partir do diretório atual):")
-        attribute = simpledialog.askstring("Obter Atributo", "Digite o nome do atributo:")
-        if path and attribute:
-            value = self.file_system.get_attribute(path, attribute)
-            if value is not None:
-                messagebox.showinfo("Valor do Atributo", f"O valor do atributo '{attribute}' em '{path}' é '{value}'.")
-            else:
-                messagebox.showerror("Erro", f"O atributo '{attribute}' em '{path}' não foi encontrado.")
-        else:
-            messagebox.showerror("Erro", "Todos os campos são obrigatórios.")
-# Classe para uma aplicação de login
-class LoginApp:
-    # Método de inicialização da classe LoginApp
-    def __init__(self, master):
-        # Define a janela principal da aplicação
-        self.master = master
-        self.master.title("Login")
-        # Dicionário para armazenar os usuários e senhas
-        self.users = {}
-        # Cria rótulos e entradas para nome de usuário e senha
-        self.username_label = tk.Label(master, text="Nome de usuário:")
-        self.username_label.pack()
-        self.username_entry = tk.Entry(master)
-        self.username_entry.pack()
-        self.password_label = tk.Label(master, text="Senha:")
-        self.password_label.pack()
-        self.password_entry = tk.Entry(master, show="*")
-        self.password_entry.pack()
-        # Cria botões para login e registro
-        self.login_button = tk.Button(master, text="Login", command=self.login)
-        self.login_button.pack()
-        self.register_button = tk.Button(master, text="Registrar", command=self.register)
-        self.register_button.pack()
-
-    # Método para realizar o login
-    def login(self):
-        # Obtém o nome de usuário e senha digitados pelo usuário
-        username = self.username_entry.get()
-        password = self.password_entry.get()
-        # Verifica se o nome de usuário e senha correspondem a um usuário registrado
-        if username in self.users and self.users[username] == password:
-            # Exibe uma mensagem de login bem-sucedido e abre a interface gráfica do sistema de arquivos
-            messagebox.showinfo("Login bem-sucedido", "Bem-vindo, " + username + "!")
-            self.master.destroy()
-            main_window = tk.Tk()
-            FileSystemGUI(main_window)
-            main_window.mainloop()
-        else:
-            # Exibe uma mensagem de erro se o login falhar
-            messagebox.showerror("Erro de login", "Nome de usuário ou senha inválidos")
-
-    # Método para registrar um novo usuário
-    def register(self):
-        # Obtém o nome de usuário e senha digitados pelo usuário
-        username = self.username_entry.get()
-        password = self.password_entry.get()
-        # Verifica se o nome de usuário já está em uso
-        if username in self.users:
-            messagebox.showerror("Erro de registro", "Nome de usuário já está em uso")
+        index = self.indexes[attribute] = AttributeIndex()
+        for entry in list(self.inodes.values()):
+            # A trava da entrada impede que um set_attribute simultâneo seja perdido
+            with entry.lock.writing() if entry.is_directory else entry.lock:
+                if entry.parent is not None:
+                    index.add(entry.inode, self._indexed_value(entry, attribute))
+
+    # Método para remover o índice de um atributo
+    def drop_index(self, attribute):
+        self.indexes.pop(attribute, None)
+
+    # Método para buscar os caminhos das entradas cujo atributo satisfaz `op value`
+    # `op` é um de "==", "<", "<=", ">", ">="; intervalos comparam só números com números e textos com textos.
+    # Com índice, a busca não percorre a árvore; sem índice, todos os inodes são examinados.
+    # Retorna a lista de caminhos em ordem alfabética
+    def query(self, attribute, op, value):
+        if op not in OPERATORS:
+            raise Exception("Operador inválido")
+        index = self.indexes.get(attribute)
+        if index is not None:
+            entries = [self.inodes.get(number) for number in index.lookup(op, value)]
         else:
-            # Registra o novo usuário e exibe uma mensagem de registro bem-sucedido
-            self.users[username] = password
-            messagebox.showinfo("Registro bem-sucedido", "Usuário registrado com sucesso")
-
-# Cria a janela principal da aplicação de login
-root = tk.Tk()
-# Inicializa a aplicação de login
-app = LoginApp(root)
-# Inicia o loop principal da interface gráfica
-root.mainloop()
\ No newline at end of file
+            entries = [entry for entry in list(self.inodes.values())
+                       if matches(self._indexed_value(entry, attribute), op, value)]
+        paths = []
+        for entry in entries:
+            # Entradas removidas durante a busca são ignoradas
+            try:
+                if entry is not None and entry.parent is not None:
+                    paths.append(self.path_of(entry))
+            except Exception:
+                continue
+        return sorted(paths)
+
+# Classes da interface gráfica, que ficam em blocoslivres_gui.py e só são carregadas (junto com o tkinter)
+# quando usadas
+_GUI_NAMES = ("FileSystemGUI", "LoginApp")
+
+# Obtém sob demanda as classes da interface gráfica (blocoslivres.FileSystemGUI continua funcionando)
+def __getattr__(name):
+    if name in _GUI_NAMES:
+        import blocoslivres_gui
+        return getattr(blocoslivres_gui, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# Executa a aplicação de login se este arquivo for executado como script principal
+if __name__ == "__main__":
+    from blocoslivres_gui import main
+    main()
@@ -0,0 +1,472 @@
+# Interface gráfica (tkinter) do sistema de arquivos de blocos livres
+# Fica separada de blocoslivres.py para que o sistema de arquivos possa ser importado sem o tkinter, em
+# scripts e em máquinas sem interface gráfica; blocoslivres.py só carrega este módulo ao abrir a interface
+# Importa a biblioteca tkinter e suas funcionalidades de messagebox e simpledialog
+import tkinter as tk
+from tkinter import messagebox, simpledialog
+# Importa o sistema de arquivos e a paginação das listagens
+from blocoslivres import FileSystem
+from directorypager import DirectoryPager
+
+# Quantidade de colunas e de linhas de células do mapa de blocos (cada célula resume uma faixa de blocos)
+MAP_COLUMNS = 64
+MAP_ROWS = 32
+# Lado de cada célula do mapa, em pixels
+CELL_SIZE = 8
+# Intervalo entre as atualizações do mapa de blocos, em milissegundos
+MAP_REFRESH_MS = 500
+# Cores das células, da faixa livre à totalmente ocupada
+MAP_COLORS = ["#ffffff", "#dbe9f6", "#bad6eb", "#89bedc", "#539ecd", "#2b7bba", "#0b559f", "#08306b"]
+# Cor das células sem blocos (quando há menos blocos visíveis que células)
+MAP_EMPTY_COLOR = "#d9d9d9"
+
+# Classe para a janela do mapa de blocos: uma grade de células desenhada em um canvas, em que cada célula
+# mostra a fração ocupada de uma faixa de blocos. A ocupação vem do resumo por grupos de blocos do sistema
+# de arquivos, então desenhar o mapa custa o mesmo em volumes de qualquer tamanho
+class BlockMapView:
+    # Método de inicialização da classe BlockMapView
+    def __init__(self, master, file_system):
+        self.file_system = file_system
+        self.window = tk.Toplevel(master)
+        self.window.title("Blocos Ocupados")
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+        # Faixa de blocos visível: do bloco `start` até `start + span - 1`
+        self.start = 0
+        self.span = file_system.total_blocks
+        self.cell_count = MAP_COLUMNS * MAP_ROWS
+        self.occupancy = []
+        self.colors = [None] * self.cell_count
+        self.refresh_id = None
+        self.drag_cell = 0
+        # Cria o rótulo com a faixa visível e o rótulo com a célula sob o mouse
+        self.range_label = tk.Label(self.window)
+        self.range_label.pack()
+        self.cell_label = tk.Label(self.window, text=" ")
+        self.cell_label.pack()
+        # Cria o canvas com uma célula retangular para cada faixa de blocos
+        self.canvas = tk.Canvas(self.window, width=MAP_COLUMNS * CELL_SIZE, height=MAP_ROWS * CELL_SIZE,
+                                highlightthickness=0)
+        self.canvas.pack()
+        self.cells = [self.canvas.create_rectangle(column * CELL_SIZE, row * CELL_SIZE, (column + 1) * CELL_SIZE,
+                                                   (row + 1) * CELL_SIZE, outline="", fill=MAP_EMPTY_COLOR)
+                      for row in range(MAP_ROWS) for column in range(MAP_COLUMNS)]
+        # Aproxima e afasta com a roda do mouse e arrasta o mapa com o botão esquerdo
+        self.canvas.bind("<MouseWheel>", lambda event: self.zoom(event.delta > 0, self.cell_at(event)))
+        self.canvas.bind("<Button-4>", lambda event: self.zoom(True, self.cell_at(event)))
+        self.canvas.bind("<Button-5>", lambda event: self.zoom(False, self.cell_at(event)))
+        self.canvas.bind("<ButtonPress-1>", self.drag_start)
+        self.canvas.bind("<B1-Motion>", self.drag)
+        self.canvas.bind("<Motion>", self.show_cell)
+        # Cria os botões de zoom, de deslocamento e do relatório de fragmentação
+        buttons = tk.Frame(self.window)
+        buttons.pack()
+        tk.Button(buttons, text="Aproximar", command=lambda: self.zoom(True)).pack(side=tk.LEFT)
+        tk.Button(buttons, text="Afastar", command=lambda: self.zoom(False)).pack(side=tk.LEFT)
+        tk.Button(buttons, text="Anterior", command=lambda: self.pan(-self.span // 2)).pack(side=tk.LEFT)
+        tk.Button(buttons, text="Próximo", command=lambda: self.pan(self.span // 2)).pack(side=tk.LEFT)
+        tk.Button(buttons, text="Fragmentação", command=self.show_fragmentation).pack(side=tk.LEFT)
+        self.refresh()
+
+    # Método para obter o índice da célula sob o mouse
+    def cell_at(self, event):
+        column = min(max(event.x // CELL_SIZE, 0), MAP_COLUMNS - 1)
+        row = min(max(event.y // CELL_SIZE, 0), MAP_ROWS - 1)
+        return row * MAP_COLUMNS + column
+
+    # Método para obter o primeiro bloco da faixa mostrada por uma célula
+    def block_at(self, cell):
+        buckets = min(self.cell_count, self.span)
+        return self.start + self.span * min(cell, buckets) // buckets
+
+    # Método para redesenhar o mapa; só as células que mudaram de cor são alteradas no canvas
+    def refresh(self):
+        buckets = min(self.cell_count, self.span)
+        self.occupancy = self.file_system.get_block_map(buckets, self.start, self.start + self.span)
+        last = len(MAP_COLORS) - 1
+        for cell in range(self.cell_count):
+            if cell < buckets:
+                blocks, used = self.occupancy[cell]
+                color = MAP_COLORS[0 if not used else max(1, round(used * last / blocks))]
+            else:
+                color = MAP_EMPTY_COLOR
+            if color != self.colors[cell]:
+                self.colors[cell] = color
+                self.canvas.itemconfig(self.cells[cell], fill=color)
+        total = self.file_system.total_blocks
+        self.range_label.config(text=f"Blocos {self.start} a {self.start + self.span - 1} de {total} | "
+                                     f"{self.span / buckets:.1f} blocos por célula | "
+                                     f"{self.file_system.free_block_count()} blocos livres")
+        # Agenda a próxima atualização, para acompanhar as alocações feitas enquanto a janela está aberta
+        if self.refresh_id is not None:
+            self.window.after_cancel(self.refresh_id)
+        self.refresh_id = self.window.after(MAP_REFRESH_MS, self.refresh)
+
+    # Método para mudar a faixa visível, mantendo-a dentro do volume, e redesenhar o mapa
+    def show_range(self, start, span):
+        total = self.file_system.total_blocks
+        self.span = min(max(span, min(self.cell_count, total)), total)
+        self.start = min(max(start, 0), total - self.span)
+        self.refresh()
+
+    # Método para aproximar (dividir a faixa visível por 2) ou afastar, mantendo fixo o bloco da célula indicada
+    def zoom(self, closer, cell=None):
+        cell = self.cell_count // 2 if cell is None else cell
+        anchor = self.block_at(cell)
+        span = self.span // 2 if closer else self.span * 2
+        self.show_range(anchor - (anchor - self.start) * span // self.span, span)
+
+    # Método para deslocar a faixa visível em `blocks` blocos
+    def pan(self, blocks):
+        self.show_range(self.start + blocks, self.span)
+
+    # Métodos para arrastar o mapa: cada célula arrastada desloca a faixa visível pelos blocos de uma célula
+    def drag_start(self, event):
+        self.drag_cell = self.cell_at(event)
+
+    def drag(self, event):
+        cell = self.cell_at(event)
+        if cell != self.drag_cell:
+            self.pan(self.block_at(self.drag_cell) - self.block_at(cell))
+            self.drag_cell = cell
+
+    # Método para mostrar a faixa e a ocupação da célula sob o mouse
+    def show_cell(self, event):
+        cell = self.cell_at(event)
+        if cell < len(self.occupancy):
+            blocks, used = self.occupancy[cell]
+            first = self.block_at(cell)
+            self.cell_label.config(text=f"Blocos {first} a {first + blocks - 1}: {used} de {blocks} ocupados")
+
+    # Método para exibir o resumo de fragmentação do espaço livre e dos arquivos
+    def show_fragmentation(self):
+        report = self.file_system.fragmentation_report()
+        messagebox.showinfo("Fragmentação",
+                            f"Maior sequência livre: {report['largest_free_run']} de {report['free_blocks']} blocos livres\n"
+                            f"Arquivos fragmentados: {report['fragmented_files']} de {report['files']}")
+
+    # Método para fechar a janela e interromper as atualizações
+    def close(self):
+        if self.refresh_id is not None:
+            self.window.after_cancel(self.refresh_id)
+        self.window.destroy()
+
+# Classe para uma interface gráfica de usuário para o sistema de arquivos
+class FileSystemGUI:
+    # Método de inicialização da classe FileSystemGUI
+    def __init__(self, master):
+        # Define a janela principal da interface gráfica
+        self.master = master
+        self.master.title("Sistema de Arquivos GUI")
+        # Cria uma instância do sistema de arquivos com 100 blocos
+        self.file_system = FileSystem(100)
+        # Define o diretório atual como o diretório raiz
+        self.current_directory = '/'
+        # Cria um rótulo para exibir o diretório atual
+        self.current_path_label = tk.Label(master, text="Diretório Atual: " + self.current_directory)
+        self.current_path_label.pack()
+        # Cria as caixas de listagem para exibir os diretórios e os arquivos do diretório atual; as entradas
+        # são carregadas em páginas, conforme a rolagem
+        self.pager = DirectoryPager(self.fetch_entries, self.show_entries)
+        self.directory_listbox = self.create_listbox(master)
+        self.file_listbox = self.create_listbox(master)
+        # Cria botões para navegar, criar diretório, criar arquivo, visualizar arquivo, editar arquivo, remover arquivo,
+        # remover diretório e visualizar blocos alocados
+        self.navigate_button = tk.Button(master, text="Abrir Diretório", command=self.open_directory)
+        self.navigate_button.pack()
+        self.navigate_back_button = tk.Button(master, text="Voltar", command=self.go_back)
+        self.navigate_back_button.pack()
+        self.create_directory_button = tk.Button(master, text="Criar Diretório", command=self.create_directory)
+        self.create_directory_button.pack()
+        self.create_file_button = tk.Button(master, text="Criar Arquivo", command=self.create_file)
+        self.create_file_button.pack()
+        self.view_file_button = tk.Button(master, text="Visualizar Arquivo", command=self.view_file)
+        self.view_file_button.pack()
+        self.edit_file_button = tk.Button(master, text="Editar Arquivo", command=self.edit_file)
+        self.edit_file_button.pack()
+        self.remove_file_button = tk.Button(master, text="Remover Arquivo", command=self.remove_file)
+        self.remove_file_button.pack()
+        self.remove_directory_button = tk.Button(master, text="Remover Diretório", command=self.remove_directory)
+        self.remove_directory_button.pack()
+        self.view_allocated_blocks_button = tk.Button(master, text="Visualizar Blocos Ocupados", command=self.view_allocated_blocks)
+        self.view_allocated_blocks_button.pack()
+        self.set_attr_button = tk.Button(master, text="Definir Atributo", command=self.set_attr)
+        self.set_attr_button.pack()
+        self.get_attr_button = tk.Button(master, text="Obter Atributo", command=self.get_attr)
+        self.get_attr_button.pack()
+        # Atualiza a caixa de listagem de diretórios
+        self.update_directory_listbox()
+
+    # Método para criar uma caixa de listagem com barra de rolagem que pede a próxima página ao rolar
+    def create_listbox(self, master):
+        frame = tk.Frame(master)
+        frame.pack()
+        scrollbar = tk.Scrollbar(frame, orient=tk.VERTICAL)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        def scrolled(first, last):
+            scrollbar.set(first, last)
+            # Cada página é dividida entre as duas caixas; a mais curta estaria sempre no fim da rolagem e
+            # pediria todas as páginas de uma vez, então só a caixa com mais entradas pede a próxima página
+            if listbox is self.paging_listbox():
+                self.pager.scrolled(first, last)
+
+        listbox = tk.Listbox(frame, height=10, width=50, yscrollcommand=scrolled)
+        listbox.pack(side=tk.LEFT)
+        scrollbar.config(command=listbox.yview)
+        return listbox
+
+    # Método para obter a caixa de listagem que pede as próximas páginas: a que tem mais entradas (a de
+    # arquivos, em caso de empate)
+    def paging_listbox(self):
+        if self.directory_listbox.size() > self.file_listbox.size():
+            return self.directory_listbox
+        return self.file_listbox
+
+    # Método para abrir um diretório selecionado na caixa de listagem de diretórios
+    def open_directory(self):
+        # Obtém o índice do diretório selecionado
+        selected_directory_index = self.directory_listbox.curselection()
+        # Exibe um erro se nenhum diretório foi selecionado
+        if not selected_directory_index:
+            messagebox.showerror("Erro", "Nenhum diretório selecionado")
+            return
+        # Obtém o nome do diretório selecionado
+        selected_directory = self.directory_listbox.get(selected_directory_index)
+        # Navega para o diretório selecionado no sistema de arquivos
+        self.file_system.navigate(selected_directory)
+        # Atualiza o diretório atual e a caixa de listagem de diretórios
+        self.current_directory = self.file_system.current_directory
+        self.update_directory_listbox()
+
+    # Método para navegar de volta para o diretório pai
+    def go_back(self):
+        # Navega para o diretório pai no sistema de arquivos
+        self.file_system.navigate_back()
+        # Atualiza o diretório atual e a caixa de listagem de diretórios
+        self.current_directory = self.file_system.current_directory
+        self.update_directory_listbox()
+
+    # Método para criar um novo diretório
+    def create_directory(self):
+        # Solicita o nome do diretório ao usuário
+        directory_name = simpledialog.askstring("Criar Diretório", "Nome do Diretório:")
+        # Cria o diretório no sistema de arquivos e atualiza a caixa de listagem de diretórios
+        if directory_name:
+            try:
+                self.file_system.create_directory(directory_name)
+                self.entry_added(directory_name, self.directory_listbox)
+            except Exception as e:
+                messagebox.showerror("Erro", str(e))
+
+    # Método para criar um novo arquivo
+    def create_file(self):
+        # Solicita o nome do arquivo ao usuário
+        filename = simpledialog.askstring("Criar Arquivo", "Nome do Arquivo:")
+        # Cria o arquivo no sistema de arquivos e atualiza a caixa de listagem de arquivos
+        if filename:
+            try:
+                self.file_system.create_file(filename)
+                self.entry_added(filename, self.file_listbox)
+            except Exception as e:
+                messagebox.showerror("Erro", str(e))
+
+    # Método para visualizar o conteúdo de um arquivo
+    def view_file(self):
+        # Obtém o índice do arquivo selecionado
+        selected_file_index = self.file_listbox.curselection()
+        # Exibe um erro se nenhum arquivo foi selecionado
+        if not selected_file_index:
+            messagebox.showerror("Erro", "Nenhum arquivo selecionado")
+            return
+        # Obtém o nome do arquivo selecionado
+        selected_file = self.file_listbox.get(selected_file_index)
+        # Exibe o conteúdo do arquivo em uma caixa de mensagem
+        try:
+            content = self.file_system.view_file(selected_file)
+            messagebox.showinfo("Conteúdo do Arquivo", content)
+        # Exceção se o arquivo não puder ser encontrado
+        except Exception as e:
+            messagebox.showerror("Erro", str(e))
+
+    # Método para editar o conteúdo de um arquivo
+    def edit_file(self):
+        # Obtém o índice do arquivo selecionado
+        selected_file_index = self.file_listbox.curselection()
+        # Exibe um erro se nenhum arquivo foi selecionado
+        if not selected_file_index:
+            messagebox.showerror("Erro", "Nenhum arquivo selecionado")
+            return
+        # Obtém o nome do arquivo selecionado
+        selected_file = self.file_listbox.get(selected_file_index)
+        try:
+            # Obtém o conteúdo atual do arquivo
+            current_content = self.file_system.view_file(selected_file)
+            # Solicita o novo conteúdo ao usuário
+            new_content = simpledialog.askstring("Editar Arquivo", "Novo Conteúdo:", initialvalue=current_content)
+            # Atualiza o conteúdo do arquivo se o novo conteúdo for fornecido
+            if new_content is not None:
+                self.file_system.edit_file(selected_file, new_content)
+        except Exception as e:
+            messagebox.showerror("Erro", str(e))
+
+    # Método para remover um arquivo
+    def remove_file(self):
+        # Obtém o índice do arquivo selecionado
+        selected_file_index = self.file_listbox.curselection()
+        # Exibe um erro se nenhum arquivo foi selecionado
+        if not selected_file_index:
+            messagebox.showerror("Erro", "Nenhum arquivo selecionado")
+            return
+        # Obtém o nome do arquivo selecionado
+        selected_file = self.file_listbox.get(selected_file_index)
+        try:
+            # Remove o arquivo do sistema de arquivos e atualiza a caixa de listagem de arquivos
+            self.file_system.remove_file(selected_file)
+            self.entry_removed(selected_file_index, self.file_listbox)
+        except Exception as e:
+            messagebox.showerror("Erro", str(e))
+
+    # Método para remover um diretório
+    def remove_directory(self):
+        # Obtém o índice do diretório selecionado
+        selected_directory_index = self.directory_listbox.curselection()
+        # Exibe um erro se nenhum diretório foi selecionado
+        if not selected_directory_index:
+            messagebox.showerror("Erro", "Nenhum diretório selecionado")
+            return
+        # Obtém o nome do diretório selecionado
+        selected_directory = self.directory_listbox.get(selected_directory_index)
+        try:
+            # Remove o diretório do sistema de arquivos e atualiza a caixa de listagem de diretórios
+            self.file_system.remove_directory(selected_directory)
+            self.entry_removed(selected_directory_index, self.directory_listbox)
+        except Exception as e:
+            messagebox.showerror("Erro", str(e))
+
+    # Método para recarregar as caixas de listagem ao entrar em um diretório
+    def update_directory_listbox(self):
+        # Limpa as caixas de listagem de diretórios e de arquivos
+        self.directory_listbox.delete(0, tk.END)
+        self.file_listbox.delete(0, tk.END)
+        # Atualiza o rótulo do diretório atual
+        self.current_path_label.config(text="Diretório Atual: " + self.current_directory)
+        # Carrega a primeira página do diretório atual; as demais vêm com a rolagem
+        self.pager.reset()
+
+    # Método para obter uma página das entradas do diretório atual
+    def fetch_entries(self, start, limit):
+        return self.file_system.iterdir(None, start, limit)
+
+    # Método para acrescentar uma página de entradas nas caixas de listagem de diretórios e de arquivos
+    def show_entries(self, page):
+        directories = [name for name, is_directory in page if is_directory]
+        files = [name for name, is_directory in page if not is_directory]
+        if directories:
+            self.directory_listbox.insert(tk.END, *directories)
+        if files:
+            self.file_listbox.insert(tk.END, *files)
+
+    # Método para mostrar uma entrada recém-criada, se ela estiver no diretório atual
+    def entry_added(self, path, listbox):
+        entry = self.file_system.lookup(path)
+        if entry.parent == self.file_system.current_inode and self.pager.added():
+            listbox.insert(tk.END, entry.name)
+
+    # Método para retirar uma entrada removida da caixa de listagem
+    def entry_removed(self, index, listbox):
+        listbox.delete(index)
+        self.pager.removed()
+
+    # Método para visualizar os blocos alocados no sistema de arquivos em um mapa de blocos com zoom
+    def view_allocated_blocks(self):
+        BlockMapView(self.master, self.file_system)
+ 
+    # Define o valor de um atributo
+    def set_attr(self):
+        path = simpledialog.askstring("Definir Atributo", "Digite o caminho do nó:")
+        attribute = simpledialog.askstring("Definir Atributo", "Digite o nome do atributo:")
+        value = simpledialog.askstring("Definir Atributo", "Digite o valor do atributo:")
+        if path and attribute and value:
+            message = self.file_system.set_attribute(path, attribute, value)
+            messagebox.showinfo("Definir Atributo", message)
+        else:
+            messagebox.showerror("Erro", "Todos os campos são obrigatórios.")
+
+# Método para obter o valor de um atributo
+    def get_attr(self):
+        path = simpledialog.askstring("Obter Atributo", "Digite o caminho do nó (a partir do diretório atual):")
+        attribute = simpledialog.askstring("Obter Atributo", "Digite o nome do atributo:")
+        if path and attribute:
+            value = self.file_system.get_attribute(path, attribute)
+            if value is not None:
+                messagebox.showinfo("Valor do Atributo", f"O valor do atributo '{attribute}' em '{path}' é '{value}'.")
+            else:
+                messagebox.showerror("Erro", f"O atributo '{attribute}' em '{path}' não foi encontrado.")
+        else:
+            messagebox.showerror("Erro", "Todos os campos são obrigatórios.")
+# Classe para uma aplicação de login
+class LoginApp:
+    # Método de inicialização da classe LoginApp
+    def __init__(self, master):
+        # Define a janela principal da aplicação
+        self.master = master
+        self.master.title("Login")
+        # Dicionário para armazenar os usuários e senhas
+        self.users = {}
+        # Cria rótulos e entradas para nome de usuário e senha
+        self.username_label = tk.Label(master, text="Nome de usuário:")
+        self.username_label.pack()
+        self.username_entry = tk.Entry(master)
+        self.username_entry.pack()
+        self.password_label = tk.Label(master, text="Senha:")
+        self.password_label.pack()
+        self.password_entry = tk.Entry(master, show="*")
+        self.password_entry.pack()
+        # Cria botões para login e registro
+        self.login_button = tk.Button(master, text="Login", command=self.login)
+        self.login_button.pack()
+        self.register_button = tk.Button(master, text="Registrar", command=self.register)
+        self.register_button.pack()
+
+    # Método para realizar o login
+    def login(self):
+        # Obtém o nome de usuário e senha digitados pelo usuário
+        username = self.username_entry.get()
+        password = self.password_entry.get()
+        # Verifica se o nome de usuário e senha correspondem a um usuário registrado
+        if username in self.users and self.users[username] == password:
+            # Exibe uma mensagem de login bem-sucedido e abre a interface gráfica do sistema de arquivos
+            messagebox.showinfo("Login bem-sucedido", "Bem-vindo, " + username + "!")
+            self.master.destroy()
+            main_window = tk.Tk()
+            FileSystemGUI(main_window)
+            main_window.mainloop()
+        else:
+            # Exibe uma mensagem de erro se o login falhar
+            messagebox.showerror("Erro de login", "Nome de usuário ou senha inválidos")
+
+    # Método para registrar um novo usuário
+    def register(self):
+        # Obtém o nome de usuário e senha digitados pelo usuário
+        username = self.username_entry.get()
+        password = self.password_entry.get()
+        # Verifica se o nome de usuário já está em uso
+        if username in self.users:
+            messagebox.showerror("Erro de registro", "Nome de usuário já está em uso")
+        else:
+            # Registra o novo usuário e exibe uma mensagem de registro bem-sucedido
+            self.users[username] = password
+            messagebox.showinfo("Registro bem-sucedido", "Usuário registrado com sucesso")
+
+# Abre a aplicação de login
+def main():
+    # Cria a janela principal da aplicação de login
+    root = tk.Tk()
+    # Inicializa a aplicação de login
+    app = LoginApp(root)
+    # Inicia o loop principal da interface gráfica
+    root.mainloop()
+
+# Executa a aplicação de login se este arquivo for executado como script principal
+if __name__ == "__main__":
+    main()
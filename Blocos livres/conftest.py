@@ -0,0 +1,15 @@
+# Configuração do pytest para os testes desta pasta
+# As pastas do i-node e de blocos livres são independentes e têm módulos com o mesmo nome (attrindex.py,
+# por exemplo). Quando o pytest roda na raiz do repositório, os módulos com nome de um módulo desta pasta
+# que foram carregados pelos testes da outra pasta são descartados, para que os testes desta pasta
+# importem as versões daqui.
+import os
+import sys
+
+PASTA = os.path.dirname(os.path.abspath(__file__))
+
+for nome, modulo in list(sys.modules.items()):
+    arquivo = getattr(modulo, "__file__", None)
+    if (arquivo and os.path.dirname(os.path.abspath(arquivo)) != PASTA
+            and os.path.exists(os.path.join(PASTA, nome + ".py"))):
+        del sys.modules[nome]
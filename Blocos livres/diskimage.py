@@ -0,0 +1,307 @@
+# Imagem de disco persistente para o sistema de arquivos de blocos livres
+# Layout do arquivo (todas as regiões alinhadas ao tamanho do bloco):
+#   superbloco | mapa de bits dos blocos livres | tabela de inodes | região de dados
+# O arquivo é acessado via mmap, então blocos são lidos e escritos sem cópias intermediárias.
+# Os metadados passam pelo journal (journal.py) antes de serem aplicados à imagem.
+import json
+import mmap
+import struct
+
+from journal import Journal
+
+# Identificação e versão do formato da imagem
+MAGIC = b'SAFS'
+VERSION = 3
+
+# Superbloco: magic, versão, tamanho do bloco, total de blocos, deslocamento e tamanho do mapa de bits,
+# deslocamento e quantidade de inodes, marca d'água dos inodes usados e deslocamento dos dados
+SUPERBLOCK = struct.Struct('<4sIIQQQQQQQ')
+
+# Registro de inode com tamanho fixo
+INODE_SIZE = 512
+# Cabeçalho do inode: tipo, reservado, tamanhos do nome e dos atributos, quantidade de extensões,
+# tamanho do arquivo, primeiro bloco indireto de extensões, número do inode do diretório pai e número
+# de sequência da entrada (a ordem de criação no diretório pai, restaurada na montagem)
+INODE_HEADER = struct.Struct('<BBHHIQQQQ')
+NAME_MAX = 255
+INLINE_EXTENTS = 8
+EXTENT = struct.Struct('<QQ')
+ATTRIBUTES_MAX = INODE_SIZE - INODE_HEADER.size - NAME_MAX - INLINE_EXTENTS * EXTENT.size
+# Cabeçalho de um bloco indireto de extensões: próximo bloco da cadeia e quantidade de extensões
+INDIRECT_HEADER = struct.Struct('<QI')
+# Valor usado para indicar a ausência de bloco
+NO_BLOCK = 0xFFFFFFFFFFFFFFFF
+
+# Tipos de inode
+INODE_FREE = 0
+INODE_FILE = 1
+INODE_DIRECTORY = 2
+
+
+# Classe com os dados de um inode lido da imagem
+# `name` é o nome da entrada dentro do diretório pai e `parent` é o número do inode do pai (0 é a raiz)
+class InodeRecord:
+    # Método de inicialização da classe InodeRecord
+    def __init__(self, kind, name, parent, size=0, extents=None, attributes=None, indirect_blocks=None,
+                 sequence=0):
+        self.kind = kind
+        self.name = name
+        self.parent = parent
+        self.sequence = sequence
+        self.size = size
+        self.extents = extents if extents is not None else []
+        self.attributes = attributes if attributes is not None else {}
+        # Blocos da cadeia indireta que guardam as extensões que não cabem no inode
+        self.indirect_blocks = indirect_blocks if indirect_blocks is not None else []
+
+
+# Arredonda um valor para cima até o múltiplo do tamanho do bloco
+def _align(value, block_size):
+    return -(-value // block_size) * block_size
+
+
+# Cria um arquivo de imagem vazio (esparso) com o layout calculado a partir dos parâmetros
+def create_image(path, total_blocks, block_size=4096, inode_count=None):
+    if inode_count is None:
+        inode_count = max(64, total_blocks // 4)
+    bitmap_offset = _align(SUPERBLOCK.size, block_size)
+    bitmap_bytes = (total_blocks + 7) // 8
+    inode_offset = _align(bitmap_offset + bitmap_bytes, block_size)
+    data_offset = _align(inode_offset + inode_count * INODE_SIZE, block_size)
+    image_size = data_offset + total_blocks * block_size
+    with open(path, 'wb') as f:
+        # O truncate cria um arquivo esparso: somente as regiões escritas ocupam espaço no disco
+        f.truncate(image_size)
+        f.write(SUPERBLOCK.pack(MAGIC, VERSION, block_size, total_blocks, bitmap_offset, bitmap_bytes,
+                                inode_offset, inode_count, 1, data_offset))
+        # O inode 0 é sempre o diretório raiz
+        f.seek(inode_offset)
+        f.write(_pack_inode(InodeRecord(INODE_DIRECTORY, '/', 0)))
+
+
+# Serializa um inode no formato de tamanho fixo (as extensões que não cabem no inode ficam de fora)
+def _pack_inode(record, extent_count=None, indirect=NO_BLOCK):
+    name = record.name.encode('utf-8')
+    attributes = json.dumps(record.attributes).encode('utf-8') if record.attributes else b''
+    if len(name) > NAME_MAX:
+        raise Exception("Nome muito longo para a imagem de disco")
+    if len(attributes) > ATTRIBUTES_MAX:
+        raise Exception("Atributos muito grandes para a imagem de disco")
+    if extent_count is None:
+        extent_count = len(record.extents)
+    header = INODE_HEADER.pack(record.kind, 0, len(name), len(attributes), extent_count, record.size,
+                               indirect, record.parent, record.sequence)
+    inline = b''.join(EXTENT.pack(start, length) for start, length in record.extents[:INLINE_EXTENTS])
+    return b''.join([
+        header,
+        name.ljust(NAME_MAX, b'\0'),
+        inline.ljust(INLINE_EXTENTS * EXTENT.size, b'\0'),
+        attributes.ljust(ATTRIBUTES_MAX, b'\0'),
+    ])
+
+
+# Classe que representa uma imagem de disco montada via mmap
+class DiskImage:
+    # Método de inicialização da classe DiskImage (abre e mapeia uma imagem existente)
+    # `journal_options` são repassadas ao Journal (batch_size, commit_interval, checkpoint_size)
+    def __init__(self, path, **journal_options):
+        self.path = path
+        self.file = open(path, 'r+b')
+        self.map = mmap.mmap(self.file.fileno(), 0)
+        self.view = memoryview(self.map)
+        # Reaplica as transações que ficaram no journal antes de ler qualquer metadado
+        self.journal = Journal(path + '.journal', **journal_options)
+        self._replay_journal()
+        (magic, version, self.block_size, self.total_blocks, self.bitmap_offset, self.bitmap_bytes,
+         self.inode_offset, self.inode_count, self.inode_high_water, self.data_offset) = SUPERBLOCK.unpack_from(self.map, 0)
+        if magic != MAGIC or version != VERSION:
+            self.journal.close()
+            self.journal = None
+            self.close()
+            raise Exception("Arquivo não é uma imagem de disco válida")
+        # Quantidade de extensões que cabem em um bloco indireto
+        self.extents_per_indirect = (self.block_size - INDIRECT_HEADER.size) // EXTENT.size
+
+    # Método para reaplicar na imagem as transações completas do journal e esvaziá-lo
+    def _replay_journal(self):
+        replayed = False
+        for records in self.journal.transactions():
+            self._apply(records)
+            replayed = True
+        if replayed:
+            self.map.flush()
+        self.journal.truncate()
+
+    # Método para aplicar registros (deslocamento, dados) diretamente na imagem
+    def _apply(self, records):
+        for offset, data in records:
+            self.view[offset:offset + len(data)] = data
+
+    # Método para escrever metadados: o registro vai para a transação em andamento do journal
+    # e só é aplicado à imagem depois do commit
+    def write_metadata(self, offset, data):
+        self.journal.log(offset, data)
+
+    # Método para marcar o fim de uma operação de metadados (faz o commit quando o lote estiver completo)
+    # Retorna True quando o commit foi feito
+    def end_operation(self):
+        if self.journal.operation_done():
+            self.commit()
+            return True
+        return False
+
+    # Método para gravar o lote pendente no journal (um fsync) e aplicá-lo à imagem
+    # Com `completed_only`, só entram no lote as operações já terminadas (ver Journal.commit)
+    def commit(self, completed_only=False):
+        self._apply(self.journal.commit(completed_only))
+        if self.journal.needs_checkpoint():
+            self.checkpoint()
+
+    # Método para sincronizar a imagem no disco e esvaziar o journal
+    def checkpoint(self):
+        self.map.flush()
+        self.journal.truncate()
+
+    # Método para obter a região do mapa de bits da imagem
+    def bitmap_buffer(self):
+        return self.view[self.bitmap_offset:self.bitmap_offset + self.bitmap_bytes]
+
+    # Método para ler um bloco de dados; retorna uma memoryview sobre o mmap, sem cópia
+    def read_block(self, block):
+        offset = self.data_offset + block * self.block_size
+        return self.view[offset:offset + self.block_size]
+
+    # Método para escrever um bloco de dados; o restante do bloco é preenchido com zeros
+    def write_block(self, block, data):
+        offset = self.data_offset + block * self.block_size
+        self.view[offset:offset + len(data)] = data
+        if len(data) < self.block_size:
+            self.view[offset + len(data):offset + self.block_size] = bytes(self.block_size - len(data))
+
+    # Método para ler blocos consecutivos; retorna uma única memoryview sobre o mmap, sem cópia
+    def read_blocks(self, start, count):
+        offset = self.data_offset + start * self.block_size
+        return self.view[offset:offset + count * self.block_size]
+
+    # Método para escrever blocos consecutivos com uma única cópia; o restante do último bloco é zerado
+    def write_blocks(self, start, data):
+        offset = self.data_offset + start * self.block_size
+        self.view[offset:offset + len(data)] = data
+        tail = -len(data) % self.block_size
+        if tail:
+            self.view[offset + len(data):offset + len(data) + tail] = bytes(tail)
+
+    # Método para avisar o sistema operacional de que blocos consecutivos serão lidos em breve
+    # O kernel começa a carregar as páginas em segundo plano (leitura antecipada assíncrona)
+    def will_need(self, start, count):
+        if not hasattr(self.map, 'madvise'):
+            return
+        offset = self.data_offset + start * self.block_size
+        aligned = offset - offset % mmap.PAGESIZE
+        length = min(offset + count * self.block_size, len(self.map)) - aligned
+        if length > 0:
+            self.map.madvise(mmap.MADV_WILLNEED, aligned, length)
+
+    # Método para zerar uma sequência de blocos liberados
+    # Só deve ser chamado depois do commit que registra a liberação: antes dele, uma falha faz a montagem
+    # voltar ao estado em que os blocos ainda pertencem ao arquivo, com o conteúdo original
+    def discard_blocks(self, start, length):
+        offset = self.data_offset + start * self.block_size
+        end = offset + length * self.block_size
+        # Zera em partes de até 1 MiB, para que sequências longas não exijam um buffer do mesmo tamanho
+        step = max(self.block_size, 1 << 20)
+        zeros = memoryview(bytes(min(step, end - offset)))
+        while offset < end:
+            count = min(step, end - offset)
+            self.view[offset:offset + count] = zeros[:count]
+            offset += count
+
+    # Método para ler os dados brutos de um inode
+    def _inode_bytes(self, slot):
+        offset = self.inode_offset + slot * INODE_SIZE
+        return self.view[offset:offset + INODE_SIZE]
+
+    # Método para ler um inode (incluindo as extensões guardadas em blocos indiretos)
+    def read_inode(self, slot):
+        raw = self._inode_bytes(slot)
+        kind, _, name_len, attr_len, extent_count, size, indirect, parent, sequence = INODE_HEADER.unpack_from(raw, 0)
+        if kind == INODE_FREE:
+            return None
+        offset = INODE_HEADER.size
+        name = bytes(raw[offset:offset + name_len]).decode('utf-8')
+        offset += NAME_MAX
+        extents = [EXTENT.unpack_from(raw, offset + i * EXTENT.size)
+                   for i in range(min(extent_count, INLINE_EXTENTS))]
+        offset += INLINE_EXTENTS * EXTENT.size
+        attributes = json.loads(bytes(raw[offset:offset + attr_len])) if attr_len else {}
+        # Percorre a cadeia de blocos indiretos com as extensões restantes
+        indirect_blocks = []
+        block = indirect
+        while block != NO_BLOCK and len(extents) < extent_count:
+            indirect_blocks.append(block)
+            data = self.read_block(block)
+            block, count = INDIRECT_HEADER.unpack_from(data, 0)
+            extents.extend(EXTENT.unpack_from(data, INDIRECT_HEADER.size + i * EXTENT.size) for i in range(count))
+        return InodeRecord(kind, name, parent, size, extents, attributes, indirect_blocks, sequence)
+
+    # Método para escrever um inode; `record.indirect_blocks` já deve ter os blocos para as extensões excedentes
+    def write_inode(self, slot, record):
+        indirect_blocks = record.indirect_blocks
+        overflow = record.extents[INLINE_EXTENTS:]
+        first = indirect_blocks[0] if indirect_blocks else NO_BLOCK
+        # Grava as extensões excedentes na cadeia de blocos indiretos
+        for i, block in enumerate(indirect_blocks):
+            chunk = overflow[i * self.extents_per_indirect:(i + 1) * self.extents_per_indirect]
+            following = indirect_blocks[i + 1] if i + 1 < len(indirect_blocks) else NO_BLOCK
+            data = INDIRECT_HEADER.pack(following, len(chunk)) + b''.join(EXTENT.pack(start, length) for start, length in chunk)
+            self.write_metadata(self.data_offset + block * self.block_size, data.ljust(self.block_size, b'\0'))
+        self.write_metadata(self.inode_offset + slot * INODE_SIZE, _pack_inode(record, len(record.extents), first))
+
+    # Método para reservar uma nova posição na tabela de inodes
+    # A marca d'água permite que a montagem percorra somente os inodes já usados
+    def reserve_inode(self):
+        slot = self.inode_high_water
+        if slot >= self.inode_count:
+            raise Exception("Tabela de inodes cheia")
+        self.inode_high_water = slot + 1
+        self._write_superblock()
+        return slot
+
+    # Método para obter quantos blocos indiretos são necessários para uma quantidade de extensões
+    def indirect_blocks_needed(self, extent_count):
+        overflow = max(0, extent_count - INLINE_EXTENTS)
+        return -(-overflow // self.extents_per_indirect)
+
+    # Método para liberar um inode
+    def free_inode(self, slot):
+        self.write_metadata(self.inode_offset + slot * INODE_SIZE, bytes(INODE_HEADER.size))
+
+    # Método para percorrer os inodes em uso como tuplas (slot, registro)
+    def iter_inodes(self):
+        for slot in range(self.inode_high_water):
+            record = self.read_inode(slot)
+            if record is not None:
+                yield slot, record
+
+    # Método para regravar o superbloco
+    def _write_superblock(self):
+        self.write_metadata(0, SUPERBLOCK.pack(MAGIC, VERSION, self.block_size, self.total_blocks, self.bitmap_offset,
+                                               self.bitmap_bytes, self.inode_offset, self.inode_count,
+                                               self.inode_high_water, self.data_offset))
+
+    # Método para tornar duráveis as alterações das operações terminadas: grava o lote pendente no journal
+    def flush(self):
+        self.commit(completed_only=True)
+
+    # Método para desmontar a imagem (faz o commit pendente e um checkpoint)
+    def close(self):
+        if self.map is None:
+            return
+        if self.journal is not None:
+            self.commit()
+            self.checkpoint()
+            self.journal.close()
+        self.view.release()
+        self.map.close()
+        self.file.close()
+        self.map = None
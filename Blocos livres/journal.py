@@ -0,0 +1,157 @@
+# Journal (write-ahead log) dos metadados da imagem de disco
+# As alterações de metadados (superbloco, mapa de bits, inodes e blocos indiretos) são acumuladas em
+# memória e gravadas no journal em lote, com um único fsync sequencial por lote (group commit).
+# Só depois de registradas no journal elas são aplicadas à imagem; na montagem, as transações
+# completas que ainda estiverem no journal são reaplicadas.
+# Os registros de cada operação ficam separados (por thread) até que ela termine; um lote só contém
+# operações terminadas, então uma operação nunca é dividida entre transações nem gravada pela metade.
+import os
+import struct
+import threading
+import time
+import zlib
+from itertools import count
+
+# Cabeçalho de uma transação: identificação, número de sequência e quantidade de registros
+TRANSACTION = struct.Struct('<4sQI')
+MAGIC = b'JRNL'
+# Cabeçalho de um registro: deslocamento na imagem e tamanho dos dados
+RECORD = struct.Struct('<QI')
+# Rodapé da transação: CRC32 de tudo o que veio antes na transação
+CHECKSUM = struct.Struct('<I')
+
+
+# Classe que representa o journal associado a uma imagem de disco
+class Journal:
+    # Método de inicialização da classe Journal
+    # `batch_size`: quantidade de operações acumuladas antes de um commit
+    # `commit_interval`: tempo máximo (em segundos) que uma operação espera pelo commit
+    # `checkpoint_size`: tamanho do journal (em bytes) a partir do qual a imagem é sincronizada e o journal esvaziado
+    def __init__(self, path, batch_size=1024, commit_interval=0.05, checkpoint_size=64 * 1024 * 1024):
+        self.path = path
+        self.batch_size = batch_size
+        self.commit_interval = commit_interval
+        self.checkpoint_size = checkpoint_size
+        self.file = open(path, 'a+b')
+        self.sequence = 0
+        # Registros (número, deslocamento, dados) das operações em andamento, por thread, e das operações
+        # já terminadas, que formam a transação em andamento; o número cresce na ordem dos registros
+        self.running = {}
+        self.pending = []
+        self.record_numbers = count(1)
+        # Número do último registro gravado em cada deslocamento: como as operações terminam fora da ordem
+        # dos seus registros, um registro mais antigo que o já gravado no mesmo lugar é descartado
+        self.latest = {}
+        # Quantidade de operações na transação em andamento e momento da primeira delas
+        self.pending_operations = 0
+        self.first_pending = None
+        # Estatísticas do journal
+        self.commits = 0
+        self.operations = 0
+        self.bytes_written = 0
+
+    # Método para registrar uma escrita de metadados na operação em andamento da thread atual
+    def log(self, offset, data):
+        records = self.running.setdefault(threading.get_ident(), [])
+        records.append((next(self.record_numbers), offset, bytes(data)))
+
+    # Método para marcar o fim da operação da thread atual, cujos registros passam para a transação em
+    # andamento; retorna True quando o lote deve ser gravado
+    def operation_done(self):
+        records = self.running.pop(threading.get_ident(), None)
+        if not records:
+            return False
+        self.pending.extend(records)
+        self.pending_operations += 1
+        self.operations += 1
+        if self.first_pending is None:
+            self.first_pending = time.monotonic()
+        return (self.pending_operations >= self.batch_size
+                or time.monotonic() - self.first_pending >= self.commit_interval)
+
+    # Método para gravar a transação em andamento no journal com um único fsync
+    # Sem `completed_only`, os registros das operações ainda em andamento também entram (na desmontagem);
+    # com ele, ficam para uma próxima transação
+    # Retorna os registros (deslocamento, dados) gravados para que sejam aplicados à imagem
+    def commit(self, completed_only=False):
+        if not completed_only:
+            for records in self.running.values():
+                self.pending.extend(records)
+            self.running.clear()
+        records = []
+        for number, offset, data in self.pending:
+            if self.latest.get(offset, 0) > number:
+                continue
+            self.latest[offset] = number
+            records.append((offset, data))
+        self.pending = []
+        self.pending_operations = 0
+        self.first_pending = None
+        if not records:
+            return []
+        self.sequence += 1
+        parts = [TRANSACTION.pack(MAGIC, self.sequence, len(records))]
+        for offset, data in records:
+            parts.append(RECORD.pack(offset, len(data)))
+            parts.append(data)
+        body = b''.join(parts)
+        self.file.write(body + CHECKSUM.pack(zlib.crc32(body)))
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.bytes_written += len(body) + CHECKSUM.size
+        self.commits += 1
+        return records
+
+    # Método para verificar se o journal cresceu o suficiente para um checkpoint
+    def needs_checkpoint(self):
+        return self.file.tell() >= self.checkpoint_size
+
+    # Método para esvaziar o journal depois que a imagem foi sincronizada no disco
+    def truncate(self):
+        self.file.truncate(0)
+        self.file.seek(0)
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+    # Método para ler as transações completas do journal como listas de registros (deslocamento, dados)
+    # A leitura para na primeira transação incompleta ou corrompida (escrita interrompida por uma falha)
+    def transactions(self):
+        self.file.seek(0)
+        content = self.file.read()
+        position = 0
+        while position + TRANSACTION.size <= len(content):
+            start = position
+            magic, sequence, count = TRANSACTION.unpack_from(content, position)
+            if magic != MAGIC:
+                break
+            position += TRANSACTION.size
+            records = []
+            for _ in range(count):
+                if position + RECORD.size > len(content):
+                    return
+                offset, length = RECORD.unpack_from(content, position)
+                position += RECORD.size
+                records.append((offset, content[position:position + length]))
+                position += length
+            if position + CHECKSUM.size > len(content):
+                return
+            (checksum,) = CHECKSUM.unpack_from(content, position)
+            if checksum != zlib.crc32(content[start:position]):
+                return
+            position += CHECKSUM.size
+            self.sequence = sequence
+            yield records
+        self.file.seek(0, os.SEEK_END)
+
+    # Método para obter as estatísticas do journal
+    def stats(self):
+        return {
+            "commits": self.commits,
+            "operations": self.operations,
+            "operations_per_commit": self.operations / self.commits if self.commits else 0.0,
+            "bytes_written": self.bytes_written,
+        }
+
+    # Método para fechar o arquivo do journal
+    def close(self):
+        self.file.close()
@@ -0,0 +1,83 @@
+# Testes da alocação de extensões do sistema de blocos livres
+import pytest
+
+from blocoslivres import FileSystem
+
+# Tamanho do bloco usado nos testes
+BLOCO = 512
+
+
+# Um arquivo grande em um volume vazio ocupa uma única extensão com o número exato de blocos
+def test_arquivo_grande_em_uma_extensao():
+    fs = FileSystem(1024, block_size=BLOCO)
+    conteudo = bytes(range(256)) * 100
+    fs.create_file("/grande.bin", conteudo)
+    entry = fs.lookup("/grande.bin")
+    blocos = -(-len(conteudo) // BLOCO)
+    assert entry.extents == [(entry.extents[0][0], blocos)]
+    assert fs.free_block_count() == 1024 - blocos
+    assert fs.read_file("/grande.bin") == conteudo
+    fs.remove_file("/grande.bin")
+    assert fs.free_block_count() == 1024
+
+
+# allocate_extent usa a dica quando o bloco está livre e devolve só a parte livre da sequência pedida
+def test_allocate_extent():
+    fs = FileSystem(64, block_size=BLOCO)
+    assert fs.allocate_extent(8) == (0, 8)
+    assert fs.allocate_extent(4, hint=8) == (8, 4)
+    fs.free_extent(4, 4)
+    assert fs.allocate_extent(10, hint=4) == (4, 4)
+    assert fs.free_block_count() == 64 - 12
+    with pytest.raises(Exception):
+        fs.free_extent(60, 8)
+    fs.free_extent(0, 12)
+    assert fs.free_block_count() == 64
+
+
+# Sem uma sequência livre do tamanho pedido, o arquivo é dividido em várias extensões
+def test_arquivo_fragmentado():
+    fs = FileSystem(32, block_size=BLOCO)
+    for i in range(8):
+        fs.create_file(f"/f{i}.bin", b"x" * BLOCO * 4)
+    for i in range(0, 8, 2):
+        fs.remove_file(f"/f{i}.bin")
+    conteudo = b"y" * BLOCO * 16
+    fs.create_file("/junto.bin", conteudo)
+    entry = fs.lookup("/junto.bin")
+    assert len(entry.extents) == 4
+    assert all(length == 4 for _, length in entry.extents)
+    assert fs.free_block_count() == 0
+    assert fs.read_file("/junto.bin") == conteudo
+    with pytest.raises(Exception):
+        fs.create_file("/mais.bin", b"z")
+
+
+# O truncamento libera os blocos além do novo tamanho e o crescimento aloca os que faltam,
+# estendendo a última extensão quando o bloco seguinte está livre
+def test_truncamento():
+    fs = FileSystem(256, block_size=BLOCO)
+    fs.create_file("/a.bin", b"a" * BLOCO * 10)
+    fs.truncate_file("/a.bin", BLOCO * 3 + 100)
+    entry = fs.lookup("/a.bin")
+    assert entry.block_count() == 4
+    assert fs.free_block_count() == 256 - 4
+    assert fs.read_file("/a.bin") == b"a" * (BLOCO * 3 + 100)
+    fs.truncate_file("/a.bin", BLOCO * 20)
+    assert entry.extents == [(entry.extents[0][0], 20)]
+    assert fs.free_block_count() == 256 - 20
+    assert fs.read_file("/a.bin") == b"a" * (BLOCO * 3 + 100) + bytes(BLOCO * 17 - 100)
+    fs.truncate_file("/a.bin", 0)
+    assert entry.extents == []
+    assert fs.free_block_count() == 256
+
+
+# Um crescimento sem blocos suficientes falha sem alterar o arquivo nem a contagem de blocos livres
+def test_truncamento_sem_espaco():
+    fs = FileSystem(16, block_size=BLOCO)
+    fs.create_file("/a.bin", b"a" * BLOCO * 2)
+    with pytest.raises(Exception):
+        fs.truncate_file("/a.bin", BLOCO * 32)
+    assert fs.lookup("/a.bin").block_count() == 2
+    assert fs.free_block_count() == 14
+    assert fs.read_file("/a.bin") == b"a" * BLOCO * 2
@@ -0,0 +1,85 @@
+# Testes do mapa de bits do sistema de blocos livres, comparado com uma lista de booleanos
+import random
+
+from bitmap import Bitmap
+
+# Tamanho do mapa: não é múltiplo de 8 e tem grupos suficientes para o resumo de ocupação ter dois níveis
+TAMANHO = 100_003
+
+
+# Monta um mapa com intervalos aleatórios ocupados e liberados e a lista equivalente
+def montar(semente=1):
+    aleatorio = random.Random(semente)
+    bitmap = Bitmap(TAMANHO)
+    referencia = [False] * TAMANHO
+    for _ in range(300):
+        inicio = aleatorio.randrange(TAMANHO)
+        tamanho = min(aleatorio.choice([1, 7, 64, 513, 4000]), TAMANHO - inicio)
+        valor = aleatorio.random() < 0.6
+        bitmap.set_range(inicio, tamanho, valor)
+        referencia[inicio:inicio + tamanho] = [valor] * tamanho
+    return bitmap, referencia, aleatorio
+
+
+# Os bits, a contagem de livres e a contagem de ocupados de intervalos quaisquer batem com a referência
+def test_contagens():
+    bitmap, referencia, aleatorio = montar()
+    assert [bitmap.test(i) for i in range(TAMANHO)] == referencia
+    assert bitmap.free_count() == referencia.count(False)
+    assert bitmap.count_set(0, TAMANHO) == sum(referencia)
+    for _ in range(200):
+        inicio = aleatorio.randrange(TAMANHO)
+        fim = aleatorio.randrange(inicio, TAMANHO + 1)
+        assert bitmap.count_set(inicio, fim) == sum(referencia[inicio:fim])
+
+
+# O resumo por faixas cobre o intervalo pedido e conta os ocupados de cada faixa
+def test_occupancy():
+    bitmap, referencia, _ = montar(2)
+    for faixas, inicio, fim in [(1, 0, None), (10, 0, None), (64, 1000, 90_001), (7, 5, 12)]:
+        resumo = bitmap.occupancy(faixas, inicio, fim)
+        fim = TAMANHO if fim is None else fim
+        assert len(resumo) == faixas
+        assert sum(blocos for blocos, _ in resumo) == fim - inicio
+        posicao = inicio
+        for blocos, ocupados in resumo:
+            assert ocupados == sum(referencia[posicao:posicao + blocos])
+            posicao += blocos
+
+
+# As buscas encontram o mesmo bloco que uma varredura simples da referência
+def test_buscas():
+    bitmap, referencia, aleatorio = montar(3)
+    for _ in range(200):
+        inicio = aleatorio.randrange(TAMANHO)
+        livre = next((i for i in range(inicio, TAMANHO) if not referencia[i]), None)
+        ocupado = next((i for i in range(inicio, TAMANHO) if referencia[i]), None)
+        assert bitmap.find_clear(inicio) == livre
+        assert bitmap.find_set(inicio) == ocupado
+
+
+# find_clear_run retorna a primeira sequência livre com o tamanho pedido, ou None se não houver
+def test_find_clear_run():
+    bitmap, referencia, aleatorio = montar(4)
+    for tamanho in [1, 5, 17, 100, 700, 3000, 50_000]:
+        inicio = aleatorio.randrange(TAMANHO // 2)
+        esperado = None
+        sequencia = 0
+        for i in range(inicio, TAMANHO):
+            sequencia = 0 if referencia[i] else sequencia + 1
+            if sequencia == tamanho:
+                esperado = i - tamanho + 1
+                break
+        assert bitmap.find_clear_run(tamanho, inicio) == esperado
+
+
+# Os bits de preenchimento do último byte nunca aparecem como livres
+def test_preenchimento():
+    bitmap = Bitmap(13)
+    bitmap.set_range(0, 13)
+    assert bitmap.free_count() == 0
+    assert bitmap.find_clear(0) is None
+    assert bitmap.find_clear_run(1) is None
+    bitmap.clear(12)
+    assert bitmap.find_clear(0) == 12
+    assert bitmap.count_set(0, 13) == 12
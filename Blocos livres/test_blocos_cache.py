@@ -0,0 +1,100 @@
+# Testes do cache de blocos: ordem de descarte de cada política e modo write-back
+import pytest
+
+from blockcache import BlockCache
+from blocoslivres import FileSystem
+
+
+# Cria um cache sobre um dicionário que faz o papel do armazenamento; retorna o cache, o armazenamento
+# e a lista das gravações feitas no armazenamento
+def novo_cache(capacidade, politica="lru", write_back=False):
+    armazenamento = {}
+    gravacoes = []
+
+    def gravar(bloco, dados):
+        gravacoes.append(bloco)
+        armazenamento[bloco] = dados
+
+    cache = BlockCache(armazenamento.get, gravar, capacidade, politica, write_back)
+    return cache, armazenamento, gravacoes
+
+
+# Lê os blocos em sequência e retorna os blocos descartados, na ordem em que saíram do cache
+def descartados(cache, blocos):
+    saida = []
+    for bloco in blocos:
+        antes = set(cache.data)
+        cache.read(bloco)
+        saida.extend(antes - set(cache.data))
+    return saida
+
+
+# Com a mesma sequência de acessos, o LRU descarta o bloco usado há mais tempo, e o CLOCK e o ARC
+# poupam o bloco 3, que foi usado duas vezes
+@pytest.mark.parametrize("politica, esperado", [("lru", [1, 2, 3]), ("clock", [1, 2, 4]), ("arc", [1, 2, 4])])
+def test_ordem_de_descarte(politica, esperado):
+    cache, _, _ = novo_cache(3, politica)
+    assert descartados(cache, [0, 1, 2, 0, 3, 3, 4, 0, 5]) == esperado
+    estatisticas = cache.stats()
+    assert (estatisticas["hits"], estatisticas["misses"], estatisticas["evictions"]) == (3, 6, 3)
+
+
+# Uma varredura de blocos usados uma só vez tira do LRU e do CLOCK os blocos usados com frequência,
+# mas não do ARC
+@pytest.mark.parametrize("politica, mantidos", [("lru", False), ("clock", False), ("arc", True)])
+def test_varredura(politica, mantidos):
+    cache, _, _ = novo_cache(4, politica)
+    descartados(cache, [0, 1, 0, 1] + list(range(10, 20)))
+    assert ({0, 1} <= set(cache.data)) == mantidos
+    assert len(cache.data) == 4
+
+
+# Um bloco liberado sai do cache sem ser gravado, e a posição dele é reutilizada sem descartar outro bloco
+@pytest.mark.parametrize("politica", ["lru", "clock", "arc"])
+def test_descarte_de_bloco_liberado(politica):
+    cache, armazenamento, gravacoes = novo_cache(3, politica, write_back=True)
+    for bloco in range(3):
+        cache.write(bloco, bytes([bloco]))
+    cache.discard(1)
+    cache.read(7)
+    assert sorted(cache.data) == [0, 2, 7]
+    assert cache.stats()["evictions"] == 0
+    assert cache.flush() == 2
+    assert gravacoes == [0, 2] and 1 not in armazenamento
+
+
+# No modo write-back, um bloco sujo descartado é gravado com os vizinhos sujos (que continuam no cache),
+# e flush grava os que restam
+def test_write_back():
+    cache, armazenamento, gravacoes = novo_cache(3, write_back=True)
+    for bloco in range(3):
+        cache.write(bloco, b"v1")
+    assert gravacoes == []
+    cache.write(3, b"v1")
+    assert gravacoes == [0, 1, 2]
+    assert cache.stats()["dirty"] == 1
+    assert sorted(cache.data) == [1, 2, 3]
+    cache.write(1, b"v2")
+    assert armazenamento[1] == b"v1"
+    assert cache.read(1) == b"v2"
+    assert cache.flush() == 2
+    assert armazenamento[1] == b"v2" and armazenamento[3] == b"v1"
+    assert cache.flush() == 0
+    assert cache.stats()["writebacks"] == 5
+
+
+# Um arquivo maior que o cache em modo write-back é lido corretamente enquanto os blocos entram e saem do
+# cache, e sync grava no armazenamento os blocos que ainda estão sujos
+@pytest.mark.parametrize("politica", ["lru", "clock", "arc"])
+def test_sistema_com_write_back(politica):
+    fs = FileSystem(256, block_size=512, cache_blocks=8, cache_policy=politica, write_back=True)
+    conteudo = bytes(range(256)) * 64
+    fs.create_file("/a.bin", conteudo)
+    fs.write_file("/a.bin", b"X" * 700, 3000)
+    esperado = conteudo[:3000] + b"X" * 700 + conteudo[3700:]
+    assert fs.read_file("/a.bin") == esperado
+    assert fs.cache.stats()["evictions"] > 0
+    fs.sync()
+    assert fs.cache.stats()["dirty"] == 0
+    blocos = list(fs.lookup("/a.bin").iter_blocks())
+    assert b"".join(fs.block_data[bloco] for bloco in blocos) == esperado
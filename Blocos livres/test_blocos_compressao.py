@@ -0,0 +1,25 @@
+# Testes da compressão por bloco do sistema de blocos livres
+from blockcodec import CODECS
+from blocoslivres import FileSystem
+
+# Tamanho do bloco usado nos testes
+BLOCO = 512
+
+
+# Um bloco liberado com free_block esquece o codec do arquivo anterior: o novo dono grava com o próprio codec
+def test_bloco_reutilizado_perde_o_codec():
+    for padrao, anterior in ((None, "lzma"), ("zlib", "bz2")):
+        fs = FileSystem(64, block_size=BLOCO, compression=padrao)
+        fs.create_file("/a.txt", b"a" * BLOCO)
+        fs.set_compression("/a.txt", anterior)
+        (block,) = fs.lookup("/a.txt").iter_blocks()
+        assert fs.block_codecs[block] == anterior
+        fs.free_block(block)
+        assert block not in fs.block_codecs
+        assert fs.allocate_extent(1, hint=block) == (block, 1)
+        fs.write_block(block, b"b" * BLOCO)
+        assert fs.read_block(block) == b"b" * BLOCO
+        if padrao is None:
+            assert fs.block_data[block] == b"b" * BLOCO
+        else:
+            assert fs.block_data[block][0] == CODECS[padrao][0]
@@ -0,0 +1,110 @@
+# Testes do sistema de blocos livres usado por várias threads
+# O teste de estresse mistura criações, escritas, acréscimos, movimentações em sentidos opostos e
+# truncamentos e depois verifica que o mapa de bits corresponde exatamente às extensões dos arquivos.
+import threading
+
+import pytest
+
+from blocoslivres import FileSystem
+
+# Quantidade de threads e iterações de cada thread no teste de estresse
+THREADS = 8
+ITERACOES = 200
+
+
+# Executa a função em `quantidade` threads ao mesmo tempo (as exceções são repassadas)
+def em_paralelo(quantidade, funcao):
+    erros = []
+    inicio_comum = threading.Barrier(quantidade)
+
+    def executar(indice):
+        try:
+            inicio_comum.wait()
+            funcao(indice)
+        except BaseException as erro:
+            erros.append(erro)
+
+    threads = [threading.Thread(target=executar, args=(i,)) for i in range(quantidade)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if erros:
+        raise erros[0]
+
+
+# Verifica que cada bloco ocupado pertence a exatamente um arquivo e que não há blocos perdidos
+# Com imagem, os blocos liberados só voltam ao mapa de bits depois do commit do journal, feito pelo sync
+def verificar_blocos(fs):
+    fs.sync()
+    ocupados = set()
+    for entry in fs.inodes.values():
+        if entry.is_directory:
+            continue
+        blocos = [block for start, length in entry.extents for block in range(start, start + length)]
+        blocos += entry.indirect_blocks
+        assert not ocupados.intersection(blocos), "bloco compartilhado entre arquivos"
+        assert len(blocos) == len(set(blocos)), "bloco repetido em um arquivo"
+        ocupados.update(blocos)
+    for block in ocupados:
+        assert fs.is_allocated(block), f"bloco {block} em uso mas livre no mapa de bits"
+    assert fs.total_blocks - fs.free_block_count() == len(ocupados), "blocos perdidos no mapa de bits"
+
+
+# Teste de estresse em memória, sobre uma imagem de disco e sobre uma imagem com cache write-back
+@pytest.mark.parametrize("imagem, opcoes", [
+    (False, {}),
+    (True, {}),
+    (True, {"cache_blocks": 256, "cache_policy": "arc", "write_back": True}),
+])
+def test_estresse(tmp_path, imagem, opcoes):
+    image_path = str(tmp_path / "estresse.img") if imagem else None
+    fs = FileSystem(1 << 16, block_size=64, image_path=image_path, **opcoes)
+    for nome in ["a", "b"] + [f"t{i}" for i in range(THREADS)]:
+        fs.create_directory(nome)
+    fs.create_file("compartilhado.txt", directory="/")
+
+    def trabalho(indice):
+        for i in range(ITERACOES):
+            nome = f"f{indice}_{i}"
+            fs.create_file(nome, "x" * (i % 300), directory=f"/t{indice}")
+            fs.write_file(f"/t{indice}/{nome}", b"z" * 100, (i * 37) % 200)
+            with fs.open("/compartilhado.txt", "ab") as arquivo:
+                arquivo.write(b"y" * 10)
+            # Movimentações em sentidos opostos entre /a e /b, que causariam deadlock sem ordem fixa das travas
+            origem, destino = ("/a", "/b") if indice % 2 else ("/b", "/a")
+            fs.move_file(f"/t{indice}/{nome}", origem)
+            fs.move_file(f"{origem}/{nome}", destino)
+            fs.read_file(f"{destino}/{nome}")
+            fs.list_directory(destino)
+            if i % 2:
+                fs.truncate_file(f"{destino}/{nome}", 0)
+
+    em_paralelo(THREADS, trabalho)
+    verificar_blocos(fs)
+    assert fs.lookup("/compartilhado.txt").size == THREADS * ITERACOES * 10
+    assert len(fs.list_directory("/a")) + len(fs.list_directory("/b")) == THREADS * ITERACOES
+    fs.close()
+    if image_path is not None:
+        # A imagem remontada tem o mesmo mapa de bits e os mesmos arquivos
+        fs = FileSystem(1 << 16, image_path=image_path)
+        verificar_blocos(fs)
+        assert len(fs.list_directory("/a")) + len(fs.list_directory("/b")) == THREADS * ITERACOES
+        fs.close()
+
+
+# Criações e remoções concorrentes no mesmo diretório não perdem nem duplicam entradas
+def test_mesmo_diretorio():
+    fs = FileSystem(1 << 14, block_size=64)
+    fs.create_directory("/d")
+
+    def trabalho(indice):
+        for i in range(ITERACOES):
+            fs.create_file(f"/d/f{indice}_{i}", b"dados")
+            if i % 2:
+                fs.remove_file(f"/d/f{indice}_{i}")
+
+    em_paralelo(THREADS, trabalho)
+    nomes = fs.list_directory("/d")
+    assert len(nomes) == len(set(nomes)) == THREADS * (ITERACOES - ITERACOES // 2)
+    verificar_blocos(fs)
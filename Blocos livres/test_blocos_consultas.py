@@ -0,0 +1,41 @@
+# Testes das consultas por atributo (query) e dos índices secundários do sistema de blocos livres
+import pytest
+
+from blocoslivres import FileSystem
+
+
+# Monta uma árvore com arquivos de tamanhos e donos diferentes
+def montar():
+    fs = FileSystem(256, block_size=512)
+    fs.create_directory("/d")
+    for i in range(6):
+        fs.create_file(f"/d/f{i}", b"x" * (i * 100))
+        fs.set_attribute(f"/d/f{i}", "dono", "ana" if i % 2 else "bia")
+    return fs
+
+
+# A consulta dá o mesmo resultado com e sem índice, e o índice acompanha as alterações
+@pytest.mark.parametrize("indice", [False, True])
+def test_consulta(indice):
+    fs = montar()
+    if indice:
+        fs.create_index("dono")
+        fs.create_index("size")
+    assert fs.query("dono", "==", "ana") == ["/d/f1", "/d/f3", "/d/f5"]
+    assert fs.query("size", ">=", 300) == ["/d/f3", "/d/f4", "/d/f5"]
+    fs.set_attribute("/d/f1", "dono", "bia")
+    fs.append_file("/d/f0", b"y" * 450)
+    fs.remove_file("/d/f5")
+    assert fs.query("dono", "==", "ana") == ["/d/f3"]
+    assert fs.query("size", ">=", 300) == ["/d/f0", "/d/f3", "/d/f4"]
+    with pytest.raises(Exception):
+        fs.query("dono", "~", "ana")
+
+
+# "size" é o tamanho do arquivo: não pode ser definido como atributo, e get_attribute e query concordam
+def test_atributo_size():
+    fs = montar()
+    with pytest.raises(Exception, match="size"):
+        fs.set_attribute("/d/f2", "size", 5)
+    assert fs.get_attribute("/d/f2", "size") == 200
+    assert fs.query("size", "==", 200) == ["/d/f2"]
@@ -0,0 +1,75 @@
+# Testes da deduplicação de blocos com contagem de referências
+from blocoslivres import FileSystem
+
+# Tamanho do bloco usado nos testes
+BLOCO = 512
+# Conteúdo de quatro blocos diferentes entre si
+CONTEUDO = b"".join(bytes([65 + i]) * BLOCO for i in range(4))
+
+
+# Cria um sistema com deduplicação e `copias` arquivos com o mesmo conteúdo
+def montar(copias):
+    fs = FileSystem(64, block_size=BLOCO, dedup=True)
+    for i in range(copias):
+        fs.create_file(f"/f{i}.bin", CONTEUDO)
+    return fs
+
+
+# Arquivos iguais compartilham os mesmos blocos físicos, e as estatísticas contam a economia
+def test_blocos_compartilhados():
+    fs = montar(3)
+    blocos = [list(fs.lookup(f"/f{i}.bin").iter_blocks()) for i in range(3)]
+    assert blocos[0] == blocos[1] == blocos[2]
+    assert fs.free_block_count() == 64 - 4
+    assert fs.refcounts == {bloco: 3 for bloco in blocos[0]}
+    estatisticas = fs.dedup_stats()
+    assert estatisticas["logical_blocks"] == 12 and estatisticas["physical_blocks"] == 4
+    assert estatisticas["dedup_ratio"] == 3.0
+    assert estatisticas["bytes_saved"] == 8 * BLOCO
+
+
+# Um bloco compartilhado só é liberado quando a última referência é removida
+def test_liberacao_pela_ultima_referencia():
+    fs = montar(3)
+    blocos = list(fs.lookup("/f0.bin").iter_blocks())
+    fs.remove_file("/f0.bin")
+    assert fs.free_block_count() == 64 - 4
+    assert fs.refcounts == {bloco: 2 for bloco in blocos}
+    fs.remove_file("/f1.bin")
+    assert fs.free_block_count() == 64 - 4
+    assert fs.refcounts == {}
+    assert all(fs.is_allocated(bloco) for bloco in blocos)
+    assert fs.read_file("/f2.bin") == CONTEUDO
+    fs.remove_file("/f2.bin")
+    assert fs.free_block_count() == 64
+    assert not any(fs.is_allocated(bloco) for bloco in blocos)
+    assert fs.dedup_stats()["bytes_saved"] == 0
+
+
+# free_block em um bloco compartilhado só retira uma referência
+def test_free_block_compartilhado():
+    fs = montar(2)
+    bloco = next(fs.lookup("/f0.bin").iter_blocks())
+    fs.free_block(bloco)
+    assert fs.is_allocated(bloco) and bloco not in fs.refcounts
+    fs.free_block(bloco)
+    assert not fs.is_allocated(bloco)
+
+
+# A escrita em um bloco compartilhado vai para um bloco novo (cópia na escrita), sem alterar os outros
+# arquivos; quando o conteúdo volta a ser igual, o bloco novo é liberado e o compartilhamento volta
+def test_copia_na_escrita():
+    fs = montar(2)
+    original = list(fs.lookup("/f0.bin").iter_blocks())
+    fs.write_file("/f1.bin", b"zz", BLOCO + 10)
+    copia = list(fs.lookup("/f1.bin").iter_blocks())
+    assert copia[0] == original[0] and copia[2:] == original[2:]
+    assert copia[1] != original[1]
+    assert original[1] not in fs.refcounts and fs.refcounts[original[0]] == 2
+    assert fs.free_block_count() == 64 - 5
+    assert fs.read_file("/f0.bin") == CONTEUDO
+    assert fs.read_file("/f1.bin") == CONTEUDO[:BLOCO + 10] + b"zz" + CONTEUDO[BLOCO + 12:]
+    fs.write_file("/f1.bin", CONTEUDO[BLOCO + 10:BLOCO + 12], BLOCO + 10)
+    assert list(fs.lookup("/f1.bin").iter_blocks()) == original
+    assert fs.free_block_count() == 64 - 4
+    assert fs.refcounts == {bloco: 2 for bloco in original}
@@ -0,0 +1,44 @@
+# Testes da desfragmentação do sistema de blocos livres
+from blockcodec import CODECS
+from blocoslivres import FileSystem
+
+# Tamanho do bloco usado nos testes
+BLOCO = 512
+
+
+# Cria um arquivo fragmentado: as partes de /a.txt ficam intercaladas com as de outros arquivos
+def criar_fragmentado(fs, partes=6):
+    conteudo = b""
+    fs.create_file("/a.txt", b"")
+    for i in range(partes):
+        parte = bytes([65 + i]) * BLOCO * 2
+        with fs.open("/a.txt", "ab") as arquivo:
+            arquivo.write(parte)
+        conteudo += parte
+        fs.create_file(f"/outro{i}.txt", b"z" * BLOCO)
+    assert len(fs.lookup("/a.txt").extents) > 1
+    return conteudo
+
+
+# A desfragmentação junta as extensões de um arquivo sem alterar o conteúdo
+def test_desfragmentacao():
+    fs = FileSystem(4096, block_size=BLOCO)
+    conteudo = criar_fragmentado(fs)
+    fs.defragment()
+    assert len(fs.lookup("/a.txt").extents) == 1
+    assert fs.read_file("/a.txt") == conteudo
+
+
+# Os blocos movidos de um arquivo com codec próprio continuam com esse codec, e não com o padrão
+def test_desfragmentacao_mantem_o_codec():
+    fs = FileSystem(4096, block_size=BLOCO, compression="zlib")
+    conteudo = criar_fragmentado(fs)
+    fs.set_compression("/a.txt", "bz2")
+    fs.defragment()
+    entry = fs.lookup("/a.txt")
+    assert len(entry.extents) == 1
+    assert fs.read_file("/a.txt") == conteudo
+    tag = CODECS["bz2"][0]
+    for block in entry.iter_blocks():
+        assert fs.block_codecs[block] == "bz2"
+        assert fs.block_data[block][0] == tag
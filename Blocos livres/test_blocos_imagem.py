@@ -0,0 +1,206 @@
+# Testes da imagem de disco e da recuperação pelo journal
+# As falhas são simuladas com os._exit em um processo filho: nada é gravado além do que o journal já
+# registrou, e a montagem seguinte reaplica as transações completas.
+import os
+import subprocess
+import sys
+import textwrap
+import threading
+
+import pytest
+
+from blocoslivres import FileSystem
+
+PASTA = os.path.dirname(os.path.abspath(__file__))
+
+
+# Executa `codigo` em um processo filho que termina com os._exit (sem close nem sync); `fs` é um
+# FileSystem montado na imagem `caminho` com as `opcoes` informadas
+def falhar_depois(caminho, codigo, **opcoes):
+    programa = (f"import os, time\nfrom blocoslivres import FileSystem\n"
+                f"fs = FileSystem(256, image_path={caminho!r}, **{opcoes!r})\n"
+                f"{textwrap.dedent(codigo)}\nos._exit(0)\n")
+    subprocess.run([sys.executable, "-c", programa], cwd=PASTA, check=True)
+
+
+# Os arquivos, diretórios e atributos sobrevivem a uma desmontagem normal
+def test_remontagem(tmp_path):
+    caminho = str(tmp_path / "disco.img")
+    fs = FileSystem(1024, image_path=caminho)
+    fs.create_directory("/docs")
+    fs.create_file("/docs/notas.txt", b"x" * 10000)
+    fs.set_attribute("/docs/notas.txt", "dono", "ana")
+    livres = fs.free_block_count()
+    fs.close()
+    fs = FileSystem(1024, image_path=caminho)
+    assert fs.list_directory("/docs") == ["notas.txt"]
+    assert fs.read_file("/docs/notas.txt") == b"x" * 10000
+    assert fs.get_attribute("/docs/notas.txt", "dono") == "ana"
+    assert fs.free_block_count() == livres
+    fs.close()
+
+
+# As operações gravadas no journal são reaplicadas depois de uma falha
+def test_falha_depois_do_commit(tmp_path):
+    caminho = str(tmp_path / "disco.img")
+    falhar_depois(caminho, """
+        fs.create_directory("/d")
+        fs.create_file("/d/a.txt", b"conteudo")
+        fs.sync()
+    """)
+    fs = FileSystem(256, image_path=caminho)
+    assert fs.read_file("/d/a.txt") == b"conteudo"
+    fs.close()
+
+
+# Sem novas operações, o lote pendente é gravado quando journal_commit_interval termina
+def test_commit_ocioso(tmp_path):
+    caminho = str(tmp_path / "disco.img")
+    falhar_depois(caminho, """
+        fs.create_directory("/d")
+        fs.create_file("/d/a.txt", b"conteudo")
+        time.sleep(0.5)
+    """, journal_commit_interval=0.01)
+    fs = FileSystem(256, image_path=caminho)
+    assert fs.list_directory("/") == ["d"]
+    assert fs.read_file("/d/a.txt") == b"conteudo"
+    fs.close()
+
+
+# Uma remoção ainda não gravada no journal não deixa o arquivo restaurado com blocos zerados ou
+# reutilizados por outro arquivo
+def test_falha_antes_do_commit_da_remocao(tmp_path):
+    caminho = str(tmp_path / "disco.img")
+    falhar_depois(caminho, """
+        fs.create_file("/a.txt", b"A" * 20000)
+        fs.sync()
+        fs.remove_file("/a.txt")
+        fs.create_file("/b.txt", b"B" * 20000)
+    """, journal_commit_interval=1000)
+    fs = FileSystem(256, image_path=caminho)
+    assert fs.list_directory("/") == ["a.txt"]
+    assert fs.read_file("/a.txt") == b"A" * 20000
+    fs.close()
+
+
+# O commit feito pela operação de outra thread não leva a liberação de blocos de uma operação ainda em
+# andamento: depois da falha, o arquivo continua com as suas extensões, ocupadas no mapa de bits
+def test_falha_com_liberacao_em_outra_thread(tmp_path):
+    caminho = str(tmp_path / "disco.img")
+    falhar_depois(caminho, """
+        import threading
+        fs.create_file("/f", b"F" * 16384)
+        fs.sync()
+        entry = fs.lookup("/f")
+        with entry.lock:
+            fs._free_extents(list(entry.extents))
+            outra = threading.Thread(target=fs.create_directory, args=("/d",))
+            outra.start()
+            outra.join()
+    """, journal_batch_size=1)
+    fs = FileSystem(256, image_path=caminho)
+    assert fs.list_directory("/") == ["f", "d"]
+    extents = list(fs.lookup("/f").extents)
+    assert all(fs.is_allocated(block) for start, length in extents for block in range(start, start + length))
+    fs.create_file("/g", b"G" * 16384)
+    assert fs.read_file("/f") == b"F" * 16384
+    fs.close()
+
+
+# Os blocos liberados voltam ao alocador depois do commit, e o mapa de bits da imagem acompanha
+def test_blocos_liberados_depois_do_commit(tmp_path):
+    caminho = str(tmp_path / "disco.img")
+    fs = FileSystem(1024, image_path=caminho, journal_commit_interval=1000)
+    livres = fs.free_block_count()
+    fs.create_file("/a.txt", b"A" * 200000)
+    fs.remove_file("/a.txt")
+    assert fs.free_block_count() < livres
+    fs.sync()
+    assert fs.free_block_count() == livres
+    fs.close()
+    fs = FileSystem(1024, image_path=caminho)
+    assert fs.free_block_count() == livres
+    fs.close()
+
+
+# A montagem restaura as entradas dos diretórios na ordem de criação, mesmo com inodes reutilizados e
+# entradas movidas (a ordem de que iterdir e a listagem paginada dependem)
+def test_ordem_das_entradas(tmp_path):
+    caminho = str(tmp_path / "disco.img")
+    fs = FileSystem(1024, image_path=caminho)
+    fs.create_directory("/d")
+    fs.create_directory("/e")
+    for i in range(10):
+        fs.create_file(f"/d/f{i}", b"x")
+    for i in range(0, 10, 3):
+        fs.remove_file(f"/d/f{i}")
+    for i in range(10, 14):
+        fs.create_file(f"/d/f{i}", b"x")
+    fs.move_file("/d/f1", "/e")
+    fs.move_file("/e/f1", "/d")
+    ordem = fs.list_directory("/d")
+    fs.close()
+    fs = FileSystem(1024, image_path=caminho)
+    assert fs.list_directory("/d") == ordem
+    assert [nome for nome, _ in fs.iterdir("/d", 3, 4)] == ordem[3:7]
+    fs.create_file("/d/novo", b"")
+    assert fs.list_directory("/d") == ordem + ["novo"]
+    fs.close()
+
+
+# Uma leitura antecipada pedida antes da remoção de um arquivo não coloca no cache os dados antigos dos
+# blocos liberados (que continuam na imagem até o commit) para o próximo dono
+def test_leitura_antecipada_de_blocos_liberados(tmp_path):
+    fs = FileSystem(64, image_path=str(tmp_path / "disco.img"), cache_blocks=32, journal_commit_interval=1000)
+    fs.create_file("/a.txt", b"a" * 4096 * 4)
+    entry = fs.lookup("/a.txt")
+    first, length = entry.extents[0]
+    fs._read_ahead(entry, 0, entry.size)
+    fs.prefetcher.submit(lambda: None).result()
+    fs.cache.discard(first, length)
+    # Segura a thread da leitura antecipada enquanto o arquivo é removido
+    liberar = threading.Event()
+    fs.prefetcher.submit(liberar.wait)
+    fs._read_ahead(entry, 0, entry.size)
+    fs.remove_file("/a.txt")
+    liberar.set()
+    fs.prefetcher.submit(lambda: None).result()
+    assert not any(block in fs.cache.data for block in range(first, first + length))
+    fs.sync()
+    assert fs.allocate_extent(length, hint=first) == (first, length)
+    assert bytes(fs.read_block(first)) == bytes(4096)
+    fs.close()
+
+
+# Um bloco liberado, mesmo antes do commit que o devolve ao alocador, não aceita uma segunda liberação,
+# leitura nem escrita (como sem imagem)
+def test_bloco_liberado_antes_do_commit(tmp_path):
+    fs = FileSystem(64, image_path=str(tmp_path / "disco.img"), journal_commit_interval=1000)
+    block = fs.allocate_block()
+    start, length = fs.allocate_extent(4)
+    fs.free_block(block)
+    fs.free_extent(start + 2, 2)
+    assert not fs.is_allocated(block)
+    for chamada in (lambda: fs.free_block(block), lambda: fs.write_block(block, b"x"),
+                    lambda: fs.read_block(block), lambda: fs.free_extent(start, 4)):
+        with pytest.raises(Exception, match="Bloco não está alocado"):
+            chamada()
+    fs.free_extent(start, 2)
+    fs.sync()
+    assert fs.free_block_count() == 64
+    fs.close()
+
+
+# Renomear uma entrada no mesmo diretório mantém a sua posição na listagem, também depois da montagem
+def test_renomear_mantem_a_posicao(tmp_path):
+    caminho = str(tmp_path / "disco.img")
+    fs = FileSystem(256, image_path=caminho)
+    for nome in ("a", "b", "c"):
+        fs.create_file(f"/{nome}", b"x")
+    fs.move("/b", "/novo")
+    assert fs.list_directory("/") == ["a", "novo", "c"]
+    assert fs.read_file("/novo") == b"x"
+    fs.close()
+    fs = FileSystem(256, image_path=caminho)
+    assert fs.list_directory("/") == ["a", "novo", "c"]
+    fs.close()
@@ -0,0 +1,74 @@
+# Testes da importação e da exportação de árvores do sistema de blocos livres
+import io
+import os
+import tarfile
+
+import pytest
+
+from blocoslivres import FileSystem
+
+
+# Cria no computador uma árvore pequena em `raiz` e retorna {caminho relativo: conteúdo}
+def criar_arvore(raiz):
+    arquivos = {"a.txt": b"primeiro", "sub/b.bin": os.urandom(3 << 20), "sub/vazio.txt": b"",
+                "sub/mais/c.txt": b"terceiro"}
+    for relativo, conteudo in arquivos.items():
+        caminho = os.path.join(raiz, *relativo.split("/"))
+        os.makedirs(os.path.dirname(caminho), exist_ok=True)
+        with open(caminho, "wb") as arquivo:
+            arquivo.write(conteudo)
+    return arquivos
+
+
+# Confere os arquivos importados no diretório `base` do sistema de arquivos
+def conferir(fs, base, arquivos):
+    for relativo, conteudo in arquivos.items():
+        assert fs.read_file(f"{base}/{relativo}") == conteudo, relativo
+
+
+# Um diretório importado e exportado (para um diretório e para um .tar) volta com o mesmo conteúdo
+def test_ida_e_volta(tmp_path):
+    arquivos = criar_arvore(tmp_path / "origem")
+    fs = FileSystem(4096)
+    totais = fs.import_tree(str(tmp_path / "origem"), "/", "dados")
+    assert totais["files"] == len(arquivos)
+    assert totais["bytes"] == sum(len(conteudo) for conteudo in arquivos.values())
+    conferir(fs, "/dados", arquivos)
+
+    fs.export_tree("/dados", str(tmp_path / "exportado"))
+    for relativo, conteudo in arquivos.items():
+        assert (tmp_path / "exportado" / relativo).read_bytes() == conteudo
+
+    fs.export_tree("/dados", str(tmp_path / "copia.tar.gz"))
+    fs.import_tree(str(tmp_path / "copia.tar.gz"), "/")
+    conferir(fs, "/copia", arquivos)
+    assert fs.list_directory("/") == ["dados", "copia"]
+
+
+# Uma origem inexistente, que não é um .tar ou cujo nome já existe no destino lança Exception com a mensagem do sistema de arquivos
+def test_erros(tmp_path):
+    fs = FileSystem(256)
+    with pytest.raises(Exception, match="Origem não existe"):
+        fs.import_tree(str(tmp_path / "nada"), "/")
+    (tmp_path / "origem").mkdir()
+    fs.import_tree(str(tmp_path / "origem"), "/")
+    with pytest.raises(Exception, match="já existe"):
+        fs.import_tree(str(tmp_path / "origem"), "/")
+    (tmp_path / "texto.txt").write_bytes(b"nao e tar")
+    with pytest.raises(Exception, match="nem um arquivo .tar"):
+        fs.import_tree(str(tmp_path / "texto.txt"), "/")
+    assert fs.list_directory("/") == ["origem"]
+
+
+# Os caminhos com ".." de um .tar são ignorados, e os demais membros são importados
+def test_tar_com_caminho_para_fora(tmp_path):
+    caminho = str(tmp_path / "suspeito.tar")
+    with tarfile.open(caminho, "w") as arquivo:
+        for nome, conteudo in [("ok.txt", b"ok"), ("../fora.txt", b"x"), ("d/../../fora2.txt", b"y")]:
+            membro = tarfile.TarInfo(nome)
+            membro.size = len(conteudo)
+            arquivo.addfile(membro, io.BytesIO(conteudo))
+    fs = FileSystem(256)
+    assert fs.import_tree(caminho, "/", "dados")["files"] == 1
+    assert fs.list_directory("/dados") == ["ok.txt"]
+    assert fs.list_directory("/") == ["dados"]
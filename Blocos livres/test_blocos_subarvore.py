@@ -0,0 +1,95 @@
+# Testes das operações sobre subárvores do sistema de blocos livres: rmtree, copytree e move
+import threading
+
+import pytest
+
+from blocoslivres import FileSystem, OperationCancelled
+
+# Tamanho do bloco usado nos testes
+BLOCO = 512
+
+
+# Monta /p/sub com 20 arquivos de dois blocos, /p/z e um arquivo fora da subárvore
+def montar():
+    fs = FileSystem(1024, block_size=BLOCO)
+    fs.create_directory("/p")
+    fs.create_directory("/p/sub")
+    for i in range(20):
+        fs.create_file(f"/p/sub/f{i}", bytes([i]) * BLOCO * 2)
+    fs.create_file("/p/z", b"z" * 10)
+    fs.create_file("/fora", b"f")
+    return fs
+
+
+# rmtree devolve todos os blocos em poucas sequências (as extensões vizinhas são unidas) e informa o total
+def test_rmtree():
+    fs = montar()
+    liberacoes = []
+    free_extent = fs.free_extent
+
+    def registrar(inicio, tamanho):
+        liberacoes.append((inicio, tamanho))
+        free_extent(inicio, tamanho)
+
+    fs.free_extent = registrar
+    lotes = []
+    totais = fs.rmtree("/p", progress=lambda entradas, blocos: lotes.append((entradas, blocos)))
+    assert totais == {"entries": 23, "blocks": 41}
+    assert lotes[-1] == (23, 41)
+    assert liberacoes == [(0, 41)]
+    assert fs.free_block_count() == 1024 - 1
+    assert fs.list_directory("/") == ["fora"]
+    assert fs.lookup("/p/sub/f0") is None
+    with pytest.raises(Exception):
+        fs.rmtree("/")
+
+
+# Um rmtree cancelado antes de começar não remove nada, e o diretório atual não pode ser removido
+def test_rmtree_cancelado():
+    fs = montar()
+    cancel = threading.Event()
+    cancel.set()
+    with pytest.raises(OperationCancelled):
+        fs.rmtree("/p", cancel=cancel)
+    assert fs.read_file("/p/sub/f3") == bytes([3]) * BLOCO * 2
+    fs.navigate("/p/sub")
+    with pytest.raises(Exception):
+        fs.rmtree("/p")
+    assert fs.lookup("/p/sub") is not None
+
+
+# copytree cria uma cópia com blocos próprios; alterar a cópia não muda o original
+def test_copytree():
+    fs = montar()
+    fs.set_attribute("/p/z", "tipo", "dado")
+    livres = fs.free_block_count()
+    totais = fs.copytree("/p", "/q")
+    assert totais == {"entries": 23, "blocks": 41}
+    assert fs.free_block_count() == livres - 41
+    assert fs.list_directory("/q/sub") == fs.list_directory("/p/sub")
+    assert fs.get_attribute("/q/z", "tipo") == "dado"
+    fs.write_file("/q/sub/f1", b"ALTERADO")
+    assert fs.read_file("/p/sub/f1") == bytes([1]) * BLOCO * 2
+    assert set(fs.lookup("/q/sub/f1").iter_blocks()).isdisjoint(fs.lookup("/p/sub/f1").iter_blocks())
+    with pytest.raises(Exception):
+        fs.copytree("/p", "/q")
+    with pytest.raises(Exception):
+        fs.copytree("/p", "/p/sub/copia")
+
+
+# move leva a subárvore para outro diretório (ou para um novo nome) sem copiar blocos
+def test_move():
+    fs = montar()
+    blocos = list(fs.lookup("/p/sub/f0").iter_blocks())
+    fs.create_directory("/destino")
+    fs.move("/p/sub", "/destino")
+    assert fs.lookup("/p/sub") is None
+    assert list(fs.lookup("/destino/sub/f0").iter_blocks()) == blocos
+    fs.move("/destino/sub", "/s")
+    assert fs.read_file("/s/f0") == bytes(BLOCO * 2)
+    with pytest.raises(Exception):
+        fs.move("/p", "/p/z2")
+    with pytest.raises(Exception):
+        fs.move("/destino", "/destino")
+    with pytest.raises(Exception):
+        fs.move("/", "/destino")
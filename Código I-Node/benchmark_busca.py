@@ -0,0 +1,61 @@
+# Benchmark da resolução de caminhos no sistema de arquivos i-node
+# Compara a busca linear antiga (lista de filhos) com o índice por nome
+import time
+
+from inode import FileSystem, INode
+
+# Tamanhos de diretório avaliados
+TAMANHOS = [10_000, 100_000, 1_000_000]
+# Quantidade de buscas medidas para cada tamanho
+BUSCAS = 200
+
+
+# Busca linear equivalente à implementação anterior de find_node
+def find_node_linear(fs, path):
+    if path == "/":
+        return fs.root
+    parts = path.strip("/").split("/")
+    current_node = fs.root
+    for part in parts:
+        if current_node.is_directory:
+            found = False
+            for child in current_node.children.values():
+                if child.name == part:
+                    current_node = child
+                    found = True
+                    break
+            if not found:
+                return None
+        else:
+            return None
+    return current_node
+
+
+# Mede a latência média (em microssegundos) de uma função de busca
+def medir(busca, fs, caminhos):
+    inicio = time.perf_counter()
+    for caminho in caminhos:
+        busca(fs, caminho)
+    return (time.perf_counter() - inicio) / len(caminhos) * 1e6
+
+
+# Executa o benchmark para um diretório com a quantidade de entradas informada
+def executar(tamanho):
+    fs = FileSystem()
+    diretorio = INode("dados", True)
+    fs.root.add_child(diretorio)
+    for i in range(tamanho):
+        diretorio.add_child(INode(f"arquivo{i}.txt"))
+    # Busca entradas espalhadas pelo diretório (em média metade da lista é percorrida)
+    passo = max(1, tamanho // BUSCAS)
+    caminhos = [f"/dados/arquivo{i}.txt" for i in range(0, tamanho, passo)][:BUSCAS]
+    # Limita as buscas lineares nos tamanhos grandes para o benchmark terminar em tempo razoável
+    caminhos_lineares = caminhos[:: max(1, tamanho // 10_000)]
+    antes = medir(find_node_linear, fs, caminhos_lineares)
+    depois = medir(FileSystem.find_node, fs, caminhos)
+    print(f"{tamanho:>9} entradas | antes: {antes:12.2f} us | depois: {depois:8.2f} us | {antes / depois:10.1f}x")
+
+
+if __name__ == "__main__":
+    for tamanho in TAMANHOS:
+        executar(tamanho)
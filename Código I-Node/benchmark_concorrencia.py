@@ -0,0 +1,60 @@
+# Benchmark de vazão do sistema de arquivos i-node com várias threads
+# Mede operações por segundo com 1, 2, 4 e 8 threads, cada uma em seu próprio diretório.
+# O teste de estresse com as verificações da árvore fica em test_inode_concorrencia.py.
+import threading
+import time
+
+from inode import FileSystem
+
+# Quantidades de threads avaliadas no benchmark
+THREADS = [1, 2, 4, 8]
+# Operações executadas por cada thread no benchmark
+OPERACOES = 20_000
+
+
+# Executa a função em `quantidade` threads e retorna o tempo total (as exceções são repassadas)
+def em_paralelo(quantidade, funcao):
+    erros = []
+    inicio_comum = threading.Barrier(quantidade)
+
+    def executar(indice):
+        try:
+            inicio_comum.wait()
+            funcao(indice)
+        except BaseException as erro:
+            erros.append(erro)
+
+    threads = [threading.Thread(target=executar, args=(i,)) for i in range(quantidade)]
+    inicio = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if erros:
+        raise erros[0]
+    return time.perf_counter() - inicio
+
+
+# Mede a vazão com threads trabalhando em diretórios disjuntos
+def vazao(quantidade):
+    fs = FileSystem()
+    for i in range(quantidade):
+        fs.add_node("/", f"t{i}", True)
+
+    def trabalho(indice):
+        diretorio = f"/t{indice}"
+        for i in range(OPERACOES // 4):
+            nome = f"f{i}"
+            fs.create_file(diretorio, nome, "conteudo")
+            fs.pwrite(f"{diretorio}/{nome}", 0, b"dados")
+            fs.read_file(f"{diretorio}/{nome}")
+            fs.find_node(f"{diretorio}/{nome}")
+
+    duracao = em_paralelo(quantidade, trabalho)
+    total = quantidade * OPERACOES
+    print(f"{quantidade} threads | {total:>7} operações | {duracao:6.2f} s | {total / duracao:10.0f} ops/s")
+
+
+if __name__ == "__main__":
+    for quantidade in THREADS:
+        vazao(quantidade)
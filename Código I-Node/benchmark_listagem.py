@@ -0,0 +1,34 @@
+# Benchmark da listagem paginada de diretórios do sistema de arquivos i-node
+# Compara o tempo de list_directory, que monta a listagem inteira, com o de iterdir, que monta só a página
+# mostrada na interface, em diretórios de tamanhos diferentes. Também mede a última página do diretório,
+# já que iterdir percorre as entradas anteriores à posição pedida.
+import time
+
+from directorypager import PAGE_SIZE
+from inode import FileSystem
+
+# Quantidades de entradas dos diretórios medidos
+QUANTIDADES = [1_000, 10_000, 100_000, 300_000]
+
+
+# Mede o tempo de uma chamada, em milissegundos (melhor de 3)
+def medir(funcao):
+    tempos = []
+    for _ in range(3):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return min(tempos) * 1000
+
+
+if __name__ == "__main__":
+    for quantidade in QUANTIDADES:
+        fs = FileSystem()
+        fs.add_node("/", "dados", True)
+        for i in range(quantidade):
+            fs.add_node("/dados", f"arquivo{i}.txt")
+        completa = medir(lambda: fs.list_directory("/dados"))
+        primeira = medir(lambda: fs.iterdir("/dados", 0, PAGE_SIZE))
+        ultima = medir(lambda: fs.iterdir("/dados", quantidade - PAGE_SIZE, PAGE_SIZE))
+        print(f"{quantidade:>7} entradas | list_directory {completa:8.2f} ms | primeira página {primeira:6.3f} ms | "
+              f"última página {ultima:6.2f} ms")
@@ -0,0 +1,58 @@
+# Benchmark de memória das representações de nós do sistema de arquivos i-node
+# Mede com tracemalloc os bytes por arquivo vazio, por arquivo com conteúdo e por diretório vazio,
+# no FileSystem (objetos INode) e na INodeTable (estrutura de arrays), à medida que a árvore cresce.
+# Uso: python benchmark_memoria.py [quantidade ...] (sem argumentos, usa QUANTIDADES)
+import sys
+import tracemalloc
+
+from inode import FileSystem
+from inodetable import INodeTable
+
+# Quantidades de nós criados em cada medição
+QUANTIDADES = [1_000, 10_000, 50_000]
+# Conteúdo dos arquivos da medição "arquivo com conteúdo"
+CONTEUDO = b"conteudo do arquivo"
+
+
+# Mede os bytes alocados por item ao aplicar a função a `quantidade` índices
+def bytes_por_item(funcao, quantidade):
+    tracemalloc.start()
+    inicio = tracemalloc.get_traced_memory()[0]
+    for i in range(quantidade):
+        funcao(i)
+    total = tracemalloc.get_traced_memory()[0] - inicio
+    tracemalloc.stop()
+    return total / quantidade
+
+
+# Mede as três categorias de nós no FileSystem
+def medir_inodes(quantidade):
+    fs = FileSystem()
+    for nome in ("vazios", "cheios", "diretorios"):
+        fs.add_node("/", nome, True)
+
+    def arquivo_cheio(i):
+        fs.add_node("/cheios", f"arquivo{i}")
+        fs.pwrite(f"/cheios/arquivo{i}", 0, CONTEUDO)
+
+    return (bytes_por_item(lambda i: fs.add_node("/vazios", f"arquivo{i}"), quantidade),
+            bytes_por_item(arquivo_cheio, quantidade),
+            bytes_por_item(lambda i: fs.add_node("/diretorios", f"dir{i}", True), quantidade))
+
+
+# Mede as três categorias de nós na INodeTable
+def medir_tabela(quantidade):
+    tabela = INodeTable()
+    vazios, cheios, diretorios = (tabela.add(tabela.root, nome, True) for nome in ("vazios", "cheios", "diretorios"))
+    return (bytes_por_item(lambda i: tabela.add(vazios, f"arquivo{i}"), quantidade),
+            bytes_por_item(lambda i: tabela.write(tabela.add(cheios, f"arquivo{i}"), 0, CONTEUDO), quantidade),
+            bytes_por_item(lambda i: tabela.add(diretorios, f"dir{i}", True), quantidade))
+
+
+if __name__ == "__main__":
+    quantidades = [int(argumento) for argumento in sys.argv[1:]] or QUANTIDADES
+    for quantidade in quantidades:
+        for nome, medir in (("INode     ", medir_inodes), ("INodeTable", medir_tabela)):
+            vazio, cheio, diretorio = medir(quantidade)
+            print(f"{nome} | {quantidade:>9} nós | arquivo vazio {vazio:6.1f} B | "
+                  f"arquivo com conteúdo {cheio:6.1f} B | diretório {diretorio:6.1f} B")
@@ -0,0 +1,80 @@
+# Benchmark dos snapshots do sistema de arquivos i-node
+# Mede o tempo de criação de um snapshot em árvores de tamanhos diferentes (deve ser constante) e faz um
+# "backup" lendo todo o snapshot enquanto outra thread continua reescrevendo arquivos. No final, compara
+# o backup com o conteúdo do momento do snapshot e informa os bytes liberados ao remover o snapshot.
+import random
+import threading
+import time
+
+from inode import FileSystem
+
+# Quantidades de arquivos das árvores medidas
+QUANTIDADES = [1_000, 10_000, 100_000]
+# Arquivos por diretório
+POR_DIRETORIO = 1_000
+# Tamanho do conteúdo de cada arquivo (em bytes)
+TAMANHO = 4 * 1024
+
+
+# Monta uma árvore com `quantidade` arquivos e retorna os caminhos dos arquivos
+def montar(fs, quantidade):
+    caminhos = []
+    for i in range(quantidade):
+        diretorio = f"/d{i // POR_DIRETORIO}"
+        if i % POR_DIRETORIO == 0:
+            fs.add_node("/", diretorio[1:], True)
+        fs.create_file(diretorio, f"f{i}", bytes([i % 256]) * TAMANHO)
+        caminhos.append(f"{diretorio}/f{i}")
+    return caminhos
+
+
+# Lê todos os arquivos de um snapshot pelos métodos de leitura e retorna {caminho: conteúdo}
+def ler_snapshot(snapshot):
+    lido = {}
+    pendentes = ["/"]
+    while pendentes:
+        diretorio = pendentes.pop()
+        for entrada in snapshot.list_directory(diretorio):
+            caminho = f"{diretorio.rstrip('/')}/{entrada[4:]}"
+            if entrada.startswith("[D]"):
+                pendentes.append(caminho)
+            else:
+                lido[caminho] = snapshot.pread(caminho, 0, TAMANHO)
+    return lido
+
+
+# Mede a criação do snapshot e o backup com escritas simultâneas
+def medir(quantidade):
+    fs = FileSystem()
+    caminhos = montar(fs, quantidade)
+    inicio = time.perf_counter()
+    fs.create_snapshot("backup")
+    criacao = time.perf_counter() - inicio
+    snapshot = fs.get_snapshot("backup")
+
+    parar = threading.Event()
+    escritas = [0]
+
+    def escritor():
+        aleatorio = random.Random(1)
+        while not parar.is_set():
+            fs.pwrite(aleatorio.choice(caminhos), 0, b"alterado")
+            escritas[0] += 1
+
+    thread = threading.Thread(target=escritor)
+    thread.start()
+    inicio = time.perf_counter()
+    lido = ler_snapshot(snapshot)
+    backup = time.perf_counter() - inicio
+    parar.set()
+    thread.join()
+    assert len(lido) == quantidade
+    assert all(conteudo == bytes([int(caminho.rsplit("f", 1)[1]) % 256]) * TAMANHO for caminho, conteudo in lido.items())
+    megabytes = quantidade * TAMANHO / (1 << 20)
+    print(f"{quantidade:>7} arquivos | criação {criacao * 1e6:7.1f} µs | backup {megabytes / backup:6.0f} MB/s | "
+          f"{escritas[0] / backup:8.0f} escritas/s durante o backup | {fs.delete_snapshot('backup')}")
+
+
+if __name__ == "__main__":
+    for quantidade in QUANTIDADES:
+        medir(quantidade)
@@ -0,0 +1,32 @@
+# Benchmark do custo da coleta de métricas no sistema de arquivos i-node
+# Compara as operações sem coletor, com o coletor (contadores e histogramas) e com amostragem de todos os eventos
+import time
+
+from inode import FileSystem
+from tracing import Tracer
+
+# Quantidade de arquivos criados, lidos e editados em cada configuração
+ARQUIVOS = 50_000
+
+
+# Executa a carga de trabalho e retorna as operações por segundo
+def executar(fs):
+    fs.add_node("/", "dados", True)
+    inicio = time.perf_counter()
+    for i in range(ARQUIVOS):
+        fs.create_file("/dados", f"arquivo{i}.txt", "conteudo")
+        fs.read_file(f"/dados/arquivo{i}.txt")
+        fs.edit_file(f"/dados/arquivo{i}.txt", "novo conteudo")
+    return ARQUIVOS * 3 / (time.perf_counter() - inicio)
+
+
+if __name__ == "__main__":
+    sem_coletor = executar(FileSystem())
+    print(f"sem coletor             | {sem_coletor:10.0f} ops/s")
+    tracer = Tracer()
+    com_coletor = executar(FileSystem(tracer=tracer))
+    print(f"contadores e histograma | {com_coletor:10.0f} ops/s | {sem_coletor / com_coletor:5.2f}x mais lento")
+    amostrado = executar(FileSystem(tracer=Tracer(sample_rate=1.0)))
+    print(f"todos os eventos        | {amostrado:10.0f} ops/s | {sem_coletor / amostrado:5.2f}x mais lento")
+    for operacao in ("create_file", "read_file", "edit_file"):
+        print(f"{operacao:>12}: p50 {tracer.percentile(operacao, 50)} ns, p99 {tracer.percentile(operacao, 99)} ns")
@@ -0,0 +1,61 @@
+# Paginação da listagem de diretórios nas interfaces gráficas
+# O DirectoryPager pede as entradas de um diretório ao sistema de arquivos em páginas (iterdir) e entrega
+# cada página à interface, que só pede a próxima quando a rolagem chega perto do fim. Assim, um diretório
+# com centenas de milhares de entradas abre sem travar a interface. A posição é a quantidade de entradas
+# já entregues; como novas entradas entram no fim do diretório, as criações e remoções feitas pela
+# interface são aplicadas como diferenças sobre a listagem, sem recarregá-la.
+
+# Quantidade de entradas pedidas em cada página
+PAGE_SIZE = 500
+# Fração visível da listagem a partir da qual a próxima página é pedida
+PREFETCH_AT = 0.9
+
+
+# Classe que acompanha a posição da listagem paginada de um diretório
+class DirectoryPager:
+    # Inicializa a paginação; `fetch(start, limit)` retorna uma página de pares (nome, é diretório) e
+    # `deliver(page)` acrescenta essa página na interface
+    def __init__(self, fetch, deliver, page_size=PAGE_SIZE):
+        self.fetch = fetch
+        self.deliver = deliver
+        self.page_size = page_size
+        self.position = 0  # Quantidade de entradas do diretório já entregues
+        self.exhausted = False  # Indica que todas as entradas já foram entregues
+
+    # Recomeça a listagem (por exemplo, ao trocar de diretório) e entrega a primeira página
+    def reset(self, fetch=None):
+        if fetch is not None:
+            self.fetch = fetch
+        self.position = 0
+        self.exhausted = False
+        self.next_page()
+
+    # Entrega a próxima página, se ainda houver entradas
+    def next_page(self):
+        if self.exhausted:
+            return
+        page = self.fetch(self.position, self.page_size)
+        self.position += len(page)
+        self.exhausted = len(page) < self.page_size
+        if page:
+            self.deliver(page)
+
+    # Recebe a posição da barra de rolagem (o yscrollcommand da Listbox) e pede a próxima página quando a
+    # parte visível passa de PREFETCH_AT da listagem
+    def scrolled(self, first, last):
+        if not self.exhausted and float(last) >= PREFETCH_AT:
+            self.next_page()
+
+    # Registra uma entrada criada no diretório listado; retorna True se a interface deve mostrá-la agora
+    # (todas as páginas já foram entregues) ou False se ela virá em uma página futura
+    def added(self):
+        if self.exhausted:
+            self.position += 1
+            return True
+        return False
+
+    # Registra a remoção de uma entrada; `delivered` indica se ela já tinha sido entregue à interface,
+    # caso em que as entradas seguintes recuam uma posição
+    def removed(self, delivered=True):
+        if delivered:
+            self.position -= 1
@@ -1,362 +1,1649 @@
-# Importa o módulo tkinter como tk
-import tkinter as tk
-# Importa simpledialog e messagebox do tkinter
-from tkinter import simpledialog, messagebox
-# Importa os módulos os e io
-import os
+# Importa o módulo io
 import io
+import os
+import sys
+import threading
+import time
+from types import MappingProxyType
+from bisect import bisect_left
+from collections import OrderedDict, deque
+from itertools import islice
+
+from attrindex import AttributeIndex, OPERATORS, matches
+from blockcodec import CODECS, DecompressedCache, check_codec, compress
+from rwlock import RWLock
+
+# Tamanho de cada pedaço do conteúdo de um arquivo (em bytes)
+CHUNK_SIZE = 64 * 1024
+
+# Define a classe ChunkedBuffer para armazenar o conteúdo de um arquivo em pedaços de bytes
+# Escritas parciais, acréscimos e truncamentos só alteram os pedaços afetados
+class ChunkedBuffer:
+    __slots__ = ("chunks", "size", "shared")
+
+    # Inicializa o buffer, opcionalmente com um conteúdo inicial
+    def __init__(self, data=b""):
+        self.chunks = []  # Pedaços de CHUNK_SIZE bytes (o último pode ser menor)
+        self.size = 0  # Tamanho total em bytes
+        self.shared = None  # Índices dos pedaços compartilhados com um snapshot (ver share)
+        if data:
+            self.write(0, data)
+
+    # Obtém o tamanho do conteúdo
+    def __len__(self):
+        return self.size
+
+    # Ajusta o intervalo pedido aos limites do conteúdo
+    def _clamp(self, offset, size):
+        offset = min(max(offset, 0), self.size)
+        end = self.size if size is None else min(self.size, offset + max(size, 0))
+        return offset, end
+
+    # Obtém um pedaço para alteração, copiando-o antes se ele for compartilhado com um snapshot
+    def _own(self, index):
+        if self.shared and index in self.shared:
+            self.shared.discard(index)
+            self.chunks[index] = bytearray(self.chunks[index])
+        return self.chunks[index]
+
+    # Executa uma alteração que muda o tamanho de um pedaço; se houver uma memoryview exportada
+    # sobre ele, o pedaço é copiado antes (a visão antiga continua válida com os dados anteriores)
+    def _resize_chunk(self, index, change):
+        self._own(index)
+        try:
+            change(self.chunks[index])
+        except BufferError:
+            self.chunks[index] = bytearray(self.chunks[index])
+            change(self.chunks[index])
+
+    # Lê um intervalo de bytes (copia somente os pedaços envolvidos)
+    def read(self, offset=0, size=None):
+        offset, end = self._clamp(offset, size)
+        parts = []
+        while offset < end:
+            index, start = divmod(offset, CHUNK_SIZE)
+            stop = min(CHUNK_SIZE, start + end - offset)
+            parts.append(memoryview(self.chunks[index])[start:stop])
+            offset += stop - start
+        return b"".join(parts)
+
+    # Obtém uma memoryview do intervalo; não há cópia quando o intervalo está dentro de um só pedaço
+    def view(self, offset=0, size=None):
+        offset, end = self._clamp(offset, size)
+        index, start = divmod(offset, CHUNK_SIZE)
+        if offset == end:
+            return memoryview(b"")
+        if start + end - offset <= CHUNK_SIZE:
+            return memoryview(self.chunks[index]).toreadonly()[start:start + end - offset]
+        return memoryview(self.read(offset, end - offset))
+
+    # Escreve bytes a partir de um deslocamento, completando com zeros se começar depois do fim
+    def write(self, offset, data):
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        data = memoryview(data).cast("B")
+        if offset > self.size:
+            self.truncate(offset)
+        position = offset
+        written = 0
+        while written < len(data):
+            index, start = divmod(position, CHUNK_SIZE)
+            if index == len(self.chunks):
+                self.chunks.append(bytearray())
+            chunk = self._own(index)
+            count = min(CHUNK_SIZE - start, len(data) - written)
+            piece = data[written:written + count]
+            if start + count <= len(chunk):
+                # Sobrescrita dentro do pedaço: não muda o tamanho
+                chunk[start:start + count] = piece
+            else:
+                self._resize_chunk(index, lambda c: c.__setitem__(slice(start, None), piece))
+            position += count
+            written += count
+        self.size = max(self.size, offset + len(data))
+        return len(data)
+
+    # Acrescenta bytes ao final do conteúdo
+    def append(self, data):
+        return self.write(self.size, data)
+
+    # Trunca o conteúdo (ou o estende com zeros) até o tamanho informado
+    def truncate(self, size):
+        size = max(size, 0)
+        if size >= self.size:
+            while self.size < size:
+                index, start = divmod(self.size, CHUNK_SIZE)
+                if index == len(self.chunks):
+                    self.chunks.append(bytearray())
+                count = min(CHUNK_SIZE - start, size - self.size)
+                self._resize_chunk(index, lambda c: c.extend(bytes(count)))
+                self.size += count
+            return self.size
+        index, start = divmod(size, CHUNK_SIZE)
+        if start:
+            del self.chunks[index + 1:]
+            self._resize_chunk(index, lambda c: c.__delitem__(slice(start, None)))
+        else:
+            del self.chunks[index:]
+        if self.shared:
+            self.shared = {i for i in self.shared if i < len(self.chunks)}
+        self.size = size
+        return self.size
+
+    # Obtém todo o conteúdo como bytes
+    def getvalue(self):
+        return self.read()
+
+    # Cria uma cópia independente do buffer, pedaço por pedaço
+    def copy(self):
+        clone = ChunkedBuffer()
+        clone.chunks = [bytearray(chunk) for chunk in self.chunks]
+        clone.size = self.size
+        return clone
+
+    # Cria um clone que compartilha os pedaços com este buffer, sem copiar os dados
+    # O clone copia cada pedaço compartilhado na primeira alteração; este buffer não deve mais ser
+    # alterado, pois é o estado guardado para os snapshots (ver INode.freeze)
+    def share(self):
+        clone = ChunkedBuffer()
+        clone.chunks = list(self.chunks)
+        clone.size = self.size
+        clone.shared = set(range(len(self.chunks)))
+        return clone
+
+    # Obtém a quantidade de bytes ocupados pelos pedaços
+    def stored_size(self):
+        return sum(len(chunk) for chunk in self.chunks)
+
+# Cache dos pedaços descomprimidos, compartilhado por todos os CompressedBuffer (limitado em bytes)
+DECOMPRESSED_CACHE_BYTES = 32 * 1024 * 1024
+decompressed_cache = DecompressedCache(DECOMPRESSED_CACHE_BYTES)
+
+# Define a classe CompressedBuffer, um ChunkedBuffer cujos pedaços ficam comprimidos com um codec de
+# blockcodec.CODECS (pedaços que não diminuem ficam sem compressão)
+# Cada escrita recomprime somente os pedaços alterados; as leituras descomprimem pelo cache compartilhado
+class CompressedBuffer(ChunkedBuffer):
+    __slots__ = ("codec",)
+
+    # Inicializa o buffer com o codec e, opcionalmente, um conteúdo inicial
+    def __init__(self, codec, data=b""):
+        self.codec = codec
+        super().__init__(data)
+
+    # Obtém os bytes descomprimidos de um pedaço
+    def _chunk(self, index):
+        return decompressed_cache.get(self.chunks[index])
+
+    # Lê um intervalo de bytes
+    def read(self, offset=0, size=None):
+        offset, end = self._clamp(offset, size)
+        parts = []
+        while offset < end:
+            index, start = divmod(offset, CHUNK_SIZE)
+            stop = min(CHUNK_SIZE, start + end - offset)
+            parts.append(memoryview(self._chunk(index))[start:stop])
+            offset += stop - start
+        return b"".join(parts)
+
+    # Obtém uma memoryview do intervalo (os pedaços descomprimidos são imutáveis, então não há cópia
+    # quando o intervalo está dentro de um só pedaço)
+    def view(self, offset=0, size=None):
+        offset, end = self._clamp(offset, size)
+        index, start = divmod(offset, CHUNK_SIZE)
+        if offset == end:
+            return memoryview(b"")
+        if start + end - offset <= CHUNK_SIZE:
+            return memoryview(self._chunk(index))[start:start + end - offset]
+        return memoryview(self.read(offset, end - offset))
+
+    # Escreve bytes a partir de um deslocamento, completando com zeros se começar depois do fim
+    def write(self, offset, data):
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        data = memoryview(data).cast("B")
+        if offset > self.size:
+            self.truncate(offset)
+        position = offset
+        written = 0
+        while written < len(data):
+            index, start = divmod(position, CHUNK_SIZE)
+            count = min(CHUNK_SIZE - start, len(data) - written)
+            if index == len(self.chunks):
+                chunk = bytearray()
+                self.chunks.append(b"")
+            elif start == 0 and count == CHUNK_SIZE:
+                chunk = bytearray()  # O pedaço inteiro é substituído: não é preciso descomprimi-lo
+            else:
+                chunk = bytearray(self._chunk(index))
+            chunk[start:start + count] = data[written:written + count]
+            self.chunks[index] = compress(self.codec, chunk)
+            position += count
+            written += count
+        self.size = max(self.size, offset + len(data))
+        return len(data)
+
+    # Trunca o conteúdo (ou o estende com zeros) até o tamanho informado
+    def truncate(self, size):
+        size = max(size, 0)
+        if size >= self.size:
+            while self.size < size:
+                index, start = divmod(self.size, CHUNK_SIZE)
+                count = min(CHUNK_SIZE - start, size - self.size)
+                if index == len(self.chunks):
+                    self.chunks.append(b"")
+                self.chunks[index] = compress(self.codec, bytes(self._chunk(index)) + bytes(count))
+                self.size += count
+            return self.size
+        index, start = divmod(size, CHUNK_SIZE)
+        del self.chunks[index + 1 if start else index:]
+        if start:
+            self.chunks[index] = compress(self.codec, self._chunk(index)[:start])
+        self.size = size
+        return self.size
+
+    # Cria uma cópia do buffer; os pedaços guardados são imutáveis e podem ser compartilhados
+    def copy(self):
+        clone = CompressedBuffer(self.codec)
+        clone.chunks = list(self.chunks)
+        clone.size = self.size
+        return clone
+
+    # Cria um clone para os snapshots; como os pedaços são imutáveis, é a própria cópia
+    def share(self):
+        return self.copy()
+
+# Define a classe EmptyBuffer, o conteúdo compartilhado pelos arquivos ainda não escritos
+# Ela só pode ser lida; INode.buffer() troca o conteúdo por um ChunkedBuffer próprio na primeira escrita
+class EmptyBuffer(ChunkedBuffer):
+    __slots__ = ()
+
+    # Recusa escritas, que devem ser feitas no buffer próprio do arquivo
+    def write(self, offset, data):
+        raise TypeError("EmptyBuffer não aceita escritas")
+
+    # Só aceita truncar para o tamanho zero
+    def truncate(self, size):
+        if size > 0:
+            raise TypeError("EmptyBuffer não aceita escritas")
+        return 0
+
+    # A cópia de um conteúdo vazio é o próprio conteúdo vazio compartilhado
+    def copy(self):
+        return self
+
+    def share(self):
+        return self
+
+# Conteúdo de todos os arquivos vazios e filhos de todos os diretórios vazios (somente leitura)
+EMPTY_CONTENT = EmptyBuffer()
+EMPTY_CHILDREN = MappingProxyType({})
 
 # Define a classe INode para representar um nó no sistema de arquivos
+# Os nós usam __slots__ e só alocam o que usam: arquivos vazios compartilham EMPTY_CONTENT, diretórios
+# vazios compartilham EMPTY_CHILDREN e o dicionário de atributos só existe depois do primeiro set_attribute.
+# Os nomes são internados, então nomes repetidos em vários diretórios ocupam uma única string.
+# `generation` e `versions` guardam os estados anteriores do nó para os snapshots (ver FileSystem._prepare)
 class INode:
+    __slots__ = ("name", "is_directory", "children", "content", "lock", "parent", "attributes", "generation",
+                 "versions")
+
     # Inicializa um nó com nome e indica se é um diretório
     def __init__(self, name, is_directory=False):
-        self.name = name  # Nome do nó
+        self.name = sys.intern(name)  # Nome do nó
         self.is_directory = is_directory  # Se é um diretório
-        self.children = [] if is_directory else None  # Filhos (para diretórios)
-        self.content = None if is_directory else io.StringIO()  # Conteúdo (para arquivos)
+        self.children = EMPTY_CHILDREN if is_directory else None  # Filhos indexados por nome (para diretórios)
+        self.content = None if is_directory else EMPTY_CONTENT  # Conteúdo em bytes (para arquivos)
+        self.lock = RWLock() if is_directory else None  # Trava das entradas do diretório
+        self.parent = None  # Diretório que contém o nó (None para a raiz e para nós removidos)
+        self.attributes = None  # Atributos definidos com set_attribute (criado no primeiro uso)
+        self.generation = 0  # Geração do sistema de arquivos em que o estado atual do nó começou
+        self.versions = None  # Estados anteriores: lista de (geração inicial, geração final, cópia congelada)
+
+    # Obtém o conteúdo para escrita, criando o buffer próprio do arquivo na primeira escrita
+    # Com `codec`, o buffer criado é um CompressedBuffer
+    def buffer(self, codec=None):
+        if self.content is EMPTY_CONTENT:
+            self.content = CompressedBuffer(codec) if codec else ChunkedBuffer()
+        return self.content
+
+    # Cria uma cópia somente leitura do estado atual do nó, para os snapshots
+    # A cópia fica com o conteúdo atual e o nó passa a usar um clone que compartilha os pedaços; os filhos
+    # são os mesmos nós, só o dicionário de entradas é copiado
+    def freeze(self):
+        frozen = INode(self.name, self.is_directory)
+        frozen.lock = None
+        if self.is_directory:
+            frozen.children = dict(self.children) if self.children else EMPTY_CHILDREN
+        else:
+            frozen.content = self.content
+            self.content = self.content.share()
+        if self.attributes:
+            frozen.attributes = dict(self.attributes)
+        return frozen
+
+    # Obtém o valor de um atributo (os campos do nó, como "name", também podem ser lidos)
+    def get_attribute(self, attribute):
+        if attribute in INode.__slots__:
+            return getattr(self, attribute)
+        return self.attributes.get(attribute) if self.attributes else None
+
+    # Define o valor de um atributo
+    # Os campos do nó não podem ser alterados por aqui: trocar a trava, o pai ou os filhos corromperia a árvore
+    def set_attribute(self, attribute, value):
+        if attribute in INode.__slots__:
+            raise ValueError(f"Atributo reservado: {attribute!r}")
+        if self.attributes is None:
+            self.attributes = {}
+        self.attributes[attribute] = value
 
     # Adiciona um filho ao nó (apenas para diretórios)
+    # O dicionário preserva a ordem de inserção, então a listagem continua na mesma ordem
     def add_child(self, child):
         if self.is_directory:
-            self.children.append(child)
+            if self.children is EMPTY_CHILDREN:
+                self.children = {}
+            self.children[child.name] = child
+            child.parent = self
+
+    # Obtém um filho pelo nome em tempo constante (apenas para diretórios)
+    def get_child(self, name):
+        if self.is_directory:
+            return self.children.get(name)
+        return None
+
+    # Remove um filho pelo nome e o retorna (apenas para diretórios)
+    def remove_child(self, name):
+        if self.is_directory:
+            if name not in self.children:
+                return None
+            child = self.children.pop(name)
+            child.parent = None
+            if not self.children:
+                self.children = EMPTY_CHILDREN
+            return child
+        return None
+
+# Normaliza um caminho para a forma absoluta "/a/b" (sem barras repetidas ou finais)
+def normalize_path(path):
+    return "/" + "/".join(part for part in path.split("/") if part)
+
+# Define a classe DentryCache, um cache limitado de caminho absoluto para nó com descarte LRU
+class DentryCache:
+    # Inicializa o cache com a capacidade máxima de entradas
+    def __init__(self, capacity=4096):
+        self.capacity = capacity
+        self.entries = OrderedDict()  # Caminho normalizado -> INode, do menos ao mais recente
+        self.hits = 0  # Quantidade de acertos
+        self.misses = 0  # Quantidade de falhas
+        self.lock = threading.Lock()  # Protege as entradas e os contadores entre threads
+        # Incrementado a cada invalidação; uma busca iniciada antes de uma invalidação não grava seu resultado
+        self.generation = 0
+
+    # Obtém o nó em cache para o caminho, contabilizando acerto ou falha
+    def get(self, path):
+        with self.lock:
+            node = self.entries.get(path)
+            if node is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.entries.move_to_end(path)
+            return node
+
+    # Obtém o nó em cache sem contabilizar estatísticas (usado na busca de ancestrais)
+    def peek(self, path):
+        with self.lock:
+            node = self.entries.get(path)
+            if node is not None:
+                self.entries.move_to_end(path)
+            return node
+
+    # Armazena um nó no cache, descartando a entrada usada há mais tempo se estiver cheio
+    # Com `generation`, a entrada só é gravada se não houve invalidação desde o início da busca
+    def put(self, path, node, generation=None):
+        if self.capacity <= 0:
+            return
+        with self.lock:
+            if generation is not None and generation != self.generation:
+                return
+            self.entries[path] = node
+            self.entries.move_to_end(path)
+            if len(self.entries) > self.capacity:
+                self.entries.popitem(last=False)
+
+    # Invalida o caminho e toda a subárvore abaixo dele
+    def invalidate(self, path):
+        with self.lock:
+            self.generation += 1
+            if path == "/":
+                self.entries.clear()
+                return
+            prefix = path + "/"
+            for cached_path in [p for p in self.entries if p == path or p.startswith(prefix)]:
+                del self.entries[cached_path]
+
+    # Esvazia o cache
+    def clear(self):
+        with self.lock:
+            self.generation += 1
+            self.entries.clear()
+
+    # Retorna as estatísticas do cache
+    def stats(self):
+        with self.lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / total if total else 0.0,
+                "size": len(self.entries),
+                "capacity": self.capacity,
+            }
+
+# Interpreta o modo de abertura (como no open() do Python) e retorna
+# (pode ler, pode escrever, trunca, cria se não existir, acrescenta no final, modo binário)
+def parse_mode(mode):
+    kinds = set(mode)
+    if not kinds <= set("rwaxb+t") or len(mode) != len(kinds) or len(kinds & set("rwax")) != 1 or {"b", "t"} <= kinds:
+        raise ValueError(f"Modo inválido: {mode!r}")
+    update = "+" in kinds
+    return ("r" in kinds or update, "r" not in kinds or update, "w" in kinds,
+            not kinds & {"r"}, "a" in kinds, "b" in kinds)
+
+# Define a classe INodeFileIO, um arquivo bruto (io.RawIOBase) sobre o conteúdo de um INode
+# O FileSystem.open a envolve com os buffers e a camada de texto do módulo io
+class INodeFileIO(io.RawIOBase):
+    # Inicializa o arquivo sobre o nó com as permissões de leitura/escrita
+    # `lock` é a trava do conteúdo do nó, fornecida pelo FileSystem, e `codec` o codec de compressão
+    # usado se o arquivo ainda não tiver conteúdo próprio. `guard(node)` é o gerenciador de contexto das
+    # escritas (o FileSystem usa _changing, que também preserva o conteúdo para os snapshots); sem ele,
+    # as escritas só usam `lock`
+    def __init__(self, node, readable, writable, append=False, lock=None, codec=None, guard=None):
+        super().__init__()
+        self.node = node
+        self.codec = codec
+        self.lock = lock if lock is not None else threading.Lock()
+        self.guard = guard
+        self._readable = readable
+        self._writable = writable
+        self._append = append
+        self.position = 0
+
+    def readable(self):
+        return self._readable
+
+    def writable(self):
+        return self._writable
+
+    def seekable(self):
+        return True
+
+    # Obtém o gerenciador de contexto de uma escrita
+    def _writing(self):
+        return self.guard(self.node) if self.guard is not None else self.lock
+
+    # Lê bytes diretamente para o buffer informado
+    def readinto(self, buffer):
+        if not self._readable:
+            raise io.UnsupportedOperation("Arquivo não aberto para leitura")
+        with self.lock:
+            data = self.node.content.view(self.position, len(buffer))
+            count = len(data)
+            memoryview(buffer).cast("B")[:count] = data
+        self.position += count
+        return count
+
+    # Escreve bytes na posição atual (ou no final, no modo de acréscimo)
+    def write(self, data):
+        if not self._writable:
+            raise io.UnsupportedOperation("Arquivo não aberto para escrita")
+        with self._writing():
+            if self._append:
+                self.position = self.node.content.size
+            count = self.node.buffer(self.codec).write(self.position, data)
+        self.position += count
+        return count
+
+    # Muda a posição atual
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_SET:
+            position = offset
+        elif whence == io.SEEK_CUR:
+            position = self.position + offset
+        elif whence == io.SEEK_END:
+            position = self.node.content.size + offset
+        else:
+            raise ValueError(f"whence inválido: {whence}")
+        if position < 0:
+            raise ValueError("Posição negativa")
+        self.position = position
+        return position
+
+    def tell(self):
+        return self.position
+
+    # Trunca o arquivo no tamanho informado (ou na posição atual)
+    def truncate(self, size=None):
+        if not self._writable:
+            raise io.UnsupportedOperation("Arquivo não aberto para escrita")
+        with self._writing():
+            return self.node.buffer(self.codec).truncate(self.position if size is None else size)
+
+# Quantidade de travas compartilhadas pelo conteúdo dos arquivos
+CONTENT_LOCK_STRIPES = 64
+
+# Define a classe NodeChange, o gerenciador de contexto de uma alteração em um nó
+# Adquire snapshot_lock para leitura e a trava exclusiva do nó e prepara o nó para a alteração (ver
+# FileSystem._prepare). É uma classe, e não um @contextmanager, porque envolve toda escrita em arquivo
+class NodeChange:
+    __slots__ = ("filesystem", "node", "lock")
+
+    # Inicializa a alteração do nó no sistema de arquivos
+    def __init__(self, filesystem, node):
+        self.filesystem = filesystem
+        self.node = node
+        self.lock = None if node.is_directory else filesystem.content_locks[hash(node) % CONTENT_LOCK_STRIPES]
+
+    def __enter__(self):
+        filesystem = self.filesystem
+        filesystem.snapshot_lock.acquire_read()
+        try:
+            if self.lock is None:
+                self.node.lock.acquire_write()
+            else:
+                self.lock.acquire()
+        except BaseException:
+            filesystem.snapshot_lock.release_read()
+            raise
+        # Sem snapshots novos, o nó já está na geração atual e não há nada a preparar
+        if self.node.generation != filesystem.generation:
+            try:
+                filesystem._prepare(self.node)
+            except BaseException:
+                self.__exit__(None, None, None)
+                raise
+
+    def __exit__(self, kind, value, traceback):
+        if self.lock is None:
+            self.node.lock.release_write()
+        else:
+            self.lock.release()
+        self.filesystem.snapshot_lock.release_read()
+
+# Quantidade de nós processados por lote em rmtree e copytree (entre lotes há progresso e cancelamento)
+BULK_BATCH = 4096
+
+# Operações do FileSystem medidas quando há um coletor de métricas instalado (ver tracing.py)
+TRACED_OPERATIONS = (
+    "find_node", "add_node", "list_directory", "iterdir", "create_file", "read_file", "pread", "pwrite", "append",
+    "truncate", "open", "edit_file", "delete_node", "rename_node", "move_node", "rmtree", "copytree", "get_attribute",
+    "set_attribute", "query", "import_tree", "export_tree",
+)
+
+# Tamanho dos pedaços lidos e gravados na importação e na exportação de árvores (import_tree/export_tree)
+TRANSFER_CHUNK = 1 << 20
+# Quantidade padrão de threads que leem e gravam o conteúdo na importação e na exportação
+TRANSFER_WORKERS = 8
+# Quantidade máxima de arquivos de cada tarefa da importação e da exportação; os nós de uma tarefa entram
+# no diretório de uma vez
+TRANSFER_BATCH = 256
+# Quantidade de tarefas na fila por thread (limita a memória usada com diretórios muito grandes)
+TRANSFER_PENDING = 4
+# Sufixos dos arquivos .tar aceitos na exportação e o modo do tarfile correspondente
+TAR_MODES = {".tar": "w", ".tar.gz": "w:gz", ".tgz": "w:gz", ".tar.bz2": "w:bz2", ".tar.xz": "w:xz"}
+
+# Define a classe _Transfer, que acumula os totais de uma importação ou exportação (atualizados por várias
+# threads) e informa o progresso e o cancelamento
+class _Transfer:
+    # Inicializa os totais com a função de progresso e o evento de cancelamento
+    def __init__(self, progress, cancel):
+        self.progress = progress
+        self.cancel = cancel
+        self.files = self.directories = self.bytes = 0
+        self.started = time.perf_counter()
+        self.lock = threading.Lock()
+
+    # Soma arquivos, diretórios e bytes aos totais; cada lote de arquivos informa o progresso
+    def add(self, files=0, directories=0, size=0):
+        with self.lock:
+            self.files += files
+            self.directories += directories
+            self.bytes += size
+            if files and self.progress is not None:
+                self.progress(self.files, self.bytes)
+
+    # Indica se o cancelamento foi pedido
+    def cancelled(self):
+        return self.cancel is not None and self.cancel.is_set()
+
+    # Resume os totais com a duração e a vazão
+    def summary(self):
+        seconds = time.perf_counter() - self.started
+        files_per_second = self.files / seconds if seconds else 0.0
+        megabytes_per_second = self.bytes / (1 << 20) / seconds if seconds else 0.0
+        return (f"{self.files} arquivos, {self.directories} diretórios e {self.bytes} bytes em {seconds:.2f} s "
+                f"({files_per_second:.0f} arquivos/s, {megabytes_per_second:.1f} MB/s).")
+
+# Campos internos do INode, que não podem ser indexados nem consultados como atributos
+RESERVED_ATTRIBUTES = INode.__slots__
 
 # Define a classe FileSystem para gerenciar o sistema de arquivos
+# Concorrência: cada diretório tem uma RWLock para suas entradas; o conteúdo dos arquivos é protegido
+# por um conjunto fixo de travas escolhidas pelo nó; movimentações entre diretórios são serializadas
+# por rename_lock e travam os dois diretórios sempre na mesma ordem, o que evita deadlocks.
+# As alterações adquirem snapshot_lock para leitura (depois de rename_lock e antes das travas dos nós);
+# create_snapshot a adquire para escrita, então um snapshot nunca vê uma alteração pela metade
 class FileSystem:
-    # Inicializa o sistema de arquivos com um diretório raiz
-    def __init__(self):
+    # Inicializa o sistema de arquivos com um diretório raiz e o cache de caminhos
+    # `tracer` é um coletor de métricas opcional (por exemplo, tracing.Tracer)
+    # `compression` é o codec usado no conteúdo dos arquivos ("zlib", "lzma", "bz2" ou None, sem compressão);
+    # o atributo "compression" de um arquivo (ver set_compression) tem prioridade sobre ele
+    def __init__(self, cache_size=4096, tracer=None, compression=None):
+        check_codec(compression)
+        self.compression = compression
         self.root = INode("/", True)
+        self.dentry_cache = DentryCache(cache_size)
+        self.rename_lock = threading.Lock()
+        self.content_locks = [threading.Lock() for _ in range(CONTENT_LOCK_STRIPES)]
+        self.indexes = {}  # Índices secundários criados com create_index (atributo -> AttributeIndex)
+        self.generation = 0  # Geração atual; cada snapshot encerra uma geração
+        self.snapshots = {}  # Snapshots pelo nome
+        self.latest_snapshot = -1  # Geração do snapshot mais recente (-1 se não houver nenhum)
+        self.snapshot_lock = RWLock()
+        self.tracer = None
+        self.set_tracer(tracer)
+
+    # Instala (ou remove, com None) o coletor de métricas das operações
+    # As operações medidas são substituídas na instância por versões envolvidas pelo coletor;
+    # sem coletor, os métodos da classe são chamados diretamente, sem nenhum custo adicional
+    def set_tracer(self, tracer):
+        for operation in TRACED_OPERATIONS:
+            self.__dict__.pop(operation, None)
+        self.tracer = tracer
+        if tracer is not None:
+            for operation in TRACED_OPERATIONS:
+                setattr(self, operation, tracer.wrap(operation, getattr(self, operation)))
+
+    # Obtém a trava do conteúdo de um arquivo
+    def _content_lock(self, node):
+        return self.content_locks[hash(node) % CONTENT_LOCK_STRIPES]
+
+    # Obtém a trava exclusiva de um nó: a de escrita do diretório ou a do conteúdo do arquivo
+    def _node_lock(self, node):
+        return node.lock.writing() if node.is_directory else self._content_lock(node)
+
+    # Guarda o estado atual de um nó antes da sua primeira alteração na geração atual, se algum snapshot
+    # ainda o enxerga. Quem chama deve ter snapshot_lock (para leitura) e a trava exclusiva do nó
+    def _prepare(self, node):
+        generation = self.generation
+        if node.generation != generation:
+            if self.latest_snapshot >= node.generation:
+                if node.versions is None:
+                    node.versions = []
+                node.versions.append((node.generation, generation, node.freeze()))
+            node.generation = generation
+
+    # Obtém o gerenciador de contexto para alterar um nó (ver NodeChange)
+    def _changing(self, node):
+        return NodeChange(self, node)
+
+    # Obtém o codec de compressão de um arquivo (o do atributo "compression" ou o do sistema de arquivos)
+    def _codec_of(self, node):
+        if node.attributes and "compression" in node.attributes:
+            codec = node.attributes["compression"]
+            if codec is None or codec in CODECS:
+                return codec
+        return self.compression
+
+    # Cria o buffer de um arquivo com o codec do arquivo e um conteúdo inicial
+    def _new_buffer(self, node, data):
+        codec = self._codec_of(node)
+        return CompressedBuffer(codec, data) if codec else ChunkedBuffer(data)
+
+    # Obtém um filho de um diretório com a trava de leitura do diretório
+    def _lookup(self, directory, name):
+        with directory.lock.reading():
+            return directory.children.get(name)
 
     # Encontra um nó no caminho especificado
     def find_node(self, path):
-        print(f"find_node: Finding node at path: {path}")
+        path = normalize_path(path)
         if path == "/":
             return self.root
-        parts = path.strip("/").split("/")
+        node = self.dentry_cache.get(path)
+        if node is not None:
+            return node
+        generation = self.dentry_cache.generation
+        # Parte do ancestral mais próximo que estiver em cache, ou da raiz
         current_node = self.root
-        for part in parts:
-            if current_node.is_directory:
-                found = False
-                for child in current_node.children:
-                    if child.name == part:
-                        current_node = child
-                        found = True
-                        break
-                if not found:
-                    return None
-            else:
+        base = path
+        remaining = []
+        while base != "/":
+            base, _, part = base.rpartition("/")
+            base = base or "/"
+            remaining.append(part)
+            cached = self.dentry_cache.peek(base) if base != "/" else None
+            if cached is not None:
+                current_node = cached
+                break
+        for part in reversed(remaining):
+            if not current_node.is_directory:
+                return None
+            current_node = self._lookup(current_node, part)
+            if current_node is None:
                 return None
+        self.dentry_cache.put(path, current_node, generation)
         return current_node
 
     # Adiciona um nó ao caminho especificado
     def add_node(self, path, name, is_directory=False):
-        print(f"add_node: Adding node '{name}' at path '{path}', is_directory={is_directory}")
+        # Somente caminhos existentes ficam em cache, então criar um nó não deixa entradas obsoletas
         parent_node = self.find_node(path)
         if parent_node and parent_node.is_directory:
-            new_node = INode(name, is_directory)
-            parent_node.add_child(new_node)
-            return new_node
+            with self._changing(parent_node):
+                if name in parent_node.children:
+                    return None
+                new_node = INode(name, is_directory)
+                new_node.generation = self.generation
+                parent_node.add_child(new_node)
+                return new_node
         return None
 
     # Lista o conteúdo de um diretório
     def list_directory(self, path):
-        print(f"list_directory: Listing directory at path: {path}")
         node = self.find_node(path)
         if node and node.is_directory:
             content = []
-            for child in node.children:
-                if child.is_directory:
-                    content.append(f"[D] {child.name}")
-                else:
-                    content.append(f"[F] {child.name}")
+            with node.lock.reading():
+                for child in node.children.values():
+                    if child.is_directory:
+                        content.append(f"[D] {child.name}")
+                    else:
+                        content.append(f"[F] {child.name}")
             return content
         return None
 
+    # Lista uma página das entradas de um diretório como pares (nome, é diretório): até `limit` entradas a
+    # partir da posição `start`, na ordem de criação. Novas entradas entram no fim, então a página seguinte
+    # começa em `start` mais a quantidade de entradas recebidas. Retorna None se não for um diretório
+    def iterdir(self, path, start=0, limit=None):
+        node = self.find_node(path)
+        if node and node.is_directory:
+            with node.lock.reading():
+                children = islice(node.children.values(), start, None if limit is None else start + limit)
+                return [(child.name, child.is_directory) for child in children]
+        return None
+
     # Cria um arquivo com conteúdo especificado
     def create_file(self, path, name, content):
-        print(f"create_file: Creating file '{name}' at path '{path}' with content: {content}")
         node = self.add_node(path, name, False)
         if node:
-            node.content.write(content)
+            if content:
+                with self._changing(node):
+                    node.buffer(self._codec_of(node)).write(0, content)
             return f"Arquivo {name} criado com sucesso."
         return f"Erro ao criar o arquivo {name}."
 
-    # Lê o conteúdo de um arquivo
-    def read_file(self, path):
-        print(f"read_file: Reading file at path: {path}")
+    # Lê o conteúdo de um arquivo como texto; com as_view=True, retorna uma memoryview dos bytes
+    # (sem cópia quando o intervalo está dentro de um só pedaço do conteúdo)
+    def read_file(self, path, offset=0, size=None, as_view=False):
+        node = self.find_node(path)
+        if node and not node.is_directory:
+            with self._content_lock(node):
+                if as_view:
+                    return node.content.view(offset, size)
+                data = node.content.read(offset, size)
+            return data.decode("utf-8", errors="replace")
+        return None if as_view else "Erro ao ler o arquivo."
+
+    # Lê até `size` bytes de um arquivo a partir de `offset`
+    def pread(self, path, offset, size):
+        node = self.find_node(path)
+        if node and not node.is_directory:
+            with self._content_lock(node):
+                return node.content.read(offset, size)
+        return None
+
+    # Escreve bytes em um arquivo a partir de `offset`; retorna a quantidade de bytes escritos
+    def pwrite(self, path, offset, data):
         node = self.find_node(path)
         if node and not node.is_directory:
-            node.content.seek(0)
-            return node.content.read()
-        return "Erro ao ler o arquivo."
+            with self._changing(node):
+                return node.buffer(self._codec_of(node)).write(offset, data)
+        return None
+
+    # Acrescenta bytes ao final de um arquivo; retorna a quantidade de bytes escritos
+    def append(self, path, data):
+        node = self.find_node(path)
+        if node and not node.is_directory:
+            with self._changing(node):
+                return node.buffer(self._codec_of(node)).append(data)
+        return None
+
+    # Trunca (ou estende com zeros) um arquivo; retorna o novo tamanho
+    def truncate(self, path, size):
+        node = self.find_node(path)
+        if node and not node.is_directory:
+            with self._changing(node):
+                if size <= 0:
+                    node.content = EMPTY_CONTENT
+                    return 0
+                return node.buffer(self._codec_of(node)).truncate(size)
+        return None
+
+    # Abre um arquivo e retorna um objeto de arquivo (leitura/escrita em partes, seek e iteração)
+    # O modo segue o open() do Python: "r", "w", "a", "x" com "+" e "b"/"t" opcionais
+    def open(self, path, mode="r", encoding="utf-8"):
+        readable, writable, truncate, create, append, binary = parse_mode(mode)
+        node = self.find_node(path)
+        if node is None:
+            if not create:
+                return None
+            path = normalize_path(path)
+            parent_path, _, name = path.rpartition("/")
+            node = self.add_node(parent_path or "/", name, False)
+            if node is None:
+                return None
+        elif node.is_directory or "x" in mode:
+            return None
+        if truncate:
+            with self._changing(node):
+                node.content = EMPTY_CONTENT
+        raw = INodeFileIO(node, readable, writable, append, self._content_lock(node), self._codec_of(node),
+                          self._changing)
+        if readable and writable:
+            handle = io.BufferedRandom(raw, CHUNK_SIZE)
+        elif writable:
+            handle = io.BufferedWriter(raw, CHUNK_SIZE)
+        else:
+            handle = io.BufferedReader(raw, CHUNK_SIZE)
+        if binary:
+            return handle
+        return io.TextIOWrapper(handle, encoding=encoding)
 
     # Edita o conteúdo de um arquivo
     def edit_file(self, path, new_content):
-        print(f"edit_file: Editing file at path: {path} with new content: {new_content}")
         node = self.find_node(path)
         if node and not node.is_directory:
-            node.content = io.StringIO(new_content)
+            with self._changing(node):
+                node.content = self._new_buffer(node, new_content) if new_content else EMPTY_CONTENT
             return f"Arquivo {path} editado com sucesso."
         return "Erro ao editar o arquivo."
 
     # Deleta um nó no caminho especificado
     def delete_node(self, path):
-        print(f"delete_node: Deleting node at path: {path}")
-        parts = path.strip("/").split("/")
-        if len(parts) == 1:
+        path = normalize_path(path)
+        if path == "/":
             return "Erro: Não é possível remover o diretório raiz."
-        parent_path = "/" + "/".join(parts[:-1])
-        node_name = parts[-1]
-        parent_node = self.find_node(parent_path)
+        parent_path, _, node_name = path.rpartition("/")
+        parent_node = self.find_node(parent_path or "/")
         if parent_node and parent_node.is_directory:
-            for child in parent_node.children:
-                if child.name == node_name:
-                    parent_node.children.remove(child)
+            with self._changing(parent_node):
+                node = parent_node.remove_child(node_name)
+                if node is not None:
+                    # Remove do cache o nó e todos os caminhos abaixo dele
+                    self.dentry_cache.invalidate(path)
+                    self._unindex_subtree(node)
                     return f"Arquivo ou diretório {node_name} removido com sucesso."
         return "Erro ao remover o arquivo ou diretório."
 
+    # Renomeia um nó mantendo-o no mesmo diretório
+    def rename_node(self, path, new_name):
+        path = normalize_path(path)
+        if path == "/" or not new_name or "/" in new_name:
+            return "Erro ao renomear o nó."
+        parent_path, _, node_name = path.rpartition("/")
+        parent_node = self.find_node(parent_path or "/")
+        if not parent_node or not parent_node.is_directory:
+            return "Erro ao renomear o nó."
+        with self._changing(parent_node):
+            if node_name not in parent_node.children:
+                return "Erro ao renomear o nó."
+            if new_name in parent_node.children:
+                return f"Erro: já existe um nó chamado {new_name}."
+            node = parent_node.remove_child(node_name)
+            with self._node_lock(node):
+                self._prepare(node)
+            node.name = sys.intern(new_name)
+            parent_node.add_child(node)
+            # Os caminhos antigos da subárvore deixam de existir
+            self.dentry_cache.invalidate(path)
+        return f"Nó {node_name} renomeado para {new_name} com sucesso."
+
+    # Obtém a lista de nós percorridos da raiz até o caminho (ou None se algum não existir)
+    def _walk(self, path):
+        nodes = [self.root]
+        for part in filter(None, path.split("/")):
+            if not nodes[-1].is_directory:
+                return None
+            child = self._lookup(nodes[-1], part)
+            if child is None:
+                return None
+            nodes.append(child)
+        return nodes
+
+    # Move um nó para outro diretório, opcionalmente com um novo nome
+    def move_node(self, path, new_parent_path, new_name=None):
+        path = normalize_path(path)
+        new_parent_path = normalize_path(new_parent_path)
+        parent_path, _, node_name = path.rpartition("/")
+        new_name = new_name or node_name
+        if path == "/" or "/" in new_name:
+            return "Erro ao mover o nó."
+        if (parent_path or "/") == new_parent_path:
+            return self.rename_node(path, new_name) if new_name != node_name else f"Nó {node_name} movido com sucesso."
+        # Movimentações entre diretórios são serializadas para que duas delas não criem um ciclo
+        with self.rename_lock:
+            source = self._walk(parent_path or "/")
+            target = self._walk(new_parent_path)
+            if source is None or target is None or not target[-1].is_directory:
+                return "Erro ao mover o nó."
+            source_parent, target_parent = source[-1], target[-1]
+            # Trava os dois diretórios em uma ordem fixa (pelo id do objeto)
+            first, second = sorted((source_parent, target_parent), key=id)
+            with self.snapshot_lock.reading(), first.lock.writing(), second.lock.writing():
+                node = source_parent.children.get(node_name)
+                if node is None:
+                    return "Erro ao mover o nó."
+                # Um diretório não pode ser movido para dentro de si mesmo
+                if any(ancestor is node for ancestor in target):
+                    return "Erro: não é possível mover um diretório para dentro dele mesmo."
+                if new_name in target_parent.children:
+                    return f"Erro: já existe um nó chamado {new_name}."
+                self._prepare(source_parent)
+                self._prepare(target_parent)
+                with self._node_lock(node):
+                    self._prepare(node)
+                source_parent.remove_child(node_name)
+                node.name = sys.intern(new_name)
+                target_parent.add_child(node)
+                self.dentry_cache.invalidate(path)
+        return f"Nó {node_name} movido para {new_parent_path} com sucesso."
+
+    # Remove um diretório e toda a sua subárvore, liberando o conteúdo dos arquivos em lotes
+    # A subárvore é percorrida uma vez, em pós-ordem: os arquivos de cada diretório são removidos em lotes
+    # de BULK_BATCH e o diretório sai do pai quando fica vazio. `progress(nós, bytes)` é chamada a cada lote
+    # e `cancel` (por exemplo, um threading.Event) interrompe a remoção entre lotes, deixando intacto o que
+    # ainda não foi removido. Durante a remoção, movimentações entre diretórios esperam (rename_lock).
+    def rmtree(self, path, progress=None, cancel=None):
+        path = normalize_path(path)
+        if path == "/":
+            return "Erro: Não é possível remover o diretório raiz."
+        removed = freed = 0
+        with self.rename_lock:
+            nodes = self._walk(path)
+            if nodes is None or not nodes[-1].is_directory:
+                return "Erro ao remover o diretório."
+            stack = [(path, nodes[-1], nodes[-2], False)]
+            while stack:
+                if cancel is not None and cancel.is_set():
+                    return f"Operação cancelada: {removed} nós removidos e {freed} bytes liberados."
+                directory_path, directory, parent, visited = stack.pop()
+                if visited:
+                    # Todos os filhos já saíram: remove o diretório (vazio) do pai
+                    with self._changing(parent):
+                        parent.remove_child(directory.name)
+                    self.dentry_cache.invalidate(directory_path)
+                    self._unindex(directory)
+                    removed += 1
+                    continue
+                stack.append((directory_path, directory, parent, True))
+                with directory.lock.reading():
+                    children = list(directory.children.values())
+                files = []
+                for child in children:
+                    if child.is_directory:
+                        stack.append((f"{directory_path}/{child.name}", child, directory, False))
+                    else:
+                        files.append(child)
+                for start in range(0, len(files), BULK_BATCH):
+                    if start and cancel is not None and cancel.is_set():
+                        return f"Operação cancelada: {removed} nós removidos e {freed} bytes liberados."
+                    with self._changing(directory):
+                        for node in files[start:start + BULK_BATCH]:
+                            directory.remove_child(node.name)
+                            self._unindex(node)
+                            with self._content_lock(node):
+                                self._prepare(node)
+                                freed += node.content.size
+                                node.content = EMPTY_CONTENT
+                    removed += len(files[start:start + BULK_BATCH])
+                    self.dentry_cache.invalidate(directory_path)
+                    if progress is not None:
+                        progress(removed, freed)
+        if progress is not None:
+            progress(removed, freed)
+        return f"Diretório {path} removido com sucesso: {removed} nós e {freed} bytes liberados."
+
+    # Copia um diretório e toda a sua subárvore para outro diretório, opcionalmente com um novo nome
+    # A cópia é montada fora da árvore e só é ligada ao destino no final, então uma cópia cancelada
+    # (pelo `cancel`, verificado a cada lote) não deixa nada pela metade. `progress(nós, bytes)` é
+    # chamada a cada lote de BULK_BATCH nós copiados.
+    def copytree(self, path, new_parent_path, new_name=None, progress=None, cancel=None):
+        path = normalize_path(path)
+        source = self.find_node(path)
+        if source is None or not source.is_directory:
+            return "Erro ao copiar o diretório."
+        new_name = new_name or source.name
+        if path == "/" and new_name == "/" or "/" in new_name:
+            return "Erro ao copiar o diretório."
+        copied = size = 0
+        generation = self.generation
+        copy = INode(new_name, True)
+        copy.generation = generation
+        self._copy_attributes(source, copy)
+        stack = [(source, copy)]
+        while stack:
+            original, clone = stack.pop()
+            with original.lock.reading():
+                children = list(original.children.values())
+            for child in children:
+                if child.is_directory:
+                    child_clone = INode(child.name, True)
+                    stack.append((child, child_clone))
+                else:
+                    child_clone = INode(child.name, False)
+                    with self._content_lock(child):
+                        child_clone.content = child.content.copy()
+                    size += child_clone.content.size
+                self._copy_attributes(child, child_clone)
+                child_clone.generation = generation
+                clone.add_child(child_clone)
+                copied += 1
+                if copied % BULK_BATCH == 0:
+                    if cancel is not None and cancel.is_set():
+                        return f"Operação cancelada: nenhuma alteração feita em {new_parent_path}."
+                    if progress is not None:
+                        progress(copied, size)
+        error = self._attach(copy, new_parent_path, generation, "Erro ao copiar o diretório.")
+        if error:
+            return error
+        if progress is not None:
+            progress(copied, size)
+        return f"Diretório {path} copiado para {new_parent_path} com sucesso: {copied + 1} nós e {size} bytes."
+
+    # Liga ao diretório `new_parent_path` uma árvore montada fora do sistema de arquivos na geração
+    # `generation` e indexa os seus nós. Retorna None, ou a mensagem de erro (`missing` se o destino não
+    # é um diretório)
+    def _attach(self, tree, new_parent_path, generation, missing):
+        target = self.find_node(new_parent_path)
+        if target is None or not target.is_directory:
+            return missing
+        with self._changing(target):
+            if tree.name in target.children:
+                return f"Erro: já existe um nó chamado {tree.name}."
+            # A árvore entra na geração atual; se houve um snapshot enquanto ela era montada, os nós são
+            # atualizados para que ele não guarde versões de nós que não enxerga
+            if generation != self.generation:
+                for node in self._subtree(tree):
+                    node.generation = self.generation
+            target.add_child(tree)
+        self._index_subtree(tree)
+        return None
+
+    # Importa uma árvore do computador como o novo diretório `new_name` dentro de `new_parent_path`: o
+    # conteúdo de um diretório ou de um arquivo .tar (também comprimido com gzip, bz2 ou xz). Sem
+    # `new_name`, usa o nome da origem (sem a extensão do .tar). Como no copytree, a árvore é montada fora
+    # do sistema de arquivos e só é ligada ao destino no final, então uma importação cancelada não deixa
+    # nada pela metade. O conteúdo é lido em pedaços de TRANSFER_CHUNK por `workers` threads (um .tar é
+    # lido em sequência, como um fluxo) e os arquivos entram nos diretórios em lotes.
+    # `progress(arquivos, bytes)` é chamada a cada lote; a mensagem final informa a vazão
+    def import_tree(self, source, new_parent_path, new_name=None, workers=TRANSFER_WORKERS, progress=None,
+                    cancel=None):
+        if new_name is None:
+            new_name = os.path.basename(os.path.normpath(source))
+            for suffix in TAR_MODES:
+                if new_name.endswith(suffix):
+                    new_name = new_name[:-len(suffix)]
+                    break
+        if not new_name or "/" in new_name:
+            return "Erro ao importar a árvore."
+        # Verifica o destino antes de ler a origem (_attach verifica de novo ao ligar a árvore)
+        target = self.find_node(new_parent_path)
+        if target is None or not target.is_directory:
+            return "Erro ao importar a árvore."
+        if self._lookup(target, new_name) is not None:
+            return f"Erro: já existe um nó chamado {new_name}."
+        if not os.path.exists(source):
+            return f"Erro: a origem {source} não existe."
+        generation = self.generation
+        tree = INode(new_name, True)
+        tree.generation = generation
+        transfer = _Transfer(progress, cancel)
+        if os.path.isdir(source):
+            completed = self._run_tasks(self._import_directory_tasks(source, tree, generation, transfer),
+                                        workers, transfer)
+        else:
+            import tarfile
+            if not tarfile.is_tarfile(source):
+                return "Erro: a origem não é um diretório nem um arquivo .tar."
+            try:
+                completed = self._import_tar(source, tree, generation, transfer)
+            except ValueError as error:
+                return str(error)
+        if not completed:
+            return f"Operação cancelada: nenhuma alteração feita em {new_parent_path}."
+        error = self._attach(tree, new_parent_path, generation, "Erro ao importar a árvore.")
+        if error:
+            return error
+        return f"Árvore {source} importada para {new_parent_path}: {transfer.summary()}"
+
+    # Percorre um diretório do computador montando os diretórios da árvore e gera as tarefas que leem os
+    # arquivos, como tuplas (função, argumentos); para no cancelamento
+    def _import_directory_tasks(self, source, tree, generation, transfer):
+        stack = [(source, tree)]
+        while stack:
+            host_directory, directory = stack.pop()
+            batch = []
+            with os.scandir(host_directory) as items:
+                for item in items:
+                    if transfer.cancelled():
+                        return
+                    if item.is_dir(follow_symlinks=False):
+                        child = INode(item.name, True)
+                        child.generation = generation
+                        directory.add_child(child)
+                        stack.append((item.path, child))
+                        transfer.add(directories=1)
+                    elif item.is_file(follow_symlinks=False):
+                        batch.append((item.name, item.path))
+                        if len(batch) == TRANSFER_BATCH:
+                            yield self._read_host_files, (directory, batch, generation, transfer)
+                            batch = []
+            if batch:
+                yield self._read_host_files, (directory, batch, generation, transfer)
+
+    # Lê um lote de arquivos do computador em pedaços, criando os nós (executado pelas threads)
+    # Retorna o diretório e os nós, que são ligados a ele pela thread que percorre a árvore
+    def _read_host_files(self, directory, files, generation, transfer):
+        nodes = []
+        size = 0
+        for name, path in files:
+            if transfer.cancelled():
+                break
+            with open(path, "rb") as host_file:
+                node = self._read_chunks(name, generation, host_file)
+            size += node.content.size
+            nodes.append(node)
+        transfer.add(files=len(nodes), size=size)
+        return directory, nodes
+
+    # Cria um nó de arquivo fora da árvore com o conteúdo lido de `reader` em pedaços de TRANSFER_CHUNK
+    # Um pedaço menor que TRANSFER_CHUNK é o último, então arquivos pequenos são lidos com uma só chamada
+    def _read_chunks(self, name, generation, reader):
+        node = INode(name, False)
+        node.generation = generation
+        data = reader.read(TRANSFER_CHUNK)
+        if data:
+            node.content = self._new_buffer(node, data)
+            while len(data) == TRANSFER_CHUNK:
+                data = reader.read(TRANSFER_CHUNK)
+                node.content.append(data)
+        return node
+
+    # Lê um arquivo .tar em sequência montando a árvore; ligações, arquivos especiais e caminhos com ".."
+    # são ignorados. Retorna False se a importação foi cancelada; um arquivo e um diretório com o mesmo
+    # caminho lançam ValueError com a mensagem de erro (a árvore ainda não foi ligada, então nada muda)
+    def _import_tar(self, source, tree, generation, transfer):
+        import tarfile
+        directories = {(): tree}
+        with tarfile.open(source, "r|*") as archive:
+            for member in archive:
+                if transfer.cancelled():
+                    return False
+                parts = tuple(part for part in member.name.split("/") if part not in ("", "."))
+                if ".." in parts:
+                    continue
+                if member.isdir():
+                    self._tar_directory(directories, parts, generation, transfer)
+                elif member.isfile() and parts:
+                    directory = self._tar_directory(directories, parts[:-1], generation, transfer)
+                    existing = directory.get_child(parts[-1])
+                    if existing is not None and existing.is_directory:
+                        raise ValueError(f"Erro: já existe um diretório chamado {parts[-1]}.")
+                    node = self._read_chunks(parts[-1], generation, archive.extractfile(member))
+                    directory.add_child(node)
+                    transfer.add(files=1, size=node.content.size)
+        return True
+
+    # Obtém (criando, se preciso) o diretório da árvore de um caminho do .tar, dado como tupla de nomes
+    def _tar_directory(self, directories, parts, generation, transfer):
+        directory = directories.get(parts)
+        if directory is None:
+            parent = self._tar_directory(directories, parts[:-1], generation, transfer)
+            directory = parent.get_child(parts[-1])
+            if directory is not None and not directory.is_directory:
+                raise ValueError(f"Erro: já existe um arquivo chamado {parts[-1]}.")
+            if directory is None:
+                directory = INode(parts[-1], True)
+                directory.generation = generation
+                parent.add_child(directory)
+                transfer.add(directories=1)
+            directories[parts] = directory
+        return directory
+
+    # Exporta um diretório para o computador: se `destination` termina em .tar (ou .tar.gz, .tgz, .tar.bz2
+    # ou .tar.xz), a subárvore é gravada nesse arquivo, em sequência; senão, ela é criada dentro do diretório
+    # `destination` (criado se não existir), com o conteúdo copiado em pedaços por `workers` threads.
+    # `progress` e `cancel` funcionam como no import_tree; uma exportação cancelada fica parcial
+    def export_tree(self, path, destination, workers=TRANSFER_WORKERS, progress=None, cancel=None):
+        top = self.find_node(path)
+        if top is None or not top.is_directory:
+            return "Erro ao exportar o diretório."
+        transfer = _Transfer(progress, cancel)
+        mode = next((mode for suffix, mode in TAR_MODES.items() if destination.endswith(suffix)), None)
+        if mode is not None:
+            completed = self._export_tar(top, destination, mode, transfer)
+        else:
+            os.makedirs(destination, exist_ok=True)
+            completed = self._run_tasks(self._export_directory_tasks(top, destination, transfer), workers, transfer)
+        if not completed:
+            return f"Operação cancelada: exportação de {path} parcial."
+        return f"Diretório {path} exportado para {destination}: {transfer.summary()}"
+
+    # Percorre uma subárvore em pré-ordem, gerando (caminho relativo, nó) para cada nó abaixo de `top`
+    def _walk_tree(self, top):
+        stack = [("", top)]
+        while stack:
+            path, directory = stack.pop()
+            with directory.lock.reading():
+                children = list(directory.children.values())
+            for child in children:
+                child_path = f"{path}/{child.name}" if path else child.name
+                yield child_path, child
+                if child.is_directory:
+                    stack.append((child_path, child))
+
+    # Cria os diretórios da exportação e gera as tarefas que copiam os arquivos; para no cancelamento
+    def _export_directory_tasks(self, top, destination, transfer):
+        batch = []
+        for path, node in self._walk_tree(top):
+            if transfer.cancelled():
+                return
+            host_path = os.path.join(destination, *path.split("/"))
+            if node.is_directory:
+                os.makedirs(host_path, exist_ok=True)
+                transfer.add(directories=1)
+                continue
+            batch.append((node, host_path))
+            if len(batch) == TRANSFER_BATCH:
+                yield self._write_host_files, (batch, transfer)
+                batch = []
+        if batch:
+            yield self._write_host_files, (batch, transfer)
+
+    # Copia um lote de arquivos para o computador, em pedaços (executado pelas threads)
+    def _write_host_files(self, files, transfer):
+        for node, host_path in files:
+            if transfer.cancelled():
+                return None
+            size = 0
+            with open(host_path, "wb") as host_file:
+                while True:
+                    with self._content_lock(node):
+                        data = node.content.read(size, TRANSFER_CHUNK)
+                    if not data:
+                        break
+                    host_file.write(data)
+                    size += len(data)
+            transfer.add(files=1, size=size)
+        return None
+
+    # Grava uma subárvore em um arquivo .tar, lendo cada arquivo em pedaços; retorna False se cancelada
+    def _export_tar(self, top, destination, mode, transfer):
+        import tarfile
+        with tarfile.open(destination, mode) as archive:
+            for path, node in self._walk_tree(top):
+                if transfer.cancelled():
+                    return False
+                info = tarfile.TarInfo(path)
+                info.mtime = time.time()
+                if node.is_directory:
+                    info.type = tarfile.DIRTYPE
+                    info.mode = 0o755
+                    archive.addfile(info)
+                    transfer.add(directories=1)
+                    continue
+                lock = self._content_lock(node)
+                with lock:
+                    info.size = node.content.size
+                archive.addfile(info, io.BufferedReader(INodeFileIO(node, True, False, lock=lock), TRANSFER_CHUNK))
+                transfer.add(files=1, size=info.size)
+        return True
+
+    # Executa as tarefas (função, argumentos) de uma transferência em `workers` threads, com no máximo
+    # TRANSFER_PENDING tarefas na fila por thread. Uma tarefa que retorna (diretório, nós) tem os nós
+    # ligados ao diretório por esta thread, a única que altera a árvore em montagem. Retorna False se a
+    # transferência foi cancelada; nesse caso, ou se uma tarefa falhar, as tarefas na fila são descartadas
+    def _run_tasks(self, tasks, workers, transfer):
+        # Importado só aqui: concurrent.futures é uma importação cara e só as transferências a usam
+        from concurrent.futures import ThreadPoolExecutor
+        pending = deque()
+
+        # Espera a tarefa mais antiga e liga os nós lidos por ela
+        def finish_oldest():
+            result = pending.popleft().result()
+            if result is not None:
+                directory, nodes = result
+                for node in nodes:
+                    directory.add_child(node)
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="transferencia") as pool:
+            try:
+                for function, arguments in tasks:
+                    pending.append(pool.submit(function, *arguments))
+                    while len(pending) > workers * TRANSFER_PENDING:
+                        finish_oldest()
+                while pending and not transfer.cancelled():
+                    finish_oldest()
+            finally:
+                for future in pending:
+                    future.cancel()
+        return not transfer.cancelled()
+
+    # Copia para `target` os atributos definidos com set_attribute em `source`
+    def _copy_attributes(self, source, target):
+        if source.attributes:
+            target.attributes = dict(source.attributes)
+
     # Obtém o valor de um atributo de um nó
     def get_attribute(self, path, attribute):
-        print(f"get_attribute: Getting attribute '{attribute}' at path: {path}")
         node = self.find_node(path)
         if node:
-            return getattr(node, attribute, None)
+            return node.get_attribute(attribute)
         return None
 
     # Define o valor de um atributo de um nó
     def set_attribute(self, path, attribute, value):
-        print(f"set_attribute: Setting attribute '{attribute}' to '{value}' at path: {path}")
+        # Alterar o nome equivale a renomear, o que mantém o índice e o cache consistentes
+        if attribute == "name":
+            return self.rename_node(path, value)
+        if attribute in RESERVED_ATTRIBUTES:
+            return f"Erro: o atributo '{attribute}' não pode ser alterado."
         node = self.find_node(path)
         if node:
-            setattr(node, attribute, value)
+            with self._changing(node):
+                self._set_indexed(node, attribute, value)
             return f"Atributo '{attribute}' definido como '{value}' para o nó em '{path}'."
         return "Erro ao definir atributo: nó não encontrado."
 
-# Define a classe FileSystemApp para a interface gráfica
-class FileSystemApp:
-    # Inicializa a interface gráfica
-    def __init__(self, root):
-        self.root = root
-        self.root.title("File System Interface")
-
-        self.file_system = FileSystem()  # Instancia o sistema de arquivos
-        self.current_path = "/"  # Caminho atual
-        self.previous_paths = []  # Lista para armazenar os caminhos visitados
+    # Define um atributo de um nó mantendo o índice do atributo; quem chama deve ter a trava do nó
+    def _set_indexed(self, node, attribute, value):
+        index = self.indexes.get(attribute)
+        if index is not None:
+            index.update(node, node.get_attribute(attribute), value)
+        node.set_attribute(attribute, value)
 
-        # Menu
-        self.menu = tk.Menu(root)
-        root.config(menu=self.menu)
+    # Retira um nó de todos os índices
+    def _unindex(self, node):
+        for attribute, index in list(self.indexes.items()):
+            index.remove(node, node.get_attribute(attribute))
 
-        self.file_menu = tk.Menu(self.menu, tearoff=0)
-        self.menu.add_cascade(label="Arquivo", menu=self.file_menu)
-        self.file_menu.add_command(label="Abrir Diretório", command=self.change_directory)
-        self.file_menu.add_command(label="Diretório Anterior", command=self.go_to_previous_directory)
-        self.file_menu.add_separator()
-        self.file_menu.add_command(label="Sair", command=root.quit)
+    # Retira dos índices um nó e toda a subárvore abaixo dele (só percorre a subárvore se houver índices)
+    def _unindex_subtree(self, node):
+        if self.indexes:
+            for descendant in self._subtree(node):
+                self._unindex(descendant)
 
-        # Rótulos para exibir o caminho atual
-        self.path_label = tk.Label(root, text="Caminho Atual:")
-        self.path_label.pack()
+    # Acrescenta aos índices um nó e toda a subárvore abaixo dele (só percorre a subárvore se houver índices)
+    def _index_subtree(self, node):
+        if self.indexes:
+            for descendant in self._subtree(node):
+                for attribute, index in list(self.indexes.items()):
+                    index.add(descendant, descendant.get_attribute(attribute))
 
-        self.path_display = tk.Label(root, text=self.current_path, fg="blue")
-        self.path_display.pack()
+    # Percorre um nó e todos os nós abaixo dele
+    def _subtree(self, node):
+        pending = [node]
+        while pending:
+            node = pending.pop()
+            yield node
+            if node.is_directory:
+                with node.lock.reading():
+                    pending.extend(node.children.values())
 
-        # Botões para criar, visualizar, editar e remover arquivos e diretórios
-        self.create_file_button = tk.Button(root, text="Criar Arquivo", command=self.create_file)
-        self.create_file_button.pack()
+    # Obtém o caminho absoluto de um nó pelos ponteiros para o pai (None se o nó foi removido)
+    def _path_of(self, node):
+        parts = []
+        while node is not self.root:
+            if node.parent is None:
+                return None
+            parts.append(node.name)
+            node = node.parent
+        return "/" + "/".join(reversed(parts))
 
-        self.view_file_button = tk.Button(root, text="Visualizar Arquivo", command=self.view_file)
-        self.view_file_button.pack()
+    # Define o codec de compressão de um arquivo (None para guardá-lo sem compressão) e recomprime o conteúdo
+    def set_compression(self, path, codec):
+        try:
+            check_codec(codec)
+        except ValueError:
+            return f"Erro: codec de compressão '{codec}' inválido."
+        node = self.find_node(path)
+        if node is None or node.is_directory:
+            return "Erro ao definir a compressão: arquivo não encontrado."
+        with self._changing(node):
+            self._set_indexed(node, "compression", codec)
+            if node.content is not EMPTY_CONTENT:
+                node.content = self._new_buffer(node, node.content.read())
+        return f"Compressão do arquivo '{path}' definida como '{codec}'."
 
-        self.edit_file_button = tk.Button(root, text="Editar Arquivo", command=self.edit_file)
-        self.edit_file_button.pack()
+    # Obtém as estatísticas de compressão: bytes dos arquivos, bytes ocupados e a razão entre eles
+    def compression_stats(self):
+        size = stored = 0
+        for node in self._subtree(self.root):
+            if not node.is_directory:
+                with self._content_lock(node):
+                    size += node.content.size
+                    stored += node.content.stored_size()
+        return {"bytes": size, "stored_bytes": stored, "ratio": size / stored if stored else 1.0}
 
-        self.delete_file_button = tk.Button(root, text="Remover Arquivo", command=self.delete_file)
-        self.delete_file_button.pack()
+    # Cria um snapshot da árvore inteira em tempo constante
+    # Nada é copiado: o snapshot só encerra a geração atual, e cada nó guarda seu estado anterior na primeira
+    # alteração depois disso (ver _prepare). As alterações em andamento terminam antes, e as seguintes
+    # esperam a criação, então o snapshot é um retrato consistente da árvore
+    def create_snapshot(self, name):
+        with self.snapshot_lock.writing():
+            if name in self.snapshots:
+                return f"Erro: já existe um snapshot chamado {name}."
+            self.snapshots[name] = Snapshot(self, name, self.generation)
+            self.latest_snapshot = self.generation
+            self.generation += 1
+        return f"Snapshot {name} criado com sucesso."
 
-        self.create_dir_button = tk.Button(root, text="Criar Diretório", command=self.create_directory)
-        self.create_dir_button.pack()
+    # Obtém um snapshot pelo nome (ou None se não existir)
+    def get_snapshot(self, name):
+        return self.snapshots.get(name)
 
-        self.delete_dir_button = tk.Button(root, text="Remover Diretório", command=self.delete_directory)
-        self.delete_dir_button.pack()
+    # Lista os nomes dos snapshots, do mais antigo ao mais recente
+    def list_snapshots(self):
+        return list(self.snapshots)
 
-        self.list_dir_button = tk.Button(root, text="Listar Diretório", command=self.list_directory)
-        self.list_dir_button.pack()
+    # Remove um snapshot e descarta as versões dos nós que só ele usava
+    # A árvore do snapshot é percorrida uma vez; os pedaços de conteúdo ainda usados pelo arquivo atual ou
+    # por outro snapshot continuam compartilhados, e só os que eram exclusivos do snapshot são liberados
+    # snapshot_lock fica com a escrita durante todo o percurso: um snapshot criado no meio dele teria
+    # versões descartadas, pois a sua geração não está entre as dos snapshots que continuam
+    def delete_snapshot(self, name):
+        released = freed = 0
+        with self.snapshot_lock.writing():
+            snapshot = self.snapshots.pop(name, None)
+            if snapshot is None:
+                return f"Erro: não há snapshot chamado {name}."
+            generations = sorted(other.generation for other in self.snapshots.values())
+            self.latest_snapshot = generations[-1] if generations else -1
+            pending = [self.root]
+            while pending:
+                node = pending.pop()
+                with self._node_lock(node):
+                    state = snapshot._resolve(node)
+                    if node.is_directory:
+                        pending.extend(state.children.values())
+                    if node.versions:
+                        kept = []
+                        dropped = []
+                        for version in node.versions:
+                            # A versão vale para as gerações [início, fim); é mantida se algum snapshot cair nela
+                            index = bisect_left(generations, version[0])
+                            (kept if index < len(generations) and generations[index] < version[1] else dropped).append(version)
+                        node.versions = kept or None
+                        released += len(dropped)
+                        if not node.is_directory:
+                            freed += self._exclusive_bytes(node, kept, dropped)
+        return f"Snapshot {name} removido: {released} versões de nós e {freed} bytes liberados."
 
-        # Botões para definir e obter atributos
-        self.set_attr_button = tk.Button(root, text="Definir Atributo", command=self.set_attr)
-        self.set_attr_button.pack()
+    # Soma os bytes dos pedaços das versões descartadas que não são usados pelo conteúdo atual do arquivo
+    # nem pelas versões mantidas
+    def _exclusive_bytes(self, node, kept, dropped):
+        used = {id(chunk) for chunk in node.content.chunks}
+        for _, _, frozen in kept:
+            used.update(id(chunk) for chunk in frozen.content.chunks)
+        freed = 0
+        for _, _, frozen in dropped:
+            for chunk in frozen.content.chunks:
+                if id(chunk) not in used:
+                    used.add(id(chunk))
+                    freed += len(chunk)
+        return freed
 
-        self.get_attr_button = tk.Button(root, text="Obter Atributo", command=self.get_attr)
-        self.get_attr_button.pack()
+    # Cria um índice secundário de um atributo definido com set_attribute
+    # O índice é montado com uma passagem pela árvore e depois é mantido a cada set_attribute, remoção e
+    # cópia, o que torna as consultas de query proporcionais ao resultado
+    def create_index(self, attribute):
+        if attribute in RESERVED_ATTRIBUTES:
+            return f"Erro: o atributo '{attribute}' não pode ser indexado."
+        if attribute not in self.indexes:
+            index = self.indexes[attribute] = AttributeIndex()
+            for node in self._subtree(self.root):
+                # A trava do nó impede que um set_attribute simultâneo seja perdido
+                if node.is_directory:
+                    with node.lock.writing():
+                        index.add(node, node.get_attribute(attribute))
+                else:
+                    with self._content_lock(node):
+                        index.add(node, node.get_attribute(attribute))
+        return f"Índice do atributo '{attribute}' criado com sucesso."
 
-    # Atualiza o rótulo de exibição do caminho atual
-    def update_path_display(self):
-        self.path_display.config(text=self.current_path)
+    # Remove o índice de um atributo
+    def drop_index(self, attribute):
+        if self.indexes.pop(attribute, None) is None:
+            return f"Erro: não há índice do atributo '{attribute}'."
+        return f"Índice do atributo '{attribute}' removido com sucesso."
 
-    # Muda o diretório atual
-    def change_directory(self):
-        new_directory = simpledialog.askstring("Abrir Diretório", "Digite o caminho do diretório:")
-        if new_directory and self.file_system.find_node(new_directory):
-            self.previous_paths.append(self.current_path)  # Adiciona o diretório atual à lista de caminhos visitados
-            self.current_path = new_directory
-            self.update_path_display()
+    # Busca os caminhos dos nós cujo atributo satisfaz `op value`
+    # `op` é um de "==", "<", "<=", ">", ">="; intervalos comparam só números com números e textos com textos.
+    # Com índice, a busca não percorre a árvore; sem índice, todos os nós são examinados.
+    # Retorna a lista de caminhos em ordem alfabética, ou None se o operador ou o atributo for inválido
+    def query(self, attribute, op, value):
+        if op not in OPERATORS or attribute in RESERVED_ATTRIBUTES:
+            return None
+        index = self.indexes.get(attribute)
+        if index is not None:
+            nodes = index.lookup(op, value)
         else:
-            messagebox.showerror("Erro", "Diretório não encontrado.")
-
-    # Vai ao diretório anterior
-    def go_to_previous_directory(self):
-        if self.previous_paths:
-            previous_directory = self.previous_paths.pop()  # Remove o último caminho visitado da lista
-            self.current_path = previous_directory
-            self.update_path_display()
-        else:
-            messagebox.showinfo("Diretório Anterior", "Nenhum diretório anterior disponível.")
-
-    # Cria um arquivo
-    def create_file(self):
-        file_name = simpledialog.askstring("Criar Arquivo", "Nome do arquivo (com extensão):")
-        if file_name:
-            content = simpledialog.askstring("Conteúdo do Arquivo", "Digite o conteúdo do arquivo:")
-            message = self.file_system.create_file(self.current_path, file_name, content)
-            messagebox.showinfo("Criar Arquivo", message)
-
-    # Visualiza o conteúdo de um arquivo
-    def view_file(self):
-        file_name = simpledialog.askstring("Visualizar Arquivo", "Nome do arquivo (com extensão):")
-        if file_name:
-            path = os.path.join(self.current_path, file_name).replace("\\", "/")
-            content = self.file_system.read_file(path)
-            messagebox.showinfo("Conteúdo do Arquivo", content)
+            nodes = [node for node in self._subtree(self.root) if matches(node.get_attribute(attribute), op, value)]
+        paths = (self._path_of(node) for node in nodes)
+        return sorted(path for path in paths if path is not None)
 
-    # Edita o conteúdo de um arquivo
-    def edit_file(self):
-        file_name = simpledialog.askstring("Editar Arquivo", "Nome do arquivo:")
-        if file_name:
-            path = os.path.join(self.current_path, file_name).replace("\\", "/")
-            content = simpledialog.askstring("Novo Conteúdo do Arquivo", "Digite o novo conteúdo do arquivo:")
-            message = self.file_system.edit_file(path, content)
-            messagebox.showinfo("Editar Arquivo", message)
-
-    # Remove um arquivo
-    def delete_file(self):
-        file_name = simpledialog.askstring("Remover Arquivo", "Nome do arquivo:")
-        if file_name:
-            path = os.path.join(self.current_path, file_name).replace("\\", "/")
-            if self.file_system.find_node(path):
-                message = self.file_system.delete_node(path)
-                messagebox.showinfo("Remover Arquivo", message)
-            else:
-                messagebox.showerror("Erro", "Arquivo não encontrado.")
-
-    # Cria um diretório
-    def create_directory(self):
-        dir_name = simpledialog.askstring("Criar Diretório", "Nome do diretório:")
-        if dir_name:
-            new_dir = self.file_system.add_node(self.current_path, dir_name, True)
-            if new_dir:
-                messagebox.showinfo("Criar Diretório", f"Diretório {dir_name} criado com sucesso.")
-            else:
-                messagebox.showerror("Erro", "Erro ao criar o diretório.")
-
-    # Remove um diretório
-    def delete_directory(self):
-        dir_name = simpledialog.askstring("Remover Diretório", "Nome do diretório:")
-        if dir_name:
-            path = os.path.join(self.current_path, dir_name).replace("\\", "/")
-            if self.file_system.find_node(path):
-                message = self.file_system.delete_node(path)
-                messagebox.showinfo("Remover Diretório", message)
-            else:
-                messagebox.showerror("Erro", "Diretório não encontrado.")
+# Define a classe Snapshot, uma visão somente leitura da árvore no momento em que foi criada
+# O snapshot compartilha os nós, os dicionários de entradas e os pedaços de conteúdo com a árvore atual;
+# para cada nó, usa a versão guardada que vale para a sua geração ou, se o nó não mudou desde então, o
+# próprio nó. As leituras usam as mesmas travas das leituras da árvore atual
+class Snapshot:
+    # Inicializa o snapshot do sistema de arquivos com o nome e a geração encerrada por ele
+    def __init__(self, filesystem, name, generation):
+        self.filesystem = filesystem
+        self.name = name
+        self.generation = generation
+
+    # Obtém o estado de um nó no momento do snapshot; quem chama deve ter a trava do nó
+    def _resolve(self, node):
+        if node.versions:
+            for _, end, frozen in node.versions:
+                if end > self.generation:
+                    return frozen
+        return node
+
+    # Obtém a trava de leitura de um nó
+    def _reading(self, node):
+        return node.lock.reading() if node.is_directory else self.filesystem._content_lock(node)
+
+    # Obtém o nó da árvore atual que estava no caminho no momento do snapshot (ou None se não existia)
+    def _lookup(self, path):
+        node = self.filesystem.root
+        for part in filter(None, path.split("/")):
+            if not node.is_directory:
+                return None
+            with node.lock.reading():
+                node = self._resolve(node).children.get(part)
+            if node is None:
+                return None
+        return node
+
+    # Encontra um nó no caminho especificado, no estado do momento do snapshot
+    # O nó retornado não deve ser alterado; para percorrer a árvore, use os métodos do snapshot
+    def find_node(self, path):
+        node = self._lookup(path)
+        if node is None:
+            return None
+        with self._reading(node):
+            return self._resolve(node)
 
     # Lista o conteúdo de um diretório
-    def list_directory(self):
-        contents = self.file_system.list_directory(self.current_path)
-        if contents is not None:
-            content_text = "\n".join(contents)
-            messagebox.showinfo("Conteúdo do Diretório", content_text)
-        else:
-            messagebox.showerror("Erro", "Erro ao listar o diretório.")
+    def list_directory(self, path):
+        node = self._lookup(path)
+        if node and node.is_directory:
+            with node.lock.reading():
+                children = list(self._resolve(node).children.items())
+            return [f"[D] {name}" if child.is_directory else f"[F] {name}" for name, child in children]
+        return None
 
-    # Define o valor de um atributo
-    def set_attr(self):
-        path = simpledialog.askstring("Definir Atributo", "Digite o caminho do nó:")
-        attribute = simpledialog.askstring("Definir Atributo", "Digite o nome do atributo:")
-        value = simpledialog.askstring("Definir Atributo", "Digite o valor do atributo:")
-        if path and attribute and value:
-            message = self.file_system.set_attribute(path, attribute, value)
-            messagebox.showinfo("Definir Atributo", message)
-        else:
-            messagebox.showerror("Erro", "Todos os campos são obrigatórios.")
-
-    # Obtém o valor de um atributo
-    def get_attr(self):
-        path = simpledialog.askstring("Obter Atributo", "Digite o caminho do nó:")
-        attribute = simpledialog.askstring("Obter Atributo", "Digite o nome do atributo:")
-        if path and attribute:
-            value = self.file_system.get_attribute(path, attribute)
-            if value is not None:
-                messagebox.showinfo("Valor do Atributo", f"O valor do atributo '{attribute}' em '{path}' é '{value}'.")
-            else:
-                messagebox.showerror("Erro", "Erro ao obter o valor do atributo.")
-        else:
-            messagebox.showerror("Erro", "Todos os campos são obrigatórios.")
-
-# Define a classe LoginApp para a interface de login
-class LoginApp:
-    def __init__(self, root):
-        self.root = root
-        self.root.title("Login")
-        
-        # Dicionário para armazenar usuários e senhas
-        self.users = {"admin": "admin123", "user": "user123"} 
-        
-        # Elementos da interface de login
-        self.username_label = tk.Label(root, text="Usuário:")
-        self.username_label.pack()
-        self.username_entry = tk.Entry(root)
-        self.username_entry.pack()
-        
-        self.password_label = tk.Label(root, text="Senha:")
-        self.password_label.pack()
-        self.password_entry = tk.Entry(root, show="*")
-        self.password_entry.pack()
-        
-        self.login_button = tk.Button(root, text="Login", command=self.login)
-        self.login_button.pack()
-
-        self.register_button = tk.Button(root, text="Registrar", command=self.register)
-        self.register_button.pack()
-
-    def login(self):
-        username = self.username_entry.get()
-        password = self.password_entry.get()
-        if username in self.users and self.users[username] == password:
-            messagebox.showinfo("Login", "Login bem-sucedido!")
-            self.root.destroy()  # Fecha a janela de login
-            main_app()  # Abre a aplicação principal
-        else:
-            messagebox.showerror("Login", "Usuário ou senha incorretos.")
-
-    def register(self):
-        username = self.username_entry.get()
-        password = self.password_entry.get()
-        if username in self.users:
-            messagebox.showerror("Erro", "Usuário já existe!")
-        elif username and password:
-            self.users[username] = password
-            messagebox.showinfo("Registro", "Usuário registrado com sucesso!")
-        else:
-            messagebox.showerror("Erro", "Usuário e senha não podem estar vazios!")
+    # Lista uma página das entradas de um diretório como pares (nome, é diretório)
+    def iterdir(self, path, start=0, limit=None):
+        node = self._lookup(path)
+        if node and node.is_directory:
+            with node.lock.reading():
+                children = islice(self._resolve(node).children.items(), start, None if limit is None else start + limit)
+                return [(name, child.is_directory) for name, child in children]
+        return None
+
+    # Lê o conteúdo de um arquivo como texto; com as_view=True, retorna uma memoryview dos bytes
+    def read_file(self, path, offset=0, size=None, as_view=False):
+        node = self._lookup(path)
+        if node and not node.is_directory:
+            with self._reading(node):
+                content = self._resolve(node).content
+                if as_view:
+                    return content.view(offset, size)
+                data = content.read(offset, size)
+            return data.decode("utf-8", errors="replace")
+        return None if as_view else "Erro ao ler o arquivo."
+
+    # Lê até `size` bytes de um arquivo a partir de `offset`
+    def pread(self, path, offset, size):
+        node = self._lookup(path)
+        if node and not node.is_directory:
+            with self._reading(node):
+                return self._resolve(node).content.read(offset, size)
+        return None
+
+    # Obtém o valor de um atributo de um nó
+    def get_attribute(self, path, attribute):
+        node = self.find_node(path)
+        if node:
+            return node.get_attribute(attribute)
+        return None
+
+# Nomes da interface gráfica, que fica em inode_gui.py e só é carregada (junto com o tkinter) quando usada
+_GUI_NAMES = ("FileSystemApp", "LoginApp", "main_app")
 
-# Função para iniciar a aplicação principal
-def main_app():
-    root = tk.Tk()
-    app = FileSystemApp(root)
-    root.mainloop()
+# Obtém sob demanda os nomes da interface gráfica (inode.FileSystemApp continua funcionando)
+def __getattr__(name):
+    if name in _GUI_NAMES:
+        import inode_gui
+        return getattr(inode_gui, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # Executa a aplicação de login se este arquivo for executado como script principal
 if __name__ == "__main__":
-    login_root = tk.Tk()
-    login_app = LoginApp(login_root)
-    login_root.mainloop()
+    from inode_gui import main
+    main()
@@ -0,0 +1,314 @@
+# Interface gráfica (tkinter) do sistema de arquivos i-node
+# Fica separada de inode.py para que o sistema de arquivos possa ser importado sem o tkinter, em scripts e
+# em máquinas sem interface gráfica; inode.py só carrega este módulo ao abrir a interface
+# Importa o módulo tkinter como tk
+import tkinter as tk
+# Importa simpledialog e messagebox do tkinter
+from tkinter import simpledialog, messagebox
+# Importa o módulo os
+import os
+
+from inode import FileSystem, normalize_path
+from directorypager import DirectoryPager
+
+# Define a janela de listagem de um diretório, carregada em páginas conforme a rolagem
+class DirectoryListing:
+    # Abre a janela e carrega a primeira página do diretório
+    def __init__(self, root, file_system, path, on_close):
+        self.file_system = file_system
+        self.path = normalize_path(path)
+        self.window = tk.Toplevel(root)
+        self.window.title(f"Conteúdo do Diretório: {self.path}")
+        self.window.protocol("WM_DELETE_WINDOW", on_close)
+
+        scrollbar = tk.Scrollbar(self.window, orient=tk.VERTICAL)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        def scrolled(first, last):
+            scrollbar.set(first, last)
+            self.pager.scrolled(first, last)
+
+        self.listbox = tk.Listbox(self.window, height=20, width=50, yscrollcommand=scrolled)
+        self.listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.config(command=self.listbox.yview)
+        self.pager = DirectoryPager(self.fetch, self.show)
+        self.pager.reset()
+
+    # Obtém uma página das entradas do diretório (vazia se ele foi removido)
+    def fetch(self, start, limit):
+        return self.file_system.iterdir(self.path, start, limit) or []
+
+    # Acrescenta uma página de entradas na listagem
+    def show(self, page):
+        self.listbox.insert(tk.END, *[f"[D] {name}" if is_directory else f"[F] {name}" for name, is_directory in page])
+
+    # Mostra um nó criado no diretório listado
+    def added(self, path, name, is_directory):
+        if normalize_path(path) == self.path and self.pager.added():
+            self.listbox.insert(tk.END, f"[D] {name}" if is_directory else f"[F] {name}")
+
+    # Retira da listagem um nó removido do diretório listado
+    def removed(self, path):
+        parent, _, name = normalize_path(path).rpartition("/")
+        if (parent or "/") != self.path:
+            return
+        # Só as páginas já entregues estão na listagem; um nó que ainda não apareceu não muda as posições
+        labels = self.listbox.get(0, tk.END)
+        for label in (f"[F] {name}", f"[D] {name}"):
+            if label in labels:
+                self.listbox.delete(labels.index(label))
+                self.pager.removed()
+                return
+
+    # Fecha a janela
+    def close(self):
+        self.window.destroy()
+
+# Define a classe FileSystemApp para a interface gráfica
+class FileSystemApp:
+    # Inicializa a interface gráfica
+    def __init__(self, root):
+        self.root = root
+        self.root.title("File System Interface")
+
+        self.file_system = FileSystem()  # Instancia o sistema de arquivos
+        self.current_path = "/"  # Caminho atual
+        self.previous_paths = []  # Lista para armazenar os caminhos visitados
+        self.listing = None  # Janela de listagem aberta, atualizada a cada criação e remoção
+
+        # Menu
+        self.menu = tk.Menu(root)
+        root.config(menu=self.menu)
+
+        self.file_menu = tk.Menu(self.menu, tearoff=0)
+        self.menu.add_cascade(label="Arquivo", menu=self.file_menu)
+        self.file_menu.add_command(label="Abrir Diretório", command=self.change_directory)
+        self.file_menu.add_command(label="Diretório Anterior", command=self.go_to_previous_directory)
+        self.file_menu.add_separator()
+        self.file_menu.add_command(label="Sair", command=root.quit)
+
+        # Rótulos para exibir o caminho atual
+        self.path_label = tk.Label(root, text="Caminho Atual:")
+        self.path_label.pack()
+
+        self.path_display = tk.Label(root, text=self.current_path, fg="blue")
+        self.path_display.pack()
+
+        # Botões para criar, visualizar, editar e remover arquivos e diretórios
+        self.create_file_button = tk.Button(root, text="Criar Arquivo", command=self.create_file)
+        self.create_file_button.pack()
+
+        self.view_file_button = tk.Button(root, text="Visualizar Arquivo", command=self.view_file)
+        self.view_file_button.pack()
+
+        self.edit_file_button = tk.Button(root, text="Editar Arquivo", command=self.edit_file)
+        self.edit_file_button.pack()
+
+        self.delete_file_button = tk.Button(root, text="Remover Arquivo", command=self.delete_file)
+        self.delete_file_button.pack()
+
+        self.create_dir_button = tk.Button(root, text="Criar Diretório", command=self.create_directory)
+        self.create_dir_button.pack()
+
+        self.delete_dir_button = tk.Button(root, text="Remover Diretório", command=self.delete_directory)
+        self.delete_dir_button.pack()
+
+        self.list_dir_button = tk.Button(root, text="Listar Diretório", command=self.list_directory)
+        self.list_dir_button.pack()
+
+        # Botões para definir e obter atributos
+        self.set_attr_button = tk.Button(root, text="Definir Atributo", command=self.set_attr)
+        self.set_attr_button.pack()
+
+        self.get_attr_button = tk.Button(root, text="Obter Atributo", command=self.get_attr)
+        self.get_attr_button.pack()
+
+    # Atualiza o rótulo de exibição do caminho atual
+    def update_path_display(self):
+        self.path_display.config(text=self.current_path)
+
+    # Muda o diretório atual
+    def change_directory(self):
+        new_directory = simpledialog.askstring("Abrir Diretório", "Digite o caminho do diretório:")
+        if new_directory and self.file_system.find_node(new_directory):
+            self.previous_paths.append(self.current_path)  # Adiciona o diretório atual à lista de caminhos visitados
+            self.current_path = new_directory
+            self.update_path_display()
+        else:
+            messagebox.showerror("Erro", "Diretório não encontrado.")
+
+    # Vai ao diretório anterior
+    def go_to_previous_directory(self):
+        if self.previous_paths:
+            previous_directory = self.previous_paths.pop()  # Remove o último caminho visitado da lista
+            self.current_path = previous_directory
+            self.update_path_display()
+        else:
+            messagebox.showinfo("Diretório Anterior", "Nenhum diretório anterior disponível.")
+
+    # Cria um arquivo
+    def create_file(self):
+        file_name = simpledialog.askstring("Criar Arquivo", "Nome do arquivo (com extensão):")
+        if file_name:
+            content = simpledialog.askstring("Conteúdo do Arquivo", "Digite o conteúdo do arquivo:")
+            message = self.file_system.create_file(self.current_path, file_name, content)
+            if self.listing and not message.startswith("Erro"):
+                self.listing.added(self.current_path, file_name, False)
+            messagebox.showinfo("Criar Arquivo", message)
+
+    # Visualiza o conteúdo de um arquivo
+    def view_file(self):
+        file_name = simpledialog.askstring("Visualizar Arquivo", "Nome do arquivo (com extensão):")
+        if file_name:
+            path = os.path.join(self.current_path, file_name).replace("\\", "/")
+            content = self.file_system.read_file(path)
+            messagebox.showinfo("Conteúdo do Arquivo", content)
+
+    # Edita o conteúdo de um arquivo
+    def edit_file(self):
+        file_name = simpledialog.askstring("Editar Arquivo", "Nome do arquivo:")
+        if file_name:
+            path = os.path.join(self.current_path, file_name).replace("\\", "/")
+            content = simpledialog.askstring("Novo Conteúdo do Arquivo", "Digite o novo conteúdo do arquivo:")
+            message = self.file_system.edit_file(path, content)
+            messagebox.showinfo("Editar Arquivo", message)
+
+    # Remove um arquivo
+    def delete_file(self):
+        file_name = simpledialog.askstring("Remover Arquivo", "Nome do arquivo:")
+        if file_name:
+            path = os.path.join(self.current_path, file_name).replace("\\", "/")
+            if self.file_system.find_node(path):
+                message = self.file_system.delete_node(path)
+                if self.listing and not message.startswith("Erro"):
+                    self.listing.removed(path)
+                messagebox.showinfo("Remover Arquivo", message)
+            else:
+                messagebox.showerror("Erro", "Arquivo não encontrado.")
+
+    # Cria um diretório
+    def create_directory(self):
+        dir_name = simpledialog.askstring("Criar Diretório", "Nome do diretório:")
+        if dir_name:
+            new_dir = self.file_system.add_node(self.current_path, dir_name, True)
+            if new_dir:
+                if self.listing:
+                    self.listing.added(self.current_path, dir_name, True)
+                messagebox.showinfo("Criar Diretório", f"Diretório {dir_name} criado com sucesso.")
+            else:
+                messagebox.showerror("Erro", "Erro ao criar o diretório.")
+
+    # Remove um diretório
+    def delete_directory(self):
+        dir_name = simpledialog.askstring("Remover Diretório", "Nome do diretório:")
+        if dir_name:
+            path = os.path.join(self.current_path, dir_name).replace("\\", "/")
+            if self.file_system.find_node(path):
+                message = self.file_system.delete_node(path)
+                if self.listing and not message.startswith("Erro"):
+                    self.listing.removed(path)
+                messagebox.showinfo("Remover Diretório", message)
+            else:
+                messagebox.showerror("Erro", "Diretório não encontrado.")
+
+    # Lista o conteúdo de um diretório em uma janela que carrega as entradas conforme a rolagem
+    def list_directory(self):
+        node = self.file_system.find_node(self.current_path)
+        if node is not None and node.is_directory:
+            self.close_listing()
+            self.listing = DirectoryListing(self.root, self.file_system, self.current_path, self.close_listing)
+        else:
+            messagebox.showerror("Erro", "Erro ao listar o diretório.")
+
+    # Fecha a janela de listagem, se estiver aberta
+    def close_listing(self):
+        if self.listing:
+            self.listing.close()
+            self.listing = None
+
+    # Define o valor de um atributo
+    def set_attr(self):
+        path = simpledialog.askstring("Definir Atributo", "Digite o caminho do nó:")
+        attribute = simpledialog.askstring("Definir Atributo", "Digite o nome do atributo:")
+        value = simpledialog.askstring("Definir Atributo", "Digite o valor do atributo:")
+        if path and attribute and value:
+            message = self.file_system.set_attribute(path, attribute, value)
+            messagebox.showinfo("Definir Atributo", message)
+        else:
+            messagebox.showerror("Erro", "Todos os campos são obrigatórios.")
+
+    # Obtém o valor de um atributo
+    def get_attr(self):
+        path = simpledialog.askstring("Obter Atributo", "Digite o caminho do nó:")
+        attribute = simpledialog.askstring("Obter Atributo", "Digite o nome do atributo:")
+        if path and attribute:
+            value = self.file_system.get_attribute(path, attribute)
+            if value is not None:
+                messagebox.showinfo("Valor do Atributo", f"O valor do atributo '{attribute}' em '{path}' é '{value}'.")
+            else:
+                messagebox.showerror("Erro", "Erro ao obter o valor do atributo.")
+        else:
+            messagebox.showerror("Erro", "Todos os campos são obrigatórios.")
+
+# Define a classe LoginApp para a interface de login
+class LoginApp:
+    def __init__(self, root):
+        self.root = root
+        self.root.title("Login")
+        
+        # Dicionário para armazenar usuários e senhas
+        self.users = {"admin": "admin123", "user": "user123"} 
+        
+        # Elementos da interface de login
+        self.username_label = tk.Label(root, text="Usuário:")
+        self.username_label.pack()
+        self.username_entry = tk.Entry(root)
+        self.username_entry.pack()
+        
+        self.password_label = tk.Label(root, text="Senha:")
+        self.password_label.pack()
+        self.password_entry = tk.Entry(root, show="*")
+        self.password_entry.pack()
+        
+        self.login_button = tk.Button(root, text="Login", command=self.login)
+        self.login_button.pack()
+
+        self.register_button = tk.Button(root, text="Registrar", command=self.register)
+        self.register_button.pack()
+
+    def login(self):
+        username = self.username_entry.get()
+        password = self.password_entry.get()
+        if username in self.users and self.users[username] == password:
+            messagebox.showinfo("Login", "Login bem-sucedido!")
+            self.root.destroy()  # Fecha a janela de login
+            main_app()  # Abre a aplicação principal
+        else:
+            messagebox.showerror("Login", "Usuário ou senha incorretos.")
+
+    def register(self):
+        username = self.username_entry.get()
+        password = self.password_entry.get()
+        if username in self.users:
+            messagebox.showerror("Erro", "Usuário já existe!")
+        elif username and password:
+            self.users[username] = password
+            messagebox.showinfo("Registro", "Usuário registrado com sucesso!")
+        else:
+            messagebox.showerror("Erro", "Usuário e senha não podem estar vazios!")
+
+# Função para iniciar a aplicação principal
+def main_app():
+    root = tk.Tk()
+    app = FileSystemApp(root)
+    root.mainloop()
+
+# Abre a aplicação de login
+def main():
+    login_root = tk.Tk()
+    login_app = LoginApp(login_root)
+    login_root.mainloop()
+
+# Executa a aplicação de login se este arquivo for executado como script principal
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+# Tabela de inodes compacta, em estrutura de arrays
+# Em vez de um objeto INode por nó, cada nó é um número inteiro e seus campos ficam em arrays paralelos
+# (nome, pai e tipo). Só os diretórios não vazios têm um dicionário de filhos e só os arquivos com
+# conteúdo têm um ChunkedBuffer. É uma alternativa ao FileSystem para árvores muito grandes e usadas
+# por uma única thread; benchmark_memoria.py compara o consumo de memória das duas representações.
+import sys
+from array import array
+
+from inode import ChunkedBuffer, normalize_path
+
+# Tipos de nó guardados em INodeTable.kinds
+FREE = 0
+FILE = 1
+DIRECTORY = 2
+
+
+# Classe para a tabela de inodes
+class INodeTable:
+    # Inicializa a tabela com o diretório raiz (sempre o nó 0)
+    def __init__(self):
+        self.names = []  # Nó -> nome internado (None para nós livres)
+        self.parents = array("q")  # Nó -> nó pai (-1 para a raiz e para nós livres)
+        self.kinds = bytearray()  # Nó -> FREE, FILE ou DIRECTORY
+        self.children = {}  # Diretório não vazio -> {nome: nó}
+        self.contents = {}  # Arquivo com conteúdo -> ChunkedBuffer
+        self.free = []  # Nós livres para reutilização
+        self.count = 0  # Quantidade de nós em uso
+        self.root = self._allocate("/", -1, DIRECTORY)
+
+    # Obtém a quantidade de nós em uso
+    def __len__(self):
+        return self.count
+
+    # Reserva um número de nó e preenche os seus campos
+    def _allocate(self, name, parent, kind):
+        name = sys.intern(name)
+        if self.free:
+            node = self.free.pop()
+            self.names[node] = name
+            self.parents[node] = parent
+            self.kinds[node] = kind
+        else:
+            node = len(self.names)
+            self.names.append(name)
+            self.parents.append(parent)
+            self.kinds.append(kind)
+        self.count += 1
+        return node
+
+    # Obtém o tipo de um nó em uso; números fora da tabela e nós já removidos são recusados
+    def _kind(self, node):
+        if not 0 <= node < len(self.kinds) or self.kinds[node] == FREE:
+            raise ValueError(f"Nó inexistente: {node}")
+        return self.kinds[node]
+
+    # Verifica que um nó em uso é um arquivo e o retorna
+    def _file(self, node):
+        if self._kind(node) != FILE:
+            raise ValueError(f"O nó {node} não é um arquivo")
+        return node
+
+    # Verifica se um nó é um diretório
+    def is_directory(self, node):
+        return self._kind(node) == DIRECTORY
+
+    # Obtém um filho de um diretório pelo nome (ou None)
+    def lookup(self, directory, name):
+        entries = self.children.get(directory)
+        return entries.get(name) if entries else None
+
+    # Encontra o nó de um caminho absoluto (ou None)
+    def resolve(self, path):
+        node = self.root
+        for part in filter(None, path.split("/")):
+            if self.kinds[node] != DIRECTORY:
+                return None
+            node = self.lookup(node, part)
+            if node is None:
+                return None
+        return node
+
+    # Adiciona um nó a um diretório; retorna o número do novo nó, ou None se o nome já existe
+    def add(self, directory, name, is_directory=False):
+        if self._kind(directory) != DIRECTORY:
+            return None
+        entries = self.children.get(directory)
+        if entries is None:
+            entries = self.children[directory] = {}
+        elif name in entries:
+            return None
+        node = self._allocate(name, directory, DIRECTORY if is_directory else FILE)
+        entries[self.names[node]] = node
+        return node
+
+    # Lista os nomes dos filhos de um diretório
+    def list(self, directory):
+        return list(self.children.get(directory, ()))
+
+    # Remove um nó e, se for um diretório, toda a subárvore abaixo dele
+    def remove(self, node):
+        self._kind(node)
+        if node == self.root:
+            return
+        parent = self.parents[node]
+        entries = self.children[parent]
+        del entries[self.names[node]]
+        if not entries:
+            del self.children[parent]
+        pending = [node]
+        while pending:
+            node = pending.pop()
+            entries = self.children.pop(node, None)
+            if entries:
+                pending.extend(entries.values())
+            self.contents.pop(node, None)
+            self.names[node] = None
+            self.parents[node] = -1
+            self.kinds[node] = FREE
+            self.free.append(node)
+            self.count -= 1
+
+    # Obtém o caminho absoluto de um nó pelos ponteiros para o pai
+    def path(self, node):
+        self._kind(node)
+        parts = []
+        while node != self.root:
+            parts.append(self.names[node])
+            node = self.parents[node]
+        return normalize_path("/".join(reversed(parts)))
+
+    # Escreve bytes no conteúdo de um arquivo (o buffer é criado na primeira escrita)
+    def write(self, node, offset, data):
+        content = self.contents.get(self._file(node))
+        if content is None:
+            content = self.contents[node] = ChunkedBuffer()
+        return content.write(offset, data)
+
+    # Lê bytes do conteúdo de um arquivo
+    def read(self, node, offset=0, size=None):
+        content = self.contents.get(self._file(node))
+        return content.read(offset, size) if content is not None else b""
+
+    # Obtém o tamanho do conteúdo de um arquivo
+    def size(self, node):
+        content = self.contents.get(self._file(node))
+        return content.size if content is not None else 0
@@ -0,0 +1,78 @@
+# Trava de leitores e escritor usada pelo sistema de arquivos para permitir acesso de várias threads
+# Vários leitores podem segurar a trava ao mesmo tempo; um escritor a segura sozinho.
+# Escritores esperando têm preferência, para que leituras contínuas não os deixem sem vez.
+# A Condition usada para esperar só é criada na primeira disputa, porque cada diretório tem uma trava.
+# Este módulo é igual nas pastas do i-node e de blocos livres.
+import threading
+from contextlib import contextmanager
+
+
+# Classe que representa a trava de leitores e escritor
+class RWLock:
+    __slots__ = ("_lock", "_condition", "_readers", "_writer", "_waiting_writers")
+
+    # Inicializa a trava
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._condition = None  # Criada sob _lock quando alguma thread precisa esperar
+        self._readers = 0  # Leitores ativos
+        self._writer = False  # Se há um escritor ativo
+        self._waiting_writers = 0  # Escritores esperando
+
+    # Espera por uma notificação; quem chama deve ter _lock
+    def _wait(self):
+        if self._condition is None:
+            self._condition = threading.Condition(self._lock)
+        self._condition.wait()
+
+    # Acorda as threads esperando; quem chama deve ter _lock
+    def _notify(self):
+        if self._condition is not None:
+            self._condition.notify_all()
+
+    # Adquire a trava para leitura
+    def acquire_read(self):
+        with self._lock:
+            while self._writer or self._waiting_writers:
+                self._wait()
+            self._readers += 1
+
+    # Libera a trava de leitura
+    def release_read(self):
+        with self._lock:
+            self._readers -= 1
+            if self._readers == 0:
+                self._notify()
+
+    # Adquire a trava para escrita
+    def acquire_write(self):
+        with self._lock:
+            self._waiting_writers += 1
+            while self._writer or self._readers:
+                self._wait()
+            self._waiting_writers -= 1
+            self._writer = True
+
+    # Libera a trava de escrita
+    def release_write(self):
+        with self._lock:
+            self._writer = False
+            self._notify()
+
+    # Gerenciador de contexto para um trecho de leitura
+    @contextmanager
+    def reading(self):
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+
+    # Gerenciador de contexto para um trecho de escrita
+    @contextmanager
+    def writing(self):
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
@@ -0,0 +1,78 @@
+# Testes da fachada assíncrona sobre o sistema de arquivos i-node
+import asyncio
+import threading
+import time
+
+import pytest
+
+from asyncfs import AsyncFileSystem
+from inode import FileSystem
+
+
+# Retorna uma função lenta que registra em `eventos` o início e o fim de cada execução
+def registrar(eventos, nome, espera=0.05):
+    trava = threading.Lock()
+
+    def funcao():
+        with trava:
+            eventos.append(("inicio", nome))
+        time.sleep(espera)
+        with trava:
+            eventos.append(("fim", nome))
+        return nome
+
+    return funcao
+
+
+# As escritas pedidas para um mesmo caminho rodam na ordem em que foram pedidas
+def test_ordem_das_escritas():
+    async def principal():
+        async with AsyncFileSystem(FileSystem(), workers=4) as afs:
+            await afs.mkdir("/d")
+            await asyncio.gather(*(afs.write("/d/a.txt", bytes([65 + i % 26]) * 100, i * 50)
+                                   for i in range(40)))
+            esperado = bytearray()
+            for i in range(40):
+                esperado[i * 50:i * 50 + 100] = bytes([65 + i % 26]) * 100
+            assert await afs.read("/d/a.txt") == bytes(esperado)
+            assert await afs.listdir("/d") == ["a.txt"]
+            info = await afs.stat("/d/a.txt")
+            assert info["size"] == len(esperado) and not info["is_directory"]
+
+    asyncio.run(principal())
+
+
+# Uma operação cancelada enquanto espera a anterior não deixa a seguinte começar antes da anterior terminar
+def test_cancelamento_mantem_a_ordem():
+    async def principal():
+        eventos = []
+        async with AsyncFileSystem(FileSystem(), workers=4) as afs:
+            primeira = asyncio.ensure_future(afs._run("/a", registrar(eventos, "primeira")))
+            segunda = asyncio.ensure_future(afs._run("/a", registrar(eventos, "segunda")))
+            terceira = asyncio.ensure_future(afs._run("/a", registrar(eventos, "terceira")))
+            await asyncio.sleep(0.01)
+            segunda.cancel()
+            assert await primeira == "primeira"
+            assert await terceira == "terceira"
+            with pytest.raises(asyncio.CancelledError):
+                await segunda
+        assert eventos == [("inicio", "primeira"), ("fim", "primeira"),
+                           ("inicio", "terceira"), ("fim", "terceira")]
+
+    asyncio.run(principal())
+
+
+# Os erros do sistema de arquivos chegam como Exception e não travam as operações seguintes do caminho
+def test_erros():
+    async def principal():
+        async with AsyncFileSystem(FileSystem()) as afs:
+            with pytest.raises(Exception):
+                await afs.read("/nada.txt")
+            with pytest.raises(Exception):
+                await afs.stat("/nada.txt")
+            await afs.write("/nada.txt", "texto")
+            assert await afs.read("/nada.txt") == b"texto"
+            await afs.unlink("/nada.txt")
+            assert await afs.listdir("/") == []
+
+    asyncio.run(principal())
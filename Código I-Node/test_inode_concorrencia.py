@@ -0,0 +1,111 @@
+# Testes do sistema de arquivos i-node usado por várias threads
+# O teste de estresse mistura criações, acréscimos, movimentações em sentidos opostos e remoções e depois
+# verifica a consistência da árvore e do cache de caminhos.
+import threading
+
+from inode import FileSystem
+
+# Quantidade de threads e iterações de cada thread no teste de estresse
+THREADS = 8
+ITERACOES = 500
+
+
+# Executa a função em `quantidade` threads ao mesmo tempo (as exceções são repassadas)
+def em_paralelo(quantidade, funcao):
+    erros = []
+    inicio_comum = threading.Barrier(quantidade)
+
+    def executar(indice):
+        try:
+            inicio_comum.wait()
+            funcao(indice)
+        except BaseException as erro:
+            erros.append(erro)
+
+    threads = [threading.Thread(target=executar, args=(i,)) for i in range(quantidade)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if erros:
+        raise erros[0]
+
+
+# Percorre a árvore e verifica que cada caminho resolve (com cache) para o próprio nó
+def verificar_arvore(fs):
+    pendentes = [("", fs.root)]
+    while pendentes:
+        caminho, no = pendentes.pop()
+        for nome, filho in no.children.items():
+            assert filho.name == nome, f"nome inconsistente em {caminho}/{nome}"
+            assert fs.find_node(f"{caminho}/{nome}") is filho, f"cache inconsistente em {caminho}/{nome}"
+            if filho.is_directory:
+                pendentes.append((f"{caminho}/{nome}", filho))
+
+
+# Teste de estresse com várias threads sobre diretórios compartilhados
+def test_estresse():
+    fs = FileSystem(cache_size=256)
+    fs.add_node("/", "a", True)
+    fs.add_node("/", "b", True)
+    fs.create_file("/", "compartilhado.txt", "")
+    for i in range(THREADS):
+        fs.add_node("/", f"t{i}", True)
+
+    def trabalho(indice):
+        for i in range(ITERACOES):
+            nome = f"f{indice}_{i}"
+            fs.create_file(f"/t{indice}", nome, "x")
+            fs.append("/compartilhado.txt", b"y")
+            # Movimentações em sentidos opostos entre /a e /b, que causariam deadlock sem ordem fixa das travas
+            origem, destino = ("/a", "/b") if indice % 2 else ("/b", "/a")
+            fs.move_node(f"/t{indice}/{nome}", origem)
+            fs.move_node(f"{origem}/{nome}", destino)
+            fs.find_node(f"{destino}/{nome}")
+            fs.list_directory(destino)
+            if i % 2:
+                fs.delete_node(f"{destino}/{nome}")
+        # Tenta mover um diretório para dentro da própria subárvore (deve ser recusado)
+        fs.move_node(f"/t{indice}", f"/t{indice}")
+
+    em_paralelo(THREADS, trabalho)
+    verificar_arvore(fs)
+    esperados = THREADS * (ITERACOES - ITERACOES // 2)
+    assert len(fs.root.children["a"].children) + len(fs.root.children["b"].children) == esperados
+    assert fs.root.children["compartilhado.txt"].content.size == THREADS * ITERACOES
+    assert all(fs.find_node(f"/t{i}") is not None for i in range(THREADS))
+
+
+# Escritas concorrentes com pwrite em posições disjuntas do mesmo arquivo não se sobrepõem
+def test_pwrite_concorrente():
+    fs = FileSystem()
+    fs.create_file("/", "dados.bin", b"")
+
+    def trabalho(indice):
+        for i in range(ITERACOES):
+            fs.pwrite("/dados.bin", (i * THREADS + indice) * 4, bytes([indice]) * 4)
+
+    em_paralelo(THREADS, trabalho)
+    conteudo = fs.pread("/dados.bin", 0, None)
+    assert len(conteudo) == THREADS * ITERACOES * 4
+    for posicao in range(0, len(conteudo), 4):
+        assert conteudo[posicao:posicao + 4] == bytes([posicao // 4 % THREADS]) * 4
+
+
+# Os campos internos do nó (trava, pai, filhos...) não podem ser trocados por set_attribute, e a trava
+# do diretório continua livre depois da recusa
+def test_atributos_reservados():
+    fs = FileSystem()
+    fs.add_node("/", "c", True)
+    fs.create_file("/c", "a.txt", b"x")
+    no = fs.find_node("/c")
+    trava, pai, filhos = no.lock, no.parent, no.children
+    for atributo in ("lock", "parent", "children", "content", "generation", "versions"):
+        assert fs.set_attribute("/c", atributo, "oops").startswith("Erro")
+    assert (no.lock, no.parent, no.children) == (trava, pai, filhos)
+    fs.set_attribute("/c", "dono", "ana")
+    assert fs.get_attribute("/c", "dono") == "ana"
+    fs.create_file("/c", "b.txt", b"y")
+    assert fs.read_file("/c/a.txt") == "x"
+    assert fs.set_attribute("/c", "name", "d").startswith("Nó")
+    assert fs.find_node("/d/b.txt") is not None
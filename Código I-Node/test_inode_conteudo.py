@@ -0,0 +1,81 @@
+# Testes do conteúdo em pedaços (ChunkedBuffer) e das leituras e escritas por intervalo do i-node
+import random
+
+import pytest
+
+from inode import CHUNK_SIZE, ChunkedBuffer, FileSystem
+
+
+# Escritas, acréscimos e truncamentos que atravessam as fronteiras dos pedaços dão o mesmo resultado que
+# as mesmas operações em um bytearray
+def test_operacoes_comparadas_com_bytearray():
+    aleatorio = random.Random(1)
+    buffer = ChunkedBuffer()
+    referencia = bytearray()
+    for _ in range(300):
+        operacao = aleatorio.choice(["write", "write", "append", "truncate"])
+        if operacao == "write":
+            posicao = aleatorio.randrange(len(referencia) + CHUNK_SIZE)
+            dados = aleatorio.randbytes(aleatorio.choice([1, 100, CHUNK_SIZE - 1, CHUNK_SIZE + 1, 2 * CHUNK_SIZE]))
+            buffer.write(posicao, dados)
+            if posicao > len(referencia):
+                referencia.extend(bytes(posicao - len(referencia)))
+            referencia[posicao:posicao + len(dados)] = dados
+        elif operacao == "append":
+            dados = aleatorio.randbytes(aleatorio.randrange(CHUNK_SIZE))
+            buffer.append(dados)
+            referencia.extend(dados)
+        else:
+            tamanho = aleatorio.randrange(len(referencia) + CHUNK_SIZE)
+            buffer.truncate(tamanho)
+            del referencia[tamanho:]
+            referencia.extend(bytes(tamanho - len(referencia)))
+        assert len(buffer) == len(referencia)
+        assert all(len(pedaco) <= CHUNK_SIZE for pedaco in buffer.chunks)
+        inicio = aleatorio.randrange(len(referencia) + 1)
+        tamanho = aleatorio.randrange(3 * CHUNK_SIZE)
+        assert buffer.read(inicio, tamanho) == referencia[inicio:inicio + tamanho]
+        assert buffer.view(inicio, tamanho) == referencia[inicio:inicio + tamanho]
+    assert buffer.getvalue() == referencia
+
+
+# Uma escrita no meio de um arquivo só altera os pedaços que ela toca
+def test_escrita_altera_so_os_pedacos_afetados():
+    buffer = ChunkedBuffer(bytes(4 * CHUNK_SIZE))
+    pedacos = list(buffer.chunks)
+    buffer.write(CHUNK_SIZE - 2, b"abcd")
+    assert [pedaco is original for pedaco, original in zip(buffer.chunks, pedacos)] == [True] * 4
+    assert buffer.read(CHUNK_SIZE - 3, 6) == b"\0abcd\0"
+    assert buffer.chunks[2] == bytes(CHUNK_SIZE) and buffer.chunks[3] == bytes(CHUNK_SIZE)
+
+
+# Uma visão dentro de um só pedaço não copia os dados e é somente leitura; uma visão que atravessa a
+# fronteira é uma cópia, e nas duas o conteúdo é o do intervalo pedido
+def test_visao():
+    buffer = ChunkedBuffer(b"x" * CHUNK_SIZE + b"y" * 10)
+    visao = buffer.view(CHUNK_SIZE + 2, 4)
+    assert visao.readonly and visao.obj is buffer.chunks[1]
+    assert visao == b"yyyy"
+    assert buffer.view(CHUNK_SIZE - 1, 2) == b"xy"
+    with pytest.raises(TypeError):
+        visao[0] = 0
+    # Um acréscimo com a visão exportada copia o pedaço, e a visão continua com os dados anteriores
+    buffer.append(b"z" * 5)
+    assert visao == b"yyyy"
+    assert buffer.read(CHUNK_SIZE + 8) == b"yyzzzzz"
+
+
+# pread, pwrite, append e truncate no sistema de arquivos trabalham com deslocamentos em bytes
+def test_api_do_sistema():
+    fs = FileSystem()
+    fs.create_file("/", "log", b"")
+    assert fs.pwrite("/log", CHUNK_SIZE - 3, b"123456") == 6
+    assert fs.pread("/log", 0, CHUNK_SIZE - 3) == bytes(CHUNK_SIZE - 3)
+    assert fs.append("/log", b"789") == 3
+    assert fs.pread("/log", CHUNK_SIZE - 3, 100) == b"123456789"
+    assert bytes(fs.read_file("/log", CHUNK_SIZE, 3, as_view=True)) == b"456"
+    assert fs.truncate("/log", CHUNK_SIZE + 1) == CHUNK_SIZE + 1
+    assert fs.pread("/log", CHUNK_SIZE - 3, None) == b"1234"
+    assert fs.truncate("/log", 0) == 0
+    assert fs.pread("/log", 0, None) == b""
+    assert fs.pwrite("/", 0, b"x") is None
@@ -0,0 +1,76 @@
+# Testes do cache de caminhos (dentry cache) do sistema de arquivos i-node
+import pytest
+
+from inode import DentryCache, FileSystem
+
+
+# Monta /a/b/c.txt e deixa os três caminhos em cache
+def montar():
+    fs = FileSystem()
+    fs.add_node("/", "a", True)
+    fs.add_node("/a", "b", True)
+    fs.create_file("/a/b", "c.txt", "c")
+    for caminho in ("/a", "/a/b", "/a/b/c.txt"):
+        assert fs.find_node(caminho) is not None
+    return fs
+
+
+# Depois de renomear, remover ou mover um ancestral, os caminhos antigos da subárvore não resolvem mais,
+# e os novos resolvem para os mesmos nós
+@pytest.mark.parametrize("operacao, novo", [
+    (lambda fs: fs.rename_node("/a/b", "x"), "/a/x/c.txt"),
+    (lambda fs: fs.rename_node("/a", "x"), "/x/b/c.txt"),
+    (lambda fs: fs.move_node("/a/b", "/"), "/b/c.txt"),
+    (lambda fs: fs.move_node("/a/b", "/", "y"), "/y/c.txt"),
+    (lambda fs: fs.delete_node("/a/b"), None),
+    (lambda fs: fs.delete_node("/a"), None),
+    (lambda fs: fs.rmtree("/a"), None),
+])
+def test_invalidacao(operacao, novo):
+    fs = montar()
+    arquivo = fs.find_node("/a/b/c.txt")
+    operacao(fs)
+    assert fs.find_node("/a/b/c.txt") is None
+    assert fs.find_node("/a/b") is None
+    assert fs.read_file("/a/b/c.txt").startswith("Erro")
+    if novo is not None:
+        assert fs.find_node(novo) is arquivo
+    assert all(node.parent is not None or node is fs.root for node in fs.dentry_cache.entries.values())
+
+
+# Um nó criado no lugar de um removido é encontrado, e não o antigo
+def test_recriacao():
+    fs = montar()
+    antigo = fs.find_node("/a/b")
+    fs.delete_node("/a/b")
+    fs.create_file("/a", "b", "agora é arquivo")
+    assert fs.find_node("/a/b") is not antigo
+    assert fs.read_file("/a/b") == "agora é arquivo"
+    assert fs.find_node("/a/b/c.txt") is None
+
+
+# Caminhos equivalentes usam a mesma entrada, e os contadores registram acertos e falhas
+def test_contadores():
+    fs = montar()
+    fs.dentry_cache.hits = fs.dentry_cache.misses = 0
+    assert fs.find_node("a//b/") is fs.find_node("/a/b")
+    fs.find_node("/a/nada")
+    estatisticas = fs.dentry_cache.stats()
+    assert (estatisticas["hits"], estatisticas["misses"]) == (2, 1)
+    assert estatisticas["size"] == 3
+
+
+# O cache descarta a entrada usada há mais tempo e ignora um resultado obtido antes de uma invalidação
+def test_descarte_lru():
+    cache = DentryCache(2)
+    cache.put("/a", "A")
+    cache.put("/b", "B")
+    cache.get("/a")
+    cache.put("/c", "C")
+    assert list(cache.entries) == ["/a", "/c"]
+    geracao = cache.generation
+    cache.invalidate("/x")
+    cache.put("/d", "D", geracao)
+    assert cache.peek("/d") is None
+    cache.invalidate("/")
+    assert cache.stats()["size"] == 0
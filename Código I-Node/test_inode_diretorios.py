@@ -0,0 +1,48 @@
+# Testes dos diretórios do sistema de arquivos i-node: filhos indexados pelo nome e ordem da listagem
+from inode import FileSystem
+
+
+# Em um diretório grande, cada nome é encontrado pelo índice, e a listagem segue a ordem de criação
+def test_diretorio_grande():
+    fs = FileSystem(cache_size=0)
+    fs.add_node("/", "d", True)
+    nomes = [f"f{i}" for i in range(5000, 0, -1)]
+    for nome in nomes:
+        fs.create_file("/d", nome, nome)
+    assert fs.list_directory("/d") == [f"[F] {nome}" for nome in nomes]
+    assert fs.read_file("/d/f1") == "f1"
+    assert fs.read_file("/d/f5000") == "f5000"
+    assert fs.find_node("/d/f0") is None
+    assert fs.find_node("/d/f1/x") is None
+
+
+# Um nome repetido não substitui o nó existente
+def test_nome_repetido():
+    fs = FileSystem()
+    fs.create_file("/", "a", "original")
+    assert fs.add_node("/", "a", True) is None
+    assert fs.create_file("/", "a", "outro").startswith("Erro")
+    assert fs.read_file("/a") == "original"
+    assert fs.list_directory("/") == ["[F] a"]
+
+
+# Remover um filho o tira do índice, e um nó novo com o mesmo nome vai para o fim da listagem; renomear
+# troca a chave do índice
+def test_remocao_e_renomeacao():
+    fs = FileSystem(cache_size=0)
+    for nome in "abc":
+        fs.add_node("/", nome, True)
+    fs.delete_node("/a")
+    assert fs.find_node("/a") is None
+    assert fs.list_directory("/") == ["[D] b", "[D] c"]
+    fs.add_node("/", "a", False)
+    assert not fs.find_node("/a").is_directory
+    assert fs.list_directory("/") == ["[D] b", "[D] c", "[F] a"]
+    fs.rename_node("/b", "x")
+    assert fs.find_node("/b") is None and fs.find_node("/x").is_directory
+    assert sorted(fs.list_directory("/")) == ["[D] c", "[D] x", "[F] a"]
+    fs.delete_node("/c")
+    fs.delete_node("/a")
+    fs.delete_node("/x")
+    assert fs.list_directory("/") == []
+    assert fs.root.children == {}
@@ -0,0 +1,91 @@
+# Testes da importação e da exportação de árvores do sistema de arquivos i-node
+import io
+import os
+import tarfile
+import threading
+
+from inode import FileSystem
+
+
+# Cria no computador uma árvore pequena em `raiz` e retorna {caminho relativo: conteúdo}
+def criar_arvore(raiz):
+    arquivos = {"a.txt": b"primeiro", "sub/b.bin": os.urandom(3 << 20), "sub/vazio.txt": b"",
+                "sub/mais/c.txt": b"terceiro"}
+    for relativo, conteudo in arquivos.items():
+        caminho = os.path.join(raiz, *relativo.split("/"))
+        os.makedirs(os.path.dirname(caminho), exist_ok=True)
+        with open(caminho, "wb") as arquivo:
+            arquivo.write(conteudo)
+    return arquivos
+
+
+# Confere os arquivos importados no diretório `base` do sistema de arquivos
+def conferir(fs, base, arquivos):
+    for relativo, conteudo in arquivos.items():
+        assert fs.pread(f"{base}/{relativo}", 0, None) == conteudo, relativo
+
+
+# Um diretório importado e exportado (para um diretório e para um .tar) volta com o mesmo conteúdo
+def test_ida_e_volta(tmp_path):
+    arquivos = criar_arvore(tmp_path / "origem")
+    fs = FileSystem()
+    assert not fs.import_tree(str(tmp_path / "origem"), "/").startswith("Erro")
+    conferir(fs, "/origem", arquivos)
+
+    assert not fs.export_tree("/origem", str(tmp_path / "exportado")).startswith("Erro")
+    for relativo, conteudo in arquivos.items():
+        assert (tmp_path / "exportado" / relativo).read_bytes() == conteudo
+
+    assert not fs.export_tree("/origem", str(tmp_path / "copia.tar.gz")).startswith("Erro")
+    assert not fs.import_tree(str(tmp_path / "copia.tar.gz"), "/").startswith("Erro")
+    conferir(fs, "/copia", arquivos)
+
+
+# Uma origem inexistente, um destino inexistente ou um nome já usado retornam mensagens de erro
+def test_erros(tmp_path):
+    criar_arvore(tmp_path / "origem")
+    fs = FileSystem()
+    assert fs.import_tree(str(tmp_path / "nada"), "/").startswith("Erro")
+    assert fs.import_tree(str(tmp_path / "origem"), "/nada").startswith("Erro")
+    fs.add_node("/", "origem", True)
+    assert fs.import_tree(str(tmp_path / "origem"), "/").startswith("Erro")
+    (tmp_path / "texto.txt").write_bytes(b"nao e tar")
+    assert fs.import_tree(str(tmp_path / "texto.txt"), "/").startswith("Erro")
+
+
+# Os caminhos com ".." de um .tar são ignorados, e os demais membros são importados
+def test_tar_com_caminho_para_fora(tmp_path):
+    caminho = str(tmp_path / "suspeito.tar")
+    with tarfile.open(caminho, "w") as arquivo:
+        for nome, conteudo in [("ok.txt", b"ok"), ("../fora.txt", b"x"), ("d/../../fora2.txt", b"y")]:
+            membro = tarfile.TarInfo(nome)
+            membro.size = len(conteudo)
+            arquivo.addfile(membro, io.BytesIO(conteudo))
+    fs = FileSystem()
+    assert not fs.import_tree(caminho, "/").startswith("Erro")
+    assert fs.list_directory("/suspeito") == ["[F] ok.txt"]
+    assert fs.find_node("/fora.txt") is None and fs.find_node("/fora2.txt") is None
+
+
+# Uma importação cancelada não deixa nada no destino
+def test_cancelamento(tmp_path):
+    criar_arvore(tmp_path / "origem")
+    fs = FileSystem()
+    cancel = threading.Event()
+    cancel.set()
+    assert fs.import_tree(str(tmp_path / "origem"), "/", cancel=cancel).startswith("Operação cancelada")
+    assert fs.find_node("/origem") is None
+
+
+# Um .tar com um arquivo e um diretório no mesmo caminho retorna erro e não cria nada no destino
+def test_tar_com_arquivo_e_diretorio_de_mesmo_nome(tmp_path):
+    for ordem in (["x", "x/y.txt"], ["x/y.txt", "x"]):
+        caminho = str(tmp_path / "conflito.tar")
+        with tarfile.open(caminho, "w") as arquivo:
+            for nome in ordem:
+                membro = tarfile.TarInfo(nome)
+                membro.size = 1
+                arquivo.addfile(membro, io.BytesIO(b"a"))
+        fs = FileSystem()
+        assert fs.import_tree(caminho, "/").startswith("Erro")
+        assert fs.find_node("/conflito") is None
@@ -0,0 +1,105 @@
+# Testes dos snapshots (cópia na escrita) do sistema de arquivos i-node
+import threading
+
+from inode import FileSystem
+
+
+# Monta uma árvore pequena com um diretório e dois arquivos
+def montar():
+    fs = FileSystem()
+    fs.add_node("/", "docs", True)
+    fs.create_file("/docs", "a.txt", b"original")
+    fs.create_file("/", "b.txt", b"b" * 10000)
+    return fs
+
+
+# O snapshot continua vendo o estado do momento em que foi criado, mesmo depois de escritas, criações,
+# remoções e renomeações na árvore atual
+def test_isolamento():
+    fs = montar()
+    assert fs.create_snapshot("s1").startswith("Snapshot")
+    assert fs.create_snapshot("s1").startswith("Erro")
+    fs.pwrite("/docs/a.txt", 0, b"ALTERADO")
+    fs.append("/b.txt", b"mais")
+    fs.create_file("/docs", "novo.txt", b"n")
+    fs.delete_node("/b.txt")
+    fs.rename_node("/docs", "papeis")
+    fs.set_attribute("/papeis/a.txt", "dono", "ana")
+    snapshot = fs.get_snapshot("s1")
+    assert snapshot.read_file("/docs/a.txt") == "original"
+    assert snapshot.pread("/b.txt", 0, None) == b"b" * 10000
+    assert snapshot.list_directory("/") == ["[D] docs", "[F] b.txt"]
+    assert snapshot.list_directory("/docs") == ["[F] a.txt"]
+    assert snapshot.find_node("/papeis") is None
+    assert snapshot.get_attribute("/docs/a.txt", "dono") is None
+    assert fs.read_file("/papeis/a.txt") == "ALTERADO"
+    assert fs.list_directory("/papeis") == ["[F] a.txt", "[F] novo.txt"]
+
+
+# Cada snapshot vê a sua geração, e remover um deles não altera o que os outros veem
+def test_varios_snapshots():
+    fs = montar()
+    fs.create_snapshot("s1")
+    fs.edit_file("/docs/a.txt", b"segunda")
+    fs.create_snapshot("s2")
+    fs.edit_file("/docs/a.txt", b"terceira")
+    assert fs.list_snapshots() == ["s1", "s2"]
+    assert fs.get_snapshot("s1").read_file("/docs/a.txt") == "original"
+    assert fs.get_snapshot("s2").read_file("/docs/a.txt") == "segunda"
+    assert fs.delete_snapshot("s1").startswith("Snapshot s1 removido")
+    assert fs.get_snapshot("s2").read_file("/docs/a.txt") == "segunda"
+    assert fs.read_file("/docs/a.txt") == "terceira"
+    assert fs.delete_snapshot("s1").startswith("Erro")
+
+
+# Remover o último snapshot descarta as versões guardadas e informa os bytes que só ele usava
+def test_remocao_descarta_versoes():
+    fs = montar()
+    fs.create_snapshot("s1")
+    fs.pwrite("/b.txt", 0, b"x" * 10000)
+    node = fs.find_node("/b.txt")
+    assert node.versions
+    mensagem = fs.delete_snapshot("s1")
+    assert node.versions is None
+    assert fs.find_node("/docs").versions is None
+    assert "10000 bytes liberados" in mensagem
+    assert fs.list_snapshots() == []
+    assert fs.read_file("/b.txt") == "x" * 10000
+
+
+# Um snapshot criado enquanto outro é removido não perde as versões gravadas depois da sua criação
+def test_criacao_durante_remocao():
+    fs = montar()
+    fs.create_snapshot("s1")
+    fs.edit_file("/b.txt", b"depois de s1")
+    # Deixa o caminho em cache, para que a escrita não dependa da trava da raiz
+    fs.find_node("/b.txt")
+    snapshot = fs.get_snapshot("s1")
+    em_percurso = threading.Event()
+    continuar = threading.Event()
+    resolver = snapshot._resolve
+
+    # Pausa o percurso da remoção na raiz, antes de visitar os arquivos
+    def pausar(node):
+        if node is fs.root and not em_percurso.is_set():
+            em_percurso.set()
+            continuar.wait(5)
+        return resolver(node)
+
+    snapshot._resolve = pausar
+    remocao = threading.Thread(target=fs.delete_snapshot, args=("s1",))
+    remocao.start()
+    assert em_percurso.wait(5)
+
+    def criar_e_escrever():
+        fs.create_snapshot("s2")
+        fs.edit_file("/b.txt", b"depois de s2")
+
+    escrita = threading.Thread(target=criar_e_escrever)
+    escrita.start()
+    escrita.join(0.3)
+    continuar.set()
+    remocao.join()
+    escrita.join()
+    assert fs.get_snapshot("s2").read_file("/b.txt") == "depois de s1"
+    assert fs.read_file("/b.txt") == "depois de s2"
@@ -0,0 +1,92 @@
+# Testes das operações sobre subárvores do sistema de arquivos i-node: rmtree, copytree e move_node
+import threading
+
+from inode import BULK_BATCH, FileSystem
+
+
+# Monta /p/sub/{x,y}, /p/z e um arquivo fora da subárvore; o atributo "tipo" é indexado
+def montar():
+    fs = FileSystem()
+    fs.create_index("tipo")
+    fs.add_node("/", "p", True)
+    fs.add_node("/p", "sub", True)
+    fs.create_file("/p/sub", "x", b"x" * 100)
+    fs.create_file("/p/sub", "y", b"y" * 50)
+    fs.create_file("/p", "z", b"z" * 10)
+    fs.create_file("/", "fora", b"f")
+    for caminho in ("/p/sub/x", "/p/z", "/fora"):
+        fs.set_attribute(caminho, "tipo", "dado")
+    return fs
+
+
+# rmtree remove a subárvore inteira, tira os nós dos índices e informa os nós e bytes liberados
+def test_rmtree():
+    fs = montar()
+    lotes = []
+    mensagem = fs.rmtree("/p", progress=lambda nos, liberados: lotes.append((nos, liberados)))
+    assert "5 nós e 160 bytes" in mensagem
+    assert lotes[-1] == (5, 160)
+    assert fs.list_directory("/") == ["[F] fora"]
+    assert fs.find_node("/p/sub/x") is None
+    assert fs.query("tipo", "==", "dado") == ["/fora"]
+    assert fs.rmtree("/fora").startswith("Erro")
+    assert fs.rmtree("/").startswith("Erro")
+
+
+# Um rmtree cancelado antes de começar não remove nada
+def test_rmtree_cancelado():
+    fs = montar()
+    cancel = threading.Event()
+    cancel.set()
+    assert fs.rmtree("/p", cancel=cancel).startswith("Operação cancelada")
+    assert fs.read_file("/p/sub/x") == "x" * 100
+
+
+# copytree cria uma cópia independente (conteúdo e atributos), que aparece nos índices
+def test_copytree():
+    fs = montar()
+    assert "5 nós e 160 bytes" in fs.copytree("/p", "/", "q")
+    assert fs.list_directory("/q") == fs.list_directory("/p")
+    assert fs.list_directory("/q/sub") == ["[F] x", "[F] y"]
+    fs.pwrite("/q/sub/x", 0, b"ALTERADO")
+    fs.delete_node("/q/z")
+    assert fs.pread("/p/sub/x", 0, 8) == b"xxxxxxxx"
+    assert fs.read_file("/p/z") == "z" * 10
+    assert fs.query("tipo", "==", "dado") == ["/fora", "/p/sub/x", "/p/z", "/q/sub/x"]
+    assert fs.copytree("/p", "/", "q").startswith("Erro")
+    assert fs.copytree("/p", "/nada").startswith("Erro")
+    assert fs.find_node("/nada") is None
+
+
+# Um copytree cancelado no meio (pelo progresso do primeiro lote) não liga nada ao destino
+def test_copytree_cancelado():
+    fs = FileSystem()
+    fs.add_node("/", "grande", True)
+    for i in range(2 * BULK_BATCH + 10):
+        fs.add_node("/grande", f"n{i}")
+    cancel = threading.Event()
+    lotes = []
+
+    def progresso(nos, tamanho):
+        lotes.append(nos)
+        cancel.set()
+
+    assert fs.copytree("/grande", "/", "copia", progress=progresso, cancel=cancel).startswith("Operação cancelada")
+    assert lotes == [BULK_BATCH]
+    assert fs.find_node("/copia") is None
+    assert fs.list_directory("/") == ["[D] grande"]
+
+
+# move_node leva a subárvore inteira para outro diretório, opcionalmente com outro nome
+def test_move_node():
+    fs = montar()
+    fs.add_node("/", "destino", True)
+    assert fs.move_node("/p/sub", "/destino", "s").endswith("com sucesso.")
+    assert fs.read_file("/destino/s/x") == "x" * 100
+    assert fs.list_directory("/p") == ["[F] z"]
+    assert fs.query("tipo", "==", "dado") == ["/destino/s/x", "/fora", "/p/z"]
+    assert fs.move_node("/p", "/p/z").startswith("Erro")
+    assert fs.move_node("/destino", "/destino/s").startswith("Erro")
+    fs.create_file("/destino", "z", b"")
+    assert fs.move_node("/p/z", "/destino").startswith("Erro")
+    assert fs.read_file("/p/z") == "z" * 10
@@ -0,0 +1,58 @@
+# Testes da tabela de inodes compacta (INodeTable)
+import pytest
+
+from inodetable import INodeTable
+
+
+# Nós são criados, resolvidos pelo caminho e removidos com a subárvore; os números livres são reutilizados
+def test_arvore():
+    tabela = INodeTable()
+    docs = tabela.add(tabela.root, "docs", True)
+    arquivo = tabela.add(docs, "a.txt")
+    sub = tabela.add(docs, "sub", True)
+    outro = tabela.add(sub, "b.txt")
+    assert tabela.add(docs, "a.txt") is None
+    assert tabela.add(arquivo, "x") is None
+    assert tabela.resolve("/docs/sub/b.txt") is not None
+    assert tabela.resolve("/docs/a.txt/x") is None
+    assert tabela.path(arquivo) == "/docs/a.txt"
+    assert tabela.list(docs) == ["a.txt", "sub"]
+    assert len(tabela) == 5
+    tabela.remove(sub)
+    assert len(tabela) == 3
+    assert tabela.list(docs) == ["a.txt"]
+    novo = tabela.add(tabela.root, "novo")
+    assert novo in (sub, outro)
+    assert tabela.path(novo) == "/novo"
+
+
+# O conteúdo de um arquivo é criado na primeira escrita e aceita escritas e leituras por intervalo
+def test_conteudo():
+    tabela = INodeTable()
+    arquivo = tabela.add(tabela.root, "a.bin")
+    assert tabela.size(arquivo) == 0
+    assert tabela.read(arquivo) == b""
+    tabela.write(arquivo, 0, b"abcdef")
+    tabela.write(arquivo, 4, b"XYZ")
+    assert tabela.read(arquivo) == b"abcdXYZ"
+    assert tabela.read(arquivo, 2, 3) == b"cdX"
+    assert tabela.size(arquivo) == 7
+
+
+# Diretórios não têm conteúdo, e nós removidos (ou inexistentes) são recusados em vez de corromper a tabela
+def test_nos_invalidos():
+    tabela = INodeTable()
+    docs = tabela.add(tabela.root, "docs", True)
+    arquivo = tabela.add(docs, "a.txt")
+    with pytest.raises(ValueError):
+        tabela.write(docs, 0, b"x")
+    with pytest.raises(ValueError):
+        tabela.read(tabela.root)
+    tabela.remove(docs)
+    for operacao in (lambda: tabela.write(arquivo, 0, b"x"), lambda: tabela.remove(arquivo),
+                     lambda: tabela.remove(docs), lambda: tabela.path(arquivo), lambda: tabela.add(docs, "c"),
+                     lambda: tabela.size(99)):
+        with pytest.raises(ValueError):
+            operacao()
+    assert len(tabela) == 1
+    assert tabela.contents == {}
@@ -0,0 +1,64 @@
+# Testes do coletor de métricas (tracing.Tracer) instalado no sistema de arquivos i-node
+import json
+
+import pytest
+
+from inode import FileSystem
+from tracing import Tracer
+
+
+# As operações chamadas aparecem no JSON com contagens, erros, histograma e percentis coerentes
+def test_exportacao_json(tmp_path):
+    tracer = Tracer(sample_rate=1.0)
+    fs = FileSystem(tracer=tracer)
+    fs.add_node("/", "d", True)
+    for i in range(10):
+        fs.create_file("/d", f"f{i}", "x")
+    fs.read_file("/d/f0")
+    with pytest.raises(TypeError):
+        fs.pwrite("/d/f0", 0, 123)
+    dados = json.loads(tracer.to_json())
+    operacoes = dados["operations"]
+    assert operacoes["create_file"]["count"] == 10
+    assert operacoes["add_node"]["count"] == 11
+    assert operacoes["pwrite"]["errors"] == 1
+    for metricas in operacoes.values():
+        assert sum(metricas["histogram"].values()) == metricas["count"]
+        assert metricas["p50_ns"] <= metricas["p99_ns"]
+        assert metricas["max_ns"] <= metricas["total_ns"]
+    # Com sample_rate=1.0, cada chamada vira um evento (inclusive as internas, como o find_node de read_file),
+    # com o caminho quando o primeiro argumento é um texto
+    eventos = dados["events"]
+    assert len(eventos) == sum(metricas["count"] for metricas in operacoes.values())
+    leitura, = [evento for evento in eventos if evento["operation"] == "read_file"]
+    assert leitura["path"] == "/d/f0" and not leitura["error"]
+    assert eventos[-1]["operation"] == "pwrite" and eventos[-1]["error"]
+    arquivo = tmp_path / "metricas.json"
+    tracer.export(str(arquivo))
+    assert json.loads(arquivo.read_text(encoding="utf-8"))["operations"] == operacoes
+
+
+# Sem amostragem não há eventos, e a fila de eventos guarda só os mais recentes
+def test_amostragem():
+    tracer = Tracer()
+    fs = FileSystem(tracer=tracer)
+    fs.find_node("/")
+    assert tracer.snapshot()["events"] == []
+    tracer = Tracer(sample_rate=1.0, max_events=3)
+    fs.set_tracer(tracer)
+    for i in range(5):
+        fs.add_node("/", f"n{i}")
+    assert len(tracer.snapshot()["events"]) == 3
+    tracer.reset()
+    assert tracer.snapshot() == {"operations": {}, "events": []}
+
+
+# Remover o coletor devolve os métodos originais da classe
+def test_remocao_do_coletor():
+    tracer = Tracer()
+    fs = FileSystem(tracer=tracer)
+    assert "find_node" in fs.__dict__
+    fs.set_tracer(None)
+    assert "find_node" not in fs.__dict__
+    fs.add_node("/", "a", True)
+    assert tracer.snapshot()["operations"] == {}
@@ -0,0 +1,124 @@
+# Coleta de métricas das operações do sistema de arquivos i-node
+# Um Tracer conta as chamadas e os erros de cada operação, agrupa as latências em um histograma
+# com faixas de potências de 2 (em nanossegundos) e, opcionalmente, guarda uma amostra dos eventos.
+# Ele só é usado quando instalado com FileSystem.set_tracer; sem ele, as operações não têm custo extra.
+import functools
+import json
+import random
+import threading
+import time
+from collections import deque
+
+# Quantidade de faixas do histograma: a faixa i contém as latências com i bits (de 2**(i-1) a 2**i - 1 ns)
+HISTOGRAM_BUCKETS = 48
+
+
+# Classe que acumula as métricas das operações
+class Tracer:
+    # Inicializa o coletor
+    # `sample_rate`: fração das chamadas (0.0 a 1.0) registradas como eventos individuais
+    # `max_events`: quantidade máxima de eventos guardados (os mais antigos são descartados)
+    def __init__(self, sample_rate=0.0, max_events=10_000):
+        self.sample_rate = sample_rate
+        self.lock = threading.Lock()
+        self.counters = {}  # Operação -> quantidade de chamadas
+        self.errors = {}  # Operação -> quantidade de chamadas que lançaram exceção
+        self.total_ns = {}  # Operação -> soma das latências
+        self.max_ns = {}  # Operação -> maior latência
+        self.histograms = {}  # Operação -> contagem por faixa de latência
+        self.events = deque(maxlen=max_events)  # Eventos amostrados
+
+    # Envolve uma função para medir cada chamada como a operação `operation`
+    def wrap(self, operation, function):
+        clock = time.perf_counter_ns
+
+        @functools.wraps(function)
+        def traced(*args, **kwargs):
+            start = clock()
+            failed = True
+            try:
+                result = function(*args, **kwargs)
+                failed = False
+                return result
+            finally:
+                self.record(operation, start, clock() - start, failed, args[0] if args else None)
+
+        return traced
+
+    # Registra uma chamada da operação com a sua latência em nanossegundos
+    def record(self, operation, start, elapsed, failed=False, path=None):
+        with self.lock:
+            self.counters[operation] = self.counters.get(operation, 0) + 1
+            if failed:
+                self.errors[operation] = self.errors.get(operation, 0) + 1
+            self.total_ns[operation] = self.total_ns.get(operation, 0) + elapsed
+            if elapsed > self.max_ns.get(operation, 0):
+                self.max_ns[operation] = elapsed
+            histogram = self.histograms.get(operation)
+            if histogram is None:
+                histogram = self.histograms[operation] = [0] * HISTOGRAM_BUCKETS
+            histogram[min(elapsed.bit_length(), HISTOGRAM_BUCKETS - 1)] += 1
+            if self.sample_rate and random.random() < self.sample_rate:
+                self.events.append({
+                    "operation": operation,
+                    "path": path if isinstance(path, str) else None,
+                    "start_ns": start,
+                    "duration_ns": elapsed,
+                    "error": failed,
+                })
+
+    # Obtém uma estimativa do percentil `q` (0 a 100) da latência de uma operação, em nanossegundos
+    # O valor retornado é o limite superior da faixa do histograma que contém o percentil
+    def percentile(self, operation, q):
+        with self.lock:
+            histogram = self.histograms.get(operation)
+            if not histogram:
+                return None
+            target = self.counters[operation] * q / 100
+            seen = 0
+            for bucket, count in enumerate(histogram):
+                seen += count
+                if count and seen >= target:
+                    return (1 << bucket) - 1
+            return self.max_ns[operation]
+
+    # Retorna todas as métricas em um dicionário pronto para serialização
+    def snapshot(self):
+        operations = {}
+        for operation in sorted(self.counters):
+            with self.lock:
+                count = self.counters[operation]
+                histogram = self.histograms[operation]
+                operations[operation] = {
+                    "count": count,
+                    "errors": self.errors.get(operation, 0),
+                    "total_ns": self.total_ns[operation],
+                    "mean_ns": self.total_ns[operation] / count,
+                    "max_ns": self.max_ns[operation],
+                    # Faixas não vazias, identificadas pelo limite superior em nanossegundos
+                    "histogram": {str((1 << bucket) - 1): hits for bucket, hits in enumerate(histogram) if hits},
+                }
+            operations[operation]["p50_ns"] = self.percentile(operation, 50)
+            operations[operation]["p99_ns"] = self.percentile(operation, 99)
+        with self.lock:
+            events = list(self.events)
+        return {"operations": operations, "events": events}
+
+    # Serializa as métricas em JSON
+    def to_json(self, **kwargs):
+        return json.dumps(self.snapshot(), **kwargs)
+
+    # Grava as métricas em um arquivo JSON
+    def export(self, path):
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(self.snapshot(), file, indent=2)
+
+    # Zera todas as métricas
+    def reset(self):
+        with self.lock:
+            self.counters.clear()
+            self.errors.clear()
+            self.total_ns.clear()
+            self.max_ns.clear()
+            self.histograms.clear()
+            self.events.clear()